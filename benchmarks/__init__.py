@@ -0,0 +1,6 @@
+"""
+Benchmarks of the frontend on generated programs, reproducing the measurements of the optimizations.
+Run them from the repository root as modules, e.g.:
+
+    python -m benchmarks.tree_printing --functions 2000
+"""
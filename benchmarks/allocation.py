@@ -0,0 +1,57 @@
+"""
+Latency of compiling a small program over and over in one process with a large resident heap,
+like a build server does: plain compilations against ones in an AllocationContext
+"""
+import argparse
+import contextlib
+import io
+import time
+
+from frontend.allocation import AllocationContext
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program, read_example
+
+
+def compile_once(source: str, allocation: bool) -> float:
+    start = time.perf_counter()
+    context = TypeCheckContext(ErrorLogger())
+    with contextlib.redirect_stderr(io.StringIO()):
+        if allocation:
+            with AllocationContext() as allocation_context:
+                program = allocation_context.track(parse_program(source))
+                type_check_program(program, context=context)
+                program.translate(io.StringIO())
+        else:
+            program = parse_program(source)
+            type_check_program(program, context=context)
+            program.translate(io.StringIO())
+            del program
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--compilations', type=int, default=1500, help='number of compilations per round')
+    parser.add_argument('--heap', type=int, default=200000, help='number of objects kept alive meanwhile')
+    args = parser.parse_args()
+
+    source = read_example()
+    # long-lived objects the cyclic garbage collector scans in its full collections
+    heap = [{'value': [index]} for index in range(args.heap)]
+
+    # rounds alternate, so both modes run with a similarly warm process
+    for allocation in (False, True, False, True):
+        latencies = sorted(compile_once(source, allocation) for _ in range(args.compilations))
+
+        def percentile(fraction: float) -> float:
+            return latencies[int(fraction * len(latencies)) - 1] * 1000
+
+        print(f'{"allocation context" if allocation else "plain"}: p50 {percentile(0.5):.1f} ms, '
+              f'p95 {percentile(0.95):.1f} ms, p99 {percentile(0.99):.1f} ms, max {latencies[-1] * 1000:.1f} ms')
+    del heap
+
+
+if __name__ == '__main__':
+    main()
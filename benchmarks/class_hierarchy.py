@@ -0,0 +1,71 @@
+"""
+Least common base and subclass queries on deep and wide class hierarchies:
+the precomputed inheritance closure against walking the superclass chains
+"""
+import argparse
+import random
+import time
+
+from frontend.abstract_syntax_tree import TypeNode, TypeCategory, IdentifierNode
+from frontend.type_checking.shared import type_check_context
+from frontend.type_checking._symbol_tables import build_symbol_tables
+from frontend.type_checking._type_inheritance import least_common_base, is_class_type_subtype_of
+from .common import parse_program
+
+
+def deep_hierarchy(size: int) -> list[str]:
+    return ['class C0 {}'] + [f'class C{index} from C{index - 1} {{}}' for index in range(1, size)]
+
+
+def wide_hierarchy(size: int, randomizer: random.Random) -> list[str]:
+    return ['class C0 {}'] + [f'class C{index} from C{randomizer.randrange(index)} {{}}' for index in range(1, size)]
+
+
+def make_class_type(name: str) -> TypeNode:
+    return TypeNode(TypeCategory.CLASS, IdentifierNode(name, 0, 0), None, 0, 0)
+
+
+def run(label: str, declarations: list[str], queries: int, randomizer: random.Random) -> None:
+    program = parse_program('\n'.join(declarations) + '\n')
+    classes = program.class_definitions
+    with type_check_context() as context:
+        context.class_definitions.extend(classes)
+        start = time.perf_counter()
+        build_symbol_tables()
+        building = time.perf_counter() - start
+        hierarchy = context.class_hierarchy
+
+        pairs = [(randomizer.choice(classes), randomizer.choice(classes)) for _ in range(queries)]
+        type_pairs = [(make_class_type(left.name), make_class_type(right.name)) for left, right in pairs]
+
+        timings = {}
+        results = {}
+        for mode, mode_hierarchy in (('chain walk', None), ('closure', hierarchy)):
+            context.class_hierarchy = mode_hierarchy
+            start = time.perf_counter()
+            bases = [least_common_base(left, right) for left, right in type_pairs]
+            middle = time.perf_counter()
+            subclasses = [is_class_type_subtype_of(left, right) for left, right in pairs]
+            timings[mode] = (middle - start, time.perf_counter() - middle)
+            results[mode] = (bases, subclasses)
+        assert results['chain walk'] == results['closure']
+
+    print(f'{label}: closure built in {building * 1000:.1f}ms')
+    for mode, (bases, subclasses) in timings.items():
+        print(f'    {mode}: {queries} least common bases {bases:.3f}s, {queries} subclass checks {subclasses:.3f}s')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depth', type=int, default=95, help='length of the inheritance chain')
+    parser.add_argument('--width', type=int, default=2000, help='number of classes of the random tree')
+    parser.add_argument('--queries', type=int, default=5000, help='number of queries of each kind')
+    args = parser.parse_args()
+
+    randomizer = random.Random(0)
+    run(f'chain of {args.depth} classes', deep_hierarchy(args.depth), args.queries, randomizer)
+    run(f'random tree of {args.width} classes', wide_hierarchy(args.width, randomizer), args.queries, randomizer)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,52 @@
+"""
+Helpers shared by the benchmarks: timing and counting the emitted instructions.
+The backend isn't run by the benchmarks, so the effect of the optimizations on the execution
+is estimated by the operations of the intermediate code instead (see count_operations)
+"""
+import sys
+import time
+from typing import Callable
+
+# compiling the programs is shared with the tests
+from tests.common import read_example, parse_program, check_program, translate_program, isinstance_chain_dispatch
+
+# generated programs are nested deep enough for the recursive parts of the frontend
+sys.setrecursionlimit(100000)
+
+# IR instructions evaluating something, as opposed to declarations, labels and jumps
+OPERATIONS = frozenset((
+    'ADD', 'SUB', 'MUL', 'DIV', 'MOD', 'LT', 'GT', 'LE', 'GE', 'EQ', 'NE',
+    'AND', 'OR', 'ACCESS', 'INDEX', 'CALL',
+))
+
+
+def measure(function: Callable[[], object], repeat: int = 3) -> float:
+    """
+    Get the best wall time of the function over the runs, in seconds
+    """
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def count_operations(intermediate_code: str, iterations: int = 1, operations: frozenset = OPERATIONS) -> int:
+    """
+    Count the operations of the intermediate code, as if every loop ran the given number of iterations.
+    It's an estimate of the work the backend does rather than its execution time: the iterations are guessed
+    and all the operations are weighted the same
+    :param operations: (optional) instructions to count, e.g. only CALL
+    """
+    depth = 0
+    total = 0
+    for line in intermediate_code.splitlines():
+        if line.startswith('LABEL WHILE'):
+            depth += 1
+        elif line.startswith('LABEL ENDWHILE'):
+            depth -= 1
+        total += sum(token in operations for token in line.split()) * iterations ** depth
+    return total
+
@@ -0,0 +1,72 @@
+"""
+Common subexpression elimination on the swaps of a bubble sort pass and on polynomials of repeated terms:
+operations of the emitted intermediate code (loops counted as running the given iterations)
+with and without the elimination, and the time of the pass.
+The backend isn't run, so the operations are counted in the intermediate code rather than timed
+"""
+import argparse
+import time
+
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from frontend.desugaring.common_subexpression_elimination import eliminate_common_subexpressions
+from .common import check_program, translate_program, count_operations
+
+
+def generate_program(functions: int) -> str:
+    parts = []
+    for index in range(functions):
+        parts.append(
+            f'function[integer] sort{index}(integer n) {{\n'
+            f'    array[integer] arr := [5, 3, 1, 4, {index}];\n'
+            f'    integer buffer := 0;\n'
+            f'    integer j := 0;\n'
+            f'    while (j < n - 1) {{\n'
+            f'        if (arr[j] > arr[j + 1]) {{\n'
+            f'            buffer := arr[j];\n'
+            f'            arr[j] := arr[j + 1];\n'
+            f'            arr[j + 1] := buffer;\n'
+            f'        }}\n'
+            f'        j := j + 1;\n'
+            f'    }}\n'
+            f'    return arr[0];\n'
+            f'}}\n'
+            f'function[integer] poly{index}(integer x, integer y) {{\n'
+            f'    integer total := 0;\n'
+            f'    integer i := 0;\n'
+            f'    while (i < x) {{\n'
+            f'        total := total + (x * y + i) * (x * y + i) + (x * y + i) * {index + 2};\n'
+            f'        i := i + 1;\n'
+            f'    }}\n'
+            f'    return total;\n'
+            f'}}\n'
+        )
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=200, help='number of generated pairs of functions')
+    parser.add_argument('--iterations', type=int, default=100, help='iterations of every loop')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions)
+    for eliminate in (False, True):
+        program, _, context = check_program(source)
+        mangle_static_functions(program)
+        elimination_time = 0.0
+        stats = None
+        if eliminate:
+            start = time.perf_counter()
+            stats = eliminate_common_subexpressions(program)
+            elimination_time = time.perf_counter() - start
+        intermediate_code = translate_program(program)
+
+        print(f'elimination {"on " if eliminate else "off"}: {len(context.error_logger.errors)} errors, '
+              f'{len(intermediate_code.splitlines())} IR lines, '
+              f'{count_operations(intermediate_code)} operations, '
+              f'{count_operations(intermediate_code, args.iterations)} operations executed, '
+              f'elimination {elimination_time:.3f}s' + (f', {stats}' if stats is not None else ''))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,73 @@
+"""
+Constant folding on code computing constants in loops: operations of the emitted intermediate code
+(loops counted as running the given iterations) and type checking time, with and without folding.
+The backend isn't run, so the operations stand for its execution time
+"""
+import argparse
+import random
+
+import frontend.type_checking._type_get as type_get
+from frontend.type_checking._constant_folding import fold_binary_operator, fold_unary_operator
+from .common import check_program, translate_program, count_operations, measure
+
+
+def generate_constant(depth: int, randomizer: random.Random) -> str:
+    if depth == 0:
+        return str(randomizer.randint(1, 50))
+    # divisors are literals, so there are no divisions by zero
+    operator = randomizer.choice(('+', '-', '*', '/', '%') if depth == 1 else ('+', '-', '*'))
+    left = generate_constant(depth - 1, randomizer)
+    right = generate_constant(depth - 1, randomizer)
+    return f'({left} {operator} {right})'
+
+
+def generate_program(functions: int, randomizer: random.Random) -> str:
+    # a few of the products overflow integers, which only the folding detects
+    parts = []
+    for index in range(functions):
+        statements = ''.join(
+            f'        total := total + i * {generate_constant(3, randomizer)};\n' for _ in range(5)
+        )
+        parts.append(
+            f'function[integer] f{index}(integer n) {{\n'
+            f'    integer total := 0;\n'
+            f'    integer i := 0;\n'
+            f'    while (i < n * (2 + 3)) {{\n'
+            f'{statements}'
+            f'        i := i + 1;\n'
+            f'    }}\n'
+            f'    return total;\n'
+            f'}}\n'
+        )
+    return ''.join(parts)
+
+
+def compile_program(source: str, fold: bool) -> tuple[float, str, int]:
+    if not fold:
+        type_get.fold_binary_operator = lambda expression, expression_type: (True, None)
+        type_get.fold_unary_operator = lambda expression, expression_type: (True, None)
+    try:
+        program, _, context = check_program(source)
+        elapsed = measure(lambda: check_program(source))
+    finally:
+        type_get.fold_binary_operator = fold_binary_operator
+        type_get.fold_unary_operator = fold_unary_operator
+    return elapsed, translate_program(program), len(context.error_logger.errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=200, help='number of generated functions')
+    parser.add_argument('--iterations', type=int, default=100, help='iterations of every loop')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions, random.Random(4))
+    for fold in (False, True):
+        elapsed, intermediate_code, errors = compile_program(source, fold)
+        print(f'folding {"on " if fold else "off"}: type check {elapsed:.3f}s, {errors} errors, '
+              f'{len(intermediate_code.splitlines())} IR lines, '
+              f'{count_operations(intermediate_code, args.iterations)} operations executed')
+
+
+if __name__ == '__main__':
+    main()
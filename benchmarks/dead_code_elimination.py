@@ -0,0 +1,61 @@
+"""
+Dead code elimination on a program of call chains, most of which the top-level statements never reach:
+size of the emitted intermediate code and translation time with and without the elimination
+"""
+import argparse
+import random
+import time
+
+from frontend.desugaring.dead_code_elimination import eliminate_dead_code
+from .common import check_program, translate_program, measure
+
+
+def generate_program(chains: int, length: int, reached: int, randomizer: random.Random) -> str:
+    # every function of the chain calls the next one, only the first few chains are called at the top level
+    parts = []
+    for chain in range(chains):
+        for index in range(length):
+            call = f'f{chain}_{index + 1}(a + 1)' if index + 1 < length else 'a'
+            parts.append(
+                f'function[integer] f{chain}_{index}(integer a) {{\n'
+                f'    integer unused := a * {randomizer.randint(2, 9)};\n'
+                f'    integer b := {call};\n'
+                f'    if (false) {{\n'
+                f'        b := b * 2;\n'
+                f'    }}\n'
+                f'    return b;\n'
+                f'}}\n'
+            )
+    for chain in range(reached):
+        parts.append(f'integer r{chain} := f{chain}_0({chain});\n')
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--chains', type=int, default=200, help='number of generated call chains')
+    parser.add_argument('--length', type=int, default=10, help='functions in every chain')
+    parser.add_argument('--reached', type=int, default=20, help='chains called by the top-level statements')
+    args = parser.parse_args()
+
+    source = generate_program(args.chains, args.length, args.reached, random.Random(7))
+    for eliminate in (False, True):
+        program, _, _ = check_program(source)
+        stats = None
+        elimination_time = 0.0
+        if eliminate:
+            # the elimination changes the program in place, so it's timed once
+            start = time.perf_counter()
+            stats = eliminate_dead_code(program)
+            elimination_time = time.perf_counter() - start
+        intermediate_code = translate_program(program)
+        translation_time = measure(lambda: translate_program(program))
+        print(f'elimination {"on " if eliminate else "off"}: {len(intermediate_code.splitlines())} IR lines, '
+              f'{len(intermediate_code)} bytes, elimination {elimination_time:.3f}s, '
+              f'translation {translation_time:.3f}s')
+        if stats is not None:
+            print(f'  {stats}')
+
+
+if __name__ == '__main__':
+    main()
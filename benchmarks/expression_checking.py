@@ -0,0 +1,93 @@
+"""
+Per-node overhead of the expression checker on arithmetic-heavy valid code:
+type checking time divided by the number of nodes of the checked functions,
+with the checkers cached by node class and with the isinstance chain walked for every node
+"""
+import argparse
+import contextlib
+import io
+import random
+import time
+
+from frontend.abstract_syntax_tree import iter_child_nodes
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program, isinstance_chain_dispatch
+
+
+def generate_expression(depth: int, randomizer: random.Random, operands: tuple[str, ...]) -> str:
+    if depth == 0:
+        return randomizer.choice(operands)
+    operator = randomizer.choice(('+', '-', '*', '/', '+', '*'))
+    left = generate_expression(depth - 1, randomizer, operands)
+    right = generate_expression(depth - 1, randomizer, operands)
+    return f'({left} {operator} {right})'
+
+
+def generate_program(functions: int, randomizer: random.Random) -> str:
+    # every statement is valid, so that the whole expressions are checked rather than up to the first error
+    operands = ('a', 'b', 'c', '1', '2.5', '(a)', 'f(a, c)')
+    parts = ['function[integer] f(integer a, integer b) { return a + b; }\n']
+    for index in range(functions):
+        statements = [f'    double x := {generate_expression(4, randomizer, operands)};\n']
+        statements.extend(f'    x := {generate_expression(4, randomizer, operands + ("x", ))};\n' for _ in range(4))
+        statements.append(
+            f'    boolean y := x < {generate_expression(2, randomizer, operands)} '
+            f'and b == {generate_expression(2, randomizer, operands)};\n'
+        )
+        parts.append(
+            f'function[double] g{index}(integer a, double b, integer c) {{\n'
+            + ''.join(statements)
+            + '    return x;\n}\n'
+        )
+    return ''.join(parts)
+
+
+def count_nodes(program) -> int:
+    count = 0
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(iter_child_nodes(node))
+    return count
+
+
+def measure_checking(source: str, repeat: int) -> tuple[float, int]:
+    """
+    Get the best time of type checking the program and the number of errors found
+    """
+    # checking annotates the tree, so every run checks its own copy
+    programs = [parse_program(source) for _ in range(repeat)]
+    best = None
+    for program in programs:
+        context = TypeCheckContext(ErrorLogger())
+        with contextlib.redirect_stderr(io.StringIO()):
+            start = time.perf_counter()
+            type_check_program(program, context=context)
+            elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best, len(context.error_logger.errors)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=400, help='number of generated functions')
+    parser.add_argument('--repeat', type=int, default=5, help='runs to take the best time of')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions, random.Random(7))
+    nodes = count_nodes(parse_program(source))
+
+    cached, errors = measure_checking(source, args.repeat)
+    with isinstance_chain_dispatch():
+        chain, chain_errors = measure_checking(source, args.repeat)
+
+    print(f'{nodes} nodes, {errors} errors ({chain_errors} with isinstance chain)')
+    print(f'cached by class: {cached:.3f}s, {cached / nodes * 1e6:.2f} us per node')
+    print(f'isinstance chain: {chain:.3f}s, {chain / nodes * 1e6:.2f} us per node')
+
+
+if __name__ == '__main__':
+    main()
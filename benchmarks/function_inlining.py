@@ -0,0 +1,79 @@
+"""
+Inlining on tight loops calling small helper functions, like the comparisons and swaps of the README's bubble_sort:
+calls executed by the emitted intermediate code (loops counted as running the given iterations)
+with and without inlining, and the time of the pass.
+The backend isn't run, so the calls are counted in the intermediate code rather than timed
+"""
+import argparse
+import time
+
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from frontend.desugaring.inline_functions import inline_functions
+from .common import check_program, translate_program, count_operations
+
+_HELPERS = '''function[boolean] greater(integer a, integer b) { return a > b; }
+function[integer] larger(integer a, integer b) {
+    integer result := a;
+    if (b > a) {
+        result := b;
+    }
+    return result;
+}
+function[integer] step(integer j) { return j + 1; }
+'''
+
+
+def generate_program(functions: int) -> str:
+    # nested loops with bounds, comparisons and updates made by the helpers
+    parts = [_HELPERS]
+    for index in range(functions):
+        parts.append(
+            f'function[integer] sort{index}(integer n) {{\n'
+            f'    integer best := 0;\n'
+            f'    integer i := 0;\n'
+            f'    while (i < n) {{\n'
+            f'        integer j := 0;\n'
+            f'        while (j < n - 1 - i) {{\n'
+            f'            if (greater(j * {index + 1}, i)) {{\n'
+            f'                best := larger(best, j);\n'
+            f'            }}\n'
+            f'            j := step(j);\n'
+            f'        }}\n'
+            f'        i := step(i);\n'
+            f'    }}\n'
+            f'    return best;\n'
+            f'}}\n'
+        )
+    parts.append(''.join(f'integer r{index} := sort{index}(10);\n' for index in range(functions)))
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=200, help='number of generated functions')
+    parser.add_argument('--iterations', type=int, default=100, help='iterations of every loop')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions)
+    for inline in (False, True):
+        program, _, context = check_program(source)
+        mangle_static_functions(program)
+        inlining_time = 0.0
+        stats = None
+        if inline:
+            start = time.perf_counter()
+            stats = inline_functions(program)
+            inlining_time = time.perf_counter() - start
+        intermediate_code = translate_program(program)
+
+        # bodies of the called functions aren't counted per call, so only the calls are compared
+        calls = count_operations(intermediate_code, args.iterations, frozenset(('CALL',)))
+        print(f'inlining {"on " if inline else "off"}: {len(context.error_logger.errors)} errors, '
+              f'{len(intermediate_code.splitlines())} IR lines, {calls} calls executed, '
+              f'inlining {inlining_time:.3f}s')
+        if stats is not None:
+            print(f'  {stats}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,90 @@
+"""
+Monomorphization of a program using the same generic classes in thousands of places:
+registered instantiations against the distinct instances, time of the pass against the translation,
+and the time copying the class per use instead would take
+"""
+import argparse
+import re
+import time
+
+from frontend.desugaring.instantiate_generic_class import instantiate_all_generics, _copy_class
+from .common import check_program, translate_program, measure
+
+_GENERIC_CLASSES = '''class Box[T] {
+    public T value;
+    public constructor(T v) {
+        this.value := v;
+    }
+}
+class Pair[A, B] {
+    public A first;
+    public nullable Box[B] second;
+    public constructor(A a) {
+        this.first := a;
+        this.second := null;
+    }
+}
+class Node[T] {
+    public T value;
+    public nullable Node[T] next;
+    public constructor(T v) {
+        this.value := v;
+        this.next := null;
+    }
+}
+'''
+
+
+def generate_program(functions: int) -> str:
+    # almost every use is Box[integer], a few functions use the other instantiations
+    parts = [_GENERIC_CLASSES]
+    for index in range(functions):
+        other = ''
+        if index % 100 == 0:
+            other = (
+                '    Pair[integer, double] p := new Pair[integer, double](x);\n'
+                '    Node[Box[integer]] n := new Node[Box[integer]](b);\n'
+            )
+        parts.append(
+            f'function[integer] f{index}(integer x) {{\n'
+            f'    Box[integer] b := new Box[integer](x);\n'
+            f'    Box[integer] c := new Box[integer](b.value + {index});\n'
+            f'{other}'
+            f'    return c.value;\n'
+            f'}}\n'
+        )
+    return ''.join(parts)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=3000, help='number of generated functions')
+    parser.add_argument('--repeat', type=int, default=3, help='runs of the pass to take the best of')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions)
+    best = None
+    for _ in range(args.repeat):
+        # the pass changes the program in place, so every run gets a freshly checked one
+        program, _, context = check_program(source)
+        start = time.perf_counter()
+        instantiate_all_generics(program)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    program, _, context = check_program(source)
+    generic_classes = [class_node for class_node in program.class_definitions if class_node.generic_params]
+    distinct = sum(len(class_node.instantiations) for class_node in generic_classes)
+    uses = len(re.findall(r'\b(?:Box|Pair|Node)\[', source))
+    copy_time = measure(lambda: _copy_class(generic_classes[0]))
+    instantiate_all_generics(program)
+    translation_time = measure(lambda: translate_program(program))
+
+    print(f'{args.functions} functions: {uses} written types of generic classes, {distinct} distinct instantiations, '
+          f'{len(program.class_definitions)} instances, {len(context.error_logger.errors)} errors')
+    print(f'pass {best:.3f}s, translation {translation_time:.3f}s, '
+          f'copying per use would take {copy_time * uses:.3f}s ({copy_time * 1000:.3f}ms per copy)')
+
+
+if __name__ == '__main__':
+    main()
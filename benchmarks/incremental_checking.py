@@ -0,0 +1,134 @@
+"""
+Edit-to-diagnostics latency on a large program: a full type check of the edited program
+against an incremental check reusing the bodies checked before the edit
+"""
+import argparse
+import contextlib
+import io
+import random
+import re
+import time
+
+from frontend.abstract_syntax_tree import ProgramNode, StructuralHasher, diff_programs
+from frontend.type_checking.entrypoint import type_check_program, type_check_program_incrementally
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program
+
+_POINT_CLASS = '''class Point {
+    public integer x;
+    public integer y;
+    public constructor(integer x, integer y) {
+        this.x := x;
+        this.y := y;
+    }
+    public function[integer] sum() {
+        return this.x + this.y;
+    }
+    public function[integer] scaled(integer k) {
+        integer s := this.x * k + this.y * k;
+        return s;
+    }
+}
+'''
+
+
+def generate_program(functions: int, randomizer: random.Random) -> str:
+    # functions call the previous ones, and some of their statements are invalid
+    parts = [_POINT_CLASS]
+    for index in range(functions):
+        body = [
+            f'    integer a := {index};',
+            '    double d := a * 2.5;',
+            '    Point p := new Point(a, a + 1);',
+        ]
+        for step in range(randomizer.randint(3, 12)):
+            kind = randomizer.random()
+            if kind < 0.3:
+                body.append(f'    a := a + p.sum() * {step};')
+            elif kind < 0.5 and index > 0:
+                body.append(f'    a := a + f{randomizer.randrange(index)}(a, {step});')
+            elif kind < 0.6:
+                body.append(f'    d := d + p.scaled({step});')
+            elif kind < 0.65:
+                body.append('    a := undefined_var + 1;')
+            elif kind < 0.7:
+                body.append('    a := p.missing();')
+            else:
+                body.append(
+                    f'    while (a < {step * 10}) {{\n        a := a + 1;\n'
+                    f'        if (a > 5) {{\n            d := d * 1.5;\n        }}\n    }}'
+                )
+        body.append('    return a;')
+        parts.append(f'function[integer] f{index}(integer x, integer y) {{\n' + '\n'.join(body) + '\n}\n')
+    parts.append('integer r := f0(1, 2);\n')
+    return ''.join(parts)
+
+
+def replace_changed_definitions(program: ProgramNode, new_program: ProgramNode, hasher: StructuralHasher) -> None:
+    """
+    Put the definitions of the new version into the previously checked program, keeping the unchanged ones
+    """
+    diff = diff_programs(program, new_program, hasher)
+    kept = {id(new_node): old_node for old_node, new_node in diff.unchanged.values()}
+    program.class_definitions = [kept.get(id(node), node) for node in new_program.class_definitions]
+    program.function_definitions = [kept.get(id(node), node) for node in new_program.function_definitions]
+    program.statements = new_program.statements
+
+
+def check(program: ProgramNode, previous_context: TypeCheckContext | None = None, incremental: bool = False):
+    context = TypeCheckContext()
+    with contextlib.redirect_stderr(io.StringIO()):
+        start = time.perf_counter()
+        if incremental:
+            type_check_program_incrementally(program, previous_context, context)
+        else:
+            type_check_program(program, context=context)
+        elapsed = time.perf_counter() - start
+    return elapsed, context
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=1000, help='number of generated functions')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions, random.Random(0))
+    edited = args.functions // 2
+    # the early functions are called by many of the later ones, so their callers are checked again
+    edits = {
+        'body edit': source.replace(f'    integer a := {edited};', f'    integer a := {edited} + 1;'),
+        'line inserted at the top': '\n' + source,
+        'signature edit': source.replace('function[integer] f1(integer x', 'function[double] f1(integer x'),
+    }
+    callers = len(re.findall(r'f1\(a,', source))
+    print(f'{args.functions} functions, f1 is called {callers} times')
+
+    for name, edited_source in edits.items():
+        start = time.perf_counter()
+        new_program = parse_program(edited_source)
+        parsing = time.perf_counter() - start
+        full_time, full_context = check(new_program)
+
+        # the previous version was hashed when it was diffed against its own previous version
+        program = parse_program(source)
+        hasher = StructuralHasher()
+        hasher.digest(program)
+        _, previous_context = check(program, incremental=True)
+        new_program = parse_program(edited_source)
+        start = time.perf_counter()
+        replace_changed_definitions(program, new_program, hasher)
+        diffing = time.perf_counter() - start
+        incremental_time, context = check(program, previous_context, incremental=True)
+
+        # kept nodes keep their locations, so only the messages are compared
+        state = context.incremental_state
+        same_errors = [error.message for error in context.error_logger] == [
+            error.message for error in full_context.error_logger
+        ]
+        print(f'{name}: parse {parsing:.3f}s, full check {full_time:.3f}s, '
+              f'diff {diffing:.3f}s + incremental check {incremental_time:.3f}s '
+              f'(checked {state.checked_bodies} bodies, reused {state.reused_bodies}), same errors: {same_errors}')
+
+
+if __name__ == '__main__':
+    main()
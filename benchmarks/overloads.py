@@ -0,0 +1,79 @@
+"""
+Duplicate overload detection on a class holding thousands of overloads:
+overloads grouped by signature keys against comparing every pair of them
+"""
+import argparse
+import re
+import time
+
+import frontend.type_checking.classes.entrypoint as classes_entrypoint
+import frontend.type_checking.functions.entrypoint as functions_entrypoint
+from frontend.type_checking._overloads import validate_overloaded_function_definitions
+from tests.test_overloads import previous_validate_overloaded_function_definitions
+from .common import check_program
+
+
+# types never converted into each other, so overloads differing in them aren't duplicates
+_DISTINCT_TYPES = ('integer', 'boolean', 'string', 'char', 'Base', 'Other')
+
+
+def generate_program(overloads: int, duplicate_every: int) -> str:
+    # parameter types of the overload are the digits of its number, every few overloads repeat the previous one
+    lines = [
+        'class Base { public integer x; }\n',
+        'class Other { public integer z; }\n',
+        'class Big {\n',
+    ]
+    for index in range(overloads):
+        number = index - 1 if index % duplicate_every == duplicate_every - 1 else index
+        types = []
+        while True:
+            number, digit = divmod(number, len(_DISTINCT_TYPES))
+            types.append(_DISTINCT_TYPES[digit])
+            if not number:
+                break
+        parameters = ', '.join(f'{type_name} a{position}' for position, type_name in enumerate(types))
+        lines.append(f'    public function[integer] m({parameters}) {{ return 1; }}\n')
+    lines.append('}\n')
+    return ''.join(lines)
+
+
+def run(source: str, validate) -> tuple[float, float, list[str]]:
+    timing = [0.0]
+
+    def timed_validate(definitions):
+        start = time.perf_counter()
+        valid = validate(definitions)
+        timing[0] += time.perf_counter() - start
+        return valid
+
+    for module in (classes_entrypoint, functions_entrypoint):
+        module.validate_overloaded_function_definitions = timed_validate
+    try:
+        start = time.perf_counter()
+        _, _, context = check_program(source)
+        total = time.perf_counter() - start
+    finally:
+        for module in (classes_entrypoint, functions_entrypoint):
+            module.validate_overloaded_function_definitions = validate_overloaded_function_definitions
+    return timing[0], total, sorted(re.sub(r' at 0x[0-9a-f]+', '', str(error)) for error in context.error_logger)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--overloads', type=int, nargs='+', default=[500, 1000, 2000], help='overloads of the class')
+    parser.add_argument('--duplicate-every', type=int, default=50, help='period of the duplicate overloads')
+    args = parser.parse_args()
+
+    for overloads in args.overloads:
+        source = generate_program(overloads, args.duplicate_every)
+        previous_time, previous_total, previous_errors = run(source, previous_validate_overloaded_function_definitions)
+        current_time, current_total, current_errors = run(source, validate_overloaded_function_definitions)
+        print(f'{overloads} overloads ({len(current_errors)} duplicates): '
+              f'pairwise {previous_time:.3f}s (check {previous_total:.3f}s), '
+              f'grouped {current_time:.3f}s (check {current_total:.3f}s), '
+              f'same errors: {previous_errors == current_errors}')
+
+
+if __name__ == '__main__':
+    main()
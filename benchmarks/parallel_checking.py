@@ -0,0 +1,71 @@
+"""
+Type checking a program of many function and method bodies (-j/--jobs) sequentially and in worker processes:
+wall time of the check, CPU time of the main process and of the workers, and the speedup over the sequential one.
+The speedup is bounded by the CPUs available, which are printed too
+"""
+import argparse
+import os
+import resource
+import time
+
+from frontend.type_checking._parallel import can_validate_in_parallel
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program
+
+
+def generate_program(functions: int) -> str:
+    return ''.join(
+        f'''class C{index} {{
+    public integer x;
+    public function[integer] get(integer a) {{ return a * {index} + (a - 1) * (a + 2); }}
+}}
+function[integer] f{index}(integer a, integer b) {{
+    integer c := a * {index} + b - (a + 1) * (b - 2);
+    while (c < a + b) {{
+        if (c > {index}) {{ c := c + a * 2; }} else {{ c := c - b / 2; }}
+    }}
+    return c + f{max(index - 1, 0)}(a, b);
+}}
+'''
+        for index in range(functions)
+    )
+
+
+def children_cpu_time() -> float:
+    usage = resource.getrusage(resource.RUSAGE_CHILDREN)
+    return usage.ru_utime + usage.ru_stime
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=3000, help='number of generated classes and functions')
+    parser.add_argument('workers', type=int, nargs='*', default=[1, 2, 4], help='numbers of processes to check in')
+    args = parser.parse_args()
+
+    if not can_validate_in_parallel():
+        print('processes can\'t be forked, bodies are checked sequentially')
+    print(f'CPUs available: {len(os.sched_getaffinity(0))}')
+
+    source = generate_program(args.functions)
+    sequential_time = None
+    for workers in args.workers:
+        program = parse_program(source)
+        context = TypeCheckContext(ErrorLogger())
+        start_children = children_cpu_time()
+        start_process = time.process_time()
+        start = time.perf_counter()
+        type_check_program(program, context=context, workers=workers)
+        elapsed = time.perf_counter() - start
+        process_time = time.process_time() - start_process
+        workers_time = children_cpu_time() - start_children
+
+        sequential_time = sequential_time if sequential_time is not None else elapsed
+        print(f'{workers} workers: {elapsed:.3f}s ({sequential_time / elapsed:.2f}x), '
+              f'main process CPU {process_time:.3f}s, workers CPU {workers_time:.3f}s, '
+              f'{len(context.error_logger.errors)} errors')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,41 @@
+"""
+Type checking of deeply nested scopes declaring many variables each: entering a scope
+doesn't copy the variables of the enclosing ones
+"""
+import argparse
+import time
+
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program
+
+
+def generate_program(depth: int, variables: int) -> str:
+    lines = ['function[integer] f(integer a) {']
+    for level in range(depth):
+        lines.extend(f'integer v{level}_{index} := a + {index};' for index in range(variables))
+        lines.append(f'if (v{level}_0 > 0) {{')
+    lines.append('a := a + 1;')
+    lines.extend(['}'] * depth)
+    lines.extend(['return a;', '}', 'integer z := f(1);'])
+    return '\n'.join(lines) + '\n'
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--depths', type=int, nargs='*', default=[200, 400, 800], help='nesting depths')
+    parser.add_argument('--variables', type=int, default=50, help='variables declared per scope')
+    args = parser.parse_args()
+
+    for depth in args.depths:
+        program = parse_program(generate_program(depth, args.variables))
+        context = TypeCheckContext(ErrorLogger())
+        start = time.perf_counter()
+        type_check_program(program, context=context)
+        print(f'depth {depth}, {args.variables} variables per scope: {time.perf_counter() - start:.3f}s, '
+              f'errors: {len(context.error_logger.errors)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,60 @@
+"""
+Position queries on a large program: building the span index once, then the innermost node at random offsets
+and the nodes in small ranges, against scanning every node for each query
+"""
+import argparse
+import random
+import time
+
+from frontend.abstract_syntax_tree import iter_child_nodes
+from .common import parse_program
+from .tree_printing import generate_program
+
+
+def scan_node_at(nodes: list, offset: int):
+    covering = [node for node in nodes if node.span is not None and node.span[0] <= offset < node.span[1]]
+    return min(covering, key=lambda node: node.span[1] - node.span[0]) if covering else None
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=600, help='number of generated functions')
+    parser.add_argument('--queries', type=int, default=10000, help='number of queries of each kind')
+    args = parser.parse_args()
+
+    source = generate_program(args.functions)
+    program = parse_program(source)
+    randomizer = random.Random(0)
+    offsets = [randomizer.randrange(len(source)) for _ in range(args.queries)]
+
+    start = time.perf_counter()
+    index = program.build_span_index()
+    print(f'source: {len(source)} characters, index built in {time.perf_counter() - start:.3f}s')
+
+    start = time.perf_counter()
+    for offset in offsets:
+        index.node_at(offset)
+    print(f'{args.queries} node_at: {time.perf_counter() - start:.3f}s')
+
+    start = time.perf_counter()
+    for offset in offsets:
+        index.nodes_in_range(offset, offset + 20)
+    print(f'{args.queries} nodes_in_range of 20 characters: {time.perf_counter() - start:.3f}s')
+
+    nodes = []
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        nodes.append(node)
+        stack.extend(iter_child_nodes(node))
+    scanned = offsets[:100]
+    start = time.perf_counter()
+    for offset in scanned:
+        scan_node_at(nodes, offset)
+    elapsed = time.perf_counter() - start
+    print(f'{len(scanned)} node_at by scanning {len(nodes)} nodes: {elapsed:.3f}s '
+          f'({elapsed / len(scanned) * args.queries:.1f}s per {args.queries})')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""
+Scaling of type checking with the number of declarations: every class, function and method
+is looked up through the symbol tables, so the time per declaration should stay flat
+"""
+import argparse
+import time
+
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program
+
+
+def generate_program(count: int) -> str:
+    declarations = ''.join(
+        f'''class C{index} {{
+    public integer v;
+    public function[integer] get(integer a) {{ return a; }}
+}}
+function[integer] f{index}(integer a) {{ return a + 1; }}
+'''
+        for index in range(count)
+    )
+    return declarations + ''.join(f'integer x{index} := f{index}(1);\n' for index in range(count))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('sizes', type=int, nargs='*', default=[100, 1000, 10000],
+                        help='numbers of classes, functions and calls of the generated programs')
+    args = parser.parse_args()
+
+    for size in args.sizes:
+        program = parse_program(generate_program(size))
+        context = TypeCheckContext(ErrorLogger())
+        start = time.perf_counter()
+        type_check_program(program, context=context)
+        elapsed = time.perf_counter() - start
+        print(f'{3 * size} declarations: {elapsed:.3f}s, {elapsed / (3 * size) * 1e6:.1f} us per declaration, '
+              f'errors: {len(context.error_logger.errors)}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,71 @@
+"""
+Dumping the tree of a large program (--print-tree): streaming it line by line into a stream
+against building the whole dump as a string and writing it at once, with the depth limit and without colors.
+Both write into the null device, like a redirected stdout. Streaming takes about the time of the string
+and keeps the peak memory constant instead of growing with the size of the dump
+"""
+import argparse
+import os
+import tracemalloc
+
+from frontend.abstract_syntax_tree import iter_child_nodes
+from .common import parse_program, measure
+
+
+def generate_program(functions: int) -> str:
+    return ''.join(
+        f'''function[integer] f{index}(integer a, integer b) {{
+    integer c := a * {index} + b - (a + 1) * (b - 2);
+    while (c < a + b) {{
+        if (c > {index}) {{ c := c + a * 2; }} else {{ c := c - b / 2; }}
+    }}
+    return c + f{max(index - 1, 0)}(a, b);
+}}
+'''
+        for index in range(functions)
+    )
+
+
+def count_nodes(program) -> int:
+    count = 0
+    stack = [program]
+    while stack:
+        node = stack.pop()
+        count += 1
+        stack.extend(iter_child_nodes(node))
+    return count
+
+
+def peak_memory(function) -> int:
+    tracemalloc.start()
+    function()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--functions', type=int, default=1500, help='number of generated functions')
+    args = parser.parse_args()
+
+    program = parse_program(generate_program(args.functions))
+    print(f'nodes: {count_nodes(program)}')
+
+    with open(os.devnull, 'w') as stream:
+        cases = {
+            'stream': lambda: program.print_tree(stream),
+            'stream, no colors': lambda: program.print_tree(stream, colored=False),
+            'stream, depth 3': lambda: program.print_tree(stream, max_depth=3),
+            'string': lambda: stream.write(str(program)),
+        }
+        peaks = {}
+        for name, function in cases.items():
+            peaks[name] = peak_memory(function)
+            print(f'{name}: {measure(function):.3f}s, peak memory {peaks[name] / 2 ** 20:.1f} MiB')
+
+    print(f'streaming peak memory is {peaks["string"] / peaks["stream"]:.0f}x lower than the string')
+
+
+if __name__ == '__main__':
+    main()
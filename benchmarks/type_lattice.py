@@ -0,0 +1,50 @@
+"""
+Microbenchmark of the primitive type conversions: lattice lookups of match_types and common_primitive_type
+against the if/elif chains they replaced (kept as the reference of the equivalence tests)
+"""
+import argparse
+import itertools
+import timeit
+
+from frontend.semantics import TypeEnum
+from frontend.type_checking._type_cast import common_primitive_type
+from frontend.type_checking._type_match import match_types
+from tests.test_type_lattice import previous_common_primitive_type, previous_match_types, make_primitive_type
+
+_NUMERIC_TYPES = (
+    TypeEnum.BYTE,
+    TypeEnum.SHORT_INTEGER,
+    TypeEnum.INTEGER,
+    TypeEnum.LONG_INTEGER,
+    TypeEnum.EXTENDED_INTEGER,
+    TypeEnum.FLOAT,
+    TypeEnum.DOUBLE,
+    TypeEnum.COMPLEX,
+)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument('--rounds', type=int, default=5000, help='rounds over all the pairs')
+    args = parser.parse_args()
+
+    name_pairs = list(itertools.product(_NUMERIC_TYPES, repeat=2))
+    type_pairs = list(itertools.product(
+        [make_primitive_type(type_name) for type_name in _NUMERIC_TYPES + (TypeEnum.STRING,)], repeat=2
+    ))
+    cases = {
+        'common_primitive_type': (common_primitive_type, previous_common_primitive_type, name_pairs),
+        'match_types': (match_types, previous_match_types, type_pairs),
+    }
+    for name, (function, previous_function, pairs) in cases.items():
+        times = [
+            min(timeit.repeat(
+                lambda: [tested(left, right) for left, right in pairs], number=args.rounds, repeat=3
+            ))
+            for tested in (previous_function, function)
+        ]
+        print(f'{name}, {len(pairs)} pairs x {args.rounds}: if/elif {times[0]:.3f}s, lattice {times[1]:.3f}s')
+
+
+if __name__ == '__main__':
+    main()
@@ -1,5 +1,12 @@
 # flake8: noqa F401
-from .ast_node import ASTNode
+from .ast_node import (
+    ASTNode,
+    is_node_class,
+    get_non_structural_attributes,
+    get_skipped_attributes,
+    iter_child_nodes,
+    iter_referenced_nodes,
+)
 from .operators import (
     BinaryOperatorABCNode,
     MemberOperatorNode,
@@ -19,6 +26,19 @@ from .classes.definition import (
     ClassMethodDeclarationNode,
 )
 
+from .diffing import (
+    StructuralHasher,
+    ProgramDiff,
+    structural_hash,
+    iter_declarations,
+    diff_programs,
+)
+from .labels import (
+    LabelAllocator
+)
+from .spans import (
+    SpanIndex,
+)
 from .construct_if import (
     IfElseNode
 )
@@ -1,15 +1,58 @@
 from abc import ABC, abstractmethod
-from typing import Sequence, TextIO
+from typing import Iterator, Sequence, TextIO
 
 
 class ASTNode(ABC):
+    # locations and validation status
+    LOCATION_ATTRIBUTES = frozenset((
+        "line",
+        "position",
+        "span",
+        "valid",
+        "translatable",
+    ))
+
+    # type checker meta info of the expressions
+    EXPRESSION_META_ATTRIBUTES = frozenset((
+        "expression_type",
+        "folded_literal",
+    ))
+
+    # attributes that are not part of the code structure (the structural hash doesn't depend on them),
+    # subclasses add their own ones
+    META_ATTRIBUTES = LOCATION_ATTRIBUTES | EXPRESSION_META_ATTRIBUTES | frozenset((
+        # type checker meta info
+        "_usages",
+        "overload_number",
+        "has_overloads",
+        "associated_class",
+        "_class",
+        "represents_generic_param",
+        "_valid_inherited_class",
+        "_valid_inherited_methods",
+        "_inherited_class_instance",
+        "_instantiations",
+    ))
+
+    # attributes referring to other nodes of the tree rather than to the child ones,
+    # e.g. operator overloads taken out of their classes refer to them
+    REFERENCE_ATTRIBUTES = frozenset((
+        "external_to",
+    ))
+
     def __init__(self, line, position):
         self.line = line
         self.position = position
         self.valid = None
 
+        # half-open interval of absolute offsets in the source code, set by the parser
+        self.span: tuple[int, int] | None = None
+
+        # type of the valid expression, set by the type checker (shared with declarations, mustn't be modified)
+        self.expression_type: "TypeNode | None" = None
+
     def __str__(self):
-        return _TreePrinter.print_tree(self)[0] + _TreePrinter.END_COLOR
+        return "".join(_TreePrinter().iter_lines(self)) + _TreePrinter.END_COLOR
 
     @property
     def location(self) -> tuple[int, int]:
@@ -29,16 +72,118 @@ class ASTNode(ABC):
             file.write(token)
         file.write('\n')
 
+    def print_tree(
+        self,
+        file: TextIO,
+        max_depth: int | None = None,
+        colored: bool = True,
+        subtree_path: str | None = None,
+    ) -> None:
+        """
+        Write the tree structure of the node into the stream line by line,
+        without building the whole dump in memory
+        :param file: stream to write into
+        :param max_depth: (optional) how many node levels to expand, unlimited if None
+        :param colored: whether to highlight validation status with ANSI colors
+        :param subtree_path: (optional) dot-separated path to the subtree to print instead of entire node,
+        e.g. "function_definitions.0.function_body"
+        :raises KeyError: if the subtree path doesn't exist
+        """
+        tree = self if not subtree_path else _TreePrinter.select_subtree(self, subtree_path)
+        file.writelines(_TreePrinter(max_depth=max_depth, colored=colored).iter_lines(tree))
+        if colored:
+            file.write(_TreePrinter.END_COLOR)
 
-class _TreePrinter:
+
+# isinstance checks against abstract ASTNode are slow, so they are done once per class
+_node_classes: dict[type, bool] = {}
+
+# attributes that aren't child nodes, by node class
+_skipped_attributes: dict[type, frozenset[str]] = {}
+
+
+def is_node_class(value_class: type) -> bool:
+    is_node = _node_classes.get(value_class)
+    if is_node is None:
+        is_node = _node_classes[value_class] = issubclass(value_class, ASTNode)
+    return is_node
+
+
+def get_non_structural_attributes(node_class: type) -> frozenset[str]:
+    """
+    Get names of the attributes of the node class that are not part of the code structure
+    (i.e. the ones structural hash doesn't depend on: locations, type checker meta info etc.)
+    :param node_class: class of AST node
+    :return: attribute names
+    """
+    return node_class.META_ATTRIBUTES
+
+
+def get_skipped_attributes(node_class: type) -> frozenset[str]:
+    """
+    Names of the attributes of the node class that aren't child nodes:
+    the ones that are not part of the code structure and references to other nodes
+    """
+    skipped = _skipped_attributes.get(node_class)
+    if skipped is None:
+        skipped = _skipped_attributes[node_class] = node_class.META_ATTRIBUTES | node_class.REFERENCE_ATTRIBUTES
+    return skipped
+
+
+def iter_child_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """
+    Iterate over the direct children of the node, in order of attributes
+    :param node: AST node
+    :return: iterator over the child nodes
+    """
+    skipped = get_skipped_attributes(type(node))
+    for name, value in node.__dict__.items():
+        if name in skipped:
+            continue
+        value_class = type(value)
+        if value_class is list or value_class is tuple:
+            for item in value:
+                item_class = type(item)
+                is_node = _node_classes.get(item_class)
+                if is_node or (is_node is None and is_node_class(item_class)):
+                    yield item
+        else:
+            is_node = _node_classes.get(value_class)
+            if is_node or (is_node is None and is_node_class(value_class)):
+                yield value
+
+
+def iter_referenced_nodes(node: ASTNode) -> Iterator[ASTNode]:
+    """
+    Iterate over all the nodes the node refers to: the child ones, and the ones referred by meta info
+    and references (e.g. types made up by the type checker), including the ones in nested lists, tuples and dicts
+    :param node: AST node
+    :return: iterator over the referred nodes
     """
+    stack = list(node.__dict__.values())
+    while stack:
+        value = stack.pop()
+        value_class = type(value)
+        if value_class is list or value_class is tuple:
+            stack.extend(value)
+        elif value_class is dict:
+            stack.extend(value.values())
+        elif is_node_class(value_class):
+            yield value
 
+
+class _TreePrinter:
+    """
+    Pretty printer of AST trees.
+    Walks the tree with an explicit stack and yields the dump line by line,
+    so neither deep nor huge trees are concatenated into a single string.
     """
 
     MIDDLE_VAR = '├──'
     LAST_VAR = '└──'
     EMPTY = '    '
     GOING = '│   '
+    TRUNCATED = ' ...'
 
     NOT_VALIDATED = '\033[93m'
     INVALID = '\033[91m'
@@ -46,8 +191,14 @@ class _TreePrinter:
 
     END_COLOR = '\033[0m'
 
-    @staticmethod
-    def get_color(node: ASTNode | list | tuple, last_color: str | None = None) -> str:
+    def __init__(self, max_depth: int | None = None, colored: bool = True):
+        self.max_depth = max_depth
+        self.colored = colored
+
+    def get_color(self, node: ASTNode | list | tuple, last_color: str | None = None) -> str:
+        if not self.colored:
+            return ""
+
         if last_color:
             return last_color
 
@@ -59,55 +210,100 @@ class _TreePrinter:
             return _TreePrinter.VALID
 
     @staticmethod
-    def print_tree(
-        tree: ASTNode | Sequence[ASTNode],
-        indent: str = "",
-        last: bool | None = None,
-        last_color: str = ""
-    ):
-
-        if not isinstance(tree, (ASTNode, list, tuple)):
-            return last_color + str(tree) + "\n", last_color
-
-        if isinstance(tree, ASTNode) and hasattr(tree, '__print_tree__'):
-            color = _TreePrinter.get_color(tree)
-            return color + tree.__print_tree__() + "\n", color
-
-        if last is not None:
-            indent += (
-                _TreePrinter.get_color(tree, last_color) +
-                (_TreePrinter.EMPTY if last else _TreePrinter.GOING)
-            )
-
-        if isinstance(tree, (list, tuple)):
-
-            arg_num = len(tree)
-            result_string = "\n"
-            for index, item in enumerate(tree):
-                marker = _TreePrinter.LAST_VAR if index == arg_num - 1 else _TreePrinter.MIDDLE_VAR
+    def tree_name(tree: ASTNode) -> str:
+        if hasattr(tree, "__tree_name__"):
+            return tree.__tree_name__()
+        return type(tree).__name__.replace("Node", "")
+
+    @staticmethod
+    def tree_attributes(tree: ASTNode) -> dict:
+        attrs = tree.__tree_dict__() if hasattr(tree, "__tree_dict__") else tree.__dict__.copy()
+        for name in ASTNode.LOCATION_ATTRIBUTES | ASTNode.EXPRESSION_META_ATTRIBUTES:
+            attrs.pop(name, None)
+        return attrs
 
-                substr, sub_color = _TreePrinter.print_tree(item, indent, index == arg_num - 1, last_color)
-                result_string += f"{indent}{last_color}{marker}{substr}"
+    @staticmethod
+    def select_subtree(tree: ASTNode | Sequence[ASTNode], path: str) -> ASTNode | Sequence[ASTNode]:
+        """
+        Get the subtree by the dot-separated path of printed attribute names and list indices,
+        e.g. "function_definitions.0.function_body"
+        :param tree: root of the tree
+        :param path: dot-separated path to the subtree
+        :return: selected subtree
+        :raises KeyError: if the path doesn't exist in the tree
+        """
+        current = tree
+        for step in filter(None, path.split(".")):
+            if isinstance(current, (list, tuple)):
+                if not step.lstrip("-").isdigit() or not -len(current) <= int(step) < len(current):
+                    raise KeyError(f"Invalid index {step} in tree path {path}")
+                current = current[int(step)]
+            elif isinstance(current, ASTNode):
+                attrs = {
+                    name.lstrip("_"): value
+                    for name, value in _TreePrinter.tree_attributes(current).items()
+                }
+                if step not in attrs:
+                    raise KeyError(f"No attribute {step} in {type(current).__name__} (tree path {path})")
+                current = attrs[step]
+            else:
+                raise KeyError(f"Cannot descend into {type(current).__name__} (tree path {path})")
+        return current
 
-            return result_string, last_color
+    def iter_lines(self, tree: ASTNode | Sequence[ASTNode]) -> Iterator[str]:
+        """
+        Yield the lines of the tree dump, each one ending with a newline
+        :param tree: node or list of nodes to print
+        :return: iterator over printed lines
+        """
+        # every entry is a pending subtree: (subtree, head of its first line, indent, last, last_color, depth)
+        stack = [(tree, "", "", None, "", 0)]
 
-        if hasattr(tree, "__tree_name__"):
-            class_name = tree.__tree_name__()
-        else:
-            class_name = type(tree).__name__.replace("Node", "")
+        while stack:
+            tree, head, indent, last, last_color, depth = stack.pop()
 
-        color = _TreePrinter.get_color(tree)
-        res = f"{color}{class_name}\n"
+            if not isinstance(tree, (ASTNode, list, tuple)):
+                yield head + last_color + str(tree) + "\n"
+                continue
 
-        attrs = tree.__tree_dict__() if hasattr(tree, "__tree_dict__") else tree.__dict__.copy()
-        attrs.pop("line", None)
-        attrs.pop("position", None)
-        attrs.pop("valid", None)
-        attrs.pop("translatable", None)
-        arg_num = len(attrs)
-        for index, (arg_name, arg_value) in enumerate(attrs.items()):
-            arg_name = arg_name.lstrip("_")
-            marker = _TreePrinter.LAST_VAR if index == arg_num - 1 else _TreePrinter.MIDDLE_VAR
-            substr, sub_color = _TreePrinter.print_tree(arg_value, indent, index == arg_num - 1, color)
-            res += f"{indent}{color}{marker}{sub_color}{arg_name}: {substr}"
-        return res, color
+            if isinstance(tree, ASTNode) and hasattr(tree, '__print_tree__'):
+                yield head + self.get_color(tree) + tree.__print_tree__() + "\n"
+                continue
+
+            if last is not None:
+                indent += (
+                    self.get_color(tree, last_color) +
+                    (_TreePrinter.EMPTY if last else _TreePrinter.GOING)
+                )
+
+            if isinstance(tree, (list, tuple)):
+                yield head + "\n"
+
+                arg_num = len(tree)
+                for index in reversed(range(arg_num)):
+                    marker = _TreePrinter.LAST_VAR if index == arg_num - 1 else _TreePrinter.MIDDLE_VAR
+                    stack.append((
+                        tree[index], f"{indent}{last_color}{marker}", indent, index == arg_num - 1, last_color, depth
+                    ))
+                continue
+
+            color = self.get_color(tree)
+            attrs = self.tree_attributes(tree)
+
+            if self.max_depth is not None and depth >= self.max_depth and attrs:
+                yield f"{head}{color}{self.tree_name(tree)}{_TreePrinter.TRUNCATED}\n"
+                continue
+
+            yield f"{head}{color}{self.tree_name(tree)}\n"
+
+            arg_num = len(attrs)
+            items = list(attrs.items())
+            for index in reversed(range(arg_num)):
+                arg_name, arg_value = items[index]
+                arg_name = arg_name.lstrip("_")
+                marker = _TreePrinter.LAST_VAR if index == arg_num - 1 else _TreePrinter.MIDDLE_VAR
+                sub_color = self.get_color(arg_value) if isinstance(arg_value, ASTNode) else color
+                stack.append((
+                    arg_value, f"{indent}{color}{marker}{sub_color}{arg_name}: ",
+                    indent, index == arg_num - 1, color, depth + 1
+                ))
@@ -63,6 +63,15 @@ class ClassDefNode(ASTNode, Usable):
     def all_fields_definitions(self) -> Iterator["ClassFieldDeclarationNode"]:
         return chain(self.fields_definitions, self.static_fields_defs)
 
+    @property
+    def instantiations(self) -> list[list[TypeNode]]:
+        """
+        Distinct lists of type arguments the generic class is instantiated with, in order of the first instantiation
+        """
+        if self._instantiations is None:
+            return []
+        return list(self._instantiations.values())
+
     @property
     def is_valid_inherited_class(self) -> bool | None:
         return self._valid_inherited_class
@@ -93,14 +102,34 @@ class ClassDefNode(ASTNode, Usable):
     def validate_inherited_methods(self, valid: bool) -> None:
         self._valid_inherited_methods = valid
 
-    def add_instantiation(self, instantiation):
+    def add_instantiation(self, instantiation: list[TypeNode], key: tuple | None = None) -> None:
+        """
+        Register the instantiation of the generic class with the given type arguments
+        :param instantiation: type arguments
+        :param key: (optional) canonical keys of the arguments, if they are already known
+        """
         self.use()
         if self._instantiations is None:
-            self._instantiations = []
+            self._instantiations = {}
 
-        if len(instantiation) != self.generic_params:
+        if len(instantiation) != len(self.generic_params):
             raise ValueError("Args count mismatch")
-        self._instantiations.append(instantiation)
+
+        # the same arguments are written in many places, but instantiate the class once
+        if key is None:
+            key = tuple(argument.canonical_key for argument in instantiation)
+        self._instantiations.setdefault(key, instantiation)
+
+    # AST desugaring methods
+
+    def set_instance_name(self, name: str) -> None:
+        """
+        Turn the copy of the generic class into its instance with the given (mangled) name
+        """
+        self._name = name
+        self._generic_params = []
+        self._instantiations = None
+        self.translatable = True
 
     def translate(self, file: TextIO, **kwargs) -> None:
         if not self.translatable:
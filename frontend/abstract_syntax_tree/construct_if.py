@@ -1,13 +1,11 @@
 from typing import TextIO, Union
 
 from .ast_node import ASTNode
+from .labels import LabelAllocator
 from .scope import ScopeNode
 
 
 class IfElseNode(ASTNode):
-
-    INSTANCES = 0
-
     def __init__(
         self,
         condition: ASTNode,
@@ -21,9 +19,6 @@ class IfElseNode(ASTNode):
         self.if_scope = if_scope
         self.else_scope = else_scope
 
-        self._curr_instance = IfElseNode.INSTANCES
-        IfElseNode.INSTANCES += 1
-
     def is_valid(self) -> bool:
         return all((
             self.valid,
@@ -33,9 +28,12 @@ class IfElseNode(ASTNode):
         ))
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        if_label = 'IF' + str(self._curr_instance)
-        else_label = 'ELSE' + str(self._curr_instance)
-        endif_label = 'ENDIF' + str(self._curr_instance)
+        labels: LabelAllocator = kwargs.setdefault('labels', LabelAllocator())
+        instance = labels.allocate(LabelAllocator.IF)
+
+        if_label = 'IF' + str(instance)
+        else_label = 'ELSE' + str(instance)
+        endif_label = 'ENDIF' + str(instance)
 
         file.write('COND')
         file.write(' ')
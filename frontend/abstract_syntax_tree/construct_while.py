@@ -1,11 +1,10 @@
 from .ast_node import ASTNode
+from .labels import LabelAllocator
 from .scope import ScopeNode
 from typing import TextIO
 
 
 class WhileNode(ASTNode):
-    INSTANCES = 0
-
     def __init__(
         self,
         condition: ASTNode,
@@ -17,9 +16,6 @@ class WhileNode(ASTNode):
         self.condition = condition
         self.while_scope = while_scope
 
-        self._curr_instance = WhileNode.INSTANCES
-        WhileNode.INSTANCES += 1
-
         # self.all_paths_return = None
 
     def is_valid(self) -> bool:
@@ -30,8 +26,11 @@ class WhileNode(ASTNode):
         ))
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        while_label = 'WHILE' + str(self._curr_instance)
-        endwhile_label = 'ENDWHILE' + str(self._curr_instance)
+        labels: LabelAllocator = kwargs.setdefault('labels', LabelAllocator())
+        instance = labels.allocate(LabelAllocator.WHILE)
+
+        while_label = 'WHILE' + str(instance)
+        endwhile_label = 'ENDWHILE' + str(instance)
 
         file.write('COND')
         file.write(' ')
@@ -43,7 +42,8 @@ class WhileNode(ASTNode):
         file.write('\n')
 
         self.write_instruction(file, ['LABEL', ' ', while_label])
-        self.while_scope.translate(file, **kwargs)
+        # break and continue inside the body jump to the labels of the innermost loop
+        self.while_scope.translate(file, **dict(kwargs, loop_label=instance))
 
         file.write('COND')
         file.write(' ')
@@ -0,0 +1,232 @@
+"""
+Structural (Merkle-style) hashing of AST trees and diffing of two program versions.
+Hashes depend only on the syntactic content of the nodes: locations, type checker
+meta info are ignored, so the same code parsed twice (or moved
+to another line) always has the same hash.
+"""
+import hashlib
+from typing import Iterator, Sequence
+
+from .ast_node import ASTNode, is_node_class, get_non_structural_attributes
+from .functions import FunctionParameter
+from .program import ProgramNode
+
+
+DeclarationKey = tuple[str, ...]
+
+
+class StructuralHasher:
+    """
+    Computes structural hashes of AST nodes bottom-up,
+    memoizing them so every node of the tree is hashed exactly once.
+    """
+
+    DIGEST_SIZE = 16
+
+    def __init__(self):
+        self._digests: dict[int, bytes] = {}
+
+        # keeps hashed nodes alive, so their ids are not reused
+        self._hashed: list = []
+
+    def digest(self, tree: ASTNode | Sequence | object) -> bytes:
+        """
+        Get the structural hash of the (sub)tree
+        :param tree: node, list of nodes or plain value
+        :return: hash digest
+        """
+        if id(tree) in self._digests:
+            return self._digests[id(tree)]
+
+        # iterative post-order walk, so that deep expressions don't hit the recursion limit
+        stack: list[tuple[object, list[tuple[str, object]] | None]] = [(tree, None)]
+        while stack:
+            current, children = stack.pop()
+            if children is None:
+                if id(current) in self._digests:
+                    continue
+
+                children = self._children(current)
+                if children is None:
+                    self._store(current, self._hash_leaf(current))
+                    continue
+
+                stack.append((current, children))
+                stack.extend((child, None) for _, child in children if id(child) not in self._digests)
+                continue
+
+            h = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+            h.update(type(current).__name__.encode())
+            for name, child in children:
+                h.update(b"\x00")
+                h.update(name.encode())
+                h.update(b"\x01")
+                h.update(self._digests[id(child)])
+            self._store(current, h.digest())
+
+        return self._digests[id(tree)]
+
+    def hexdigest(self, tree: ASTNode | Sequence | object) -> str:
+        return self.digest(tree).hex()
+
+    def signature_digest(self, parameters: list[FunctionParameter]) -> str:
+        """
+        Get the hash of the function/method parameter types, ignoring the parameter names
+        :param parameters: function parameters
+        :return: hex digest of the signature
+        """
+        h = hashlib.blake2b(digest_size=self.DIGEST_SIZE)
+        for parameter in parameters:
+            h.update(self.digest(parameter.type))
+        return h.hexdigest()
+
+    def _store(self, tree, digest: bytes) -> None:
+        self._digests[id(tree)] = digest
+        self._hashed.append(tree)
+
+    @staticmethod
+    def _children(tree) -> list[tuple[str, object]] | None:
+        tree_class = type(tree)
+        if tree_class is list or tree_class is tuple:
+            return [(str(index), item) for index, item in enumerate(tree)]
+
+        if not is_node_class(tree_class):
+            return None
+
+        excluded = get_non_structural_attributes(tree_class)
+        references = tree_class.REFERENCE_ATTRIBUTES
+
+        # references (e.g. operator overloads to their classes) are hashed by the names of the referred nodes
+        children = []
+        for name, value in sorted(tree.__dict__.items()):
+            if name in excluded:
+                continue
+            if name in references and value is not None:
+                value = value.name
+            children.append((name, value))
+        return children
+
+    @staticmethod
+    def _hash_leaf(value) -> bytes:
+        h = hashlib.blake2b(digest_size=StructuralHasher.DIGEST_SIZE)
+        h.update(type(value).__name__.encode())
+        h.update(b"\x00")
+        h.update(repr(value).encode())
+        return h.digest()
+
+
+def structural_hash(tree: ASTNode | Sequence) -> str:
+    """
+    Get the structural hash of the (sub)tree, ignoring locations and type checker meta info
+    :param tree: node or list of nodes
+    :return: hex digest
+    """
+    return StructuralHasher().hexdigest(tree)
+
+
+def iter_declarations(
+    program: ProgramNode,
+    hasher: StructuralHasher
+) -> Iterator[tuple[DeclarationKey, ASTNode, bytes]]:
+    """
+    Iterate over the program declarations with their identity keys and structural hashes.
+    Keys are:
+        ("class", class_name)
+        ("method", class_name, method_name, signature_digest), for both regular and static methods
+        ("function", function_name, signature_digest), including operator overloads
+        ("statement", statement_digest, occurrence), for global statements
+    Class hash covers the whole class including its methods,
+    so that changed class headers and fields are reported as changed class.
+    :param program: program AST root
+    :param hasher: hasher to compute (and memoize) hashes with
+    :return: iterator of (key, node, digest)
+    """
+    for class_node in program.class_definitions:
+        yield ("class", class_node.name), class_node, hasher.digest(class_node)
+
+        for method in (*class_node.methods_defs, *class_node.static_methods_defs):
+            key = ("method", class_node.name, method.function_name, hasher.signature_digest(method.parameters))
+            yield key, method, hasher.digest(method)
+
+    for function in program.function_definitions:
+        key = ("function", function.function_name, hasher.signature_digest(function.parameters))
+        yield key, function, hasher.digest(function)
+
+    occurrences: dict[bytes, int] = {}
+    for statement in program.statements:
+        digest = hasher.digest(statement)
+        occurrence = occurrences.get(digest, 0)
+        occurrences[digest] = occurrence + 1
+        yield ("statement", digest.hex(), str(occurrence)), statement, digest
+
+
+def _unique_declarations(
+    declarations: Iterator[tuple[DeclarationKey, ASTNode, bytes]]
+) -> Iterator[tuple[DeclarationKey, ASTNode, bytes]]:
+    """
+    (Hidden) Disambiguate repeated declarations (e.g. duplicate definitions in invalid code)
+    by appending the occurrence number to the key
+    """
+    seen: dict[DeclarationKey, int] = {}
+    for key, node, digest in declarations:
+        occurrence = seen.get(key, 0)
+        seen[key] = occurrence + 1
+        yield (key if not occurrence else (*key, f"#{occurrence}")), node, digest
+
+
+class ProgramDiff:
+    """
+    Result of the structural comparison of two program versions.
+    Added and removed map keys to the new and old nodes respectively,
+    changed and unchanged map keys to (old node, new node) pairs.
+    """
+
+    def __init__(self):
+        self.added: dict[DeclarationKey, ASTNode] = {}
+        self.removed: dict[DeclarationKey, ASTNode] = {}
+        self.changed: dict[DeclarationKey, tuple[ASTNode, ASTNode]] = {}
+        self.unchanged: dict[DeclarationKey, tuple[ASTNode, ASTNode]] = {}
+
+    def __repr__(self) -> str:
+        return (
+            f"ProgramDiff(added={list(self.added)}, removed={list(self.removed)}, "
+            f"changed={list(self.changed)}, unchanged={len(self.unchanged)})"
+        )
+
+
+def diff_programs(
+    old_program: ProgramNode,
+    new_program: ProgramNode,
+    hasher: StructuralHasher | None = None,
+) -> ProgramDiff:
+    """
+    Compare declarations of two program versions in linear time
+    :param old_program: previous version of the program
+    :param new_program: current version of the program
+    :param hasher: (optional) hasher to share memoized hashes with other passes
+    :return: ProgramDiff with added, removed, changed and unchanged declarations
+    """
+    hasher = hasher or StructuralHasher()
+    diff = ProgramDiff()
+
+    old_declarations = {
+        key: (node, digest)
+        for key, node, digest in _unique_declarations(iter_declarations(old_program, hasher))
+    }
+
+    for key, new_node, new_digest in _unique_declarations(iter_declarations(new_program, hasher)):
+        old = old_declarations.pop(key, None)
+        if old is None:
+            diff.added[key] = new_node
+            continue
+
+        old_node, old_digest = old
+        if old_digest == new_digest:
+            diff.unchanged[key] = (old_node, new_node)
+        else:
+            diff.changed[key] = (old_node, new_node)
+
+    for key, (old_node, _) in old_declarations.items():
+        diff.removed[key] = old_node
+
+    return diff
@@ -11,14 +11,14 @@ class KeywordNode(ASTNode, ABC):
 
 
 class BreakNode(KeywordNode):
-    def __init__(self, line, position, loop=None, error=None):
+    def __init__(self, line, position, in_loop=False, error=None):
         super().__init__(line, position)
-        self.loop_instance = loop
+        self.in_loop = in_loop
         self.thrown_error = error
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        if self.loop_instance is not None:
-            endwhile_label = 'ENDWHILE' + str(self.loop_instance)
+        if self.in_loop and kwargs.get('loop_label') is not None:
+            endwhile_label = 'ENDWHILE' + str(kwargs['loop_label'])
             self.write_instruction(file, ['JUMP', ' ', endwhile_label])
         elif self.thrown_error is not None:
             file.write(Assignment.translate(Assignment.VALUE_ASSIGNMENT))
@@ -40,14 +40,14 @@ class ThisNode(KeywordNode):
 
 
 class ContinueNode(KeywordNode):
-    def __init__(self, line, position, loop=None, error=None):
+    def __init__(self, line, position, in_loop=False, error=None):
         super().__init__(line, position)
-        self.loop_instance = loop
+        self.in_loop = in_loop
         self.catched_error = error
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        if self.loop_instance is not None:
-            while_label = 'WHILE' + str(self.loop_instance)
+        if self.in_loop and kwargs.get('loop_label') is not None:
+            while_label = 'WHILE' + str(kwargs['loop_label'])
             self.write_instruction(file, ['JUMP', ' ', while_label])
         elif self.catched_error is not None:
             file.write(Assignment.translate(Assignment.VALUE_ASSIGNMENT))
@@ -0,0 +1,22 @@
+class LabelAllocator:
+    """
+    Allocates numbers of the jump labels (IF, ELSE, WHILE, ENDWHILE etc.) during a single translation.
+    Numbering depends only on the translated program, not on what else was parsed or translated
+    in the process, so the output is deterministic and independent programs can be translated concurrently.
+    """
+
+    IF = 'IF'
+    WHILE = 'WHILE'
+
+    def __init__(self):
+        self._counters: dict[str, int] = {}
+
+    def allocate(self, construct: str) -> int:
+        """
+        Get the next free label number for the construct
+        :param construct: kind of the construct labels are numbered for, e.g. LabelAllocator.WHILE
+        :return: label number, unique within this allocator for the given construct
+        """
+        number = self._counters.get(construct, 0)
+        self._counters[construct] = number + 1
+        return number
@@ -4,7 +4,11 @@ from .ast_node import ASTNode
 
 
 class CalculationNode(ASTNode, ABC):
-    pass
+    # calculations get these ones from the type checker, but for methods and fields they are parts of declarations
+    META_ATTRIBUTES = ASTNode.META_ATTRIBUTES | frozenset((
+        "is_overload",
+        "is_static",
+    ))
 
 
 class LiteralNode(CalculationNode, ABC):
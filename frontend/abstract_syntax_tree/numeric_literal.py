@@ -2,6 +2,7 @@ from enum import IntEnum
 from typing import Literal, TextIO
 import struct
 
+from .._syntax.operators import Operator, OperatorMethods
 from .literals import LiteralNode
 
 
@@ -77,7 +78,7 @@ class IntegerLiteralNode(LiteralNode):
         return self._size <= size
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        file.write(str(self.value))
+        _translate_number(file, self.value)
 
 
 class FloatLiteralNode(LiteralNode):
@@ -144,7 +145,7 @@ class FloatLiteralNode(LiteralNode):
         return self._value == 0
 
     def translate(self, file: TextIO, **kwargs) -> None:
-        file.write(str(self.value))
+        _translate_number(file, self.value)
 
 
 class ImaginaryFloatLiteralNode(FloatLiteralNode):
@@ -156,3 +157,13 @@ class ImaginaryFloatLiteralNode(FloatLiteralNode):
         file.write('IMAGINARY')
         file.write(' ')
         file.write(str(self.value))
+
+
+def _translate_number(file: TextIO, value: int | float) -> None:
+    # negative literals are made up by constant folding only, and backend reads unsigned numbers
+    text = str(value)
+    if text.startswith('-'):
+        file.write(OperatorMethods.translate(Operator.MINUS, 1))
+        file.write(' ')
+        text = text[1:]
+    file.write(text)
@@ -24,6 +24,9 @@ class OperatorABC(CalculationNode, ABC):
         self.category = category
         super().__init__(line, position)
 
+        # literal the operator of constant operands is folded to by the type checker, translated instead of it
+        self.folded_literal = None
+
     @property
     def is_arithmetic(self) -> bool:
         return self.category == OperatorCategory.Arithmetic
@@ -28,6 +28,9 @@ class MemberOperatorNode(CalculationNode):
         from frontend.abstract_syntax_tree import TypeNode
         self.associated_class: TypeNode | None = None
 
+        # Type checker: whether the member is a static one of the class named by the left operand
+        self.is_static = False
+
     def is_valid(self) -> bool:
         return all((
             self.valid,
@@ -28,6 +28,10 @@ class BinaryOperatorABCNode(OperatorABC):
         self.overload_number = 0
 
     def translate(self, file: TextIO, **kwargs) -> None:
+        if self.folded_literal is not None:
+            self.folded_literal.translate(file, **kwargs)
+            return
+
         if self.is_overload:
             file.write('CALL')
 
@@ -79,6 +83,10 @@ class UnaryOperatorABCNode(OperatorABC):
         ))
 
     def translate(self, file: TextIO, **kwargs) -> None:
+        if self.folded_literal is not None:
+            self.folded_literal.translate(file, **kwargs)
+            return
+
         if self.is_overload:
             file.write('CALL')
 
@@ -1,6 +1,8 @@
 from .ast_node import ASTNode
 from .classes.definition import ClassDefNode
 from .functions import FunctionDefNode
+from .labels import LabelAllocator
+from .spans import SpanIndex
 from typing import TextIO
 
 
@@ -17,6 +19,9 @@ class ProgramNode(ASTNode):
         self.statements = statements
 
     def translate(self, file: TextIO, **kwargs):
+        # labels are numbered per translation, unless the caller provides its own allocator
+        kwargs.setdefault('labels', LabelAllocator())
+
         if self.class_definitions:
             self.write_instruction(file, ['REGION', ' ', 'CLASS_DEFNS', '\n'])
             for cls in self.class_definitions:
@@ -44,3 +49,11 @@ class ProgramNode(ASTNode):
             all((f.is_valid() for f in self.function_definitions)),
             all((s.is_valid() for s in self.statements))
         ))
+
+    def build_span_index(self) -> SpanIndex:
+        """
+        Build the index of node spans for position queries (innermost node at offset, nodes in range).
+        Should be built once after parsing and reused, since the tree is walked entirely.
+        :return: SpanIndex of the program
+        """
+        return SpanIndex(self)
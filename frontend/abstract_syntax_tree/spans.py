@@ -0,0 +1,134 @@
+"""
+Source spans of AST nodes and the index answering position queries over them.
+Span of the node is a half-open interval [start, end) of absolute character offsets in the source code.
+"""
+from bisect import bisect_left, bisect_right
+from typing import Iterator
+
+from .ast_node import ASTNode, iter_child_nodes
+
+
+class SpanIndex:
+    """
+    Index over the spans of the tree nodes, built once per tree.
+    Node spans are nested or disjoint, so the source is split into elementary segments
+    each owned by the innermost node covering it, and lookups are binary searches.
+    Nesting is determined by spans, not by the tree structure, since some nodes are moved
+    by the parser (e.g. operator overloads are taken out of their classes).
+    """
+
+    def __init__(self, root: ASTNode):
+        # innermost node enclosing the given one (by id)
+        self._enclosing: dict[int, ASTNode | None] = {}
+
+        # all nodes with spans, sorted by (start, -end), and their starts
+        self._nodes: list[ASTNode] = []
+        self._node_starts: list[int] = []
+
+        # elementary segments: [start, end) owned by the innermost node
+        self._segment_starts: list[int] = []
+        self._segment_ends: list[int] = []
+        self._segment_owners: list[ASTNode] = []
+
+        self._build(root)
+
+    def _build(self, root: ASTNode) -> None:
+        # collect nodes with their depth, so that among equal spans the outer node goes first
+        depths: dict[int, int] = {}
+        nodes = []
+        stack = [(root, 0)]
+        while stack:
+            node, depth = stack.pop()
+            if id(node) in depths:
+                continue
+            depths[id(node)] = depth
+            if node.span is not None:
+                nodes.append(node)
+            stack.extend((child, depth + 1) for child in iter_child_nodes(node))
+
+        nodes.sort(key=lambda n: (n.span[0], -n.span[1], depths[id(n)]))
+        self._nodes = nodes
+        self._node_starts = [n.span[0] for n in nodes]
+
+        # sweep: open nodes as [node, end clamped by enclosing node, cursor of the uncovered part]
+        opened = []
+        for node in nodes:
+            start, end = node.span
+            while opened and opened[-1][1] <= start:
+                self._close(opened)
+
+            if opened:
+                enclosing = opened[-1]
+                end = min(end, enclosing[1])
+                self._add_segment(enclosing[2], start, enclosing[0])
+                enclosing[2] = end
+                self._enclosing[id(node)] = enclosing[0]
+            else:
+                self._enclosing[id(node)] = None
+            opened.append([node, end, start])
+
+        while opened:
+            self._close(opened)
+
+    def _close(self, opened: list[list]) -> None:
+        node, end, cursor = opened.pop()
+        self._add_segment(cursor, end, node)
+        if opened:
+            opened[-1][2] = max(opened[-1][2], end)
+
+    def _add_segment(self, start: int, end: int, owner: ASTNode) -> None:
+        if start < end:
+            self._segment_starts.append(start)
+            self._segment_ends.append(end)
+            self._segment_owners.append(owner)
+
+    def __len__(self) -> int:
+        return len(self._nodes)
+
+    def enclosing(self, node: ASTNode) -> ASTNode | None:
+        """
+        Get the innermost node which span encloses the span of the given one
+        """
+        return self._enclosing.get(id(node))
+
+    def node_at(self, offset: int) -> ASTNode | None:
+        """
+        Get the innermost node covering the offset
+        :param offset: absolute character offset in the source
+        :return: innermost node or None if no node covers the offset
+        """
+        index = bisect_right(self._segment_starts, offset) - 1
+        if index < 0 or offset >= self._segment_ends[index]:
+            return None
+        return self._segment_owners[index]
+
+    def ancestors(self, node: ASTNode) -> Iterator[ASTNode]:
+        """
+        Iterate over the node and all the nodes enclosing it, innermost first
+        """
+        current = node
+        while current is not None:
+            yield current
+            current = self._enclosing.get(id(current))
+
+    def nodes_in_range(self, start: int, end: int) -> list[ASTNode]:
+        """
+        Get all the nodes which spans intersect [start, end), ordered by their start (outer nodes first)
+        :param start: absolute character offset of range beginning
+        :param end: absolute character offset of range end (exclusive)
+        :return: list of intersecting nodes
+        """
+        if start >= end:
+            return []
+
+        # nodes beginning before the range intersect it only if they cover its start
+        first = bisect_left(self._node_starts, start)
+        covering = self.node_at(start)
+        result = []
+        if covering is not None:
+            result = [node for node in self.ancestors(covering) if node.span[0] < start]
+            result.reverse()
+
+        last = bisect_left(self._node_starts, end)
+        result.extend(self._nodes[first:last])
+        return result
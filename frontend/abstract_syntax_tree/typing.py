@@ -47,6 +47,9 @@ class TypeLiteral(ASTNode):
 
 
 class TypeNode(ASTNode):
+    # primitive types not bound to code location, shared by all usages (see mock_simple)
+    _SHARED_PRIMITIVES: dict[tuple[str, bool], "TypeNode"] = {}
+
     def __init__(
         self,
         category: TypeCategory,
@@ -86,11 +89,15 @@ class TypeNode(ASTNode):
         ))
 
     def _add_flag(self, flag: TypeModifierFlag):
+        if self.is_shared:
+            raise AssertionError("Shared type cannot be modified, use its shallow copy")
         if self._modifiers & flag:
             raise AssertionError(f"Flag {flag} already present")
         self._modifiers |= flag
 
     def _remove_flag(self, flag: TypeModifierFlag):
+        if self.is_shared:
+            raise AssertionError("Shared type cannot be modified, use its shallow copy")
         if not (self._modifiers & flag):
             raise AssertionError(f"Flag {flag} already absent")
         self._modifiers &= ~flag
@@ -103,6 +110,13 @@ class TypeNode(ASTNode):
     def is_literal(self) -> bool:
         return self._literal
 
+    @property
+    def is_shared(self) -> bool:
+        return (
+            self.category == TypeCategory.PRIMITIVE and
+            TypeNode._SHARED_PRIMITIVES.get((self.type.name, self._literal)) is self
+        )
+
     @property
     def is_user_defined_type(self) -> bool:
         return isinstance(self.type, IdentifierNode)
@@ -118,6 +132,14 @@ class TypeNode(ASTNode):
             result.append("nullable")
         return " ".join(result)
 
+    def add_modifiers_of(self, other: "TypeNode") -> None:
+        """
+        Add all the modifiers of the other type, the ones already present are kept
+        """
+        if self.is_shared:
+            raise AssertionError("Shared type cannot be modified, use its shallow copy")
+        self._modifiers |= other._modifiers
+
     @property
     def is_constant(self):
         return self._modifiers & TypeModifierFlag.CONSTANT
@@ -150,13 +172,32 @@ class TypeNode(ASTNode):
 
     @property
     def class_node(self):
-        if self.category == TypeCategory.PRIMITIVE or TypeCategory.COLLECTION:
+        if self.category in (TypeCategory.PRIMITIVE, TypeCategory.COLLECTION):
             raise AttributeError(f"Type {self.category} cannot have class instance")
         elif self._class is None:
             raise AttributeError("Uninstantiated class node here")
         else:
             return self._class
 
+    @property
+    def canonical_key(self) -> tuple:
+        """
+        Hashable key of the type, equal for the types written the same way regardless of their locations
+        """
+        arguments = None
+        if self.arguments:
+            arguments = tuple(
+                argument.canonical_key if isinstance(argument, TypeNode) else None
+                for argument in self.arguments
+            )
+        return self.make_canonical_key(arguments)
+
+    def make_canonical_key(self, argument_keys: tuple | None) -> tuple:
+        """
+        Canonical key of the type with the already known keys of its arguments (None if it has no arguments)
+        """
+        return self.category, self.name, self._modifiers, bool(self.represents_generic_param), argument_keys
+
     def __tree_dict__(self):
         if self.category not in (TypeCategory.COLLECTION, TypeCategory.GENERIC_CLASS):
             return {
@@ -243,10 +284,24 @@ class TypeNode(ASTNode):
                 raise NotImplementedError
 
     @staticmethod
-    def mock_simple(name):
-        return TypeNode(
-            TypeCategory.PRIMITIVE,
-            TypeLiteral(name, -1, -1),
-            None,
-            -1, -1
-        )
+    def mock_simple(name, literal: bool = False) -> "TypeNode":
+        """
+        Get the primitive type not bound to any code location.
+        Such types are created once and shared by all usages, so they must not be modified:
+        use shallow_copy to get the modifiable one.
+        :param name: primitive type name
+        :param literal: whether it's the type of literal
+        :return: shared TypeNode instance
+        """
+        key = (name, literal)
+        shared = TypeNode._SHARED_PRIMITIVES.get(key)
+        if shared is None:
+            shared = TypeNode(
+                TypeCategory.PRIMITIVE,
+                TypeLiteral(name, -1, -1),
+                None,
+                -1, -1,
+                _literal=literal,
+            )
+            shared = TypeNode._SHARED_PRIMITIVES.setdefault(key, shared)
+        return shared
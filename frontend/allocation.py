@@ -0,0 +1,90 @@
+import gc
+import threading
+from typing import Self
+
+try:
+    import frontend.abstract_syntax_tree as AST
+except ImportError:
+    import abstract_syntax_tree as AST
+
+
+class AllocationContext:
+    """
+    Allocation context of a single compilation.
+    AST nodes are allocated in large numbers and are referred from each other
+    (e.g. types refer to classes), so the cyclic garbage collector repeatedly scans
+    the tree while it's being built. The context defers the cyclic GC until the compilation ends,
+    and then frees all tracked trees at once by breaking their references, so that
+    they are released by reference counting rather than by later collections.
+
+    The garbage collector is switched for the whole process, so contexts entered in nested calls
+    or in other threads are counted, and the collector is restored only when the last of them exits.
+
+    Usage:
+        with AllocationContext() as allocation:
+            program = allocation.track(Parser(tokens).parse())
+            ...
+    """
+
+    # contexts deferring the GC in the process, and whether the GC was enabled before the first one
+    _deferring_lock = threading.Lock()
+    _deferring_count = 0
+    _gc_was_enabled = False
+
+    def __init__(self, defer_gc: bool = True):
+        """
+        :param defer_gc: whether to disable the cyclic garbage collector inside the context
+        """
+        self.defer_gc = defer_gc
+        self._roots: list[AST.ASTNode] = []
+
+    def __enter__(self) -> Self:
+        if self.defer_gc:
+            with AllocationContext._deferring_lock:
+                if AllocationContext._deferring_count == 0:
+                    AllocationContext._gc_was_enabled = gc.isenabled()
+                    gc.disable()
+                AllocationContext._deferring_count += 1
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb) -> None:
+        self.release()
+        if self.defer_gc:
+            with AllocationContext._deferring_lock:
+                AllocationContext._deferring_count -= 1
+                if AllocationContext._deferring_count == 0 and AllocationContext._gc_was_enabled:
+                    gc.enable()
+
+    def track(self, root: AST.ASTNode) -> AST.ASTNode:
+        """
+        Register the tree to be freed when the compilation ends
+        :param root: root of the tree, e.g. ProgramNode
+        :return: the same root, for convenience
+        """
+        self._roots.append(root)
+        return root
+
+    def release(self) -> int:
+        """
+        Free all the tracked trees at once.
+        All nodes reachable from tracked roots are emptied, so they mustn't be used afterward.
+        Shared (e.g. primitive) types are left intact.
+        :return: number of freed nodes
+        """
+        visited = set()
+        nodes = []
+        stack = list(self._roots)
+        self._roots.clear()
+
+        while stack:
+            node = stack.pop()
+            if id(node) in visited or (type(node) is AST.TypeNode and node.is_shared):
+                continue
+
+            visited.add(id(node))
+            nodes.append(node)
+            stack.extend(AST.iter_referenced_nodes(node))
+
+        for node in nodes:
+            node.__dict__.clear()
+        return len(nodes)
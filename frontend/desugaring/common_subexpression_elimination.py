@@ -0,0 +1,537 @@
+"""
+Common subexpression elimination within basic blocks.
+
+Expressions repeated in straight-line code (the statements of a scope between the control flow ones,
+and the condition of an if-else statement, which its branches continue) are evaluated once into local variables
+declared before the statements they first occur in, and the repeated occurrences refer to the variables.
+Occurrences are matched by the structural hashes of the expressions (see StructuralHasher), so the same
+expression written twice is found regardless of its location.
+
+Expressions are the reads: operators that aren't overloaded, fields, elements and calls of read-only functions
+(see get_read_only_functions). Assignments, declarations, passing by reference and calls of other functions
+make the expressions reading what they may change unavailable afterwards.
+
+Evaluating the first occurrence before its statement must not change what the statement does: it's extracted
+only if it's evaluated unconditionally (not short-circuited by the other operands), and everything the statement
+evaluates before it never fails or is extracted before it as well. As the variables cost instructions
+of their own, expressions are extracted only if that saves enough evaluations.
+"""
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    FunctionCallNode,
+    MemberOperatorNode,
+    IndexNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    AssignmentNode,
+    OperatorCategory,
+    ScopeNode,
+    IfElseNode,
+    WhileNode,
+    ThisNode,
+    IdentifierNode,
+    LiteralNode,
+    TypeNode,
+    TypeCategory,
+    VariableDeclarationNode,
+    StructuralHasher,
+    is_node_class,
+    get_skipped_attributes,
+)
+from .._syntax.operators import Assignment
+from .shared_tree_analysis import (
+    is_pure,
+    get_passed_by_reference,
+    FunctionVariables,
+    get_variable_type,
+    get_read_only_callee,
+    get_read_only_functions,
+    get_function_variables,
+    ExpressionReads,
+    get_expression_reads,
+    READING_OPERATOR_CATEGORIES,
+    SHORT_CIRCUIT_OPERATORS,
+)
+from .shared_type_mangler import mangle_common_subexpression
+
+
+# evaluations of the operators, fields and elements, and calls, saved by every replaced occurrence
+_OPERATOR_COST = 1
+_READ_COST = 2
+_CALL_COST = 4
+
+# evaluations to save for the declaration of the variable to pay off
+_MIN_SAVED_COST = 2
+
+
+class CommonSubexpressionStats:
+    """
+    Numbers of the repeated expressions evaluated into the variables, and of the occurrences replaced with them
+    """
+
+    def __init__(self):
+        self.extracted_expressions = 0
+        self.replaced_occurrences = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"CommonSubexpressionStats(expressions={self.extracted_expressions}, "
+            f"occurrences={self.replaced_occurrences})"
+        )
+
+
+class _Block:
+    """
+    Statements of the scope, with the declarations of the variables to put before them
+    """
+
+    def __init__(self, local_variables: list[VariableDeclarationNode] | None):
+        self.local_variables = local_variables
+
+        # declarations with the orders of the expressions, by the ids of the statements they are put before
+        self.declarations: dict[int, list[tuple[int, VariableDeclarationNode]]] = {}
+
+    def add_declaration(self, statement: ASTNode, order: int, declaration: VariableDeclarationNode) -> None:
+        self.declarations.setdefault(id(statement), []).append((order, declaration))
+
+    def insert_declarations(self, statements: list[ASTNode]) -> list[ASTNode]:
+        """
+        Get the statements with the declarations put before them, in the order the expressions are evaluated in
+        """
+        if not self.declarations:
+            return statements
+
+        inserted_statements = []
+        for statement in statements:
+            declarations = self.declarations.get(id(statement))
+            if declarations is not None:
+                declarations.sort(key=lambda ordered: ordered[0])
+                declarations = [declaration for _, declaration in declarations]
+                inserted_statements.extend(declarations)
+                if self.local_variables is not None:
+                    self.local_variables.extend(declarations)
+            inserted_statements.append(statement)
+        return inserted_statements
+
+
+class _Expression:
+    """
+    Expression evaluated in the block, available for the next occurrences until anything it reads is changed
+    """
+
+    def __init__(
+        self,
+        node: ASTNode,
+        occurrence: tuple,
+        block: _Block,
+        statement: ASTNode,
+        order: int,
+        reads: ExpressionReads
+    ):
+        self.node = node
+        # the parent node, the name of the attribute and the index in it (None if it isn't a list)
+        self.occurrence = occurrence
+        self.block = block
+        self.statement = statement
+        self.order = order
+
+        # expressions to extract before this one, as the statement evaluates them before it
+        self.prerequisites: list[_Expression] = []
+
+        self.reads = reads
+        self.cost = reads.operators * _OPERATOR_COST + reads.accesses * _READ_COST + reads.calls * _CALL_COST
+
+        # name of the variable once extracted, and the occurrences to replace with it then
+        self.variable_name: str | None = None
+        self.repeated: list[tuple] = []
+
+
+class _SubexpressionEliminator:
+    def __init__(self, read_only_functions: dict[str, bool], stats: CommonSubexpressionStats):
+        # read-only functions by their names, whether they read fields or elements
+        self._read_only_functions = read_only_functions
+        self._stats = stats
+        self._hasher = StructuralHasher()
+
+        # for the orders of the evaluated expressions and unique names of the variables
+        self._evaluations = 0
+        self._extractions = 0
+
+        # the function and the statement being processed, and the expressions available in it
+        self._variables: FunctionVariables | None = None
+        self._block: _Block | None = None
+        self._statement: ASTNode | None = None
+        self._available: dict[bytes, _Expression] = {}
+
+        # expressions to extract before the next one in the statement, and whether it can't be extracted at all
+        self._prerequisites: list[_Expression] = []
+        self._blocked = False
+
+    def eliminate_statements(
+        self,
+        statements: list[ASTNode],
+        local_variables: list[VariableDeclarationNode] | None,
+        variables: FunctionVariables,
+        available: dict[bytes, _Expression]
+    ) -> list[ASTNode]:
+        """
+        Replace the repeated expressions among the statements executed in sequence
+        :param statements: statements of the scope
+        :param local_variables: local variables of the scope the extracted ones are added to,
+            None for the top-level statements
+        :param variables: variables of the function the scope is in
+        :param available: expressions evaluated before the statements, changed in place
+        :return: the statements with the declarations of the variables the expressions are extracted into
+        """
+        block = _Block(local_variables)
+        for statement in statements:
+            statement_class = type(statement)
+            if statement_class is ScopeNode:
+                self.eliminate_scope(statement, variables, dict(available))
+                available = {}
+            elif statement_class is IfElseNode:
+                self._start_statement(statement, block, variables, available)
+                statement.condition = self._eliminate_expression(statement.condition, (statement, "condition", None))
+
+                # branches continue the condition, unlike the next conditions of else-if chain
+                self.eliminate_scope(statement.if_scope, variables, dict(available))
+                branch = statement.else_scope
+                if type(branch) is ScopeNode:
+                    self.eliminate_scope(branch, variables, dict(available))
+                while type(branch) is IfElseNode:
+                    self.eliminate_scope(branch.if_scope, variables, {})
+                    branch = branch.else_scope
+                    if branch is not None:
+                        self.eliminate_scope(branch, variables, {})
+                available = {}
+            elif statement_class is WhileNode:
+                # conditions are evaluated again after the bodies
+                self.eliminate_scope(statement.while_scope, variables, {})
+                available = {}
+            else:
+                self._start_statement(statement, block, variables, available)
+                self._eliminate_children(statement, may_extract=True)
+                self._kill(statement)
+        return block.insert_declarations(statements)
+
+    def eliminate_scope(
+        self,
+        scope: ScopeNode,
+        variables: FunctionVariables,
+        available: dict[bytes, _Expression]
+    ) -> None:
+        scope.statements = self.eliminate_statements(scope.statements, scope.local_variables, variables, available)
+
+    def _start_statement(
+        self,
+        statement: ASTNode,
+        block: _Block,
+        variables: FunctionVariables,
+        available: dict[bytes, _Expression]
+    ) -> None:
+        self._variables = variables
+        self._block = block
+        self._statement = statement
+        self._available = available
+        self._prerequisites = []
+        self._blocked = False
+
+    def _eliminate_expression(self, node: ASTNode, occurrence: tuple, may_extract: bool = True) -> ASTNode:
+        """
+        Replace the repeated expressions in the expression, in the order the statement evaluates them
+        :param occurrence: the parent node, the name of the attribute and the index in it the node is at
+        :param may_extract: whether the expression is evaluated unconditionally, so it may be extracted
+        :return: the expression to put instead of the given one
+        """
+        node_class = type(node)
+        is_read = _is_read(node)
+        if is_read and self._available:
+            expression = self._available.get(self._hasher.digest(node))
+            if expression is not None:
+                replacing = self._replace_repeated(expression, node, occurrence)
+                if replacing is not node:
+                    return replacing
+
+                # the occurrence is replaced as a whole once the expression is extracted, its operands may be already now
+                prerequisites = self._prerequisites
+                blocked = self._blocked
+                self._eliminate_children(node, may_extract=False)
+                self._prerequisites = prerequisites + [expression]
+                self._blocked = blocked
+                return node
+
+        prerequisites = list(self._prerequisites)
+        blocked = self._blocked
+        if (
+            node_class is BinaryOperatorABCNode
+            and (node.operator in SHORT_CIRCUIT_OPERATORS or node.category == OperatorCategory.Coalesce)
+        ):
+            node.left = self._eliminate_expression(node.left, (node, "left", None), may_extract)
+            node.right = self._eliminate_expression(node.right, (node, "right", None), may_extract=False)
+        else:
+            self._eliminate_children(node, may_extract)
+        self._evaluations += 1
+
+        if is_read and may_extract and not blocked:
+            expression = self._make_expression(node, occurrence)
+            if expression is not None:
+                expression.prerequisites = prerequisites
+                self._available[self._hasher.digest(node)] = expression
+                # the expression and everything it consists of is evaluated before the statement once extracted
+                self._prerequisites = prerequisites + [expression]
+                self._blocked = False
+                return node
+
+        if not _is_pure_evaluation(node):
+            self._blocked = True
+        self._kill(node)
+        return node
+
+    def _eliminate_children(self, node: ASTNode, may_extract: bool) -> None:
+        """
+        Replace the repeated expressions the node consists of, but not the node itself
+        """
+        node_class = type(node)
+        attributes = node.__dict__
+        if node_class is AssignmentNode:
+            # assigned elements and fields aren't read, and may be evaluated before or after the value
+            target = node.left
+            may_extract = may_extract and _is_pure_target(target)
+            node.right = self._eliminate_expression(node.right, (node, "right", None), may_extract)
+            if type(target) is not IdentifierNode:
+                self._eliminate_children(target, may_extract=False)
+            return
+
+        for name, value in attributes.items():
+            if name in get_skipped_attributes(node_class):
+                continue
+            # names of the members and the called functions
+            if (node_class is MemberOperatorNode and name == "right") or (
+                node_class is FunctionCallNode and name == "identifier"
+            ):
+                continue
+
+            value_class = type(value)
+            if value_class is list:
+                for index, item in enumerate(value):
+                    item_class = type(item)
+                    if item_class is not TypeNode and is_node_class(item_class):
+                        value[index] = self._eliminate_expression(item, (node, name, index), may_extract)
+            elif value_class is not TypeNode and is_node_class(value_class):
+                attributes[name] = self._eliminate_expression(value, (node, name, None), may_extract)
+
+    def _make_expression(self, node: ASTNode, occurrence: tuple) -> _Expression | None:
+        """
+        Get the expression the next occurrences of the node may be replaced with, None if there is no such one
+        """
+        expression_type = node.expression_type
+        node_class = type(node)
+        # fields and elements may be references to the objects, but other expressions may create new ones
+        if (
+            node.valid is not True
+            or get_variable_type(expression_type) is None
+            or (
+                node_class is not MemberOperatorNode
+                and node_class is not IndexNode
+                and expression_type.category != TypeCategory.PRIMITIVE
+            )
+        ):
+            return None
+
+        reads = get_expression_reads(node, self._read_only_functions)
+        if reads is None:
+            return None
+        return _Expression(node, occurrence, self._block, self._statement, self._evaluations, reads)
+
+    def _replace_repeated(self, expression: _Expression, node: ASTNode, occurrence: tuple) -> ASTNode:
+        """
+        Replace the repeated occurrence with the variable, if the expression is worth extracting
+        :return: the node to put instead of the occurrence
+        """
+        if expression.variable_name is None:
+            if expression.cost * (len(expression.repeated) + 1) < _MIN_SAVED_COST:
+                # it's replaced with the variable as well, if the expression is extracted later
+                expression.repeated.append(occurrence)
+                return node
+            self._extract(expression)
+
+        self._stats.replaced_occurrences += 1
+        return _make_variable(expression, node)
+
+    def _extract(self, expression: _Expression) -> None:
+        """
+        Evaluate the expression into the variable declared before its statement, and replace its occurrences
+        """
+        if expression.variable_name is not None:
+            return
+        for prerequisite in expression.prerequisites:
+            self._extract(prerequisite)
+
+        self._extractions += 1
+        expression.variable_name = mangle_common_subexpression(self._extractions)
+        node = expression.node
+        declaration = _copy_meta(node, VariableDeclarationNode(
+            get_variable_type(node.expression_type),
+            expression.variable_name,
+            Assignment.VALUE_ASSIGNMENT,
+            node,
+            *node.location
+        ))
+        expression.block.add_declaration(expression.statement, expression.order, declaration)
+        self._stats.extracted_expressions += 1
+
+        _replace_occurrence(expression.occurrence, _make_variable(expression, node))
+        for occurrence in expression.repeated:
+            _replace_occurrence(occurrence, _make_variable(expression, node))
+            self._stats.replaced_occurrences += 1
+        expression.repeated = []
+
+    def _kill(self, node: ASTNode) -> None:
+        """
+        Make the expressions reading what the evaluated node may change unavailable
+        """
+        node_class = type(node)
+        if node_class is VariableDeclarationNode:
+            self._kill_variable(node.name)
+        elif node_class is AssignmentNode:
+            target = node.left
+            if type(target) is IdentifierNode:
+                self._kill_variable(target.name)
+            elif type(target) is MemberOperatorNode:
+                self._kill_expressions(lambda expression: target.right.name in expression.reads.fields)
+            else:
+                self._kill_expressions(lambda expression: expression.reads.reads_elements)
+        elif node_class is FunctionCallNode:
+            for name in get_passed_by_reference(node.arguments):
+                self._kill_variable(name)
+            if get_read_only_callee(node, self._read_only_functions) is None:
+                self._kill_memory()
+        elif node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+            # allocations run constructors and deletions destructors
+            if node.folded_literal is None and (
+                node.is_overload or node.category not in READING_OPERATOR_CATEGORIES
+            ):
+                self._kill_memory()
+        elif node_class is IndexNode and node.is_overload:
+            self._kill_memory()
+
+    def _kill_variable(self, name: str) -> None:
+        variables = self._variables
+        # references may refer to the global variables or to each other
+        if variables.reference_names and (variables.is_global(name) or name in variables.reference_names):
+            self._kill_expressions(lambda expression: expression.reads.reads_globals(variables))
+        self._kill_expressions(lambda expression: name in expression.reads.names)
+
+    def _kill_memory(self) -> None:
+        variables = self._variables
+        self._kill_expressions(lambda expression: (
+            expression.reads.reads_memory
+            or expression.reads.reads_elements
+            or bool(expression.reads.fields)
+            or expression.reads.reads_globals(variables)
+        ))
+
+    def _kill_expressions(self, is_killed) -> None:
+        available = self._available
+        for digest, expression in list(available.items()):
+            if is_killed(expression):
+                del available[digest]
+
+
+def _copy_meta(node: ASTNode, replacing: ASTNode) -> ASTNode:
+    """
+    Copy the validity and the span of the replaced node
+    """
+    replacing.valid = node.valid
+    replacing.span = node.span
+    return replacing
+
+
+def _make_variable(expression: _Expression, node: ASTNode) -> IdentifierNode:
+    identifier = _copy_meta(node, IdentifierNode(expression.variable_name, *node.location))
+    identifier.expression_type = expression.node.expression_type
+    return identifier
+
+
+def _replace_occurrence(occurrence: tuple, replacing: ASTNode) -> None:
+    parent, name, index = occurrence
+    if index is None:
+        parent.__dict__[name] = replacing
+    else:
+        parent.__dict__[name][index] = replacing
+
+
+def _is_read(node: ASTNode) -> bool:
+    """
+    Check whether the node is an expression worth replacing: an operator, a field, an element or a call
+    """
+    node_class = type(node)
+    if node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+        # folded ones are translated as literals
+        return node.folded_literal is None
+    return node_class is MemberOperatorNode or node_class is IndexNode or node_class is FunctionCallNode
+
+
+def _is_pure_target(target: ASTNode) -> bool:
+    """
+    Check whether evaluating the assigned variable, field or element (but not assigning it) never fails
+    and has no side effects
+    """
+    target_class = type(target)
+    if target_class is IdentifierNode:
+        return True
+    if target_class is MemberOperatorNode:
+        return is_pure(target.left)
+    if target_class is IndexNode:
+        return is_pure(target.variable) and all(is_pure(argument) for argument in target.arguments)
+    return False
+
+
+def _is_pure_evaluation(node: ASTNode) -> bool:
+    """
+    Check whether evaluating the node itself (its operands are checked on their own) never fails
+    and has no side effects
+    """
+    node_class = type(node)
+    if node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+        return node.folded_literal is not None or (
+            not node.is_overload
+            and node.category in READING_OPERATOR_CATEGORIES
+            and (node_class is UnaryOperatorABCNode or is_pure(node))
+        )
+    return node_class is IdentifierNode or node_class is ThisNode or issubclass(node_class, LiteralNode)
+
+
+def eliminate_common_subexpressions(root: ProgramNode) -> CommonSubexpressionStats:
+    """
+    Evaluate the expressions repeated in the basic blocks of the type checked program once, in place.
+    Should be run after the static methods and overloads are flattened, see mangle_static_functions
+    :param root: type checked program
+    :return: statistics of the extracted expressions
+    """
+    stats = CommonSubexpressionStats()
+    eliminator = _SubexpressionEliminator(get_read_only_functions(root.function_definitions), stats)
+
+    for function_node in root.function_definitions:
+        body = function_node.function_body
+        eliminator.eliminate_scope(body, get_function_variables(function_node.parameters, body), {})
+
+    for class_node in root.class_definitions:
+        for method_node in class_node.methods_defs:
+            body = method_node.function_body
+            if body is not None:
+                eliminator.eliminate_scope(body, get_function_variables(method_node.parameters, body), {})
+
+    # top-level variables are the global ones functions refer to, unlike the ones of the nested scopes
+    global_names = {
+        statement.name for statement in root.statements if type(statement) is VariableDeclarationNode
+    }
+    root.statements = eliminator.eliminate_statements(
+        root.statements,
+        None,
+        FunctionVariables(None, global_names, set()),
+        {}
+    )
+
+    return stats
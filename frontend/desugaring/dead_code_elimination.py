@@ -0,0 +1,489 @@
+"""
+Reachability-based elimination of dead code in the type checked program.
+
+Top-level statements are the entry point of the program: classes, functions and methods not reachable
+from them through the call graph are removed. Calls are resolved the same way as they are translated,
+by the names and overload numbers the type checker annotated the call sites with: function calls,
+method calls (including overrides in the subclasses, as they may be called by virtual dispatch),
+constructor calls and overloaded operators. Call sites the type checker didn't resolve
+(e.g. the invalid ones) conservatively reach every declaration with the called name, or every overload
+of the operator.
+Classes are reachable if any reachable code refers to their types, and keep their destructors
+and the methods called by virtual dispatch from their superclasses.
+
+Reachable bodies are cleaned as well: branches of if-else statements and loops with constant conditions,
+statements after the ones that never complete normally (return, break, continue, if-else with all branches
+not completing, infinite loops without breaks) and local variables that are never referred
+and initialized without side effects are removed.
+"""
+from collections import Counter
+from itertools import chain
+
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    ClassDefNode,
+    ClassMethodDeclarationNode,
+    FunctionDefNode,
+    FunctionCallNode,
+    MemberOperatorNode,
+    IndexNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    ScopeNode,
+    IfElseNode,
+    WhileNode,
+    BreakNode,
+    ContinueNode,
+    ReturnNode,
+    IdentifierNode,
+    BooleanLiteralNode,
+    TypeNode,
+    TypeCategory,
+    iter_child_nodes,
+)
+from .._syntax.operators import OperatorMethods
+from .shared_tree_analysis import count_nodes, is_pure
+
+
+class DeadCodeStats:
+    """
+    Numbers of declarations, statements and nodes removed by the dead code elimination
+    """
+
+    def __init__(self):
+        self.removed_classes = 0
+        self.removed_functions = 0
+        self.removed_methods = 0
+        self.removed_statements = 0
+        self.removed_local_variables = 0
+
+        # all the nodes of the removed subtrees
+        self.removed_nodes = 0
+
+    def __repr__(self) -> str:
+        return (
+            f"DeadCodeStats(classes={self.removed_classes}, functions={self.removed_functions}, "
+            f"methods={self.removed_methods}, statements={self.removed_statements}, "
+            f"local_variables={self.removed_local_variables}, nodes={self.removed_nodes})"
+        )
+
+
+class _ReachabilityAnalyzer:
+    def __init__(self, program: ProgramNode, stats: DeadCodeStats):
+        self._stats = stats
+
+        self._classes: dict[str, ClassDefNode] = {class_node.name: class_node for class_node in program.class_definitions}
+        self._functions: dict[str, list[FunctionDefNode]] = {}
+        for function_node in program.function_definitions:
+            self._functions.setdefault(function_node.function_name, []).append(function_node)
+
+        # ids of the reachable classes, functions and methods
+        self.reached: set[int] = set()
+
+        # names of the methods called on the classes, to dispatch them to the overrides of subclasses,
+        # and the ones called on unknown classes, which may be any
+        self._called_methods: dict[str, set[str]] = {}
+        self._called_anywhere: set[str] = set()
+
+        self._pending: list[ASTNode] = []
+
+    def reach_statements(self, statements: list[ASTNode]) -> None:
+        """
+        Reach everything the statements refer to, transitively
+        """
+        self._pending.extend(statements)
+        while self._pending:
+            self._scan(self._pending.pop())
+
+    def _scan(self, root: ASTNode) -> None:
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            node_class = type(node)
+
+            if node_class is FunctionCallNode:
+                self._reach_call(node)
+            elif node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+                # operands of the invalid operators may be of the classes overloading them
+                if node.is_overload or (node.valid is not True and OperatorMethods.overloadable(node.operator)):
+                    arity = 2 if node_class is BinaryOperatorABCNode else 1
+                    self._reach_functions(f"$operator_{OperatorMethods.translate(node.operator, arity)}", node)
+            elif node_class is IndexNode:
+                if node.is_overload or node.valid is not True:
+                    self._reach_functions("$operator_index", node)
+            elif node_class is MemberOperatorNode:
+                # static fields belong to their classes
+                if node.is_static and node.associated_class is not None:
+                    class_node = self._classes.get(node.associated_class.name)
+                    if class_node is not None:
+                        self._reach_class(class_node)
+            elif node_class is TypeNode:
+                if node.category in (TypeCategory.CLASS, TypeCategory.GENERIC_CLASS):
+                    class_node = self._classes.get(node.name)
+                    if class_node is not None:
+                        self._reach_class(class_node)
+
+            stack.extend(iter_child_nodes(node))
+
+    def _reach_call(self, call: FunctionCallNode) -> None:
+        identifier = call.identifier
+        identifier_class = type(identifier)
+
+        if identifier_class is IdentifierNode:
+            self._reach_functions(identifier.name, call)
+
+        elif identifier_class is TypeNode and call.is_constructor:
+            class_node = self._classes.get(identifier.name)
+            if class_node is not None:
+                self._reach_class(class_node)
+                for method_node in class_node.methods_defs:
+                    if method_node.is_constructor and _is_resolved_to(call, method_node):
+                        self._reach(method_node)
+
+        elif identifier_class is MemberOperatorNode and type(identifier.right) is IdentifierNode:
+            method_name = identifier.right.name
+            associated_class = identifier.associated_class
+            class_node = self._classes.get(associated_class.name) if associated_class is not None else None
+            if class_node is None or call.valid is not True:
+                self._reach_method_anywhere(method_name)
+            elif identifier.is_static:
+                self._reach_class(class_node)
+                for method_node in class_node.static_methods_defs:
+                    if method_node.function_name == method_name and _is_resolved_to(call, method_node):
+                        self._reach(method_node)
+            else:
+                self._reach_method(class_node, method_name, call)
+
+    def _reach_functions(self, function_name: str, call: ASTNode) -> None:
+        for function_node in self._functions.get(function_name, ()):
+            if _is_resolved_to(call, function_node):
+                self._reach(function_node)
+
+    def _reach_method(self, class_node: ClassDefNode, method_name: str, call: FunctionCallNode) -> None:
+        # the method statically resolved is the one of the nearest class defining it
+        for ancestor in self._iter_ancestors(class_node):
+            methods = [method_node for method_node in ancestor.methods_defs if method_node.function_name == method_name]
+            if methods:
+                for method_node in methods:
+                    if _is_resolved_to(call, method_node):
+                        self._reach(method_node)
+                break
+
+        # any override of reachable subclasses may be called instead, whichever overload it is
+        called = self._called_methods.setdefault(class_node.name, set())
+        if method_name in called:
+            return
+        called.add(method_name)
+        for subclass in list(self._iter_reached_classes()):
+            if subclass is not class_node and class_node in self._iter_ancestors(subclass):
+                self._reach_methods_named(subclass, method_name)
+
+    def _reach_method_anywhere(self, method_name: str) -> None:
+        if method_name in self._called_anywhere:
+            return
+        self._called_anywhere.add(method_name)
+        for class_node in list(self._iter_reached_classes()):
+            self._reach_methods_named(class_node, method_name)
+
+    def _reach_methods_named(self, class_node: ClassDefNode, method_name: str) -> None:
+        for method_node in chain(class_node.methods_defs, class_node.static_methods_defs):
+            if method_node.function_name == method_name:
+                self._reach(method_node)
+
+    def _reach_class(self, class_node: ClassDefNode) -> None:
+        if id(class_node) in self.reached:
+            return
+        self.reached.add(id(class_node))
+
+        # everything but the methods is needed by the class itself
+        self._pending.extend(field for field in class_node.all_fields_definitions)
+        if class_node.superclass is not None:
+            self._pending.append(class_node.superclass)
+
+        # destructors are called implicitly, operator methods aren't resolved by the type checker
+        for method_node in class_node.methods_defs:
+            if method_node.is_destructor or method_node.is_overload:
+                self._reach(method_node)
+
+        for method_name in self._called_anywhere:
+            self._reach_methods_named(class_node, method_name)
+        for ancestor in self._iter_ancestors(class_node):
+            if ancestor is not class_node:
+                for method_name in self._called_methods.get(ancestor.name, ()):
+                    self._reach_methods_named(class_node, method_name)
+
+    def _reach(self, declaration: FunctionDefNode | ClassMethodDeclarationNode) -> None:
+        if id(declaration) in self.reached:
+            return
+        self.reached.add(id(declaration))
+
+        # bodies are cleaned before the scan, so calls of the removed code don't reach anything
+        clean_function_body(declaration.function_body, self._stats)
+        self._pending.append(declaration)
+
+    def _iter_ancestors(self, class_node: ClassDefNode):
+        """
+        Iterate over the class and its superclasses, nearest first
+        """
+        visited = set()
+        while class_node is not None and id(class_node) not in visited:
+            visited.add(id(class_node))
+            yield class_node
+            superclass = class_node.superclass
+            class_node = self._classes.get(superclass.name) if superclass is not None else None
+
+    def _iter_reached_classes(self):
+        return (class_node for class_node in self._classes.values() if id(class_node) in self.reached)
+
+
+def _is_resolved_to(call: ASTNode, declaration: FunctionDefNode | ClassMethodDeclarationNode) -> bool:
+    """
+    Check whether the call site may call the declaration with the matching name.
+    Call sites the type checker didn't resolve may call any overload
+    """
+    return call.valid is not True or call.overload_number == declaration.overload_number
+
+
+def _count_identifiers(root: ASTNode, counts: Counter, increment: int) -> None:
+    # declarations are local variables of their scopes as well, so they are counted once
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        if type(node) is IdentifierNode:
+            counts[node.name] += increment
+        stack.extend(iter_child_nodes(node))
+
+
+def _get_constant_condition(condition: ASTNode) -> bool | None:
+    if type(condition) in (BinaryOperatorABCNode, UnaryOperatorABCNode) and condition.folded_literal is not None:
+        condition = condition.folded_literal
+    if type(condition) is BooleanLiteralNode:
+        return condition.value == "true"
+    return None
+
+
+def _completes_normally(statement: ASTNode) -> bool:
+    """
+    Check whether the execution may continue after the (cleaned) statement
+    """
+    statement_class = type(statement)
+    if statement_class is ReturnNode:
+        return False
+    elif statement_class is BreakNode or statement_class is ContinueNode:
+        # the ones outside loops only set the error, see their translation
+        return not statement.in_loop
+    elif statement_class is ScopeNode:
+        return not statement.statements or _completes_normally(statement.statements[-1])
+    elif statement_class is IfElseNode:
+        return (
+            statement.else_scope is None
+            or _completes_normally(statement.if_scope)
+            or _completes_normally(statement.else_scope)
+        )
+    elif statement_class is WhileNode:
+        return _get_constant_condition(statement.condition) is not True or _has_break(statement.while_scope)
+    return True
+
+
+def _has_break(scope: ScopeNode) -> bool:
+    """
+    Check whether the loop body breaks out of the loop itself, not the nested ones
+    """
+    stack = list(scope.statements)
+    while stack:
+        statement = stack.pop()
+        statement_class = type(statement)
+        if statement_class is BreakNode and statement.in_loop:
+            return True
+        elif statement_class is ScopeNode:
+            stack.extend(statement.statements)
+        elif statement_class is IfElseNode:
+            stack.append(statement.if_scope)
+            if statement.else_scope is not None:
+                stack.append(statement.else_scope)
+    return False
+
+
+def _clean_statement(statement: ASTNode, stats: DeadCodeStats) -> ASTNode | None:
+    """
+    Clean the nested scopes of the statement
+    :return: the statement to put instead (e.g. the branch of the if-else statement taken), None to remove it
+    """
+    statement_class = type(statement)
+    if statement_class is ScopeNode:
+        _clean_scope(statement, stats)
+
+    elif statement_class is IfElseNode:
+        condition = _get_constant_condition(statement.condition)
+        if condition is None:
+            _clean_scope(statement.if_scope, stats)
+            if statement.else_scope is not None:
+                statement.else_scope = _clean_statement(statement.else_scope, stats)
+            return statement
+
+        taken, dropped = (
+            (statement.if_scope, statement.else_scope) if condition else (statement.else_scope, statement.if_scope)
+        )
+        if dropped is not None:
+            stats.removed_nodes += count_nodes(dropped)
+        # the if-else statement itself and its condition
+        stats.removed_nodes += 1 + count_nodes(statement.condition)
+        return _clean_statement(taken, stats) if taken is not None else None
+
+    elif statement_class is WhileNode:
+        if _get_constant_condition(statement.condition) is False:
+            stats.removed_nodes += count_nodes(statement)
+            return None
+        _clean_scope(statement.while_scope, stats)
+
+    return statement
+
+
+def _clean_statements(statements: list[ASTNode], stats: DeadCodeStats) -> list[ASTNode]:
+    """
+    Clean the statements executed in sequence, and remove the ones that are never executed
+    """
+    cleaned = []
+    for index, statement in enumerate(statements):
+        statement = _clean_statement(statement, stats)
+        if statement is None:
+            stats.removed_statements += 1
+            continue
+
+        cleaned.append(statement)
+        if not _completes_normally(statement):
+            unreachable = statements[index + 1:]
+            stats.removed_statements += len(unreachable)
+            stats.removed_nodes += sum(map(count_nodes, unreachable))
+            break
+    return cleaned
+
+
+def _clean_scope(scope: ScopeNode, stats: DeadCodeStats) -> None:
+    scope.statements = _clean_statements(scope.statements, stats)
+    if scope.local_variables:
+        kept = {id(statement) for statement in scope.statements}
+        scope.local_variables = [variable for variable in scope.local_variables if id(variable) in kept]
+
+
+def _iter_scopes(body: ScopeNode):
+    stack = [body]
+    while stack:
+        scope = stack.pop()
+        yield scope
+        for statement in scope.statements:
+            statement_class = type(statement)
+            if statement_class is ScopeNode:
+                stack.append(statement)
+            elif statement_class is WhileNode:
+                stack.append(statement.while_scope)
+            elif statement_class is IfElseNode:
+                while type(statement) is IfElseNode:
+                    stack.append(statement.if_scope)
+                    statement = statement.else_scope
+                if statement is not None:
+                    stack.append(statement)
+
+
+def _remove_unused_local_variables(body: ScopeNode, stats: DeadCodeStats) -> None:
+    """
+    Remove local variables never referred by name in the body, if their initializers have no side effects.
+    Variables can't be redeclared in nested scopes, so names identify them in the whole body
+    """
+    scopes = list(_iter_scopes(body))
+    if not any(scope.local_variables for scope in scopes):
+        return
+
+    counts = Counter()
+    _count_identifiers(body, counts, 1)
+
+    # initializers of the removed variables may refer the only usages of other variables
+    changed = True
+    while changed:
+        changed = False
+        for scope in scopes:
+            unused = [
+                variable for variable in scope.local_variables
+                if not counts[variable.name] and is_pure(variable.value)
+            ]
+            if not unused:
+                continue
+
+            changed = True
+            removed = {id(variable) for variable in unused}
+            scope.statements = [statement for statement in scope.statements if id(statement) not in removed]
+            scope.local_variables = [variable for variable in scope.local_variables if id(variable) not in removed]
+            for variable in unused:
+                _count_identifiers(variable, counts, -1)
+                stats.removed_local_variables += 1
+                stats.removed_nodes += count_nodes(variable)
+
+
+def clean_function_body(body: ScopeNode, stats: DeadCodeStats) -> None:
+    """
+    Remove unreachable statements and unused local variables of the function or method body, in place
+    :param body: outermost scope of the function or method
+    :param stats: statistics to count the removed code in
+    """
+    _clean_scope(body, stats)
+    _remove_unused_local_variables(body, stats)
+
+
+def eliminate_dead_code(root: ProgramNode, stats: DeadCodeStats | None = None) -> DeadCodeStats:
+    """
+    Remove the code unreachable from the top-level statements of the type checked program, in place.
+    Should be run after the generic classes are instantiated, so unused instances are removed too
+    :param root: type checked program
+    :param stats: statistics to count the removed code in, e.g. the ones of the previous run
+    :return: statistics of the removed code
+    """
+    if stats is None:
+        stats = DeadCodeStats()
+    root.statements = _clean_statements(root.statements, stats)
+
+    analyzer = _ReachabilityAnalyzer(root, stats)
+    analyzer.reach_statements(root.statements)
+    reached = analyzer.reached
+
+    class_definitions = []
+    for class_node in root.class_definitions:
+        if id(class_node) not in reached:
+            stats.removed_classes += 1
+            stats.removed_nodes += count_nodes(class_node)
+            continue
+
+        methods = []
+        for method_node in class_node.methods_defs:
+            if id(method_node) in reached:
+                methods.append(method_node)
+            else:
+                stats.removed_methods += 1
+                stats.removed_nodes += count_nodes(method_node)
+        class_node.methods_defs = methods
+
+        static_methods = []
+        for method_node in class_node.static_methods_defs:
+            if id(method_node) in reached:
+                static_methods.append(method_node)
+            else:
+                stats.removed_methods += 1
+                stats.removed_nodes += count_nodes(method_node)
+        class_node.static_methods_defs = static_methods
+        class_definitions.append(class_node)
+    root.class_definitions = class_definitions
+
+    function_definitions = []
+    for function_node in root.function_definitions:
+        if id(function_node) in reached:
+            function_definitions.append(function_node)
+        else:
+            stats.removed_functions += 1
+            stats.removed_nodes += count_nodes(function_node)
+    root.function_definitions = function_definitions
+
+    return stats
@@ -0,0 +1,345 @@
+"""
+Loop-invariant code motion for while loops.
+
+Conditions of while loops are evaluated on every iteration (and translated twice, before the loop and at the end
+of its body), so the expressions that evaluate the same on every iteration are hoisted into local variables
+declared right before the loop. An expression is invariant if the loop can't change anything it reads:
+variables the loop doesn't assign, declare or pass by reference, fields the loop doesn't assign,
+elements of collections if the loop assigns none, and calls of read-only functions with invariant arguments.
+Calls of other functions, methods and constructors may change any field, element or global variable.
+
+Read-only functions are the global ones (including the static methods and operator overloads,
+so it's run after they are flattened, see mangle_static_functions) that assign only their own local variables
+and call only read-only functions; the type checker resolved the calls they make to the final names.
+
+Hoisted expressions are evaluated once even if the loop is never entered, so expressions that may fail
+(e.g. divide by zero, access a field of null or call a function) are hoisted only from the conditions,
+which are evaluated at least once anyway, and only if they aren't short-circuited by the other operands.
+Expressions from the bodies of loops are hoisted if they never fail. Every expression is hoisted
+before the outermost loop it's invariant in: the outer loops are processed before the nested ones.
+"""
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    FunctionCallNode,
+    MemberOperatorNode,
+    IndexNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    AssignmentNode,
+    OperatorCategory,
+    ScopeNode,
+    IfElseNode,
+    WhileNode,
+    IdentifierNode,
+    TypeNode,
+    TypeCategory,
+    VariableDeclarationNode,
+    is_node_class,
+    get_skipped_attributes,
+)
+from .._syntax.operators import Assignment
+from .shared_tree_analysis import (
+    is_pure,
+    iter_tree_nodes,
+    get_passed_by_reference,
+    FunctionVariables,
+    get_variable_type,
+    get_read_only_callee,
+    get_read_only_functions,
+    get_function_variables,
+    ExpressionReads,
+    get_expression_reads,
+    READING_OPERATOR_CATEGORIES,
+    SHORT_CIRCUIT_OPERATORS,
+)
+from .shared_type_mangler import mangle_loop_invariant
+
+
+class HoistingStats:
+    """
+    Numbers of the expressions hoisted out of the loops, and of the loops they are hoisted out of
+    """
+
+    def __init__(self):
+        self.hoisted_expressions = 0
+        self.loops = 0
+
+    def __repr__(self) -> str:
+        return f"HoistingStats(expressions={self.hoisted_expressions}, loops={self.loops})"
+
+
+class _LoopEffects:
+    """
+    What the loop (its condition and its body) may change on every iteration
+    """
+
+    def __init__(self, loop: WhileNode, variables: FunctionVariables, read_only_functions: dict[str, bool]):
+        self.variables = variables
+        self.changed_names = get_passed_by_reference([loop.condition, loop.while_scope])
+        self.changed_fields: set[str] = set()
+        self.changes_elements = False
+        self.calls_writing = False
+
+        for node in iter_tree_nodes(loop):
+            node_class = type(node)
+            if node_class is VariableDeclarationNode:
+                self.changed_names.add(node.name)
+            elif node_class is AssignmentNode:
+                target = node.left
+                if type(target) is IdentifierNode:
+                    self.changed_names.add(target.name)
+                elif type(target) is MemberOperatorNode:
+                    self.changed_fields.add(target.right.name)
+                else:
+                    self.changes_elements = True
+            elif node_class is FunctionCallNode:
+                if get_read_only_callee(node, read_only_functions) is None:
+                    self.calls_writing = True
+            elif node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode or node_class is IndexNode:
+                if node.is_overload and (node_class is IndexNode or node.folded_literal is None):
+                    self.calls_writing = True
+                elif node_class is not IndexNode and node.category not in READING_OPERATOR_CATEGORIES:
+                    # allocations run constructors and deletions destructors
+                    self.calls_writing = True
+
+        # references may refer to the global variables or to each other
+        self.globals_changed = self.calls_writing or (bool(variables.reference_names) and any(
+            variables.is_global(name) or name in variables.reference_names for name in self.changed_names
+        ))
+
+    def is_changed(self, name: str) -> bool:
+        return name in self.changed_names or (self.globals_changed and (
+            self.variables.is_global(name) or name in self.variables.reference_names
+        ))
+
+    def is_field_changed(self, name: str) -> bool:
+        return self.calls_writing or name in self.changed_fields
+
+    def is_memory_changed(self) -> bool:
+        return self.calls_writing or self.changes_elements or bool(self.changed_fields)
+
+    def changes(self, reads: ExpressionReads) -> bool:
+        """
+        Check whether the loop may change anything the expression reads
+        """
+        return (
+            any(self.is_changed(name) for name in reads.names)
+            or any(self.is_field_changed(name) for name in reads.fields)
+            or (reads.reads_elements and (self.calls_writing or self.changes_elements))
+            or (reads.reads_memory and self.is_memory_changed())
+        )
+
+
+class _LoopInvariantHoister:
+    def __init__(self, read_only_functions: dict[str, bool], stats: HoistingStats):
+        # read-only functions by their names, whether they read fields or elements
+        self._read_only_functions = read_only_functions
+        self._stats = stats
+
+        # for unique names of the hoisted variables
+        self._hoistings = 0
+
+    def hoist_statements(
+        self,
+        statements: list[ASTNode],
+        local_variables: list[VariableDeclarationNode] | None,
+        variables: FunctionVariables
+    ) -> list[ASTNode]:
+        """
+        Hoist the invariant expressions out of the loops among the statements executed in sequence
+        :param statements: statements of the scope
+        :param local_variables: local variables of the scope the hoisted ones are added to,
+            None for the top-level statements
+        :param variables: variables of the function the scope is in
+        :return: the statements with the declarations of the hoisted variables before the loops
+        """
+        hoisted_statements = []
+        for statement in statements:
+            statement_class = type(statement)
+            if statement_class is ScopeNode:
+                self.hoist_scope(statement, variables)
+            elif statement_class is IfElseNode:
+                branch = statement
+                while type(branch) is IfElseNode:
+                    self.hoist_scope(branch.if_scope, variables)
+                    branch = branch.else_scope
+                if branch is not None:
+                    self.hoist_scope(branch, variables)
+            elif statement_class is WhileNode:
+                declarations = self._hoist_loop(statement, variables)
+                hoisted_statements.extend(declarations)
+                if local_variables is not None:
+                    local_variables.extend(declarations)
+                self.hoist_scope(statement.while_scope, variables)
+            hoisted_statements.append(statement)
+        return hoisted_statements
+
+    def hoist_scope(self, scope: ScopeNode, variables: FunctionVariables) -> None:
+        scope.statements = self.hoist_statements(scope.statements, scope.local_variables, variables)
+
+    def _hoist_loop(self, loop: WhileNode, variables: FunctionVariables) -> list[VariableDeclarationNode]:
+        """
+        Replace the expressions invariant in the loop with the variables, including the ones in the nested loops
+        :return: declarations of the variables, to put before the loop
+        """
+        effects = _LoopEffects(loop, variables, self._read_only_functions)
+        declarations = []
+        loop.condition = self._hoist_expression(loop.condition, effects, declarations, may_fail=True)
+        for statement in loop.while_scope.statements:
+            self._hoist_children(statement, effects, declarations, may_fail=False)
+
+        if declarations:
+            # hoisted variables are local ones, the nested loops can't change them
+            if variables.local_names is not None:
+                variables.local_names.update(declaration.name for declaration in declarations)
+            self._stats.hoisted_expressions += len(declarations)
+            self._stats.loops += 1
+        return declarations
+
+    def _hoist_expression(
+        self,
+        expression: ASTNode,
+        effects: _LoopEffects,
+        declarations: list[VariableDeclarationNode],
+        may_fail: bool
+    ) -> ASTNode:
+        """
+        Hoist the largest invariant expressions out of the loop
+        :param declarations: declarations of the hoisted variables to add to
+        :param may_fail: whether the expression is evaluated on every iteration before anything else,
+            so it may be hoisted even if it may fail
+        :return: the expression to put instead of the given one
+        """
+        if self._is_hoisted(expression, effects, may_fail):
+            self._hoistings += 1
+            name = mangle_loop_invariant(self._hoistings)
+            declarations.append(_copy_meta(expression, VariableDeclarationNode(
+                get_variable_type(expression.expression_type),
+                name,
+                Assignment.VALUE_ASSIGNMENT,
+                expression,
+                *expression.location
+            )))
+            identifier = _copy_meta(expression, IdentifierNode(name, *expression.location))
+            identifier.expression_type = expression.expression_type
+            return identifier
+
+        expression_class = type(expression)
+        if expression_class is BinaryOperatorABCNode and (
+            expression.operator in SHORT_CIRCUIT_OPERATORS or expression.category == OperatorCategory.Coalesce
+        ):
+            expression.left = self._hoist_expression(expression.left, effects, declarations, may_fail)
+            expression.right = self._hoist_expression(expression.right, effects, declarations, may_fail=False)
+        else:
+            self._hoist_children(expression, effects, declarations, may_fail)
+        return expression
+
+    def _hoist_children(
+        self,
+        node: ASTNode,
+        effects: _LoopEffects,
+        declarations: list[VariableDeclarationNode],
+        may_fail: bool
+    ) -> None:
+        """
+        Hoist the invariant expressions the node consists of, but not the node itself
+        """
+        node_class = type(node)
+        attributes = node.__dict__
+        for name, value in attributes.items():
+            if name in get_skipped_attributes(node_class):
+                continue
+            # names of the members and the called functions, and the variables declared in the scopes
+            if (
+                (node_class is MemberOperatorNode and name == "right")
+                or (node_class is FunctionCallNode and name == "identifier")
+                or (node_class is ScopeNode and name == "local_variables")
+            ):
+                continue
+
+            value_class = type(value)
+            if value_class is list:
+                for index, item in enumerate(value):
+                    item_class = type(item)
+                    if node_class is ScopeNode:
+                        self._hoist_children(item, effects, declarations, may_fail)
+                    elif item_class is not TypeNode and is_node_class(item_class):
+                        value[index] = self._hoist_expression(item, effects, declarations, may_fail)
+            elif value_class is TypeNode or not is_node_class(value_class):
+                continue
+            elif (node_class is AssignmentNode and name == "left") or value_class is ScopeNode:
+                self._hoist_children(value, effects, declarations, may_fail)
+            else:
+                attributes[name] = self._hoist_expression(value, effects, declarations, may_fail)
+
+    def _is_hoisted(self, expression: ASTNode, effects: _LoopEffects, may_fail: bool) -> bool:
+        """
+        Check whether the expression is worth hoisting, may be hoisted and is invariant in the loop
+        """
+        expression_class = type(expression)
+        if expression_class is BinaryOperatorABCNode or expression_class is UnaryOperatorABCNode:
+            # folded ones are translated as literals
+            if expression.folded_literal is not None:
+                return False
+        elif expression_class is FunctionCallNode:
+            if not may_fail:
+                return False
+        elif expression_class is not MemberOperatorNode and expression_class is not IndexNode:
+            return False
+
+        # fields and elements may be references to the objects, but other expressions may create new ones
+        expression_type = expression.expression_type
+        if (
+            expression.valid is not True
+            or get_variable_type(expression_type) is None
+            or (
+                expression_class is not MemberOperatorNode
+                and expression_class is not IndexNode
+                and expression_type.category != TypeCategory.PRIMITIVE
+            )
+        ):
+            return False
+
+        if not may_fail and not is_pure(expression):
+            return False
+        reads = get_expression_reads(expression, self._read_only_functions)
+        return reads is not None and not effects.changes(reads)
+
+
+def _copy_meta(node: ASTNode, replacing: ASTNode) -> ASTNode:
+    """
+    Copy the validity and the span of the replaced node
+    """
+    replacing.valid = node.valid
+    replacing.span = node.span
+    return replacing
+
+
+def hoist_loop_invariants(root: ProgramNode) -> HoistingStats:
+    """
+    Hoist the expressions invariant in the while loops of the type checked program out of them, in place.
+    Should be run after the static methods and overloads are flattened, see mangle_static_functions
+    :param root: type checked program
+    :return: statistics of the hoisted expressions
+    """
+    stats = HoistingStats()
+    hoister = _LoopInvariantHoister(get_read_only_functions(root.function_definitions), stats)
+
+    for function_node in root.function_definitions:
+        body = function_node.function_body
+        hoister.hoist_scope(body, get_function_variables(function_node.parameters, body))
+
+    for class_node in root.class_definitions:
+        for method_node in class_node.methods_defs:
+            body = method_node.function_body
+            if body is not None:
+                hoister.hoist_scope(body, get_function_variables(method_node.parameters, body))
+
+    # top-level variables are the global ones functions refer to, unlike the ones of the nested scopes
+    global_names = {
+        statement.name for statement in root.statements if type(statement) is VariableDeclarationNode
+    }
+    root.statements = hoister.hoist_statements(root.statements, None, FunctionVariables(None, global_names, set()))
+
+    return stats
@@ -0,0 +1,577 @@
+"""
+Inlining of small functions.
+
+Calls of small functions are replaced with their bodies, so tight loops don't pay for the calls at runtime.
+Only global functions are inlined, including the static methods and operator overloads (so it's run after
+they are flattened, see mangle_static_functions): other methods may be overridden and are called
+by virtual dispatch. Recursive functions (calling themselves directly or through other ones) and the ones
+with bodies larger than the budget are never inlined. Functions are processed callees first,
+so the inlined bodies have the calls of their own callees inlined already.
+
+Functions returning a single expression are inlined into any expression, if their arguments can be
+substituted for the parameters: the ones passed by reference are variables, and the ones passed by value
+are literals, variables the call can't change, or expressions without side effects used once.
+Other functions are inlined into the statements calling them (f(...); x := f(...); T x := f(...); return f(...);)
+as scopes declaring the rest of the parameters as local variables, if they return only at the ends of their bodies.
+Local variables of the inlined bodies are renamed (see mangle_inlined_variable), so they don't clash
+with the ones of the callers.
+"""
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    FunctionDefNode,
+    FunctionCallNode,
+    MemberOperatorNode,
+    IndexNode,
+    AssignmentNode,
+    ScopeNode,
+    IfElseNode,
+    WhileNode,
+    BreakNode,
+    ContinueNode,
+    ReturnNode,
+    ThisNode,
+    IdentifierNode,
+    LiteralNode,
+    IntegerLiteralNode,
+    TypeNode,
+    TypeCategory,
+    VariableDeclarationNode,
+    is_node_class,
+    get_skipped_attributes,
+    iter_child_nodes,
+)
+from .._syntax.operators import Assignment
+from ..semantics import TypeEnum
+from .shared_tree_analysis import (
+    count_nodes,
+    copy_tree,
+    is_pure,
+    is_side_effect_free,
+    iter_tree_nodes,
+    iter_variable_declarations,
+    get_declared_names,
+    is_passed_by_reference,
+    get_passed_by_reference,
+    replace_variables,
+    count_variable_usages,
+)
+from .shared_type_mangler import mangle_inlined_variable
+
+
+# nodes in the body of the largest function inlined
+_MAX_INLINED_SIZE = 40
+
+# integer literals are typed as the smallest of these types their values fit in
+_INTEGER_TYPES = frozenset((
+    TypeEnum.BYTE,
+    TypeEnum.SHORT_INTEGER,
+    TypeEnum.INTEGER,
+    TypeEnum.LONG_INTEGER,
+    TypeEnum.EXTENDED_INTEGER,
+))
+
+# states of the functions in the depth-first traversal of the call graph
+_VISITING = 1
+_VISITED = 2
+
+
+class InliningStats:
+    """
+    Numbers of the calls replaced by the inlined functions
+    """
+
+    def __init__(self):
+        self.inlined_expressions = 0
+        self.inlined_statements = 0
+
+    def __repr__(self) -> str:
+        return f"InliningStats(expressions={self.inlined_expressions}, statements={self.inlined_statements})"
+
+
+class _InlinedFunction:
+    """
+    Function that may be inlined, with what its call sites need to know about its body
+    """
+
+    def __init__(self, function_node: FunctionDefNode, returned: ASTNode | None, inlined_into_statements: bool):
+        self.function_node = function_node
+        body = function_node.function_body
+
+        # the expression the function returns at the end, and the same if it's the only statement of its body
+        self.returned = returned
+        self.expression = returned if len(body.statements) == 1 and not body.local_variables else None
+        self.is_side_effect_free = self.expression is not None and is_side_effect_free(self.expression)
+        self.inlined_into_statements = inlined_into_statements
+
+        self.local_names = get_declared_names(body)
+        self.usages = count_variable_usages(body)
+
+        parameter_names = {parameter.name for parameter in function_node.parameters}
+        self.free_names = set(self.usages) - parameter_names - self.local_names
+        self.changed_names = _get_changed_names(body)
+
+        # references assigned themselves may be rebound, unlike the variables they are replaced with
+        self.reassigned_names = {
+            node.left.name for node in iter_tree_nodes(body) if type(node) is AssignmentNode and type(node.left) is IdentifierNode
+        }
+
+
+class _FunctionInliner:
+    def __init__(self, function_definitions: list[FunctionDefNode], stats: InliningStats):
+        self._stats = stats
+
+        # names of the functions are final after the overloads are mangled
+        self._functions: dict[str, FunctionDefNode] = {
+            function_node.function_name: function_node for function_node in function_definitions
+        }
+        self._inlined: dict[str, _InlinedFunction] = {}
+
+        # ids of the functions calling themselves, directly or through other ones
+        self._recursive: set[int] = set()
+
+        # for unique names of the inlined variables
+        self._inlinings = 0
+
+    def order_callees_first(self) -> list[FunctionDefNode]:
+        """
+        Get the functions in the order every function comes after the ones it calls, except the recursive calls
+        """
+        ordered = []
+        states: dict[int, int] = {}
+        for function_node in self._functions.values():
+            if id(function_node) in states:
+                continue
+
+            states[id(function_node)] = _VISITING
+            stack = [(function_node, iter(self._get_callees(function_node)))]
+            positions = {id(function_node): 0}
+            while stack:
+                caller, callees = stack[-1]
+                for callee in callees:
+                    state = states.get(id(callee))
+                    if state is None:
+                        states[id(callee)] = _VISITING
+                        positions[id(callee)] = len(stack)
+                        stack.append((callee, iter(self._get_callees(callee))))
+                        break
+                    elif state == _VISITING:
+                        # every function on the stack from the callee on is a part of the cycle
+                        for cycle_function, _ in stack[positions[id(callee)]:]:
+                            self._recursive.add(id(cycle_function))
+                else:
+                    stack.pop()
+                    states[id(caller)] = _VISITED
+                    ordered.append(caller)
+        return ordered
+
+    def add_inlined(self, function_node: FunctionDefNode) -> None:
+        """
+        Let the function be inlined into the ones processed after it, if it may be
+        """
+        if id(function_node) in self._recursive:
+            return
+        inlined = _get_inlined_function(function_node)
+        if inlined is not None:
+            self._inlined[function_node.function_name] = inlined
+
+    def inline_statements(self, statements: list[ASTNode], caller_names: set[str]) -> list[ASTNode]:
+        """
+        Inline the calls in the statements executed in sequence
+        :param statements: statements of the scope
+        :param caller_names: names of the local variables and parameters of the function the scope is in
+        :return: the statements with the calls inlined
+        """
+        inlined_statements = []
+        for statement in statements:
+            statement_class = type(statement)
+            if statement_class is ScopeNode:
+                self.inline_scope(statement, caller_names)
+            elif statement_class is IfElseNode:
+                branch = statement
+                while type(branch) is IfElseNode:
+                    branch.condition = self._inline_expression(branch.condition, caller_names)
+                    self.inline_scope(branch.if_scope, caller_names)
+                    branch = branch.else_scope
+                if branch is not None:
+                    self.inline_scope(branch, caller_names)
+            elif statement_class is WhileNode:
+                statement.condition = self._inline_expression(statement.condition, caller_names)
+                self.inline_scope(statement.while_scope, caller_names)
+            else:
+                self._inline_children(statement, caller_names)
+                replacing = self._inline_statement(statement, caller_names)
+                if replacing is not None:
+                    inlined_statements.extend(replacing)
+                    continue
+            inlined_statements.append(statement)
+        return inlined_statements
+
+    def inline_scope(self, scope: ScopeNode, caller_names: set[str]) -> None:
+        scope.statements = self.inline_statements(scope.statements, caller_names)
+
+    def _get_callees(self, function_node: FunctionDefNode) -> list[FunctionDefNode]:
+        callees = {}
+        for node in iter_tree_nodes(function_node.function_body):
+            if type(node) is FunctionCallNode and type(node.identifier) is IdentifierNode:
+                callee = self._functions.get(node.identifier.name)
+                if callee is not None:
+                    callees[id(callee)] = callee
+        return list(callees.values())
+
+    def _inline_children(self, node: ASTNode, caller_names: set[str]) -> None:
+        """
+        Inline the calls in the expressions the node consists of, in place
+        """
+        attributes = node.__dict__
+        for name, value in attributes.items():
+            if name in get_skipped_attributes(type(node)):
+                continue
+            value_class = type(value)
+            if value_class is list:
+                for index, item in enumerate(value):
+                    item_class = type(item)
+                    if item_class is not TypeNode and is_node_class(item_class):
+                        value[index] = self._inline_expression(item, caller_names)
+            elif value_class is not TypeNode and is_node_class(value_class):
+                attributes[name] = self._inline_expression(value, caller_names)
+
+    def _inline_expression(self, expression: ASTNode, caller_names: set[str]) -> ASTNode:
+        """
+        Inline the calls in the expression, innermost first
+        :return: the expression to put instead of the given one
+        """
+        self._inline_children(expression, caller_names)
+        if type(expression) is not FunctionCallNode:
+            return expression
+
+        inlined = self._get_inlined(expression, caller_names)
+        if inlined is None or inlined.expression is None:
+            return expression
+
+        bound = self._bind_arguments(expression, inlined, caller_names, in_expression=True)
+        if bound is None:
+            return expression
+        replacements, _ = bound
+
+        def replace(identifier: IdentifierNode) -> ASTNode:
+            return _replace_variable(identifier, replacements)
+
+        self._stats.inlined_expressions += 1
+        replacing = copy_tree(inlined.expression)
+        if type(replacing) is IdentifierNode:
+            return replace(replacing)
+        replace_variables(replacing, replace)
+        return replacing
+
+    def _inline_statement(self, statement: ASTNode, caller_names: set[str]) -> list[ASTNode] | None:
+        """
+        Inline the function the statement calls, if it's the entire statement or its value
+        :return: the statements to put instead of the given one, None if it isn't inlined
+        """
+        statement_class = type(statement)
+        target = None
+        if statement_class is FunctionCallNode:
+            call = statement
+        elif (
+            statement_class is VariableDeclarationNode
+            and type(statement.value) is FunctionCallNode
+            and statement.operator == Assignment.VALUE_ASSIGNMENT
+        ):
+            call, target = statement.value, statement.name
+        elif (
+            statement_class is AssignmentNode
+            and type(statement.left) is IdentifierNode
+            and type(statement.right) is FunctionCallNode
+            and statement.operator == Assignment.VALUE_ASSIGNMENT
+        ):
+            call, target = statement.right, statement.left.name
+        elif statement_class is ReturnNode and type(statement.value) is FunctionCallNode:
+            call = statement.value
+        else:
+            return None
+
+        inlined = self._get_inlined(call, caller_names)
+        if inlined is None or not inlined.inlined_into_statements:
+            return None
+
+        # the value the function returns is assigned, returned or dropped, if it has no side effects
+        returned = inlined.returned
+        if target is not None or statement_class is ReturnNode:
+            if returned is None and target is not None:
+                return None
+        elif returned is not None and not is_side_effect_free(returned) and type(returned) is not FunctionCallNode:
+            return None
+
+        bound = self._bind_arguments(call, inlined, caller_names, in_expression=False)
+        if bound is None:
+            return None
+        replacements, declarations = bound
+
+        body = copy_tree(inlined.function_node.function_body)
+        if body.statements and type(body.statements[-1]) is ReturnNode:
+            returned = body.statements.pop().value
+
+        function_name = inlined.function_node.function_name
+        for variable in iter_variable_declarations(body):
+            local_name = mangle_inlined_variable(function_name, variable.name, self._inlinings)
+            replacements[variable.name] = local_name
+            variable.name = local_name
+
+        def replace(identifier: IdentifierNode) -> ASTNode:
+            return _replace_variable(identifier, replacements)
+
+        replace_variables(body, replace)
+        if type(returned) is IdentifierNode:
+            returned = replace(returned)
+        elif returned is not None:
+            replace_variables(returned, replace)
+
+        if target is not None:
+            body.statements.append(_copy_meta(call, AssignmentNode(
+                _copy_meta(call, IdentifierNode(target, *call.location)),
+                Assignment.VALUE_ASSIGNMENT,
+                returned,
+                *call.location
+            )))
+        elif statement_class is ReturnNode:
+            body.statements.append(_copy_meta(statement, ReturnNode(returned, *statement.location)))
+        elif type(returned) is FunctionCallNode:
+            body.statements.append(returned)
+
+        self._stats.inlined_statements += 1
+        scope = _copy_meta(call, ScopeNode(
+            declarations + body.statements,
+            declarations + body.local_variables,
+            *call.location
+        ))
+
+        if statement_class is VariableDeclarationNode:
+            # the variable is declared in the scope of the call, and initialized by the inlined body
+            statement.operator = None
+            statement.value = None
+            return [statement, scope]
+        return [scope]
+
+    def _get_inlined(self, call: FunctionCallNode, caller_names: set[str]) -> _InlinedFunction | None:
+        """
+        Get the function the call may be replaced with
+        """
+        if call.valid is not True or call.is_constructor or type(call.identifier) is not IdentifierNode:
+            return None
+        inlined = self._inlined.get(call.identifier.name)
+        if inlined is None or len(call.arguments) != len(inlined.function_node.parameters):
+            return None
+        # variables the function refers to must not be the local ones of the caller
+        if not inlined.free_names.isdisjoint(caller_names):
+            return None
+        return inlined
+
+    def _bind_arguments(
+        self,
+        call: FunctionCallNode,
+        inlined: _InlinedFunction,
+        caller_names: set[str],
+        in_expression: bool
+    ) -> tuple[dict[str, str | ASTNode], list[VariableDeclarationNode]] | None:
+        """
+        Bind the arguments of the call to the parameters of the inlined function:
+        parameters are replaced with the names of the variables, the expressions substituted,
+        or the names of the local variables initialized with the arguments, declared before the inlined body
+        :param in_expression: whether the function is inlined into the expression, so nothing can be declared
+        :return: replacements of the parameters by their names and the declarations,
+            None if the arguments can't be bound
+        """
+        self._inlinings += 1
+        function_node = inlined.function_node
+        passed_by_reference = get_passed_by_reference(call.arguments)
+
+        replacements = {}
+        declarations = []
+        for parameter, argument in zip(function_node.parameters, call.arguments):
+            name = parameter.name
+            parameter_type = parameter.type
+
+            if parameter_type.is_reference:
+                if (
+                    type(argument) is not TypeNode
+                    or not is_passed_by_reference(argument)
+                    or name in inlined.reassigned_names
+                ):
+                    return None
+                replacements[name] = argument.type.name
+                continue
+
+            unchanged = name not in inlined.changed_names
+            if unchanged and _is_literal_of_type(argument, parameter_type):
+                replacements[name] = argument
+                continue
+
+            if unchanged and _is_same_type(argument.expression_type, parameter_type):
+                if (
+                    type(argument) is IdentifierNode
+                    and argument.name not in passed_by_reference
+                    and (inlined.is_side_effect_free or argument.name in caller_names)
+                ):
+                    replacements[name] = argument.name
+                    continue
+
+                usages = inlined.usages[name]
+                if in_expression and (
+                    (usages == 1 and inlined.is_side_effect_free and is_side_effect_free(argument))
+                    or (usages == 0 and is_pure(argument))
+                ):
+                    replacements[name] = argument
+                    continue
+
+            if in_expression:
+                return None
+
+            local_name = mangle_inlined_variable(function_node.function_name, name, self._inlinings)
+            declaration = _copy_meta(argument, VariableDeclarationNode(
+                parameter_type,
+                local_name,
+                Assignment.VALUE_ASSIGNMENT,
+                argument,
+                *argument.location
+            ))
+            declarations.append(declaration)
+            replacements[name] = local_name
+
+        return replacements, declarations
+
+
+def _copy_meta(node: ASTNode, replacing: ASTNode) -> ASTNode:
+    """
+    Copy the validity and the span of the replaced node
+    """
+    replacing.valid = node.valid
+    replacing.span = node.span
+    return replacing
+
+
+def _get_inlined_function(function_node: FunctionDefNode) -> _InlinedFunction | None:
+    """
+    Check whether the function may be inlined, and how
+    """
+    return_type = function_node.return_type
+    body = function_node.function_body
+    if function_node.valid is not True or (return_type is not None and return_type.is_reference):
+        return None
+    if count_nodes(body) > _MAX_INLINED_SIZE:
+        return None
+
+    returns = []
+    for node in iter_tree_nodes(body):
+        node_class = type(node)
+        if node_class is ReturnNode:
+            returns.append(node)
+        # the ones outside loops set the error instead, see their translation
+        elif (node_class is BreakNode or node_class is ContinueNode) and not node.in_loop:
+            return None
+        elif node_class is ThisNode:
+            return None
+
+    last_return = body.statements[-1] if body.statements and type(body.statements[-1]) is ReturnNode else None
+    returned = last_return.value if last_return is not None else None
+    if returned is not None and not _is_same_type(returned.expression_type, return_type):
+        return None
+
+    # the ones returning elsewhere can't be inlined as scopes
+    inlined_into_statements = len(returns) == (1 if last_return is not None else 0)
+    inlined = _InlinedFunction(function_node, returned, inlined_into_statements)
+    if inlined.expression is None and not inlined_into_statements:
+        return None
+    return inlined
+
+
+def _is_same_type(type_node: TypeNode | None, other: TypeNode | None) -> bool:
+    """
+    Check whether the types are the same regardless of their modifiers, so no conversion is needed between them
+    """
+    if type_node is None or other is None:
+        return False
+    category, name, _, is_generic, arguments = type_node.canonical_key
+    other_category, other_name, _, other_is_generic, other_arguments = other.canonical_key
+    return (category, name, is_generic, arguments) == (other_category, other_name, other_is_generic, other_arguments)
+
+
+def _is_literal_of_type(argument: ASTNode, parameter_type: TypeNode) -> bool:
+    """
+    Check whether the argument is a literal of a single value, which needs no conversion to the parameter type
+    """
+    argument_class = type(argument)
+    if argument_class is IntegerLiteralNode:
+        return parameter_type.category == TypeCategory.PRIMITIVE and parameter_type.name in _INTEGER_TYPES
+    return (
+        issubclass(argument_class, LiteralNode)
+        and next(iter_child_nodes(argument), None) is None
+        and _is_same_type(argument.expression_type, parameter_type)
+    )
+
+
+def _get_changed_names(body: ScopeNode) -> set[str]:
+    """
+    Get the names of the variables the body may change: the ones it assigns (or the elements or fields of which
+    it assigns), calls the methods of or passes by reference
+    """
+    names = get_passed_by_reference([body])
+    for node in iter_tree_nodes(body):
+        node_class = type(node)
+        if node_class is AssignmentNode:
+            target = node.left
+        elif node_class is FunctionCallNode and type(node.identifier) is MemberOperatorNode:
+            target = node.identifier.left
+        else:
+            continue
+
+        while type(target) is IndexNode or type(target) is MemberOperatorNode:
+            target = target.variable if type(target) is IndexNode else target.left
+        if type(target) is IdentifierNode:
+            names.add(target.name)
+    return names
+
+
+def _replace_variable(identifier: IdentifierNode, replacements: dict[str, str | ASTNode]) -> ASTNode:
+    replacement = replacements.get(identifier.name)
+    if replacement is None:
+        return identifier
+    if type(replacement) is str:
+        identifier.name = replacement
+        return identifier
+    return copy_tree(replacement)
+
+
+def _get_caller_names(parameters: list, body: ScopeNode) -> set[str]:
+    return {parameter.name for parameter in parameters} | get_declared_names(body)
+
+
+def inline_functions(root: ProgramNode) -> InliningStats:
+    """
+    Inline the calls of the small functions of the type checked program, in place.
+    Should be run after the static methods and overloads are flattened, see mangle_static_functions
+    :param root: type checked program
+    :return: statistics of the inlined calls
+    """
+    stats = InliningStats()
+    inliner = _FunctionInliner(root.function_definitions, stats)
+
+    for function_node in inliner.order_callees_first():
+        body = function_node.function_body
+        inliner.inline_scope(body, _get_caller_names(function_node.parameters, body))
+        inliner.add_inlined(function_node)
+
+    for class_node in root.class_definitions:
+        for method_node in class_node.methods_defs:
+            body = method_node.function_body
+            if body is not None:
+                inliner.inline_scope(body, _get_caller_names(method_node.parameters, body))
+
+    # top-level variables are the global ones functions refer to, unlike the ones of the nested scopes
+    nested_names = set()
+    for statement in root.statements:
+        if type(statement) is not VariableDeclarationNode:
+            nested_names |= get_declared_names(statement)
+    root.statements = inliner.inline_statements(root.statements, nested_names)
+
+    return stats
@@ -1,13 +1,240 @@
-from ..abstract_syntax_tree import ProgramNode
+"""
+Monomorphization of generic classes.
 
+Every generic class is replaced by its instances, one per distinct list of type arguments it's used with:
+the instance is a copy of the class named after the mangled arguments (see mangle_class_instance),
+in which generic parameters are replaced by the arguments. Types of the generic classes in the rest
+of the program (and in the instances themselves, which may use other generic classes) are replaced
+by the types of their instances, so generic classes aren't referred anywhere afterwards.
 
-def instantiate_all_generics(root: ProgramNode):
+Instances are collected from the instantiations registered by the type checker, and from the types
+met while replacing, e.g. the ones instances of other generic classes use.
+"""
+from copy import deepcopy
 
-    cleaned_class_definitions = []
-    for class_defn in root.class_definitions:
-        if class_defn.generic_params:
-            for inst in class_defn._instantiations:
-                pass
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    ClassDefNode,
+    TypeNode,
+    TypeCategory,
+    IdentifierNode,
+    iter_child_nodes,
+    get_skipped_attributes,
+    is_node_class,
+)
+from .shared_type_mangler import mangle_class_instance
 
-def instantiate_generics():
-    pass
+
+# nesting of type arguments to give up at, as a generic class instantiated with its own arguments wrapped
+# into other generic (e.g. Node[T] having a field of type Node[Box[T]]) has infinitely many instances.
+# The type checker rejects such classes (see validate_generic_expansion), this only guards unchecked programs.
+# Arguments are replaced by the types of their instances before instantiating, so the nesting is counted
+# through the depths of the instances
+_MAX_ARGUMENTS_DEPTH = 32
+
+# meta info that refers to the types of the generic classes and is translated, so it's replaced as well
+_REPLACED_META_ATTRIBUTES = frozenset((
+    "associated_class",
+))
+
+
+class _GenericInstantiator:
+    def __init__(self, generic_classes: list[ClassDefNode]):
+        self._generic_classes = {class_node.name: class_node for class_node in generic_classes}
+
+        # instances by mangled names, and by names of their generic classes in order of instantiation
+        self._instances: dict[str, ClassDefNode] = {}
+        self._instances_by_key: dict[tuple, ClassDefNode] = {}
+        self.instances_by_class: dict[str, list[ClassDefNode]] = {name: [] for name in self._generic_classes}
+
+        # nesting of the arguments the instances were instantiated with, before they were replaced, by mangled names
+        self._depths: dict[str, int] = {}
+
+        # instances with types not replaced yet, with the arguments of generic parameters by their names
+        self._pending: list[tuple[ClassDefNode, dict[str, TypeNode]]] = []
+
+    def instantiate_registered(self, class_node: ClassDefNode) -> None:
+        """
+        Instantiate the generic class with all the concrete arguments the type checker registered
+        """
+        for arguments in class_node.instantiations:
+            if all(_is_concrete(argument) for argument in arguments):
+                self._get_instance(class_node, [self._replace_type(argument, {}) for argument in arguments])
+
+    def replace_types(self, root: ASTNode, substitution: dict[str, TypeNode]) -> None:
+        """
+        Replace the types in the tree with the instantiated ones, in place
+        :param root: root of the tree
+        :param substitution: arguments of generic parameters by their names
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            attributes = node.__dict__
+            skipped = get_skipped_attributes(type(node))
+            for name, value in attributes.items():
+                if name in skipped and name not in _REPLACED_META_ATTRIBUTES:
+                    continue
+
+                value_class = type(value)
+                if value_class is TypeNode:
+                    attributes[name] = self._replace_type(value, substitution)
+                elif value_class is list:
+                    for index, item in enumerate(value):
+                        item_class = type(item)
+                        if item_class is TypeNode:
+                            value[index] = self._replace_type(item, substitution)
+                        elif is_node_class(item_class):
+                            stack.append(item)
+                elif is_node_class(value_class):
+                    stack.append(value)
+
+    def replace_pending(self) -> None:
+        """
+        Replace the types in the instances, until there are no new instances
+        """
+        while self._pending:
+            instance, substitution = self._pending.pop()
+            self.replace_types(instance, substitution)
+
+    def _replace_type(self, type_node: TypeNode, substitution: dict[str, TypeNode]) -> TypeNode:
+        """
+        Get the type with generic parameters replaced by their arguments, and generic classes by their instances.
+        Types are never changed in place, as they are shared by the nodes of the generic classes and their copies
+        :return: the new type, or the given one if nothing is replaced
+        """
+        if type_node.represents_generic_param:
+            argument = substitution.get(type_node.name)
+            if argument is None:
+                return type_node
+            return _with_modifiers_of(argument.shallow_copy(), type_node)
+
+        if not type_node.arguments:
+            return type_node
+
+        arguments = [
+            self._replace_type(argument, substitution) if type(argument) is TypeNode else argument
+            for argument in type_node.arguments
+        ]
+
+        generic_class = self._generic_classes.get(type_node.name)
+        if type_node.category != TypeCategory.GENERIC_CLASS or generic_class is None:
+            if all(argument is original for argument, original in zip(arguments, type_node.arguments)):
+                return type_node
+            replaced = type_node.shallow_copy()
+            replaced.arguments = arguments
+            return replaced
+
+        # types of invalid expressions, e.g. the ones with arguments left generic
+        if not all(_is_concrete(argument) for argument in arguments):
+            return type_node
+
+        # the same instantiation is written in many places, so its instance is looked up by the cheaper key first
+        key = (generic_class.name, tuple(argument.canonical_key for argument in arguments))
+        instance = self._instances_by_key.get(key)
+        if instance is None:
+            instance = self._instances_by_key[key] = self._get_instance(generic_class, arguments)
+
+        replaced = TypeNode(TypeCategory.CLASS, IdentifierNode(instance.name, *type_node.location), None, *type_node.location)
+        replaced.represents_generic_param = False
+        replaced.set_class(cls=instance)
+        replaced.valid = type_node.valid
+        return _with_modifiers_of(replaced, type_node)
+
+    def _get_instance(self, class_node: ClassDefNode, arguments: list[TypeNode]) -> ClassDefNode:
+        name = mangle_class_instance(class_node.name, arguments)
+        instance = self._instances.get(name)
+        if instance is not None:
+            return instance
+
+        depth = 1 + max(map(self._get_depth, arguments))
+        if depth > _MAX_ARGUMENTS_DEPTH:
+            raise ValueError(f"Class {class_node.name} is instantiated recursively with infinitely nested arguments")
+
+        substitution = {parameter.name: argument for parameter, argument in zip(class_node.generic_params, arguments)}
+        instance = _copy_class(class_node)
+        instance.set_instance_name(name)
+
+        self._instances[name] = instance
+        self._depths[name] = depth
+        self.instances_by_class[class_node.name].append(instance)
+        self._pending.append((instance, substitution))
+        return instance
+
+    def _get_depth(self, type_node: TypeNode) -> int:
+        """
+        Get the nesting of the type arguments, counting the types of the instances as their arguments
+        """
+        depth = self._depths.get(type_node.name, 1) if type_node.category == TypeCategory.CLASS else 1
+        return max(depth, 1 + max(map(self._get_depth, type_node.arguments or ()), default=0))
+
+
+def _copy_class(class_node: ClassDefNode) -> ClassDefNode:
+    """
+    Copy the class with all its child nodes, but not the nodes outside of the class they refer to
+    (e.g. types of expressions). References inside the class (e.g. the class of its own type Node[T] in Node[T])
+    refer to the copies
+    """
+    nodes = []
+    copied_ids = set()
+    stack = [class_node]
+    while stack:
+        node = stack.pop()
+        if id(node) in copied_ids:
+            continue
+        nodes.append(node)
+        copied_ids.add(id(node))
+        stack.extend(iter_child_nodes(node))
+
+    memo = {}
+    for node in nodes:
+        attributes = node.__dict__
+        for name in get_skipped_attributes(type(node)):
+            value = attributes.get(name)
+            if isinstance(value, (ASTNode, list, dict)) and id(value) not in copied_ids:
+                memo[id(value)] = value
+    return deepcopy(class_node, memo)
+
+
+def _with_modifiers_of(type_node: TypeNode, modified: TypeNode) -> TypeNode:
+    """
+    Add the modifiers and the location of the replaced type (e.g. const T) to the replacing one
+    """
+    type_node.add_modifiers_of(modified)
+    type_node.line, type_node.position = modified.location
+    return type_node
+
+
+def _is_concrete(type_node: TypeNode) -> bool:
+    if type_node.represents_generic_param:
+        return False
+    return all(_is_concrete(argument) for argument in type_node.arguments or ())
+
+
+def instantiate_all_generics(root: ProgramNode) -> None:
+    """
+    Replace the generic classes of the type checked program with their instances, in place
+    :param root: type checked program
+    """
+    generic_classes = [class_node for class_node in root.class_definitions if class_node.generic_params]
+    if not generic_classes:
+        return
+
+    instantiator = _GenericInstantiator(generic_classes)
+    for class_node in generic_classes:
+        instantiator.instantiate_registered(class_node)
+
+    # generic classes themselves are neither replaced nor translated
+    class_definitions = root.class_definitions
+    root.class_definitions = [class_node for class_node in class_definitions if not class_node.generic_params]
+    instantiator.replace_types(root, {})
+    instantiator.replace_pending()
+
+    # instances take the places of their generic classes
+    root.class_definitions = []
+    for class_node in class_definitions:
+        if class_node.generic_params:
+            root.class_definitions.extend(instantiator.instances_by_class[class_node.name])
+        else:
+            root.class_definitions.append(class_node)
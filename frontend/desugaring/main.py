@@ -1,12 +1,48 @@
+"""
+Desugaring of the type checked program into the translatable one: generic classes are instantiated
+and static members are flattened into global functions and variables.
+Optimized program also has its dead code removed, small functions inlined, loop invariants hoisted
+and common subexpressions computed once.
+"""
 from ..abstract_syntax_tree import ProgramNode
-from .cleaning import clean_up_unused
+from .instantiate_generic_class import instantiate_all_generics
+from .dead_code_elimination import eliminate_dead_code, DeadCodeStats
+from .mangle_static_functions import mangle_static_functions
+from .inline_functions import inline_functions, InliningStats
+from .hoist_loop_invariants import hoist_loop_invariants, HoistingStats
+from .common_subexpression_elimination import eliminate_common_subexpressions, CommonSubexpressionStats
 
 
+class DesugaringStats:
+    """
+    Statistics of the optimizations made while desugaring, None for the ones that weren't made
+    """
 
-def desugar_ast_tree(typed_ast: ProgramNode) -> None:
-    p = typed_ast
-    clean_up_unused(p)
-    # p = mangle_templates(p)
-    # p = mangle_methods(p)
-    # p = mangle_functions(p)
-    # p = mangle_classes_into_structs(p)
+    def __init__(self):
+        self.dead_code: DeadCodeStats | None = None
+        self.inlining: InliningStats | None = None
+        self.hoisting: HoistingStats | None = None
+        self.common_subexpressions: CommonSubexpressionStats | None = None
+
+
+def desugar_ast_tree(typed_ast: ProgramNode, optimize: bool = False) -> DesugaringStats:
+    """
+    Desugar the type checked program, in place
+    :param typed_ast: type checked program
+    :param optimize: (optional) whether to optimize the program as well
+    :return: statistics of the optimizations
+    """
+    stats = DesugaringStats()
+    instantiate_all_generics(typed_ast)
+    if optimize:
+        # unused instances are removed before their static members are flattened
+        stats.dead_code = eliminate_dead_code(typed_ast)
+    mangle_static_functions(typed_ast)
+
+    if optimize:
+        stats.inlining = inline_functions(typed_ast)
+        # functions inlined at all their call sites aren't called anymore
+        eliminate_dead_code(typed_ast, stats.dead_code)
+        stats.hoisting = hoist_loop_invariants(typed_ast)
+        stats.common_subexpressions = eliminate_common_subexpressions(typed_ast)
+    return stats
@@ -1,5 +1,184 @@
-from ..abstract_syntax_tree import ProgramNode
+"""
+Flattening of static class members and overloads into global functions and variables.
 
+Static methods become global functions and static fields become global variables (declared before
+the top-level statements), named after their classes (see mangle_class_member). Every function,
+including the operator overloads and the static methods, gets the final name of its overload (see mangle_overload),
+and the call sites the type checker resolved call it by that name directly:
+static method calls and overloaded operators are replaced with plain function calls,
+and accesses of static fields with the names of their global variables.
+So the backend resolves all of them by name, without looking up the classes at runtime.
+"""
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    ClassDefNode,
+    ClassMethodDeclarationNode,
+    ClassFieldDeclarationNode,
+    FunctionDefNode,
+    FunctionCallNode,
+    MemberOperatorNode,
+    IndexNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    IdentifierNode,
+    VariableDeclarationNode,
+    get_skipped_attributes,
+    is_node_class,
+)
+from .._syntax.operators import OperatorMethods
+from .shared_type_mangler import mangle_class_member, mangle_overload
 
-def mangle_static_functions(root: ProgramNode):
-    pass
+
+class _CallSiteMangler:
+    def __init__(self):
+        # final names of the global functions by their names and overload numbers, and of the static methods
+        # by the names of their classes, their names and overload numbers
+        self.functions: dict[tuple[str, int], str] = {}
+        self.static_methods: dict[tuple[str, str, int], str] = {}
+
+    def mangle(self, root: ASTNode) -> None:
+        """
+        Replace the resolved call sites in the tree with the calls of the global functions, in place
+        """
+        stack = [root]
+        while stack:
+            node = stack.pop()
+            attributes = node.__dict__
+            skipped = get_skipped_attributes(type(node))
+            for name, value in attributes.items():
+                if name in skipped:
+                    continue
+
+                value_class = type(value)
+                if value_class is list:
+                    for index, item in enumerate(value):
+                        if is_node_class(type(item)):
+                            value[index] = item = self._mangle_node(item)
+                            stack.append(item)
+                elif is_node_class(value_class):
+                    attributes[name] = value = self._mangle_node(value)
+                    stack.append(value)
+
+    def _mangle_node(self, node: ASTNode) -> ASTNode:
+        """
+        Get the node to put instead of the given one, or the node itself if it isn't a resolved call site
+        """
+        node_class = type(node)
+        if node.valid is not True:
+            return node
+
+        if node_class is FunctionCallNode:
+            identifier = node.identifier
+            identifier_class = type(identifier)
+            if identifier_class is IdentifierNode:
+                function_name = self.functions.get((identifier.name, node.overload_number))
+                if function_name is not None and function_name != identifier.name:
+                    return _make_call(node, function_name, node.arguments)
+            elif identifier_class is MemberOperatorNode and identifier.is_static:
+                key = (identifier.associated_class.name, identifier.right.name, node.overload_number)
+                function_name = self.static_methods.get(key)
+                if function_name is not None:
+                    return _make_call(node, function_name, node.arguments)
+
+        elif node_class is MemberOperatorNode:
+            if node.is_static:
+                replaced = IdentifierNode(mangle_class_member(node.associated_class.name, node.right.name), *node.location)
+                return _copy_meta(node, replaced)
+
+        elif node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+            if node.is_overload and node.folded_literal is None:
+                operands = [node.left, node.right] if node_class is BinaryOperatorABCNode else [node.expression]
+                operator_name = f"$operator_{OperatorMethods.translate(node.operator, len(operands))}"
+                function_name = self.functions.get((operator_name, node.overload_number))
+                if function_name is not None:
+                    return _make_call(node, function_name, operands)
+
+        elif node_class is IndexNode:
+            if node.is_overload:
+                function_name = self.functions.get(("$operator_index", node.overload_number))
+                if function_name is not None:
+                    return _make_call(node, function_name, [node.variable, *node.arguments])
+
+        return node
+
+
+def _copy_meta(node: ASTNode, replaced: ASTNode) -> ASTNode:
+    """
+    Copy the validity, the type and the span of the replaced node
+    """
+    replaced.valid = node.valid
+    replaced.expression_type = node.expression_type
+    replaced.span = node.span
+    return replaced
+
+
+def _make_call(node: ASTNode, function_name: str, arguments: list[ASTNode]) -> FunctionCallNode:
+    call = FunctionCallNode(IdentifierNode(function_name, *node.location), arguments, *node.location)
+    return _copy_meta(node, call)
+
+
+def _make_function(class_node: ClassDefNode, method_node: ClassMethodDeclarationNode) -> FunctionDefNode:
+    function_name = mangle_overload(mangle_class_member(class_node.name, method_node.function_name), method_node.overload_number)
+    function_node = FunctionDefNode(
+        method_node.return_type,
+        function_name,
+        method_node.parameters,
+        method_node.function_body,
+        *method_node.location
+    )
+    function_node.valid = method_node.valid
+    function_node.span = method_node.span
+    function_node._usages = method_node.usages
+    return function_node
+
+
+def _make_global_variable(class_node: ClassDefNode, field_node: ClassFieldDeclarationNode) -> VariableDeclarationNode:
+    variable = VariableDeclarationNode(
+        field_node.type,
+        mangle_class_member(class_node.name, field_node.name),
+        None,
+        None,
+        *field_node.location
+    )
+    variable.valid = field_node.valid
+    variable.span = field_node.span
+    return variable
+
+
+def mangle_static_functions(root: ProgramNode) -> None:
+    """
+    Turn static methods and static fields of the type checked program into global functions and variables,
+    and rename the overloads of functions to their final names, in place. Should be run after the generic classes
+    are instantiated, as static members of the instances are different ones
+    :param root: type checked program
+    """
+    mangler = _CallSiteMangler()
+
+    for function_node in root.function_definitions:
+        function_name = mangle_overload(function_node.function_name, function_node.overload_number)
+        mangler.functions[(function_node.function_name, function_node.overload_number)] = function_name
+
+    static_functions = []
+    static_variables = []
+    for class_node in root.class_definitions:
+        for method_node in class_node.static_methods_defs:
+            function_node = _make_function(class_node, method_node)
+            key = (class_node.name, method_node.function_name, method_node.overload_number)
+            mangler.static_methods[key] = function_node.function_name
+            static_functions.append(function_node)
+        static_variables.extend(_make_global_variable(class_node, field) for field in class_node.static_fields_defs)
+
+        class_node.static_methods_defs = []
+        class_node.static_fields_defs = []
+
+    # static methods are checked as a part of their classes, so they come before the other functions
+    root.function_definitions = static_functions + root.function_definitions
+    root.statements = static_variables + root.statements
+    mangler.mangle(root)
+
+    # names are final now, so the overload numbers aren't appended to them by the translation
+    for function_node in root.function_definitions:
+        function_node.function_name = mangle_overload(function_node.function_name, function_node.overload_number)
+        function_node.overload_number = 0
+        function_node.has_overloads = False
@@ -0,0 +1,465 @@
+"""
+Walking and analysis of the type checked trees shared by the optimizations in desugaring stage.
+"""
+from collections import Counter
+
+from ..abstract_syntax_tree import (
+    ASTNode,
+    FunctionDefNode,
+    FunctionCallNode,
+    AssignmentNode,
+    MemberOperatorNode,
+    IndexNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    OperatorCategory,
+    IdentifierNode,
+    LiteralNode,
+    ThisNode,
+    ScopeNode,
+    TypeNode,
+    VariableDeclarationNode,
+    is_node_class,
+    get_skipped_attributes,
+    iter_child_nodes,
+)
+from .._syntax.operators import Comparison, Operator
+
+
+# operators that may fail at runtime, so expressions using them aren't pure
+_FAILING_OPERATORS = frozenset((
+    Operator.DIVIDE,
+    Operator.FLOOR_DIVIDE,
+    Operator.MODULO,
+))
+
+# categories of operators that read only their operands and have no side effects, if they aren't overloaded
+READING_OPERATOR_CATEGORIES = frozenset((
+    OperatorCategory.Arithmetic,
+    OperatorCategory.Logical,
+    OperatorCategory.Comparison,
+))
+
+# operators evaluating the right operand only depending on the left one
+SHORT_CIRCUIT_OPERATORS = frozenset((
+    Operator.AND,
+    Operator.OR,
+))
+
+def count_nodes(root: ASTNode) -> int:
+    """
+    Count the distinct nodes of the tree, e.g. declarations once, though they are local variables of their scopes
+    """
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) not in visited:
+            visited.add(id(node))
+            stack.extend(iter_child_nodes(node))
+    return len(visited)
+
+
+def copy_tree(root: ASTNode) -> ASTNode:
+    """
+    Copy the node with all its child nodes, but not the nodes they refer to (e.g. types of expressions).
+    Child nodes referred more than once (e.g. declarations, which are local variables of their scopes as well)
+    are copied once
+    """
+    # every node is copied shallowly first, and then its child nodes are replaced with their copies
+    copies: dict[int, ASTNode] = {}
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in copies:
+            continue
+        node_copy = copies[id(node)] = object.__new__(type(node))
+        node_copy.__dict__.update(node.__dict__)
+        stack.extend(iter_child_nodes(node))
+
+    for node_copy in copies.values():
+        attributes = node_copy.__dict__
+        for name in attributes.keys() - get_skipped_attributes(type(node_copy)):
+            value = attributes[name]
+            if type(value) is list:
+                attributes[name] = [copies.get(id(item), item) for item in value]
+            else:
+                attributes[name] = copies.get(id(value), value)
+    return copies[id(root)]
+
+
+def iter_tree_nodes(root: ASTNode):
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        yield node
+        stack.extend(iter_child_nodes(node))
+
+
+def iter_variable_declarations(root: ASTNode):
+    # declarations are both the statements and the local variables of their scopes
+    visited = set()
+    for node in iter_tree_nodes(root):
+        if type(node) is VariableDeclarationNode and id(node) not in visited:
+            visited.add(id(node))
+            yield node
+
+
+def get_declared_names(root: ASTNode) -> set[str]:
+    return {declaration.name for declaration in iter_variable_declarations(root)}
+
+
+def is_passed_by_reference(argument: TypeNode) -> bool:
+    """
+    Check whether the argument is a variable passed by reference (reference x is parsed as a type)
+    """
+    return argument.is_reference and type(argument.type) is IdentifierNode and not argument.arguments
+
+
+def get_passed_by_reference(arguments: list[ASTNode]) -> set[str]:
+    """
+    Get the names of the variables passed by reference in the arguments, including the nested calls
+    """
+    names = set()
+    stack = list(arguments)
+    while stack:
+        node = stack.pop()
+        if type(node) is TypeNode:
+            if is_passed_by_reference(node):
+                names.add(node.type.name)
+            continue
+        stack.extend(iter_child_nodes(node))
+    return names
+
+
+def replace_variables(root: ASTNode, replace) -> None:
+    """
+    Replace the identifiers referring to the variables in the tree, in place: not the names of the called functions,
+    members or types, except the variables passed by reference
+    :param root: root of the tree, not replaced itself
+    :param replace: function getting the node to put instead of the identifier
+    """
+    # declarations are both the statements and the local variables of their scopes, so they are visited once
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+
+        node_class = type(node)
+        attributes = node.__dict__
+        for name, value in attributes.items():
+            if name in get_skipped_attributes(node_class):
+                continue
+            if node_class is MemberOperatorNode and name == "right":
+                continue
+
+            value_class = type(value)
+            if value_class is list:
+                for index, item in enumerate(value):
+                    item_class = type(item)
+                    if item_class is IdentifierNode:
+                        value[index] = replace(item)
+                    elif item_class is TypeNode:
+                        if node_class is FunctionCallNode and is_passed_by_reference(item):
+                            item.type = replace(item.type)
+                    elif is_node_class(item_class):
+                        stack.append(item)
+            elif value_class is IdentifierNode:
+                if not (node_class is FunctionCallNode and name == "identifier"):
+                    attributes[name] = replace(value)
+            elif value_class is not TypeNode and is_node_class(value_class):
+                stack.append(value)
+
+
+def count_variable_usages(root: ASTNode) -> Counter:
+    usages = Counter()
+
+    def count(identifier: IdentifierNode) -> IdentifierNode:
+        usages[identifier.name] += 1
+        return identifier
+
+    replace_variables(root, count)
+    return usages
+
+
+
+
+def is_pure(expression: ASTNode | None) -> bool:
+    """
+    Check whether the expression evaluates without side effects and never fails
+    """
+    if expression is None:
+        return True
+
+    expression_class = type(expression)
+    if expression_class is BinaryOperatorABCNode or expression_class is UnaryOperatorABCNode:
+        if expression.folded_literal is not None:
+            return True
+        if expression.is_overload or expression.category not in READING_OPERATOR_CATEGORIES:
+            return False
+        if expression_class is BinaryOperatorABCNode:
+            return (
+                expression.operator not in _FAILING_OPERATORS
+                and is_pure(expression.left)
+                and is_pure(expression.right)
+            )
+        return is_pure(expression.expression)
+
+    if expression_class is IdentifierNode or expression_class is ThisNode:
+        return True
+
+    # literals of collections are pure if their elements are
+    if issubclass(expression_class, LiteralNode):
+        return all(is_pure(child) for child in iter_child_nodes(expression))
+
+    return False
+
+
+def is_side_effect_free(expression: ASTNode | None) -> bool:
+    """
+    Check whether the expression evaluates without side effects, though it may fail
+    (e.g. divides by zero, indexes out of range or accesses a field of null)
+    """
+    if expression is None:
+        return True
+
+    expression_class = type(expression)
+    if expression_class is BinaryOperatorABCNode or expression_class is UnaryOperatorABCNode:
+        if expression.folded_literal is not None:
+            return True
+        if expression.is_overload or expression.category not in READING_OPERATOR_CATEGORIES:
+            return False
+        if expression_class is BinaryOperatorABCNode:
+            return is_side_effect_free(expression.left) and is_side_effect_free(expression.right)
+        return is_side_effect_free(expression.expression)
+
+    if expression_class is IndexNode:
+        return (
+            not expression.is_overload
+            and is_side_effect_free(expression.variable)
+            and all(is_side_effect_free(argument) for argument in expression.arguments)
+        )
+
+    # fields, as methods are only the identifiers of the calls
+    if expression_class is MemberOperatorNode:
+        return is_side_effect_free(expression.left)
+
+    if expression_class is IdentifierNode or expression_class is ThisNode:
+        return True
+
+    if issubclass(expression_class, LiteralNode):
+        return all(is_side_effect_free(child) for child in iter_child_nodes(expression))
+
+    return False
+
+
+class FunctionVariables:
+    """
+    Variables visible in the body of the function, or in the top-level statements
+    """
+
+    def __init__(self, local_names: set[str] | None, global_names: set[str], reference_names: set[str]):
+        # local variables and parameters, None for the top-level statements, where the global ones are declared
+        self.local_names = local_names
+        self.global_names = global_names
+        self.reference_names = reference_names
+
+    def is_global(self, name: str) -> bool:
+        if self.local_names is None:
+            return name in self.global_names
+        return name not in self.local_names
+
+
+def get_variable_type(expression_type: TypeNode | None) -> TypeNode | None:
+    """
+    Get the type of the variable holding the value of the expression of the given type,
+    None if there is no such type
+    """
+    if type(expression_type) is not TypeNode or expression_type.is_literal:
+        return None
+    if not expression_type.is_constant and not expression_type.is_reference:
+        return expression_type
+
+    variable_type = expression_type.shallow_copy()
+    if variable_type.is_constant:
+        variable_type.unset_constant()
+    if variable_type.is_reference:
+        variable_type.unset_reference()
+    return variable_type
+
+
+def get_read_only_callee(call: FunctionCallNode, read_only_functions: dict[str, bool]) -> bool | None:
+    """
+    Check whether the call is a call of the read-only function
+    :return: whether the function reads fields or elements, None if it isn't read-only
+    """
+    if call.valid is not True or call.is_constructor or type(call.identifier) is not IdentifierNode:
+        return None
+    return read_only_functions.get(call.identifier.name)
+
+
+class ExpressionReads:
+    """
+    What the expression consisting of reads only reads, and how many evaluations it consists of
+    """
+
+    def __init__(self):
+        self.names: set[str] = set()
+        self.fields: set[str] = set()
+        self.reads_elements = False
+        # membership of the elements of the collections, and calls of the functions reading fields or elements
+        self.reads_memory = False
+
+        self.operators = 0
+        # fields and elements
+        self.accesses = 0
+        self.calls = 0
+
+    def reads_globals(self, variables: FunctionVariables) -> bool:
+        return any(variables.is_global(name) or name in variables.reference_names for name in self.names)
+
+    def add(self, node: ASTNode, read_only_functions: dict[str, bool]) -> bool:
+        """
+        Add what the node reads
+        :param read_only_functions: read-only functions by their names, whether they read fields or elements
+        :return: whether the node consists of reads only
+        """
+        node_class = type(node)
+        if node_class is IdentifierNode:
+            self.names.add(node.name)
+            return True
+
+        if node_class is ThisNode:
+            return True
+
+        if node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+            if node.folded_literal is not None:
+                return True
+            if node.is_overload or node.category not in READING_OPERATOR_CATEGORIES:
+                return False
+            if node.operator == Comparison.MEMBERSHIP_OPERATOR:
+                self.reads_memory = True
+            self.operators += 1
+            if node_class is BinaryOperatorABCNode:
+                return self.add(node.left, read_only_functions) and self.add(node.right, read_only_functions)
+            return self.add(node.expression, read_only_functions)
+
+        if node_class is MemberOperatorNode:
+            if type(node.right) is not IdentifierNode:
+                return False
+            self.fields.add(node.right.name)
+            self.accesses += 1
+            return self.add(node.left, read_only_functions)
+
+        if node_class is IndexNode:
+            if node.is_overload:
+                return False
+            self.reads_elements = True
+            self.accesses += 1
+            return self.add(node.variable, read_only_functions) and all(
+                self.add(argument, read_only_functions) for argument in node.arguments
+            )
+
+        if node_class is FunctionCallNode:
+            reads_memory = get_read_only_callee(node, read_only_functions)
+            if reads_memory is None:
+                return False
+            self.reads_memory = self.reads_memory or reads_memory
+            self.calls += 1
+            return all(self.add(argument, read_only_functions) for argument in node.arguments)
+
+        # literals of collections create new ones every time
+        return issubclass(node_class, LiteralNode) and next(iter_child_nodes(node), None) is None
+
+
+def get_expression_reads(expression: ASTNode, read_only_functions: dict[str, bool]) -> ExpressionReads | None:
+    """
+    Get what the expression reads: variables, fields, elements and read-only functions
+    :param read_only_functions: read-only functions by their names, whether they read fields or elements
+    :return: the reads, None if the expression consists of anything else (e.g. calls of other functions)
+    """
+    reads = ExpressionReads()
+    if not reads.add(expression, read_only_functions):
+        return None
+    return reads
+
+
+def get_read_only_functions(function_definitions: list[FunctionDefNode]) -> dict[str, bool]:
+    """
+    Find the functions that change nothing but their own local variables
+    :return: whether the read-only functions read fields or elements, by the names of the functions
+    """
+    read_only_functions = {}
+    callees: dict[str, set[str]] = {}
+    for function_node in function_definitions:
+        return_type = function_node.return_type
+        if (
+            function_node.valid is not True
+            or (return_type is not None and return_type.is_reference)
+            or any(parameter.type.is_reference for parameter in function_node.parameters)
+        ):
+            continue
+
+        body = function_node.function_body
+        local_names = {parameter.name for parameter in function_node.parameters} | get_declared_names(body)
+        # global variables may be changed by anything, so the functions reading them aren't considered at all
+        if not local_names.issuperset(count_variable_usages(body)):
+            continue
+
+        reads_memory = False
+        called_names = set()
+        for node in iter_tree_nodes(body):
+            node_class = type(node)
+            if node_class is AssignmentNode:
+                if type(node.left) is not IdentifierNode:
+                    break
+            elif node_class is FunctionCallNode:
+                if node.is_constructor or type(node.identifier) is not IdentifierNode:
+                    break
+                called_names.add(node.identifier.name)
+            elif node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+                if node.folded_literal is None and (
+                    node.is_overload or node.category not in READING_OPERATOR_CATEGORIES
+                ):
+                    break
+                if node.operator == Comparison.MEMBERSHIP_OPERATOR:
+                    reads_memory = True
+            elif node_class is IndexNode:
+                if node.is_overload:
+                    break
+                reads_memory = True
+            elif node_class is MemberOperatorNode:
+                reads_memory = True
+            elif node_class is ThisNode:
+                break
+        else:
+            read_only_functions[function_node.function_name] = reads_memory
+            callees[function_node.function_name] = called_names
+
+    # the functions calling the ones that aren't read-only aren't either, and so on
+    changed = True
+    while changed:
+        changed = False
+        for function_name, called_names in callees.items():
+            if function_name not in read_only_functions:
+                continue
+            if not called_names.issubset(read_only_functions):
+                del read_only_functions[function_name]
+                changed = True
+            elif not read_only_functions[function_name]:
+                # functions calling the ones reading fields or elements read them too
+                if any(read_only_functions[called_name] for called_name in called_names):
+                    read_only_functions[function_name] = True
+                    changed = True
+    return read_only_functions
+
+
+def get_function_variables(parameters: list, body: ScopeNode) -> FunctionVariables:
+    return FunctionVariables(
+        {parameter.name for parameter in parameters} | get_declared_names(body),
+        set(),
+        {parameter.name for parameter in parameters if parameter.type.is_reference}
+    )
@@ -1,19 +1,75 @@
-from ..abstract_syntax_tree import TypeNode
+from ..abstract_syntax_tree import TypeNode, TypeCategory
 
 
-def mangle_typenode(type_node: TypeNode) -> None:
+def mangle_typenode(type_node: TypeNode) -> str:
     """
-    Standardized type node name mangler for every case in desugaring stage
+    Standardized type node name mangler for every case in desugaring stage.
+    Mangled names of different types are different, and they consist of letters, digits and underscores only:
+    modifier flags, kind of the type, length-prefixed name and mangled arguments between I and E, if any
+    (e.g. mopP7integer for integer, mopC3BoxImopP7integerE for Box[integer])
     """
-    l = []
-    l += 'c' if type_node.is_constant else 'm'
-    l += 'r' if type_node.is_reference else 'o'
-    l += 'n' if type_node.is_nullable else 'p'
-    l += type_node.type.name
+    if type_node.represents_generic_param:
+        raise ValueError(f"Generic parameter {type_node.name} can't be mangled, it must be instantiated first")
+
+    name = type_node.name.replace(' ', '_')
+    parts = [
+        'c' if type_node.is_constant else 'm',
+        'r' if type_node.is_reference else 'o',
+        'n' if type_node.is_nullable else 'p',
+        'C' if type_node.category in (TypeCategory.CLASS, TypeCategory.GENERIC_CLASS) else 'P',
+        str(len(name)),
+        name,
+    ]
     if type_node.arguments:
-        l += '__'.join([mangle_typenode(t) for t in type_node.arguments])
+        parts.append('I')
+        parts.extend(mangle_typenode(argument) for argument in type_node.arguments)
+        parts.append('E')
 
-    if type_node.represents_generic_param:
-        raise ValueError("It shouldn't be herem the generic type repr...")
-    
-    return '_'.join(l)
+    return ''.join(parts)
+
+
+def mangle_class_instance(class_name: str, arguments: list[TypeNode]) -> str:
+    """
+    Name of the instance of the generic class with the given type arguments
+    """
+    return class_name + '__' + ''.join(mangle_typenode(argument) for argument in arguments)
+
+
+def mangle_class_member(class_name: str, member_name: str) -> str:
+    """
+    Name of the static member of the class turned into the global one, the same as methods are translated with
+    (e.g. Math$sqrt). Names of the program can't contain $, so they never clash with it
+    """
+    return class_name + '$' + member_name
+
+
+def mangle_overload(function_name: str, overload_number: int) -> str:
+    """
+    Name of the overload of the function, method or operator with the given number, as they are translated
+    (e.g. add$_1 for the second overload of add, the first one is named add)
+    """
+    return function_name if overload_number == 0 else f'{function_name}$_{overload_number}'
+
+
+def mangle_inlined_variable(function_name: str, variable_name: str, inlining_number: int) -> str:
+    """
+    Name of the parameter or local variable of the function inlined into another one, unique for every inlining
+    (e.g. swap$buffer$inline_3), so the variables of the inlined bodies never clash with the ones of the callers
+    """
+    return f'{function_name}${variable_name}$inline_{inlining_number}'
+
+
+def mangle_loop_invariant(hoisting_number: int) -> str:
+    """
+    Name of the local variable the loop invariant expression is hoisted into, unique for every hoisting
+    (e.g. invariant$2), so it never clashes with the variables of the program
+    """
+    return f'invariant${hoisting_number}'
+
+
+def mangle_common_subexpression(extraction_number: int) -> str:
+    """
+    Name of the local variable the repeated expression is evaluated into, unique for every extraction
+    (e.g. common$4), so it never clashes with the variables of the program
+    """
+    return f'common${extraction_number}'
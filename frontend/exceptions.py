@@ -51,3 +51,16 @@ class SemanticException(Exception):
 
     def __str__(self) -> str:
         return f"Occurred parsing error at line {self.line}, position {self.position}: \n{self.message}"
+
+
+class TooManyErrorsException(Exception):
+    """
+    This exception is for use to be thrown in the type-checking process
+    when the number of collected errors reaches the configured limit, to stop checking early.
+    It holds the limit of errors.
+    """
+    def __init__(self, max_errors: int):
+        self.max_errors = max_errors
+
+    def __str__(self) -> str:
+        return f"Too many errors ({self.max_errors}), type checking is stopped"
@@ -18,6 +18,8 @@ class TokenScannerIterator:
         self._current_token_relative_position = 0
         self._next_token_relative_position = 0
 
+        self._current_token_start = 0
+
         self.lexer: Lexer = lexer
         self.input_string = input_string
 
@@ -40,7 +42,14 @@ class TokenScannerIterator:
         while token_type == TokenType.COMMENT:
             token_type, token_value = self.scan_next_token()
 
-        return Token(token_type, token_value, self.line_number, self._current_token_relative_position)
+        return Token(
+            token_type,
+            token_value,
+            self.line_number,
+            self._current_token_relative_position,
+            self._current_token_start,
+            self.position,
+        )
 
     def error(self):
         err = UnknownTokenError(self.input_string[self.position], self.line_number, self._current_token_relative_position)
@@ -71,6 +80,7 @@ class TokenScannerIterator:
         if match is None:
             self.error()
 
+        self._current_token_start = match.start()
         self._next_token_relative_position += (match.end() - self.position)
         self.position = match.end()
 
@@ -11,7 +11,8 @@ except ImportError:
 
 from .exceptions import ParsingException
 from .tokens import TokenType, Token
-from typing import Iterator, KeysView, ValuesView, NoReturn, Literal
+from functools import wraps
+from typing import Callable, Iterator, KeysView, ValuesView, NoReturn, Literal
 
 
 # TODO: inherited generics should equal base
@@ -62,6 +63,45 @@ class ContextFlag(IntFlag):
         return current_context | flag
 
 
+def _spanned(parse_method: Callable) -> Callable:
+    """
+    Decorator for parser methods, that sets the span of returned node
+    from the first token it consumed up to the last one, unless the node already has a span
+    (nodes built by the operator parsers and parenthesized expressions get it on creation)
+    """
+    @wraps(parse_method)
+    def wrapper(self: "Parser", *args, **kwargs):
+        first_token = self._curr_token
+        node = parse_method(self, *args, **kwargs)
+        if getattr(node, "span", True) is None and isinstance(node, AST.ASTNode):
+            first_start, first_end = first_token.start_offset, first_token.end_offset
+            last_token = self._prev_token
+            if first_start is not None and last_token is not None and last_token.end_offset is not None:
+                node.span = (first_start, max(first_end, last_token.end_offset))
+        return node
+    return wrapper
+
+
+def _joined_span(*parts: AST.ASTNode | Token) -> tuple[int, int] | None:
+    """
+    Get the smallest span covering the spans of all the given nodes or tokens
+    (parts without span are skipped), or None if none of them has a span
+    """
+    spans = [part.span for part in parts if part.span is not None]
+    if not spans:
+        return None
+    return min(span[0] for span in spans), max(span[1] for span in spans)
+
+
+def _with_span(node: AST.ASTNode, *parts: AST.ASTNode | Token) -> AST.ASTNode:
+    """
+    Set the span of the built node to cover all the given nodes or tokens
+    :return: the same node
+    """
+    node.span = _joined_span(*parts)
+    return node
+
+
 class Parser(object):
     """
     Class for generating an AST tree from a stream of lexical tokens
@@ -232,8 +272,12 @@ class Parser(object):
                 function_definitions.append(statement)
             else:
                 statements.append(statement)
-        return AST.ProgramNode(class_definitions, function_definitions, statements)
 
+        program = AST.ProgramNode(class_definitions, function_definitions, statements)
+        program.span = _joined_span(*class_definitions, *function_definitions, *statements)
+        return program
+
+    @_spanned
     def parse_statement(self, context: ContextFlag, **kwargs) -> AST.ASTNode:
         """
         Parses any complete statement:
@@ -483,6 +527,7 @@ class Parser(object):
         self.consume(TokenType.CLOSING_SQUARE_BRACKET)
         return arguments
 
+    @_spanned
     def parse_scope(self, context: ContextFlag, **kwargs) -> AST.ScopeNode:
         """
         Parse the scope, limited with braces
@@ -583,7 +628,7 @@ class Parser(object):
         line, position = self.line_and_position_of_consumed_token()
 
         condition = self._parse_condition(context=current_context)
-        while_scope = self.parse_scope(context=current_context, loop=AST.WhileNode.INSTANCES)
+        while_scope = self.parse_scope(context=current_context, loop=True)
         if self.is_consumable(expected_type=TokenType.END_OF_STATEMENT):
             self.consume(expected_type=TokenType.END_OF_STATEMENT)
         return AST.WhileNode(condition=condition, while_scope=while_scope, line=line, position=position)
@@ -614,7 +659,7 @@ class Parser(object):
             if not loop:
                 raise NotImplementedError
 
-            return AST.BreakNode(loop=loop, line=line, position=position)
+            return AST.BreakNode(in_loop=True, line=line, position=position)
         else:
             return AST.BreakNode(error=expression, line=line, position=position)
 
@@ -643,7 +688,7 @@ class Parser(object):
             if not loop:
                 raise NotImplementedError
 
-            return AST.ContinueNode(loop=loop, line=line, position=position)
+            return AST.ContinueNode(in_loop=True, line=line, position=position)
         else:
             return AST.ContinueNode(error=expression, line=line, position=position)
 
@@ -747,12 +792,12 @@ class Parser(object):
 
             parameter_name = self.consume(expected_type=TokenType.IDENTIFIER)
             line, position = self.line_and_position_of_consumed_token()
-            parameters.append(
-                AST.FunctionParameter(
-                    type_=type_node, parameter_name=parameter_name,
-                    line=line, position=position
-                )
+            parameter = AST.FunctionParameter(
+                type_=type_node, parameter_name=parameter_name,
+                line=line, position=position
             )
+            parameter.span = _joined_span(type_node, self._prev_token)
+            parameters.append(parameter)
 
             if self.is_consumable(expected_type=TokenType.COMMA):
                 self.consume(expected_type=TokenType.COMMA)
@@ -850,6 +895,7 @@ class Parser(object):
         self.consume(expected_type=TokenType.END_OF_STATEMENT)
         return result
 
+    @_spanned
     def parse_type_declaration(self, context: ContextFlag) -> AST.TypeNode:
         # Check for const or reference modifiers
         modifiers = []
@@ -871,11 +917,13 @@ class Parser(object):
 
         return base_type
 
+    @_spanned
     def parse_base_type(self, context: ContextFlag, as_constructor: bool = False) -> AST.TypeNode:
         if self.is_consumable(expected_type=TokenType.SIMPLE_TYPE):
             type_name = self.consume(expected_type=TokenType.SIMPLE_TYPE)
             line, position = self.line_and_position_of_consumed_token()
             type_literal_node = AST.TypeLiteral(name=type_name, line=line, location=position)
+            type_literal_node.span = self._prev_token.span
             return AST.TypeNode(
                 category=AST.TypeCategory.PRIMITIVE,
                 type_node=type_literal_node, args=None, line=line, position=position
@@ -884,12 +932,14 @@ class Parser(object):
         elif self.is_consumable(expected_type=TokenType.COMPOUND_TYPE):
             compound_type = self.consume(expected_type=TokenType.COMPOUND_TYPE)
             line, position = self.line_and_position_of_consumed_token()
+            compound_type_span = self._prev_token.span
 
             parameters = []
             if self.is_consumable(expected_type=TokenType.OPENING_SQUARE_BRACKET):
                 parameters = self.__parse_square_bracket_content(allow_keymaps=False, context=context)
 
             type_literal_node = AST.TypeLiteral(name=compound_type, line=line, location=position)
+            type_literal_node.span = compound_type_span
             return AST.TypeNode(
                 category=AST.TypeCategory.COLLECTION,
                 type_node=type_literal_node, args=parameters, line=line, position=position
@@ -902,9 +952,11 @@ class Parser(object):
         else:
             self.error(msg="Invalid type declaration")
 
+    @_spanned
     def parse_arithmetic_expression(self, context: ContextFlag) -> AST.BinaryOperatorABCNode | AST.ASTNode:
         return self.parse_logical_or_expression(context=context)
 
+    @_spanned
     def parse_assignment_expression(self, context: ContextFlag) -> AST.AssignmentNode | AST.ASTNode:
         """
         Operator parser.
@@ -953,6 +1005,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Logical,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -977,6 +1030,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Logical,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1001,6 +1055,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Logical,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1025,6 +1080,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Arithmetic,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1049,6 +1105,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Arithmetic,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1073,6 +1130,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Arithmetic,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1105,6 +1163,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Comparison,
                 left=left, operator=operator, right=right, line=line, position=position
             ))
+            statements[-1].span = _joined_span(left, right)
             left = right
 
         if not statements:
@@ -1142,6 +1201,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Comparison,
                 left=left, operator=operator, right=right, line=line, position=position
             ))
+            statements[-1].span = _joined_span(left, right)
             left = right
 
         if not statements:
@@ -1172,6 +1232,8 @@ class Parser(object):
         root = AST.BinaryOperatorABCNode(
             category=AST.OperatorCategory.Logical,
             left=statements[0], operator=Operator.AND, right=None)  # type: ignore
+        # every "and" node covers the comparisons from its left one to the end of the chain
+        root.span = _joined_span(statements[0], statements[-1])
         curr = root
         for index, statement in enumerate(statements):
             if index == 0:
@@ -1180,6 +1242,7 @@ class Parser(object):
                 new_node = AST.BinaryOperatorABCNode(
                     category=AST.OperatorCategory.Logical,
                     left=statement, operator=Operator.AND, right=None)  # type: ignore
+                new_node.span = _joined_span(statement, statements[-1])
                 curr.right = new_node
                 curr = new_node
             else:
@@ -1207,6 +1270,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Comparison,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1234,6 +1298,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Comparison,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1258,6 +1323,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Arithmetic,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1287,6 +1353,7 @@ class Parser(object):
                 category=AST.OperatorCategory.Arithmetic,
                 left=left, operator=operator, right=right, line=line, position=position
             )
+            left.span = _joined_span(left.left, left.right)
 
         return left
 
@@ -1310,11 +1377,12 @@ class Parser(object):
         )):
             operator = self.consume(expected_type=TokenType.OPERATOR)
             line, position = self.line_and_position_of_consumed_token()
+            operator_token = self._prev_token
             right = self.parse_power_expression(context=context)
-            return AST.UnaryOperatorABCNode(
+            return _with_span(AST.UnaryOperatorABCNode(
                 category=AST.OperatorCategory.Arithmetic,
                 operator=operator, expression=right, line=line, position=position
-            )
+            ), operator_token, right)
         else:
             return self.parse_power_expression(context=context)
 
@@ -1348,12 +1416,14 @@ class Parser(object):
             left=right_expressions[-2], operator=Operator.POWER, right=right_expressions[-1],
             line=operators_positions[-1][0], position=operators_positions[-1][1]
         )
+        result.span = _joined_span(result.left, result.right)
         for _left, (_line, _position) in reversed(list(zip(right_expressions[:-2], operators_positions[:-1]))):
             result = AST.BinaryOperatorABCNode(
                 category=AST.OperatorCategory.Arithmetic,
                 left=_left, operator=Operator.POWER, right=result,
                 line=_line, position=_position
             )
+            result.span = _joined_span(result.left, result.right)
 
         return result
 
@@ -1374,19 +1444,21 @@ class Parser(object):
         if self.is_consumable(expected_type=TokenType.OPERATOR, expected_value=(Operator.NOT, )):
             operator = self.consume(expected_type=TokenType.OPERATOR)
             line, position = self.line_and_position_of_consumed_token()
+            operator_token = self._prev_token
             right = self.parse_dynamic_memory_allocation(context=context)
-            return AST.UnaryOperatorABCNode(
+            return _with_span(AST.UnaryOperatorABCNode(
                 category=AST.OperatorCategory.Logical,
                 operator=operator, expression=right, line=line, position=position
-            )
+            ), operator_token, right)
         elif self.is_consumable(expected_type=TokenType.OPERATOR, expected_value=(Operator.REFERENCE, Operator.DEREFERENCE)):
             operator = self.consume(expected_type=TokenType.OPERATOR)
             line, position = self.line_and_position_of_consumed_token()
+            operator_token = self._prev_token
             right = self.parse_identifier(context=context, pure_identifier=True)
-            return AST.UnaryOperatorABCNode(
+            return _with_span(AST.UnaryOperatorABCNode(
                 category=AST.OperatorCategory.Reference,
                 operator=operator, expression=right, line=line, position=position
-            )
+            ), operator_token, right)
         else:
             return self.parse_dynamic_memory_allocation(context=context)
 
@@ -1406,23 +1478,26 @@ class Parser(object):
         if self.is_consumable(expected_type=TokenType.OPERATOR, expected_value=Operator.NEW_INSTANCE):
             operator = self.consume(expected_type=TokenType.OPERATOR, expected_value=Operator.NEW_INSTANCE)
             line, position = self.line_and_position_of_consumed_token()
+            operator_token = self._prev_token
             right = self.parse_base_type(context=context, as_constructor=True)
-            return AST.UnaryOperatorABCNode(
+            return _with_span(AST.UnaryOperatorABCNode(
                 category=AST.OperatorCategory.Allocation,
                 operator=operator, expression=right, line=line, position=position
-            )
+            ), operator_token, right)
         elif self.is_consumable(expected_type=TokenType.OPERATOR, expected_value=Operator.DELETE_INSTANCE):
             operator = self.consume(expected_type=TokenType.OPERATOR, expected_value=Operator.DELETE_INSTANCE)
             line, position = self.line_and_position_of_consumed_token()
+            operator_token = self._prev_token
             right = self.parse_identifier(context=context, pure_identifier=True)
-            return AST.UnaryOperatorABCNode(
+            return _with_span(AST.UnaryOperatorABCNode(
                 category=AST.OperatorCategory.Allocation,
                 operator=operator, expression=right, line=line, position=position
-            )
+            ), operator_token, right)
         else:
             return self.parse_primary_expression(context=context)
 
     # TODO: string adequate parser, comments, refactor it into methods ...
+    @_spanned
     def parse_primary_expression(self, context: ContextFlag) -> AST.ASTNode:
         if self.is_consumable(expected_type=(
             TokenType.DECIMAL_INTEGER_LITERAL,
@@ -1478,9 +1553,11 @@ class Parser(object):
 
         if self.is_consumable(expected_type=TokenType.OPENING_PARENTHESIS):
             self.consume(expected_type=TokenType.OPENING_PARENTHESIS)
+            opening_token = self._prev_token
             node = self.parse_arithmetic_expression(context)
             self.consume(expected_type=TokenType.CLOSING_PARENTHESIS)
-            return node
+            # parenthesized expression covers its parentheses, so do the operators around it
+            return _with_span(node, opening_token, self._prev_token)
         if self.is_consumable(expected_type=TokenType.OPENING_SQUARE_BRACKET):
             return self.parse_square_bracket_literal_expression(context)
 
@@ -1518,8 +1595,10 @@ class Parser(object):
         _ = self.consume(expected_type=TokenType.KEYWORD, expected_value=Keyword.THIS)
         line, position = self.line_and_position_of_consumed_token()
         previous_result = AST.ThisNode(line=line, position=position)
+        previous_result.span = self._prev_token.span
         return self._parse_indexation_or_function_calls_if_exist(previous_result, context)
 
+    @_spanned
     def parse_identifier(
         self,
         context: ContextFlag,
@@ -1539,6 +1618,7 @@ class Parser(object):
         identifier = self.consume(expected_type=TokenType.IDENTIFIER)
         line, position = self.line_and_position_of_consumed_token()
         previous_result = AST.IdentifierNode(name=identifier, line=line, position=position)
+        previous_result.span = self._prev_token.span
         if pure_identifier:
             return previous_result
         return self._parse_indexation_or_function_calls_if_exist(node=previous_result, context=context)
@@ -1563,18 +1643,24 @@ class Parser(object):
     def _parse_function_call(self, identifier, context: ContextFlag):
         line, position = self.line_and_position_of_consumed_token()
         arguments = self.__parse_parentheses_content(context)
-        return AST.FunctionCallNode(identifier=identifier, arguments=arguments, line=line, position=position)
+        return _with_span(
+            AST.FunctionCallNode(identifier=identifier, arguments=arguments, line=line, position=position),
+            identifier, self._prev_token
+        )
 
     def _parse_indexation_call(self, identifier, context: ContextFlag):
         line, position = self.line_and_position_of_consumed_token()
         arguments = self.__parse_square_bracket_content(allow_keymaps=False, context=context)
-        return AST.IndexNode(variable=identifier, arguments=arguments, line=line, position=position)
+        return _with_span(
+            AST.IndexNode(variable=identifier, arguments=arguments, line=line, position=position),
+            identifier, self._prev_token
+        )
 
     def _parse_membership_operator(self, identifier, context: ContextFlag):
         op = self.consume(expected_type=TokenType.OPERATOR)
         line, position = self.line_and_position_of_consumed_token()
         arguments = self.parse_identifier(context, True)
-        return AST.MemberOperatorNode(identifier, op, arguments, line=line, position=position)
+        return _with_span(AST.MemberOperatorNode(identifier, op, arguments, line=line, position=position), identifier, arguments)
 
     def __parse_square_bracket_content(self, allow_keymaps: bool, context: ContextFlag) -> list[AST.ASTNode]:
 
@@ -1653,33 +1739,33 @@ class Parser(object):
         elif refine_as == "constructor":
             if not isinstance(node, AST.FunctionCallNode):
                 self.error(msg="Expected parenthesised expression for constructor")
-            return AST.FunctionCallNode(
+            return _with_span(AST.FunctionCallNode(
                 identifier=self.refine_identifier_as_class_name(node=node.identifier),
                 arguments=node.arguments,
                 line=node.line,
                 position=node.position,
                 is_constructor=True,
-            )
+            ), node)
 
     def refine_identifier_as_class_name(
         self,
         node
     ) -> AST.TypeNode:
         if isinstance(node, AST.IdentifierNode):
-            return AST.TypeNode(
+            return _with_span(AST.TypeNode(
                 category=AST.TypeCategory.CLASS,
                 type_node=node, args=None, line=node.line, position=node.position
-            )
+            ), node)
         elif isinstance(node, AST.IndexNode):
             if not isinstance(node.variable, AST.IdentifierNode):
                 self.error(msg=f"Invalid class type declaration: {node.variable.__class__.__name__}")
-            return AST.TypeNode(
+            return _with_span(AST.TypeNode(
                 category=AST.TypeCategory.GENERIC_CLASS,
                 type_node=node.variable,
                 args=[self.refine_identifier_as_class_name(node=x) for x in node.arguments],
                 line=node.line,
                 position=node.position
-            )
+            ), node)
         elif isinstance(node, AST.TypeNode):
             if node.category in (AST.TypeCategory.PRIMITIVE, AST.TypeCategory.COLLECTION):
                 return node
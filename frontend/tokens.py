@@ -60,13 +60,25 @@ class TokenType:
 
 
 class Token:
-    def __init__(self, token_type: str, token_value: str, line_number: int, column_position: int):
+    def __init__(
+        self,
+        token_type: str,
+        token_value: str,
+        line_number: int,
+        column_position: int,
+        start_offset: int | None = None,
+        end_offset: int | None = None,
+    ):
         self._token_type = token_type
         self._token_value = token_value
 
         self._line_number = line_number
         self._column_position = column_position
 
+        # absolute offsets of the token in the source, end is exclusive
+        self._start_offset = start_offset
+        self._end_offset = end_offset
+
     def __str__(self) -> str:
         return f"{str(self._token_type)}, {self._token_value}"
 
@@ -85,3 +97,17 @@ class Token:
     @property
     def position(self) -> int:
         return self._column_position
+
+    @property
+    def start_offset(self) -> int | None:
+        return self._start_offset
+
+    @property
+    def end_offset(self) -> int | None:
+        return self._end_offset
+
+    @property
+    def span(self) -> tuple[int, int] | None:
+        if self._start_offset is None:
+            return None
+        return self._start_offset, self._end_offset
@@ -1,7 +1,8 @@
 """
 Package that behaves as singleton object and validates program typing
 For the sake of simplicity and efficiency of development, this package
-is implemented in functional style with using cross-module shared variables.
+is implemented in functional style with using cross-module shared state,
+kept in the TypeCheckContext of the current run (see shared module).
 All modules, except entrypoint and function-less one, should begin with underscore
 and have all functions beginning with underscore unless it's used in another module.
 In such way, the inner implementation of separate type-checkers is separated and hidden
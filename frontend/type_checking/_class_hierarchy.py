@@ -0,0 +1,175 @@
+"""
+Precomputed closure of the class inheritance hierarchy.
+The hierarchy is a forest, linearized once by Euler tour: a class is a subclass of another one
+iff its entry time lies inside the other's [entry, exit) interval, and the least common base
+is the shallowest class between their first occurrences in the tour, found in a sparse table.
+So subclass checks and least common base queries don't walk the inheritance chains.
+"""
+from ..abstract_syntax_tree import ClassDefNode, TypeNode
+
+
+class ClassHierarchy:
+    """
+    Only the classes defined exactly once and inheriting (transitively) from such classes without cycles
+    are linearized. Others (e.g. with undefined superclass) are unknown to the hierarchy,
+    so the callers must fall back to walking the inheritance chain.
+    """
+
+    def __init__(self, classes_by_name: dict[str, list[ClassDefNode]]):
+        """
+        :param classes_by_name: class definitions grouped by name, in order of definition
+        """
+        self._ids: dict[str, int] = {}
+        self._classes: list[ClassDefNode] = []
+        self._parents: list[int] = []
+        self._depths: list[int] = []
+
+        # Euler tour
+        self._entries: list[int] = []
+        self._exits: list[int] = []
+        self._first_occurrences: list[int] = []
+
+        # sparse table over the tour: _sparse_table[k][i] is the shallowest class in tour[i:i + 2**k]
+        self._sparse_table: list[list[int]] = []
+
+        self._link(classes_by_name)
+        self._linearize()
+
+    def _link(self, classes_by_name: dict[str, list[ClassDefNode]]) -> None:
+        unique_classes = {
+            name: definitions[0]
+            for name, definitions in classes_by_name.items()
+            if len(definitions) == 1
+        }
+
+        # None if class (or any of its superclasses) can't be linearized, True if it can
+        linkable: dict[str, bool | None] = {}
+        for name in unique_classes:
+            chain = []
+            current = name
+            while current not in linkable:
+                class_node = unique_classes.get(current)
+                if class_node is None or current in chain:
+                    break
+                chain.append(current)
+                if class_node.superclass is None:
+                    current = None
+                    break
+                current = class_node.superclass.name
+
+            result = True if current is None else linkable.get(current)
+            for chain_name in chain:
+                linkable[chain_name] = result
+
+        # parents get lower ids than children, so ids are assigned from the roots down
+        for name in unique_classes:
+            self._add(name, unique_classes, linkable)
+
+    def _add(self, name: str, unique_classes: dict[str, ClassDefNode], linkable: dict[str, bool | None]) -> None:
+        chain = []
+        while name not in self._ids and linkable.get(name):
+            chain.append(name)
+            superclass = unique_classes[name].superclass
+            if superclass is None:
+                break
+            name = superclass.name
+
+        for chain_name in reversed(chain):
+            class_node = unique_classes[chain_name]
+            parent = -1 if class_node.superclass is None else self._ids[class_node.superclass.name]
+            self._ids[chain_name] = len(self._classes)
+            self._classes.append(class_node)
+            self._parents.append(parent)
+            self._depths.append(0 if parent == -1 else self._depths[parent] + 1)
+
+    def _linearize(self) -> None:
+        count = len(self._classes)
+        children: list[list[int]] = [[] for _ in range(count)]
+        roots = []
+        for class_id, parent in enumerate(self._parents):
+            if parent == -1:
+                roots.append(class_id)
+            else:
+                children[parent].append(class_id)
+
+        self._entries = [0] * count
+        self._exits = [0] * count
+        self._first_occurrences = [0] * count
+
+        tour = []
+        time = 0
+        for root in roots:
+            # iterative DFS: (class, index of the next child)
+            stack = [(root, 0)]
+            self._entries[root] = time
+            self._first_occurrences[root] = len(tour)
+            tour.append(root)
+            time += 1
+            while stack:
+                class_id, child_index = stack.pop()
+                if child_index < len(children[class_id]):
+                    child = children[class_id][child_index]
+                    stack.append((class_id, child_index + 1))
+                    stack.append((child, 0))
+                    self._entries[child] = time
+                    self._first_occurrences[child] = len(tour)
+                    tour.append(child)
+                    time += 1
+                else:
+                    self._exits[class_id] = time
+                    if stack:
+                        tour.append(stack[-1][0])
+
+        depths = self._depths
+        level = tour
+        self._sparse_table = [level]
+        span = 1
+        while 2 * span <= len(tour):
+            level = [
+                left if depths[left] <= depths[right] else right
+                for left, right in zip(level, level[span:])
+            ]
+            self._sparse_table.append(level)
+            span *= 2
+
+    def __len__(self) -> int:
+        return len(self._classes)
+
+    def get_id(self, cls: ClassDefNode | TypeNode | str) -> int | None:
+        """
+        Get the id of the class in the hierarchy
+        :param cls: class definition, class type or class name
+        :return: id of the class or None if class is unknown to the hierarchy
+        """
+        if isinstance(cls, ClassDefNode):
+            class_id = self._ids.get(cls.name)
+            return class_id if class_id is not None and self._classes[class_id] is cls else None
+        elif isinstance(cls, TypeNode):
+            return self._ids.get(cls.name)
+        return self._ids.get(cls)
+
+    def is_subclass(self, class_id: int, base_id: int) -> bool:
+        """
+        Checks if the class is the base class or inherits from it (directly or not)
+        """
+        return self._entries[base_id] <= self._entries[class_id] < self._exits[base_id]
+
+    def least_common_base(self, class_id: int, other_id: int) -> ClassDefNode | None:
+        """
+        Get the least common base class of the two classes
+        :return: class definition or None if the classes are in different trees
+        """
+        left = self._first_occurrences[class_id]
+        right = self._first_occurrences[other_id]
+        if left > right:
+            left, right = right, left
+
+        level = (right - left + 1).bit_length() - 1
+        first = self._sparse_table[level][left]
+        second = self._sparse_table[level][right - (1 << level) + 1]
+        common = first if self._depths[first] <= self._depths[second] else second
+
+        # for classes of different trees, the shallowest class found is a root of one of them
+        if not self.is_subclass(class_id, common) or not self.is_subclass(other_id, common):
+            return None
+        return self._classes[common]
@@ -0,0 +1,268 @@
+"""
+Constant folding of operators with literal operands.
+Operators whose operands are constants (literals or already folded operators) get the folded literal
+(see OperatorABC.folded_literal), which is translated instead of the whole operator.
+Integer constants are folded precisely, so the results that don't fit into the type of the operator
+are overflows (bytes and short integers are evaluated as integers by the backend), unless the operator is
+of extended integers. Integer division (or modulo) of constants by zero is an error, as it can't be folded,
+while the ones of variables are left to the backend (they may never be evaluated), as well as floating point ones,
+which give infinities or NaN.
+
+Only the operations evaluated in the same way by the backend are folded, e.g. integer divisions
+truncate towards zero, modulo is folded for non-negative integers only and integer powers aren't folded,
+as the backend evaluates them into doubles.
+"""
+import math
+
+from .._syntax.operators import Operator, Comparison
+from ..abstract_syntax_tree import (
+    ASTNode,
+    TypeNode,
+    TypeCategory,
+    LiteralNode,
+    IntegerLiteralNode,
+    FloatLiteralNode,
+    BooleanLiteralNode,
+    BinaryOperatorABCNode,
+    UnaryOperatorABCNode,
+    OperatorCategory,
+    IntegerSizes,
+)
+from ..semantics import TypeEnum
+
+from .core import ErrorCode
+from .shared import get_context
+
+
+# shifts by more bits aren't folded, as the backend masks the shift count
+_MAX_SHIFT = 31
+
+_INTEGER_SIZES = {
+    TypeEnum.BYTE: IntegerSizes.BYTE,
+    TypeEnum.SHORT_INTEGER: IntegerSizes.SHORT,
+    TypeEnum.INTEGER: IntegerSizes.INTEGER,
+    TypeEnum.LONG_INTEGER: IntegerSizes.LONG,
+    TypeEnum.EXTENDED_INTEGER: IntegerSizes.EXTENDED,
+}
+
+_DIVISIONS = (Operator.DIVIDE, Operator.FLOOR_DIVIDE, Operator.MODULO)
+
+_COMPARISONS = {
+    Comparison.EQUAL: lambda lhs, rhs: lhs == rhs,
+    Comparison.NOT_EQUAL: lambda lhs, rhs: lhs != rhs,
+    Comparison.LESSER: lambda lhs, rhs: lhs < rhs,
+    Comparison.LESSER_OR_EQUAL: lambda lhs, rhs: lhs <= rhs,
+    Comparison.GREATER: lambda lhs, rhs: lhs > rhs,
+    Comparison.GREATER_OR_EQUAL: lambda lhs, rhs: lhs >= rhs,
+}
+
+_LOGICAL_OPERATORS = {
+    Operator.AND: lambda lhs, rhs: lhs and rhs,
+    Operator.FULL_AND: lambda lhs, rhs: lhs and rhs,
+    Operator.OR: lambda lhs, rhs: lhs or rhs,
+    Operator.FULL_OR: lambda lhs, rhs: lhs or rhs,
+    Operator.XOR: lambda lhs, rhs: lhs != rhs,
+    Operator.FULL_XOR: lambda lhs, rhs: lhs != rhs,
+}
+
+_BITWISE_OPERATORS = {
+    Operator.BITWISE_AND: lambda lhs, rhs: lhs & rhs,
+    Operator.BITWISE_OR: lambda lhs, rhs: lhs | rhs,
+    Operator.BITWISE_XOR: lambda lhs, rhs: lhs ^ rhs,
+}
+
+
+def get_constant(node: ASTNode) -> int | float | bool | None:
+    """
+    Get the value of the constant expression
+    :param node: checked expression
+    :return: value of the integer, float or boolean constant, or None if the expression isn't constant
+    """
+    node_class = type(node)
+    if node_class is BinaryOperatorABCNode or node_class is UnaryOperatorABCNode:
+        node = node.folded_literal
+        node_class = type(node)
+
+    if node_class is IntegerLiteralNode or node_class is FloatLiteralNode:
+        return node.value
+    elif node_class is BooleanLiteralNode:
+        return node.value == "true"
+    return None
+
+
+def fold_binary_operator(
+    expression: BinaryOperatorABCNode,
+    expression_type: TypeNode
+) -> tuple[bool, LiteralNode | None]:
+    """
+    Fold the valid operator of primitive operands, if they are constants
+    :param expression: checked operator
+    :param expression_type: type of the operator
+    :return: validity of the operator (False on overflow or integer division by zero) and the folded literal, if any
+    """
+    rhs = get_constant(expression.right)
+    if rhs is None:
+        return True, None
+    lhs = get_constant(expression.left)
+    if lhs is None:
+        return True, None
+
+    operator = expression.operator
+    category = expression.category
+    if (
+        category == OperatorCategory.Arithmetic and operator in _DIVISIONS and rhs == 0 and
+        _get_integer_size(expression_type) is not None
+    ):
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.CONSTANT_EVALUATION,
+            reason="Division by zero"
+        )
+        return False, None
+
+    if category == OperatorCategory.Logical:
+        if type(lhs) is bool and type(rhs) is bool and operator in _LOGICAL_OPERATORS:
+            return True, _make_literal(_LOGICAL_OPERATORS[operator](lhs, rhs), expression)
+        return True, None
+
+    # booleans aren't numbers for the rest of operators
+    if type(lhs) is bool or type(rhs) is bool:
+        return True, None
+
+    if category == OperatorCategory.Comparison:
+        if operator in _COMPARISONS:
+            return True, _make_literal(_COMPARISONS[operator](lhs, rhs), expression)
+        return True, None
+
+    if category != OperatorCategory.Arithmetic:
+        return True, None
+
+    if type(lhs) is int and type(rhs) is int:
+        return _fit_integer(_fold_integer_operator(operator, lhs, rhs), expression_type, expression)
+    return True, _make_float_literal(_fold_float_operator(operator, lhs, rhs), expression)
+
+
+def fold_unary_operator(
+    expression: UnaryOperatorABCNode,
+    expression_type: TypeNode
+) -> tuple[bool, LiteralNode | None]:
+    """
+    Fold the valid operator of primitive operand, if it's a constant
+    :param expression: checked operator
+    :param expression_type: type of the operator
+    :return: validity of the operator and the folded literal, if any
+    """
+    value = get_constant(expression.expression)
+    if value is None:
+        return True, None
+
+    operator = expression.operator
+    category = expression.category
+    if category == OperatorCategory.Logical:
+        if operator == Operator.NOT and type(value) is bool:
+            return True, _make_literal(not value, expression)
+        return True, None
+
+    if category != OperatorCategory.Arithmetic or type(value) is bool:
+        return True, None
+
+    if operator == Operator.MINUS:
+        result = -value
+    elif operator == Operator.PLUS:
+        result = value
+    elif operator == Operator.BITWISE_INVERSE and type(value) is int:
+        result = ~value
+    else:
+        return True, None
+
+    if type(result) is int:
+        return _fit_integer(result, expression_type, expression)
+    return True, _make_float_literal(result, expression)
+
+
+def _fold_integer_operator(operator: str, lhs: int, rhs: int) -> int | None:
+    if operator == Operator.PLUS:
+        return lhs + rhs
+    elif operator == Operator.MINUS:
+        return lhs - rhs
+    elif operator == Operator.MULTIPLY:
+        return lhs * rhs
+    elif operator in (Operator.DIVIDE, Operator.FLOOR_DIVIDE):
+        quotient = abs(lhs) // abs(rhs)
+        return quotient if (lhs < 0) == (rhs < 0) else -quotient
+    elif operator == Operator.MODULO:
+        if lhs < 0 or rhs < 0:
+            return None
+        return lhs % rhs
+    elif operator in _BITWISE_OPERATORS:
+        return _BITWISE_OPERATORS[operator](lhs, rhs)
+    elif operator in (Operator.BITWISE_LSHIFT, Operator.BITWISE_RSHIFT):
+        if not 0 <= rhs <= _MAX_SHIFT:
+            return None
+        return lhs << rhs if operator == Operator.BITWISE_LSHIFT else lhs >> rhs
+    return None
+
+
+def _fit_integer(
+    result: int | None,
+    expression_type: TypeNode,
+    expression: ASTNode
+) -> tuple[bool, IntegerLiteralNode | None]:
+    """
+    Make the literal of the folded integer, if it fits into the type the backend evaluates the operator in
+    :param result: folded value or None if the operation isn't folded
+    :return: validity of the operator (False on overflow) and the literal, if any
+    """
+    size = _get_integer_size(expression_type)
+    if result is None or size is None:
+        return True, None
+
+    literal = _make_literal(result, expression)
+    if literal.size <= max(size, IntegerSizes.INTEGER):
+        return True, literal
+
+    get_context().error_logger.add(
+        location=expression,
+        code=ErrorCode.CONSTANT_EVALUATION,
+        reason="Integer overflow in constant expression with operator {}",
+        args=(expression.operator,)
+    )
+    return False, None
+
+
+def _fold_float_operator(operator: str, lhs: int | float, rhs: int | float) -> float | None:
+    # floor division and modulo of floats are left to the backend, as well as division by zero
+    if operator == Operator.PLUS:
+        return lhs + rhs
+    elif operator == Operator.MINUS:
+        return lhs - rhs
+    elif operator == Operator.MULTIPLY:
+        return lhs * rhs
+    elif operator == Operator.DIVIDE and rhs != 0:
+        return lhs / rhs
+    return None
+
+
+def _get_integer_size(type_node: TypeNode | None) -> IntegerSizes | None:
+    if not isinstance(type_node, TypeNode) or type_node.category != TypeCategory.PRIMITIVE:
+        return None
+    return _INTEGER_SIZES.get(type_node.name)
+
+
+def _make_literal(value: int | bool, expression: ASTNode) -> IntegerLiteralNode | BooleanLiteralNode:
+    line, position = expression.location
+    if type(value) is bool:
+        return BooleanLiteralNode("true" if value else "false", line, position)
+    return IntegerLiteralNode(str(value), 10, line, position)
+
+
+def _make_float_literal(value: float | None, expression: ASTNode) -> FloatLiteralNode | None:
+    # backend reads plain decimal numbers only
+    if value is None or not math.isfinite(value):
+        return None
+    text = repr(float(value))
+    if "e" in text:
+        return None
+
+    line, position = expression.location
+    return FloatLiteralNode(text, line, position)
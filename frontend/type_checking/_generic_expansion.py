@@ -0,0 +1,102 @@
+"""
+Detection of generic classes with infinitely many instances.
+Generic parameters of the classes are the vertices of the graph, and every generic class type written
+in a generic class, e.g. Node[Box[T]] in Node[T], adds edges from the parameters used in its arguments
+to the parameters of the instantiated class: plain ones if the argument is the parameter itself
+and expanding ones if the parameter is nested in the argument.
+Instantiating the class then instantiates its types with ever more nested arguments iff an expanding edge
+lies on a cycle, which the monomorphization would never finish.
+"""
+from ..abstract_syntax_tree import ASTNode, ClassDefNode, TypeNode, TypeCategory, iter_child_nodes
+
+from .core import ErrorCode
+from .shared import get_context
+
+# parameter of the generic class, as (class name, parameter index)
+_Parameter = tuple[str, int]
+
+
+def validate_generic_expansion() -> bool:
+    """
+    Check that no generic class is instantiated with infinitely nested arguments of its own parameters
+    :return: True if every generic class has finitely many instances
+    """
+    generic_classes = {
+        class_node.name: class_node
+        for class_node in get_context().class_definitions
+        if class_node.generic_params
+    }
+    if not generic_classes:
+        return True
+
+    edges: dict[_Parameter, set[_Parameter]] = {}
+    expanding_edges: list[tuple[_Parameter, _Parameter, TypeNode]] = []
+    for class_node in generic_classes.values():
+        parameters = {parameter.name: index for index, parameter in enumerate(class_node.generic_params)}
+        for type_node in _iter_generic_class_types(class_node, generic_classes):
+            instantiated_parameters = generic_classes[type_node.name].generic_params
+            for index, (_, argument) in enumerate(zip(instantiated_parameters, type_node.arguments)):
+                target = (type_node.name, index)
+                for name, nested in _iter_parameters(argument):
+                    if name not in parameters:
+                        continue
+                    source = (class_node.name, parameters[name])
+                    edges.setdefault(source, set()).add(target)
+                    if nested:
+                        expanding_edges.append((source, target, type_node))
+
+    valid = True
+    reported = set()
+    for source, target, type_node in expanding_edges:
+        if id(type_node) in reported or not _is_reachable(edges, target, source):
+            continue
+        reported.add(id(type_node))
+        valid = False
+        get_context().error_logger.add(
+            location=type_node,
+            code=ErrorCode.INVALID_INSTANTIATION,
+            reason="Generic class {} is instantiated with infinitely nested arguments",
+            args=(type_node.name,)
+        )
+    return valid
+
+
+def _iter_generic_class_types(root: ClassDefNode, generic_classes: dict[str, ClassDefNode]):
+    """
+    Iterate over the valid types of the generic classes written in the class, including the nested ones
+    """
+    stack: list[ASTNode] = [root]
+    while stack:
+        node = stack.pop()
+        node_class = type(node)
+        if node_class is TypeNode and node.valid and node.category == TypeCategory.GENERIC_CLASS \
+                and node.name in generic_classes:
+            yield node
+
+        stack.extend(iter_child_nodes(node))
+
+
+def _iter_parameters(argument: TypeNode, nested: bool = False):
+    """
+    Iterate over the generic parameters used in the type argument
+    :return: pairs of the parameter name and whether it's nested in the argument
+    """
+    if argument.represents_generic_param:
+        yield argument.name, nested
+    for inner in argument.arguments or ():
+        if type(inner) is TypeNode:
+            yield from _iter_parameters(inner, True)
+
+
+def _is_reachable(edges: dict[_Parameter, set[_Parameter]], start: _Parameter, goal: _Parameter) -> bool:
+    visited = {start}
+    stack = [start]
+    while stack:
+        current = stack.pop()
+        if current == goal:
+            return True
+        for following in edges.get(current, ()):
+            if following not in visited:
+                visited.add(following)
+                stack.append(following)
+    return False
@@ -1,4 +1,6 @@
-from .shared import class_definitions
+from ._symbol_tables import lookup_classes, lookup_methods
+from ._type_match import get_signature_key
+from .shared import get_context, record_dependency
 from ..abstract_syntax_tree import TypeNode, ClassDefNode, ClassFieldDeclarationNode, ClassMethodDeclarationNode
 
 
@@ -9,13 +11,9 @@ def get_class_by_name(
     class_name: str,
     multiple: bool = False,
 ) -> None | ClassDefNode | list[ClassDefNode]:
-    matching_class_definitions = [
-        class_definition
-        for class_definition in class_definitions
-        if class_definition.name == class_name
-    ]
+    matching_class_definitions = lookup_classes(class_name)
     if multiple:
-        return matching_class_definitions
+        return list(matching_class_definitions)
     elif len(matching_class_definitions) == 1:
         return matching_class_definitions[0]
     else:
@@ -37,14 +35,20 @@ def get_class_method(
     else:
         return None
 
-    look_methods_in = class_instance.methods_defs if not is_static else class_instance.static_methods_defs
-    for class_method in look_methods_in:
-        if class_method.function_name != method_name:
-            continue
+    record_dependency("class", class_instance.name)
 
+    cache = get_context().overload_cache
+    signature_key = get_signature_key(type_signature)
+    key = ("method", id(class_instance), is_static, method_name, signature_key) if signature_key is not None else None
+
+    resolution = cache.lookup(key)
+    if resolution is not cache.MISSING:
+        return resolution
+
+    for class_method in lookup_methods(class_instance, method_name, is_static):
         if match_signatures(args_signature=type_signature, function_signature=class_method.parameters_signature):
-            return class_method
-    return None
+            return cache.store(key, class_method)
+    return cache.store(key, None)
 
 
 def get_class_field(
@@ -59,6 +63,7 @@ def get_class_field(
 
     elif isinstance(_class, ClassDefNode):
         class_instance = _class
+        record_dependency("class", class_instance.name)
 
     else:
         return None
@@ -81,5 +86,20 @@ def instantiate_generic_type(
                 return True, actual
         else:
             return False, None
-    else:
+
+    # generic parameters can be arguments of the type as well, e.g. Box[T]
+    if not possibly_generic_type.arguments or not generic_args:
+        return True, possibly_generic_type
+
+    arguments = []
+    for argument in possibly_generic_type.arguments:
+        is_valid, instantiated_argument = instantiate_generic_type(argument, class_instance, generic_args)
+        if not is_valid:
+            return False, None
+        arguments.append(instantiated_argument)
+
+    if all(argument is original for argument, original in zip(arguments, possibly_generic_type.arguments)):
         return True, possibly_generic_type
+    instantiated_type = possibly_generic_type.shallow_copy()
+    instantiated_type.arguments = arguments
+    return True, instantiated_type
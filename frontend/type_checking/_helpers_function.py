@@ -1,7 +1,8 @@
 from ..abstract_syntax_tree import TypeNode, FunctionDefNode, FunctionParameter
-from ._type_match import match_types, strict_match_types
+from ._type_match import match_types, strict_match_types, get_signature_key
 
-from .shared import function_definitions
+from ._symbol_tables import lookup_functions
+from .shared import get_context, record_dependency
 
 
 def match_signatures(args_signature: list[TypeNode], function_signature: list[TypeNode]) -> bool:
@@ -42,13 +43,21 @@ def get_function(
     func_name: str,
     args_signature: list[TypeNode]
 ) -> tuple[bool, FunctionDefNode | None]:
-    for func in function_definitions:
-        if func.function_name != func_name:
-            continue
+    # resolution depends on all the overloads, even if none of them matches
+    record_dependency("function", func_name)
+
+    cache = get_context().overload_cache
+    signature_key = get_signature_key(args_signature)
+    key = ("function", func_name, signature_key) if signature_key is not None else None
+
+    resolution = cache.lookup(key)
+    if resolution is not cache.MISSING:
+        return resolution
 
+    for func in lookup_functions(func_name):
         if match_signatures(args_signature, func.parameters_signature):
-            return True, func
-    return False, None
+            return cache.store(key, (True, func))
+    return cache.store(key, (False, None))
 
 
 def instantiate_environment_from_function_parameters(
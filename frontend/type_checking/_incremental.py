@@ -0,0 +1,228 @@
+"""
+Incremental type checking: reuse of function and method bodies checked by the previous check of the program.
+
+The checked program is changed in place, by adding, removing or replacing its class and function definitions
+(or bodies of functions and methods) with the new nodes. While a body is checked, names of the classes
+and functions it looks up are recorded (see record_dependency), as well as its errors and the changes
+of declarations it makes (usages and instantiations).
+
+On the next check, the body kept from the previous check is checked again only if any class or function
+it depends on was added, removed or replaced. Subclasses of such classes are changed too,
+as inherited members and subclass relations depend on the whole inheritance chain.
+Other bodies aren't checked, their errors and changes of declarations are repeated instead.
+Declarations themselves and global statements are cheap to check, so they are always checked again,
+after the type checker meta info of the kept declarations is restored to the one before their first check.
+"""
+from ..abstract_syntax_tree import (
+    ASTNode,
+    ProgramNode,
+    ScopeNode,
+    ClassDefNode,
+    FunctionDefNode,
+    ClassMethodDeclarationNode,
+    iter_child_nodes,
+    get_non_structural_attributes,
+)
+from .core import ErrorRecord
+from .shared import get_context, use_declaration, add_class_instantiation
+from ._scope import validate_scope
+
+
+class _BodyResult:
+    def __init__(
+        self,
+        function_node: FunctionDefNode | ClassMethodDeclarationNode,
+        valid: bool,
+        errors: list[ErrorRecord],
+        declaration_log: list[tuple],
+        dependencies: set[tuple[str, str]],
+    ):
+        self.function_node = function_node
+        self.body: ScopeNode = function_node.function_body
+        self.valid = valid
+        self.errors = errors
+        self.declaration_log = declaration_log
+        self.dependencies = dependencies
+
+
+# meta info of the declaration nodes (except bodies), as (node, attribute values)
+_MetaSnapshot = list[tuple[ASTNode, dict[str, object]]]
+
+
+class IncrementalState:
+    """
+    Results of the incremental check to be reused by the next one
+    """
+
+    def __init__(self):
+        # class and function definitions of the checked program by ids, with their meta info before the first check
+        self.declarations: dict[int, tuple[ClassDefNode | FunctionDefNode, _MetaSnapshot]] = {}
+
+        # results of function and method bodies by ids of the functions and methods
+        self.bodies: dict[int, _BodyResult] = {}
+
+        # statistics
+        self.checked_bodies = 0
+        self.reused_bodies = 0
+
+
+class IncrementalBodyValidator:
+    """
+    Checks the bodies affected by the changes since the previous check, and reuses the rest
+    """
+
+    def __init__(self, program: ProgramNode, previous_state: IncrementalState | None):
+        """
+        :param program: program to check, the one checked previously with the changes, if any
+        :param previous_state: results of the previous check, if any
+        """
+        self.state = IncrementalState()
+        self._previous = previous_state
+        self._changed_names: set[tuple[str, str]] = set()
+
+        previous_declarations = previous_state.declarations if previous_state is not None else {}
+        for declaration in program.class_definitions + program.function_definitions:
+            kept = previous_declarations.get(id(declaration))
+            if kept is not None and kept[0] is declaration:
+                snapshot = kept[1]
+                _restore_meta(snapshot)
+            else:
+                snapshot = _take_meta(declaration)
+            self.state.declarations[id(declaration)] = (declaration, snapshot)
+
+        if previous_state is not None:
+            self._changed_names = _get_changed_names(previous_state, self.state)
+
+    def validate_body(self, function_node: FunctionDefNode | ClassMethodDeclarationNode, scope_kwargs: dict) -> bool:
+        result = self._previous.bodies.get(id(function_node)) if self._previous is not None else None
+        if (
+            result is not None and
+            result.function_node is function_node and
+            result.body is function_node.function_body and
+            result.dependencies.isdisjoint(self._changed_names)
+        ):
+            self._reuse_body(result)
+            self.state.reused_bodies += 1
+        else:
+            result = self._check_body(function_node, scope_kwargs)
+            self.state.checked_bodies += 1
+
+        self.state.bodies[id(function_node)] = result
+        return result.valid
+
+    @staticmethod
+    def _check_body(function_node: FunctionDefNode | ClassMethodDeclarationNode, scope_kwargs: dict) -> _BodyResult:
+        # bodies of methods and operator overloads depend on their class
+        dependencies = set()
+        current_class = scope_kwargs.get("current_class")
+        if current_class is not None:
+            dependencies.add(("class", current_class.name))
+
+        context = get_context()
+        first_error = len(context.error_logger.errors)
+        context.declaration_log = []
+        context.dependency_log = dependencies
+        try:
+            valid = validate_scope(scope=function_node.function_body, **scope_kwargs)
+            declaration_log = context.declaration_log
+        finally:
+            context.declaration_log = None
+            context.dependency_log = None
+
+        errors = context.error_logger.errors[first_error:]
+        return _BodyResult(function_node, valid, errors, declaration_log, dependencies)
+
+    @staticmethod
+    def _reuse_body(result: _BodyResult) -> None:
+        get_context().error_logger.extend(result.errors)
+        for change, declaration, *args in result.declaration_log:
+            if change == "use":
+                use_declaration(declaration)
+            else:
+                add_class_instantiation(declaration, args[0])
+
+
+def _iter_declaration_nodes(declaration: ClassDefNode | FunctionDefNode):
+    """
+    Iterate over the nodes of the declaration, except function and method bodies
+    """
+    stack = [declaration]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        yield node
+
+        body = node.__dict__.get("function_body")
+        stack.extend(child for child in iter_child_nodes(node) if child is not body)
+
+
+def _take_meta(declaration: ClassDefNode | FunctionDefNode) -> _MetaSnapshot:
+    snapshot = []
+    for node in _iter_declaration_nodes(declaration):
+        attributes = node.__dict__
+        values = {
+            name: _copy_meta_value(attributes[name])
+            for name in get_non_structural_attributes(type(node))
+            if name in attributes
+        }
+        snapshot.append((node, values))
+    return snapshot
+
+
+def _restore_meta(snapshot: _MetaSnapshot) -> None:
+    for node, values in snapshot:
+        attributes = node.__dict__
+        for name, value in values.items():
+            attributes[name] = _copy_meta_value(value)
+
+
+def _copy_meta_value(value: object) -> object:
+    # containers of meta info (e.g. instantiations of generic classes) are changed in place by the type checker
+    value_class = type(value)
+    if value_class is list:
+        return list(value)
+    if value_class is dict:
+        return dict(value)
+    return value
+
+
+def _get_name(declaration: ClassDefNode | FunctionDefNode) -> tuple[str, str]:
+    if isinstance(declaration, ClassDefNode):
+        return "class", declaration.name
+    return "function", declaration.function_name
+
+
+def _get_changed_names(previous: IncrementalState, current: IncrementalState) -> set[tuple[str, str]]:
+    """
+    Get the names of classes and functions added, removed or replaced, as dependencies of bodies
+    """
+    changed_names = set()
+    for declarations, other_declarations in (
+        (previous.declarations, current.declarations),
+        (current.declarations, previous.declarations),
+    ):
+        for declaration_id, (declaration, _) in declarations.items():
+            other = other_declarations.get(declaration_id)
+            if other is None or other[0] is not declaration:
+                changed_names.add(_get_name(declaration))
+
+    # names of the superclasses of every class in both versions
+    superclasses: dict[str, set[str]] = {}
+    for declarations in (previous.declarations, current.declarations):
+        for declaration, _ in declarations.values():
+            if isinstance(declaration, ClassDefNode) and declaration.superclass is not None:
+                superclasses.setdefault(declaration.name, set()).add(declaration.superclass.name)
+
+    changed = True
+    while changed:
+        changed = False
+        for class_name, superclass_names in superclasses.items():
+            if ("class", class_name) in changed_names:
+                continue
+            if any(("class", superclass_name) in changed_names for superclass_name in superclass_names):
+                changed_names.add(("class", class_name))
+                changed = True
+    return changed_names
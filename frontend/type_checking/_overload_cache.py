@@ -0,0 +1,52 @@
+"""
+Memoization of overload resolution.
+Call sites usually call the same few functions with the same argument types,
+so resolved definitions are cached by (callee, argument types) instead of matching
+the signatures of all candidates over and over again.
+"""
+from typing import Any, Hashable
+
+
+class OverloadResolutionCache:
+    # marker of absent entry, as None is a valid resolution result
+    MISSING = object()
+
+    def __init__(self):
+        self._resolutions: dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable | None) -> Any:
+        """
+        Get the memoized resolution
+        :param key: resolution key, None if the lookup can't be memoized
+        :return: resolution result or OverloadResolutionCache.MISSING
+        """
+        if key is None:
+            return self.MISSING
+
+        result = self._resolutions.get(key, self.MISSING)
+        if result is self.MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def store(self, key: Hashable | None, result: Any) -> Any:
+        if key is not None:
+            self._resolutions[key] = result
+        return result
+
+    def invalidate(self) -> None:
+        """
+        Forget all the resolutions, e.g. when the definitions or their signatures change
+        """
+        self._resolutions.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return f"OverloadResolutionCache(hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.2%})"
@@ -1,67 +1,63 @@
 from ._helpers_function import match_signatures
 from ..abstract_syntax_tree import FunctionDefNode, ClassMethodDeclarationNode
 
-from .shared import error_logger
+from .core import ErrorCode
+from .shared import get_context
+from ._symbol_tables import group_by_function_name
+from ._type_match import get_signature_match_class_key
 
 
 def validate_overloaded_function_definitions(
     definitions: list[FunctionDefNode | ClassMethodDeclarationNode]
 ) -> bool:
+    definitions_by_name = group_by_function_name(definitions)
 
-    not_overloaded_function_names = set()
-    distinct_functions_names = set()
-
-    for function in definitions:
-        name = function.function_name
-        if name in distinct_functions_names:
-            not_overloaded_function_names.discard(name)
-        else:
-            not_overloaded_function_names.add(name)
-            distinct_functions_names.add(name)
-
-    overloads = distinct_functions_names.difference(not_overloaded_function_names)
-    if not overloads:
-        return True
+    valid = True
+    for function_name, overloaded_functions in definitions_by_name.items():
+        if len(overloaded_functions) < 2:
+            continue
 
-    # denoting different overloads for desugaring stage
-    counter = {name: 0 for name in overloads}
-    for function in definitions:
-        if (name := function.function_name) in overloads:
+        # denoting different overloads for desugaring stage
+        for overload_number, function in enumerate(overloaded_functions):
             function.has_overloads = True
-            function.overload_number = counter[name]
-            counter[name] += 1
+            function.overload_number = overload_number
 
-    overload_validations = [
-        _validate_overloaded_function_name(definitions=definitions, function_name=function_name)
-        for function_name in overloads
-    ]
-    return all(overload_validations)
+        if not _validate_overloaded_function_name(overloaded_functions=overloaded_functions, function_name=function_name):
+            valid = False
+    return valid
 
 
 def _validate_overloaded_function_name(
-    definitions: list[FunctionDefNode | ClassMethodDeclarationNode],
+    overloaded_functions: list[FunctionDefNode | ClassMethodDeclarationNode],
     function_name: str
 ) -> bool:
-    overloaded_functions: list[FunctionDefNode] = []
-
-    for function in definitions:
-        if function.function_name != function_name:
-            continue
-
-        overloaded_functions.append(function)
-
-    has_no_duplicate_definitions = True
-    for i in range(len(overloaded_functions)):
-        for j in range(i + 1, len(overloaded_functions)):
-            if match_signatures(
-                args_signature=overloaded_functions[i].parameters_signature,
-                function_signature=overloaded_functions[j].parameters_signature
-            ):
-                has_no_duplicate_definitions = False
-                error_logger.add(
-                    location=overloaded_functions[i],
-                    reason=f"Multiple overloads for function {function_name} with same signature"
-                    f"{overloaded_functions[i].parameters_signature} found"
-                )
-
-    return has_no_duplicate_definitions
+    # only the overloads with equal signature keys can match, so they are compared within the groups
+    groups = {}
+    for index, function in enumerate(overloaded_functions):
+        key = get_signature_match_class_key(function.parameters_signature)
+        if key is None:
+            groups = {None: range(len(overloaded_functions))}
+            break
+        groups.setdefault(key, []).append(index)
+
+    duplicates = []
+    for group in groups.values():
+        for i_position, i in enumerate(group):
+            for j in group[i_position + 1:]:
+                if match_signatures(
+                    args_signature=overloaded_functions[i].parameters_signature,
+                    function_signature=overloaded_functions[j].parameters_signature
+                ):
+                    duplicates.append((i, j))
+
+    # errors are logged in order of pairs, as if all of them were compared
+    duplicates.sort()
+    for i, _ in duplicates:
+        get_context().error_logger.add(
+            location=overloaded_functions[i],
+            code=ErrorCode.INVALID_DECLARATION,
+            reason="Multiple overloads for function {} with same signature{} found",
+            args=(function_name, overloaded_functions[i].parameters_signature)
+        )
+
+    return not duplicates
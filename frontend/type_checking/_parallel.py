@@ -0,0 +1,255 @@
+"""
+Parallel validation of function and method bodies in worker processes.
+Bodies are independent of each other: checking one of them only reads the declarations,
+and the only changes of declarations it makes are usages and instantiations of generic classes.
+
+Workers are forked after the symbol tables are built, and each of them validates the class and function
+definitions in the same order as the main process does, but checks only its own share of bodies
+(every worker_count-th one) and skips the rest. The main process skips all the bodies
+and takes their results from the workers in the same order instead, so errors, usages and
+instantiations are merged exactly in order of the sequential checking.
+
+Checking a body annotates its nodes (validity, overload numbers, resolved classes etc.), so the checked body
+is sent back as a whole and replaces the unchecked one in the main process. Nodes outside the bodies
+(declarations, global statements) are sent as their numbers, known to both processes.
+
+Forking copies only the forking thread, and the locks other threads hold stay locked in the workers
+(e.g. the ones of the imports or of the output buffers in the concurrent compilations), so the bodies are checked
+in workers only while no other threads are running, and sequentially otherwise.
+"""
+import io
+import multiprocessing
+import pickle
+import sys
+import threading
+import traceback
+from multiprocessing.connection import Connection
+
+from ..abstract_syntax_tree import (
+    ASTNode,
+    TypeNode,
+    ProgramNode,
+    FunctionDefNode,
+    ClassMethodDeclarationNode,
+    is_node_class,
+    iter_referenced_nodes,
+)
+from .shared import get_context
+from ._scope import validate_scope
+from .classes.entrypoint import validate_all_class_definitions
+from .functions.entrypoint import validate_all_function_definitions
+
+
+class _NodeRegistry:
+    """
+    Numbers of all the nodes outside function and method bodies by the moment workers are forked,
+    which are the same in all the processes
+    """
+
+    def __init__(self, program: ProgramNode):
+        self.nodes: list[ASTNode] = []
+        self.numbers: dict[int, int] = {}
+
+        stack = [program]
+        while stack:
+            node = stack.pop()
+            if id(node) in self.numbers:
+                continue
+            self.numbers[id(node)] = len(self.nodes)
+            self.nodes.append(node)
+            body = node.__dict__.get("function_body")
+            stack.extend(child for child in iter_referenced_nodes(node) if child is not body)
+
+
+def _registered_node(number: int) -> ASTNode:
+    """
+    Placeholder of the registered node in pickled results, replaced by the node itself when unpickling
+    """
+    raise AssertionError("Registered nodes can be loaded by _BodyUnpickler only")
+
+
+class _BodyPickler(pickle.Pickler):
+    def __init__(self, file: io.BytesIO, registry: _NodeRegistry):
+        super().__init__(file, protocol=pickle.HIGHEST_PROTOCOL)
+        self._registry = registry
+
+    def reducer_override(self, obj):
+        # called for objects of non-builtin types only, unlike persistent_id
+        obj_class = type(obj)
+        if not is_node_class(obj_class):
+            return NotImplemented
+        if obj_class is TypeNode and obj.is_shared:
+            return TypeNode.mock_simple, (obj.name, obj.is_literal)
+        number = self._registry.numbers.get(id(obj))
+        if number is not None:
+            return _registered_node, (number,)
+
+        # nodes of the body and ones made up by the type checker, e.g. expression types
+        return NotImplemented
+
+
+class _BodyUnpickler(pickle.Unpickler):
+    def __init__(self, file: io.BytesIO, registry: _NodeRegistry):
+        super().__init__(file)
+        self._registry = registry
+
+    def find_class(self, module_name: str, name: str):
+        if module_name == __name__ and name == _registered_node.__name__:
+            return self._registry.nodes.__getitem__
+        return super().find_class(module_name, name)
+
+
+class _WorkerBodyValidator:
+    """
+    Validates every worker_count-th body and sends the results to the main process
+    """
+
+    def __init__(self, worker_index: int, worker_count: int, connection: Connection, registry: _NodeRegistry):
+        self._worker_index = worker_index
+        self._worker_count = worker_count
+        self._connection = connection
+        self._registry = registry
+        self._body_number = 0
+
+    def validate_body(self, function_node: FunctionDefNode | ClassMethodDeclarationNode, scope_kwargs: dict) -> bool:
+        body_number = self._body_number
+        self._body_number += 1
+        if body_number % self._worker_count != self._worker_index:
+            return True
+
+        context = get_context()
+        first_error = len(context.error_logger.errors)
+        context.declaration_log = []
+        try:
+            valid = validate_scope(scope=function_node.function_body, **scope_kwargs)
+            result = (
+                body_number,
+                valid,
+                context.error_logger.errors[first_error:],
+                function_node.function_body,
+                context.declaration_log
+            )
+        finally:
+            context.declaration_log = None
+
+        buffer = io.BytesIO()
+        _BodyPickler(buffer, self._registry).dump(("body", result))
+        self._connection.send_bytes(buffer.getvalue())
+        return valid
+
+
+class _MainBodyValidator:
+    """
+    Takes the body results from the workers, in order of the sequential checking
+    """
+
+    def __init__(self, connections: list[Connection], registry: _NodeRegistry):
+        self._connections = connections
+        self._registry = registry
+        self._body_number = 0
+
+    def validate_body(self, function_node: FunctionDefNode | ClassMethodDeclarationNode, scope_kwargs: dict) -> bool:
+        body_number = self._body_number
+        self._body_number += 1
+
+        connection = self._connections[body_number % len(self._connections)]
+        try:
+            message = connection.recv_bytes()
+        except EOFError:
+            raise RuntimeError("Type checking worker exited unexpectedly")
+
+        kind, result = _BodyUnpickler(io.BytesIO(message), self._registry).load()
+        if kind == "error":
+            raise result
+
+        worker_body_number, valid, errors, body, declaration_log = result
+        if worker_body_number != body_number:
+            raise AssertionError("Worker checked the bodies in different order")
+
+        function_node.function_body = body
+
+        context = get_context()
+        context.error_logger.extend(errors)
+        for change, declaration, *args in declaration_log:
+            if change == "use":
+                declaration.use()
+            else:
+                declaration.add_instantiation(instantiation=args[0])
+        return valid
+
+
+def _run_worker(worker_index: int, worker_count: int, connection: Connection, registry: _NodeRegistry) -> None:
+    context = get_context()
+    context.body_validator = _WorkerBodyValidator(worker_index, worker_count, connection, registry)
+
+    # worker sees only its share of errors, so the limit is checked by the main process when merging them
+    context.error_logger.max_errors = None
+    try:
+        validate_all_class_definitions()
+        validate_all_function_definitions()
+    except Exception as error:
+        try:
+            message = pickle.dumps(("error", error))
+        except Exception:
+            message = pickle.dumps(("error", RuntimeError(traceback.format_exc())))
+        try:
+            connection.send_bytes(message)
+        except OSError:
+            pass  # main process already stopped checking
+    finally:
+        connection.close()
+
+
+def validate_definitions_in_parallel(program: ProgramNode, worker_count: int) -> tuple[bool, bool]:
+    """
+    Validate all class and function definitions, checking bodies of functions and methods in worker processes.
+    Results are the same as of validate_all_class_definitions and validate_all_function_definitions
+    :param program: program, which definitions are in the current context
+    :param worker_count: number of worker processes
+    :return: validity of class definitions and of function definitions
+    """
+    mp_context = multiprocessing.get_context("fork")
+    registry = _NodeRegistry(program)
+
+    # forked workers flush the inherited output buffers on exit
+    sys.stdout.flush()
+    sys.stderr.flush()
+
+    connections = []
+    processes = []
+    for worker_index in range(worker_count):
+        receiver, sender = mp_context.Pipe(duplex=False)
+        process = mp_context.Process(
+            target=_run_worker,
+            args=(worker_index, worker_count, sender, registry),
+            daemon=True
+        )
+        process.start()
+        sender.close()
+        connections.append(receiver)
+        processes.append(process)
+
+    context = get_context()
+    context.body_validator = _MainBodyValidator(connections, registry)
+    completed = False
+    try:
+        valid_class_defs = validate_all_class_definitions()
+        valid_function_defs = validate_all_function_definitions()
+        completed = True
+    finally:
+        context.body_validator = None
+        for connection in connections:
+            connection.close()
+        for process in processes:
+            if not completed:
+                process.terminate()
+            process.join()
+    return valid_class_defs, valid_function_defs
+
+
+def can_validate_in_parallel() -> bool:
+    """
+    Workers share the checked program by forking, so it's available only where processes can be forked,
+    and only while the current thread is the only one running (see the module docstring)
+    """
+    return "fork" in multiprocessing.get_all_start_methods() and threading.active_count() == 1
@@ -10,10 +10,13 @@ from ..abstract_syntax_tree import (
     ReturnNode,
     ClassDefNode,
     VariableDeclarationNode,
+    FunctionDefNode,
+    ClassMethodDeclarationNode,
     ASTNode
 )
 
-from .shared import error_logger
+from .core import ErrorCode
+from .shared import get_context
 
 from ._type_get import check_arithmetic_expression
 from ._type_match import match_types
@@ -32,40 +35,46 @@ def validate_scope(
     is_class_nonstatic_method: bool = False,
     outermost_function_scope: bool = False
 ) -> bool:
-    own_environment = environment.copy()
-
     # if empty
     if not scope.statements:
         if is_loop:
-            error_logger.add(
+            get_context().error_logger.add(
                 scope.statements,
+                ErrorCode.INVALID_STATEMENT,
                 "Loop requires at least one statement in the scope"
             )
             scope.valid = False
             return False
 
         if is_function and expected_return_type is not None:
-            error_logger.add(
+            get_context().error_logger.add(
                 scope.statements,
+                ErrorCode.INVALID_STATEMENT,
                 "Function requires at least one return statement in the scope"
             )
             scope.valid = False
             return False
 
     # validate every expression
-    valid_expression = [
-        _validate_expression(
-            expr,
-            own_environment,
-            is_loop,
-            is_function,
-            is_class,
-            expected_return_type,
-            current_class,
-            is_class_nonstatic_method,
-        )
-        for expr in scope.statements
-    ]
+    # the scope extends the environment of the outer one in place, instead of copying it,
+    # and removes its local variables on exit. It's enough since variables can't be redeclared
+    # in nested scopes, so no outer variable is ever overwritten.
+    try:
+        valid_expression = [
+            _validate_expression(
+                expr,
+                environment,
+                is_loop,
+                is_function,
+                is_class,
+                expected_return_type,
+                current_class,
+                is_class_nonstatic_method,
+            )
+            for expr in scope.statements
+        ]
+    finally:
+        _remove_local_variables(scope, environment)
 
     scope.valid = all(valid_expression)
     return scope.valid
@@ -84,13 +93,43 @@ def validate_scope(
     # # TODO: all paths return
     # if is_function and outermost_function_scope and expected_return_type is not None:
     #     if not scope.all_paths_return:
-    #         error_logger.add(
+    #         get_context().error_logger.add(
     #             scope.location,
     #             f"Not all paths return value in this scope"
     #         )
     #         return False
 
 
+def validate_function_body(
+    function_node: FunctionDefNode | ClassMethodDeclarationNode,
+    **kwargs
+) -> bool:
+    """
+    Validate the outermost scope of function or method.
+    Bodies are independent of each other, so they may be validated by the worker processes
+    (see _parallel module), otherwise it's just validate_scope
+    :param function_node: function or method which body to validate
+    :param kwargs: arguments of validate_scope
+    :return: true if the body is valid else false
+    """
+    body_validator = get_context().body_validator
+    if body_validator is not None:
+        return body_validator.validate_body(function_node, kwargs)
+    return validate_scope(scope=function_node.function_body, **kwargs)
+
+
+def _remove_local_variables(
+    scope: ScopeNode | ProgramNode,
+    environment: dict[str, TypeNode],
+) -> None:
+    """
+    (Hidden) Remove variables declared directly in the scope from the environment
+    """
+    for statement in scope.statements:
+        if isinstance(statement, VariableDeclarationNode) and environment.get(statement.name) is statement.type:
+            del environment[statement.name]
+
+
 def _validate_expression(
     expression: ASTNode,
     environment: dict[str, TypeNode],
@@ -183,8 +222,9 @@ def _validate_expression(
         expression.type: TypeNode
 
         if expression.name in environment:
-            error_logger.add(
-                expression.location,
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.INVALID_STATEMENT,
                 "Variable is already defined in current context"
             )
             expression.valid = False
@@ -209,32 +249,38 @@ def _validate_expression(
             match expression.operator:
                 case Assignment.VALUE_ASSIGNMENT:
                     if expr_type.is_reference:
-                        error_logger.add(
-                            expression.location,
+                        get_context().error_logger.add(
+                            expression,
+                            ErrorCode.UNSUPPORTED_OPERATION,
                             "Use '=' assignment operator for references!"
                         )
                         expression.valid = False
                         return False
                 case Assignment.REFERENCE_ASSIGNMENT:
                     if not expr_type.is_reference:
-                        error_logger.add(
-                            expression.location,
+                        get_context().error_logger.add(
+                            expression,
+                            ErrorCode.UNSUPPORTED_OPERATION,
                             "Use ':=' assignment operator for values!"
                         )
                         expression.valid = False
                         return False
                 case _:
-                    error_logger.add(
-                        expression.location,
-                        f"Invalid assignment operator for variable initialization: {expression.operator}"
+                    get_context().error_logger.add(
+                        expression,
+                        ErrorCode.UNSUPPORTED_OPERATION,
+                        "Invalid assignment operator for variable initialization: {}",
+                        (expression.operator,)
                     )
                     expression.valid = False
                     return False
 
             if not match_types(expr_type, expression.type):
-                error_logger.add(
-                    expression.location,
-                    f"Type mismatch for assignment operator: {expr_type.name} and {expression.type.name}"
+                get_context().error_logger.add(
+                    expression,
+                    ErrorCode.TYPE_MISMATCH,
+                    "Type mismatch for assignment operator: {} and {}",
+                    (expr_type.name, expression.type.name)
                 )
                 expression.valid = False
                 return False
@@ -246,22 +292,26 @@ def _validate_expression(
 
     elif isinstance(expression, ReturnNode):
         if not is_function:
-            error_logger.add(
-                expression.location,
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.INVALID_STATEMENT,
                 "Invalid usage of return keyword: non-function/method context"
             )
             return False
 
         if expression.value is None and expected_return_type is not None:
-            error_logger.add(
-                expression.location,
-                f"Expected some value of type {expected_return_type.name} to return"
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.TYPE_MISMATCH,
+                "Expected some value of type {} to return",
+                (expected_return_type.name,)
             )
             return False
 
         if expression.value is not None and expected_return_type is None:
-            error_logger.add(
-                expression.location,
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.TYPE_MISMATCH,
                 "Expected no return value for procedure"
             )
             return False
@@ -281,22 +331,29 @@ def _validate_expression(
             return False
 
         if not match_types(expr_type, expected_return_type):
-            error_logger.add(
-                expression.location,
-                f"Expected {expected_return_type}, but got {expr_type}"
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.TYPE_MISMATCH,
+                "Expected {}, but got {}",
+                (expected_return_type, expr_type)
             )
             return False
 
         return True
 
     elif isinstance(expression, ContinueNode):
+        # unlike break, continue with an error can't be used outside of loop either
         if not is_loop:
-            error_logger.add(
-                expression.location,
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.INVALID_STATEMENT,
                 "Empty continue keyword cannot be used outside of loop"
             )
             return False
 
+        if expression.in_loop:
+            return True
+
         # TODO: separate into 'error' type
         is_valid_expr, expr_type = check_arithmetic_expression(
             expression.catched_error, environment,
@@ -310,21 +367,26 @@ def _validate_expression(
             return False
 
         if not match_types(expr_type, TypeNode.mock_simple(TypeEnum.INTEGER)):
-            error_logger.add(
-                expression.location,
-                f"Expected error type for continue statement, but got {expr_type}"
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.TYPE_MISMATCH,
+                "Expected error type for continue statement, but got {}",
+                (expr_type,)
             )
             return False
 
         return True
 
     elif isinstance(expression, BreakNode):
-        if not is_loop and expression.loop_instance is not None:
-            error_logger.add(
-                expression.location,
-                "Empty break keyword cannot be used outside of loop"
-            )
-            return False
+        if expression.in_loop:
+            if not is_loop:
+                get_context().error_logger.add(
+                    expression,
+                    ErrorCode.INVALID_STATEMENT,
+                    "Empty break keyword cannot be used outside of loop"
+                )
+                return False
+            return True
 
         # TODO: separate into 'error' type
         is_valid_expr, expr_type = check_arithmetic_expression(
@@ -339,9 +401,11 @@ def _validate_expression(
             return False
 
         if not match_types(expr_type, TypeNode.mock_simple(TypeEnum.INTEGER)):
-            error_logger.add(
-                expression.location,
-                f"Expected error type for break statement, but got {expr_type}"
+            get_context().error_logger.add(
+                expression,
+                ErrorCode.TYPE_MISMATCH,
+                "Expected error type for break statement, but got {}",
+                (expr_type,)
             )
             return False
 
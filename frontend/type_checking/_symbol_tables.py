@@ -0,0 +1,71 @@
+"""
+Indexes of class, function and method definitions by name (and the class hierarchy), so that lookups don't scan
+all the definitions of the program. Built once in type_check_program, after the definitions are collected,
+and stored in the current TypeCheckContext.
+"""
+from ..abstract_syntax_tree import ClassDefNode, FunctionDefNode, ClassMethodDeclarationNode
+from .shared import get_context, record_dependency
+from ._class_hierarchy import ClassHierarchy
+
+
+def build_symbol_tables() -> None:
+    """
+    (Re)build all the indexes from the class and function definitions of the current context
+    """
+    context = get_context()
+    context.classes_by_name.clear()
+    context.functions_by_name.clear()
+    context.methods_by_class.clear()
+
+    for class_definition in context.class_definitions:
+        context.classes_by_name.setdefault(class_definition.name, []).append(class_definition)
+        context.methods_by_class[(id(class_definition), False)] = group_by_function_name(
+            class_definition.methods_defs
+        )
+        context.methods_by_class[(id(class_definition), True)] = group_by_function_name(
+            class_definition.static_methods_defs
+        )
+
+    context.class_hierarchy = ClassHierarchy(context.classes_by_name)
+
+    for function_definition in context.function_definitions:
+        context.functions_by_name.setdefault(function_definition.function_name, []).append(function_definition)
+
+    # resolutions might refer to previous definitions
+    context.overload_cache.invalidate()
+    context.type_cache.invalidate()
+
+
+def group_by_function_name(
+    definitions: list[FunctionDefNode | ClassMethodDeclarationNode]
+) -> dict[str, list[FunctionDefNode | ClassMethodDeclarationNode]]:
+    """
+    Group function or method definitions by name, keeping the definition order inside the groups
+    """
+    groups = {}
+    for definition in definitions:
+        groups.setdefault(definition.function_name, []).append(definition)
+    return groups
+
+
+def lookup_classes(class_name: str) -> list[ClassDefNode]:
+    record_dependency("class", class_name)
+    return get_context().classes_by_name.get(class_name, [])
+
+
+def lookup_functions(function_name: str) -> list[FunctionDefNode]:
+    return get_context().functions_by_name.get(function_name, [])
+
+
+def lookup_methods(
+    class_instance: ClassDefNode,
+    method_name: str,
+    is_static: bool = False
+) -> list[ClassMethodDeclarationNode]:
+    methods = get_context().methods_by_class.get((id(class_instance), is_static))
+    if methods is None:
+        # class isn't one of the program definitions
+        methods = group_by_function_name(
+            class_instance.methods_defs if not is_static else class_instance.static_methods_defs
+        )
+    return methods.get(method_name, [])
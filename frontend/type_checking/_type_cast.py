@@ -8,6 +8,7 @@ from ..semantics import TypeEnum
 
 
 from ._type_inheritance import least_common_base
+from ._type_lattice import lookup_common_type
 
 
 def common_base(left_type: TypeNode, right_type: TypeNode) -> TypeNode | None:
@@ -96,55 +97,4 @@ def common_primitive_type(left_type: TypeEnum | str, right_type: TypeEnum | str)
         return left_type
 
     # TODO: other implicit casts (maybe)
-    integer_types = (
-        TypeEnum.BYTE,
-        TypeEnum.SHORT_INTEGER,
-        TypeEnum.INTEGER,
-        TypeEnum.LONG_INTEGER,
-        TypeEnum.EXTENDED_INTEGER
-    )
-    float_types = (
-        TypeEnum.FLOAT,
-        TypeEnum.DOUBLE,
-        TypeEnum.COMPLEX
-    )
-    numeric_types = integer_types + float_types
-
-    if not (left_type in numeric_types and right_type in numeric_types):
-        return None
-
-    if left_type == TypeEnum.BYTE:
-        return right_type
-
-    elif left_type == TypeEnum.SHORT_INTEGER:
-        return right_type if right_type != TypeEnum.BYTE else left_type
-
-    elif left_type == TypeEnum.INTEGER:
-        return right_type if right_type not in (TypeEnum.BYTE, TypeEnum.SHORT_INTEGER) else left_type
-
-    elif left_type == TypeEnum.INTEGER:
-        return right_type if right_type not in (TypeEnum.BYTE, TypeEnum.SHORT_INTEGER, TypeEnum.INTEGER) else left_type
-
-    # extended int is not compatible with floats
-    elif left_type == TypeEnum.EXTENDED_INTEGER:
-        if right_type in float_types:
-            return None
-        else:
-            return left_type
-
-    elif left_type == TypeEnum.FLOAT:
-        if right_type == TypeEnum.EXTENDED_INTEGER:
-            return None
-        return right_type if right_type in float_types else left_type
-
-    elif left_type == TypeEnum.DOUBLE:
-        if right_type == TypeEnum.EXTENDED_INTEGER:
-            return None
-        return right_type if right_type == TypeEnum.COMPLEX else left_type
-
-    elif left_type == TypeEnum.COMPLEX:
-        if right_type == TypeEnum.EXTENDED_INTEGER:
-            return None
-        return left_type
-    else:
-        return None
+    return lookup_common_type(left_type, right_type)
@@ -1,4 +1,4 @@
-from typing import Tuple, Union, TypedDict, Unpack
+from typing import Callable, Tuple, Union
 
 from .._syntax.operators import OperatorMethods, Operator
 
@@ -22,140 +22,156 @@ from ..semantics import TypeEnum
 
 from ._type_cast import common_base, common_primitive_type
 from ._type_match import match_types
+from ._type_validate import validate_type
 from .._syntax.operators import Assignment
 
-from .shared import error_logger
+from .core import ErrorCode
+from .shared import get_context, use_declaration, record_dependency
+from ._constant_folding import fold_binary_operator, fold_unary_operator
 
 from ._helpers_class import get_class_method, get_class_field, get_class_by_name, instantiate_generic_type
 from ._helpers_function import get_function
 
 
-class _ContextParams(TypedDict):
-    outermost: bool
-    context_class: ClassDefNode | None
-    is_nonstatic_method: bool
+class ExpressionContext:
+    """
+    Immutable context the expression and all its subexpressions are checked in
+    """
+    __slots__ = ("context_class", "is_nonstatic_method", "outermost", "allow_compound_constructor", "inner")
+
+    def __init__(
+        self,
+        context_class: ClassDefNode | None = None,
+        is_nonstatic_method: bool = False,
+        outermost: bool = False,
+        allow_compound_constructor: bool = False,
+    ):
+        """
+        :param context_class: (optional) class, which method the expression is in
+        :param is_nonstatic_method: (optional) if the expression is in non-static method (so this is available)
+        :param outermost: (optional) if the expression is the whole statement (so assignment is allowed)
+        :param allow_compound_constructor: (optional) if the expression is an operand of new operator
+        """
+        self.context_class = context_class
+        self.is_nonstatic_method = is_nonstatic_method
+        self.outermost = outermost
+        self.allow_compound_constructor = allow_compound_constructor
+
+        # context of the subexpressions, created once instead of on every recursive call
+        if outermost or allow_compound_constructor:
+            self.inner = ExpressionContext(context_class, is_nonstatic_method)
+        else:
+            self.inner = self
 
 
 def check_arithmetic_expression(
     expression: ASTNode,
     environment: dict[str, TypeNode],
     outermost: bool = False,
-    **context: Unpack[_ContextParams]
+    context_class: ClassDefNode | None = None,
+    is_nonstatic_method: bool = False,
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    allow_compound_constructor = context.pop('allow_compound_constructor', False)
-    if isinstance(expression, LiteralNode):
-        valid_expr, expr_type = _check_primitive_literal(literal=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
-
-    elif isinstance(expression, BinaryOperatorABCNode):
-        valid_expr, expr_type = _check_binary_operator(expression=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
-
-    elif isinstance(expression, UnaryOperatorABCNode):
-        valid_expr, expr_type = _check_unary_operator(unary_op_expr=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
-
-    elif isinstance(expression, MemberOperatorNode):
-        valid_expr, expr_type = _check_member(expression=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
+    """
+    Check the expression and infer its type, annotating every checked node with validity and type
+    :param expression: expression to check
+    :param environment: types of the variables in scope by names
+    :param outermost: (optional) if the expression is the whole statement (so assignment is allowed)
+    :param context_class: (optional) class, which method the expression is in
+    :param is_nonstatic_method: (optional) if the expression is in non-static method
+    :return: validity of the expression and its type
+    """
+    context = ExpressionContext(context_class, is_nonstatic_method, outermost=outermost)
+    return _check_expression(expression, environment, context)
 
-    elif isinstance(expression, FunctionCallNode):
-        valid_expr, expr_type = _get_type_of_function_call(expression=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
 
-    elif isinstance(expression, IndexNode):
-        res = _get_type_of_indexation_call(
-            expression=expression, environment=environment, **context,
-            allow_compound_constructor=allow_compound_constructor
+def _check_expression(
+    expression: ASTNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    expression_class = type(expression)
+    handler = _handlers_by_class.get(expression_class, _MISSING)
+    if handler is _MISSING:
+        handler = _handlers_by_class[expression_class] = _resolve_handler(expression_class)
+
+    if handler is None:
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Unexpected expression"
         )
-        if len(res) == 2:
-            valid_expr, expr_type = res
-        elif len(res) == 3:
-            valid_expr, expr_type, _num = res
-            expression.is_overload = True
-            expression.overload_number = _num
-        else:
-            # unreachable
-            return False, None
-        expression.valid = valid_expr
-        return valid_expr, expr_type
+        return False, None
 
-    elif isinstance(expression, IdentifierNode):
-        valid_expr, expr_type = _get_type_of_identifier(expression=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
+    valid_expr, expr_type = handler(expression, environment, context)
+    return _annotate(expression, valid_expr, expr_type)
 
-    elif isinstance(expression, ThisNode):
-        valid_expr, expr_type = _check_this_literal(expression=expression, environment=environment, **context)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
 
-    elif isinstance(expression, AssignmentNode):
-        valid_expr, expr_type = _check_assignment(expression=expression, environment=environment, **context, outermost=outermost)
-        expression.valid = valid_expr
-        return valid_expr, expr_type
-    else:
-        # print(expression)
-        error_logger.add(
-            location=expression.location,
-            reason="Unexpected expression"
-        )
-        return False, None
+def _annotate(
+    expression: ASTNode,
+    valid_expr: bool,
+    expr_type: TypeNode | None
+) -> Tuple[bool, Union[TypeNode, None]]:
+    """
+    Store the check result in the expression node, so later passes don't infer its type again
+    :return: the check result itself
+    """
+    expression.valid = valid_expr
+    expression.expression_type = expr_type if valid_expr else None
+    return valid_expr, expr_type
 
 
 def _check_assignment(
     expression: AssignmentNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, TypeNode | None]:
-    outermost = context.pop("outermost", False)
-    if not outermost:
-        error_logger.add(
-            location=expression.location,
+    if not context.outermost:
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unexpected place for assignment expression"
         )
         return False, None
 
     if not isinstance(expression.left, (IndexNode, IdentifierNode, MemberOperatorNode)):
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid expression to assign into: {type(expression.left).__name__}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid expression to assign into: {}",
+            args=(type(expression.left).__name__,)
         )
         return False, None
 
-    valid_left_expr, left_expr_type = check_arithmetic_expression(
-        expression=expression.left, environment=environment, **context
-    )
-    valid_right_expr, right_expr_type = check_arithmetic_expression(
-        expression=expression.right, environment=environment, **context, outermost=outermost
-    )
+    valid_left_expr, left_expr_type = _check_expression(expression.left, environment, context.inner)
+
+    # assignment is an expression itself, so it can be chained to the right
+    valid_right_expr, right_expr_type = _check_expression(expression.right, environment, context)
 
     if not (valid_left_expr and valid_right_expr):
         # error is already logged
         return False, None
 
     if not match_types(current_type=right_expr_type, target_type=left_expr_type):
-        error_logger.add(
-            location=expression.location,
-            reason=f"Type assignment mismatch: {left_expr_type.name} != {right_expr_type.name}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.TYPE_MISMATCH,
+            reason="Type assignment mismatch: {} != {}",
+            args=(left_expr_type.name, right_expr_type.name)
         )
         return False, None
 
     if left_expr_type.is_reference and expression.operator == Assignment.VALUE_ASSIGNMENT:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNSUPPORTED_OPERATION,
             reason="Invalid assignment operator for reference: ':='"
         )
         return False, None
 
     if not left_expr_type.is_reference and expression.operator == Assignment.REFERENCE_ASSIGNMENT:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNSUPPORTED_OPERATION,
             reason="Invalid assignment operator for value: '='"
         )
         return False, None
@@ -166,29 +182,49 @@ def _check_assignment(
 def _check_this_literal(
     expression: ThisNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    context_class: ClassDefNode | None = context.get("context_class")
-    is_nonstatic_method = context.get("is_nonstatic_method", False)
-
-    if context_class and is_nonstatic_method:
-        return True, TypeNode(
-            TypeCategory.CLASS if not context_class.generic_params else TypeCategory.GENERIC_CLASS,
-            IdentifierNode(context_class.name, *context_class.location),
-            context_class.generic_params,
-            *context_class.location
-        )
-    error_logger.add(
-        location=expression.location,
+    context_class = context.context_class
+    if context_class and context.is_nonstatic_method:
+        return True, _get_this_type(context_class)
+    get_context().error_logger.add(
+        location=expression,
+        code=ErrorCode.INVALID_EXPRESSION,
         reason="Invalid context for using this keyword"
     )
     return False, None
 
 
+def _get_this_type(context_class: ClassDefNode) -> TypeNode:
+    """
+    Get the type of this in methods of the class, instantiated with its own generic parameters if it's generic
+    """
+    if not context_class.generic_params:
+        this_type = TypeNode(TypeCategory.CLASS, IdentifierNode(context_class.name, *context_class.location), None, *context_class.location)
+        this_type.represents_generic_param = False
+        this_type.set_class(cls=context_class)
+        return this_type
+
+    generic_args = []
+    for parameter in context_class.generic_params:
+        generic_arg = TypeNode(TypeCategory.CLASS, IdentifierNode(parameter.name, *parameter.location), None, *parameter.location)
+        generic_arg.represents_generic_param = True
+        generic_args.append(generic_arg)
+
+    this_type = TypeNode(
+        TypeCategory.GENERIC_CLASS,
+        IdentifierNode(context_class.name, *context_class.location),
+        generic_args,
+        *context_class.location
+    )
+    this_type.set_class(cls=context_class)
+    return this_type
+
+
 def _check_member(
     expression: MemberOperatorNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
     """
     Checks if the MembershipOperatorNode is valid and returns a field
@@ -203,16 +239,23 @@ def _check_member(
 
     member_name = expression.right.name
     operator = expression.operator
-    valid, class_type = check_arithmetic_expression(expression=expression.left, environment=environment, **context)
+
+    static_class = _get_static_class(expression.left, environment)
+    if static_class is not None:
+        return _check_static_field(expression, static_class)
+
+    valid, class_type = _check_expression(expression.left, environment, context.inner)
 
     if not valid:
         # error is logged by this point
         return False, None
 
     if class_type is None:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid expression on the left side of the membership {operator} operator"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid expression on the left side of the membership {} operator",
+            args=(operator,)
         )
         return False, None
     else:
@@ -228,9 +271,11 @@ def _check_member(
     )
 
     if class_field is None:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Field {member_name} of the class {class_type.name} does not exist"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Field {} of the class {} does not exist",
+            args=(member_name, class_type.name)
         )
         expression.right.valid = False
         return False, None
@@ -244,23 +289,82 @@ def _check_member(
     )
 
     if not is_valid:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.TYPE_MISMATCH,
             reason="Invalid return type"
         )
         return False, None
 
-    class_field.use()
+    use_declaration(class_field)
+    expression.right.expression_type = return_type
     return True, return_type
 
 
+def _get_static_class(
+    expression: ASTNode,
+    environment: dict[str, TypeNode]
+) -> ClassDefNode | None:
+    """
+    Get the class the left operand of the membership operator names, e.g. Math in Math.sqrt(x).
+    Local variables hide the classes of the same names
+    :return: the class, or None if the operand isn't a class name
+    """
+    if type(expression) is not IdentifierNode or expression.name in environment:
+        return None
+    return get_class_by_name(class_name=expression.name)
+
+
+def _get_static_class_type(
+    expression: MemberOperatorNode,
+    static_class: ClassDefNode
+) -> TypeNode | None:
+    if static_class.generic_params:
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Static members of the generic class {} can't be accessed",
+            args=(static_class.name,)
+        )
+        return None
+
+    expression.associated_class = _get_this_type(static_class)
+    expression.is_static = True
+    return expression.associated_class
+
+
+def _check_static_field(
+    expression: MemberOperatorNode,
+    static_class: ClassDefNode
+) -> Tuple[bool, Union[TypeNode, None]]:
+    if _get_static_class_type(expression, static_class) is None:
+        return False, None
+
+    member_name = expression.right.name
+    class_field = next((f for f in static_class.static_fields_defs if f.name == member_name), None)
+    if class_field is None:
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Static field {} of the class {} does not exist",
+            args=(member_name, static_class.name)
+        )
+        expression.right.valid = False
+        return False, None
+
+    expression.right.valid = True
+    use_declaration(class_field)
+    expression.right.expression_type = class_field.type
+    return True, class_field.type
+
+
 def _check_binary_operator(
     expression: BinaryOperatorABCNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    lhs_valid, lhs_type = check_arithmetic_expression(expression=expression.left, environment=environment, **context)
-    rhs_valid, rhs_type = check_arithmetic_expression(expression=expression.right, environment=environment, **context)
+    lhs_valid, lhs_type = _check_expression(expression.left, environment, context.inner)
+    rhs_valid, rhs_type = _check_expression(expression.right, environment, context.inner)
     operator = expression.operator
 
     if not (lhs_valid and rhs_valid):
@@ -268,7 +372,7 @@ def _check_binary_operator(
         return False, None
 
     if expression.is_arithmetic:
-        res = __get_type_of_arithmetic_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression.location)
+        res = __get_type_of_arithmetic_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression)
         if len(res) == 2:
             return res
         elif len(res) == 3:
@@ -281,9 +385,9 @@ def _check_binary_operator(
             return False, None
 
     elif expression.is_logical:
-        return __get_type_of_logical_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression.location)
+        return __get_type_of_logical_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression)
     elif expression.is_comparison:
-        res = __get_type_of_comparison_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression.location)
+        res = __get_type_of_comparison_binary_operator(lhs_type=lhs_type, rhs_type=rhs_type, operator=operator, location=expression)
         if len(res) == 2:
             return res
         elif len(res) == 3:
@@ -296,17 +400,19 @@ def _check_binary_operator(
             return False, None
     elif expression.is_casting:
         if not isinstance(expression.right, TypeNode):
-            error_logger.add(
-                location=expression.location,
+            get_context().error_logger.add(
+                location=expression,
+                code=ErrorCode.INVALID_EXPRESSION,
                 reason="Invalid type to cast"
             )
             return False, None
         return True, expression.right
     elif expression.is_coalesce:
-        return check_arithmetic_expression(expression=expression.left, environment=environment, **context)
+        return _check_expression(expression.left, environment, context.inner)
     else:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression"
         )
         return False, None
@@ -315,34 +421,41 @@ def _check_binary_operator(
 def ___get_type_of_overloaded_operator(
     signature: list[TypeNode],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]] | Tuple[bool, Union[TypeNode, None], int]:
     if not OperatorMethods.overloadable(operator) and operator not in ["call", "index"]:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Operator {operator} is not overridable and cannot be applied to this types"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Operator {} is not overridable and cannot be applied to this types",
+            args=(operator,)
         )
         return False, None
 
     if OperatorMethods.overloadable(operator):
-        function_name = f"$operator_{OperatorMethods.translate(operator, 2)}"
+        # unary and binary operators are overloaded by the functions of different names, e.g. NEGATE and SUB
+        function_name = f"$operator_{OperatorMethods.translate(operator, len(signature))}"
     else:
         function_name = f"$operator_{operator}"
     is_valid, function_node = get_function(func_name=function_name, args_signature=signature)
 
     if not is_valid or function_node is None:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Operator {operator} is overridable, but no override definition found"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Operator {} is overridable, but no override definition found",
+            args=(operator,)
         )
         return False, None
 
     if not isinstance(function_node.external_to, ClassDefNode):
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.UNSUPPORTED_OPERATION,
             reason="Operator overload is not associated to some class"
         )
         return False, None
+    record_dependency("class", function_node.external_to.name)
 
     # TODO: support operator overloading for generics
     # TODO: deduce generic args
@@ -353,8 +466,9 @@ def ___get_type_of_overloaded_operator(
     )
 
     if not is_valid:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.UNSUPPORTED_OPERATION,
             reason="Failed to deduce return type for operator overload"
         )
         return False, None
@@ -366,7 +480,7 @@ def __get_type_of_arithmetic_binary_operator(
     lhs_type: Union[TypeNode, None],
     rhs_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if lhs_type.category == rhs_type.category == TypeCategory.PRIMITIVE:
         common_type = common_primitive_type(left_type=lhs_type.name, right_type=rhs_type.name)
@@ -374,9 +488,11 @@ def __get_type_of_arithmetic_binary_operator(
             common_type = common_primitive_type(left_type=lhs_type.name, right_type=TypeEnum.FLOAT)
 
         if common_type is None:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
-                reason=f"Unsupported operation {operator} for types {lhs_type.name} and {rhs_type.name}"
+                code=ErrorCode.UNSUPPORTED_OPERATION,
+                reason="Unsupported operation {} for types {} and {}",
+                args=(operator, lhs_type.name, rhs_type.name)
             )
             return False, None
 
@@ -388,32 +504,40 @@ def __get_type_of_arithmetic_binary_operator(
         (lhs_type.category == TypeCategory.PRIMITIVE and rhs_type.type == TypeCategory.COLLECTION) or
         (lhs_type.category == TypeCategory.COLLECTION and rhs_type.category == TypeCategory.PRIMITIVE)
     ):
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Unsupported operation {operator} for types {lhs_type.name} and {rhs_type.name}"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Unsupported operation {} for types {} and {}",
+            args=(operator, lhs_type.name, rhs_type.name)
         )
         return False, None
 
     elif lhs_type.category == rhs_type.category == TypeCategory.COLLECTION:
         if lhs_type.type != rhs_type.type:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
-                reason=f"Unsupported operation {operator} for types {lhs_type.name} and {rhs_type.name}"
+                code=ErrorCode.UNSUPPORTED_OPERATION,
+                reason="Unsupported operation {} for types {} and {}",
+                args=(operator, lhs_type.name, rhs_type.name)
             )
             return False, None
 
         if lhs_type.type == TypeEnum.KEYMAP:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
-                reason=f"Unsupported operation {operator} for type {lhs_type.name}"
+                code=ErrorCode.UNSUPPORTED_OPERATION,
+                reason="Unsupported operation {} for type {}",
+                args=(operator, lhs_type.name)
             )
             return False, None
 
         common_type = common_base(left_type=lhs_type, right_type=rhs_type)
         if common_type is None:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
-                reason=f"Unsupported operation {operator} for types {lhs_type.name} and {rhs_type.name}"
+                code=ErrorCode.UNSUPPORTED_OPERATION,
+                reason="Unsupported operation {} for types {} and {}",
+                args=(operator, lhs_type.name, rhs_type.name)
             )
             return False, None
         return True, common_type
@@ -426,12 +550,14 @@ def __get_type_of_logical_binary_operator(
     lhs_type: Union[TypeNode, None],
     rhs_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if not (lhs_type.type == rhs_type.type == TypeEnum.BOOLEAN):
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Operator {operator} supports only boolean types"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Operator {} supports only boolean types",
+            args=(operator,)
         )
         return False, None
     return True, lhs_type
@@ -441,7 +567,7 @@ def __get_type_of_comparison_binary_operator(
     lhs_type: Union[TypeNode, None],
     rhs_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
 
     numeric_types = (
@@ -465,20 +591,73 @@ def __get_type_of_comparison_binary_operator(
         return ___get_type_of_overloaded_operator(signature=[lhs_type, rhs_type], operator=operator, location=location)
 
 
+def _check_folded_binary_operator(
+    expression: BinaryOperatorABCNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    """
+    Check the binary operator and fold it, if its operands are constants
+    """
+    valid_expr, expr_type = _check_binary_operator(expression, environment, context)
+    expression.folded_literal = None
+    if not valid_expr or expression.is_overload:
+        return valid_expr, expr_type
+
+    valid_expr, folded_literal = fold_binary_operator(expression, expr_type)
+    return _apply_folding(expression, valid_expr, expr_type, folded_literal, environment, context)
+
+
+def _check_folded_unary_operator(
+    expression: UnaryOperatorABCNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    """
+    Check the unary operator and fold it, if its operand is a constant
+    """
+    valid_expr, expr_type = _check_unary_operator(expression, environment, context)
+    expression.folded_literal = None
+    if not valid_expr or expression.is_overload:
+        return valid_expr, expr_type
+
+    valid_expr, folded_literal = fold_unary_operator(expression, expr_type)
+    return _apply_folding(expression, valid_expr, expr_type, folded_literal, environment, context)
+
+
+def _apply_folding(
+    expression: BinaryOperatorABCNode | UnaryOperatorABCNode,
+    valid_expr: bool,
+    expr_type: TypeNode | None,
+    folded_literal: LiteralNode | None,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    if not valid_expr or folded_literal is None:
+        return valid_expr, expr_type
+
+    expression.folded_literal = folded_literal
+
+    # folded integer is of the precise size, unlike the common type of operands
+    if type(folded_literal) is IntegerLiteralNode:
+        return _annotate(folded_literal, *_check_integer_literal(folded_literal, environment, context))
+    return _annotate(folded_literal, True, expr_type)
+
+
 def _check_unary_operator(
     unary_op_expr: UnaryOperatorABCNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    allow_compound_constructor = (unary_op_expr.operator == Operator.NEW_INSTANCE)
+    if unary_op_expr.operator == Operator.NEW_INSTANCE:
+        operand_context = ExpressionContext(context.context_class, context.is_nonstatic_method, allow_compound_constructor=True)
+    else:
+        operand_context = context.inner
 
-    valid_expr, expression_type = check_arithmetic_expression(
-        expression=unary_op_expr.expression, environment=environment, **context,
-        allow_compound_constructor=allow_compound_constructor
-    )
+    valid_expr, expression_type = _check_expression(unary_op_expr.expression, environment, operand_context)
     operator = unary_op_expr.operator
     if unary_op_expr.is_arithmetic:
-        res = __get_type_of_arithmetic_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr.location)
+        res = __get_type_of_arithmetic_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr)
         if len(res) == 2:
             return res
         elif len(res) == 3:
@@ -491,17 +670,18 @@ def _check_unary_operator(
             return False, None
 
     elif unary_op_expr.is_allocation:
-        return __get_type_of_allocation_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr.location)
+        return __get_type_of_allocation_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr)
 
     elif unary_op_expr.is_logical:
-        return __get_type_of_logical_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr.location)
+        return __get_type_of_logical_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr)
 
     elif unary_op_expr.is_reference:
-        return __get_type_of_reference_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr.location)
+        return __get_type_of_reference_unary_operator(expression_type=expression_type, operator=operator, location=unary_op_expr)
 
     else:
-        error_logger.add(
-            location=unary_op_expr.location,
+        get_context().error_logger.add(
+            location=unary_op_expr,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression"
         )
         return False, None
@@ -510,22 +690,26 @@ def _check_unary_operator(
 def __get_type_of_arithmetic_unary_operator(
     expression_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if expression_type.category == TypeCategory.PRIMITIVE:
         compatible_type = common_primitive_type(left_type=expression_type.name, right_type=TypeEnum.BYTE)
         if compatible_type is None:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
-                reason=f"Unsupported unary operation {operator} for types {expression_type.name}"
+                code=ErrorCode.UNSUPPORTED_OPERATION,
+                reason="Unsupported unary operation {} for types {}",
+                args=(operator, expression_type.name)
             )
             return False, None
         return True, expression_type
 
     elif expression_type.category == TypeCategory.COLLECTION:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Unsupported unary operation {operator} for types {expression_type.name}"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Unsupported unary operation {} for types {}",
+            args=(operator, expression_type.name)
         )
         return False, None
 
@@ -536,12 +720,14 @@ def __get_type_of_arithmetic_unary_operator(
 def __get_type_of_logical_unary_operator(
     expression_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if expression_type.type != TypeEnum.BOOLEAN:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
-            reason=f"Operator {operator} supports only boolean types"
+            code=ErrorCode.UNSUPPORTED_OPERATION,
+            reason="Operator {} supports only boolean types",
+            args=(operator,)
         )
         return False, None
     return True, expression_type
@@ -550,11 +736,12 @@ def __get_type_of_logical_unary_operator(
 def __get_type_of_allocation_unary_operator(
     expression_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if expression_type is None:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression for allocation before even checking"
         )
         return False, None
@@ -565,8 +752,9 @@ def __get_type_of_allocation_unary_operator(
     elif operator == Operator.DELETE_INSTANCE:
         return True, None
     else:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression for allocation"
         )
         return False, None
@@ -575,12 +763,13 @@ def __get_type_of_allocation_unary_operator(
 def __get_type_of_reference_unary_operator(
     expression_type: Union[TypeNode, None],
     operator: str,
-    location: tuple[int, int]
+    location: ASTNode
 ) -> Tuple[bool, Union[TypeNode, None]]:
     if operator == Operator.REFERENCE:
         if expression_type.is_reference:
-            error_logger.add(
+            get_context().error_logger.add(
                 location=location,
+                code=ErrorCode.UNSUPPORTED_OPERATION,
                 reason="Cannot reference already referenced type"
             )
             return False, None
@@ -588,8 +777,9 @@ def __get_type_of_reference_unary_operator(
         copy.set_reference()
         return True, copy
     elif operator == Operator.DEREFERENCE:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.UNSUPPORTED_OPERATION,
             reason="Cannot dereference non-reference type"
         )
         if not expression_type.is_reference:
@@ -598,8 +788,9 @@ def __get_type_of_reference_unary_operator(
         copy.unset_reference()
         return True, copy
     else:
-        error_logger.add(
+        get_context().error_logger.add(
             location=location,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression"
         )
         return False, None
@@ -608,16 +799,18 @@ def __get_type_of_reference_unary_operator(
 def _get_type_of_identifier(
     expression: IdentifierNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
     maybe_local_var = environment.get(expression.name)
     if maybe_local_var is not None:
         return True, maybe_local_var
 
     # function name, class name...
-    error_logger.add(
-        location=expression.location,
-        reason=f"Unresolved reference for {expression.name}"
+    get_context().error_logger.add(
+        location=expression,
+        code=ErrorCode.UNRESOLVED_REFERENCE,
+        reason="Unresolved reference for {}",
+        args=(expression.name,)
     )
     return False, None
 
@@ -625,23 +818,24 @@ def _get_type_of_identifier(
 def _get_type_of_function_call(
     expression: FunctionCallNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
 
     function_id = expression.identifier
     if isinstance(function_id, MemberOperatorNode):
-        return __get_method_call(expression=expression, environment=environment, **context)
+        return __get_method_call(expression=expression, environment=environment, context=context)
 
     elif isinstance(function_id, IdentifierNode):
-        return __get_function_call(expression=expression, environment=environment, **context)
+        return __get_function_call(expression=expression, environment=environment, context=context)
 
     elif isinstance(function_id, TypeNode):
-        return __get_constructor_call(expression=expression, environment=environment, **context)
+        return __get_constructor_call(expression=expression, environment=environment, context=context)
 
     # Assume no static, functors etc
     else:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Unsupported expression"
         )
         return False, None
@@ -650,17 +844,22 @@ def _get_type_of_function_call(
 def __get_method_call(
     expression: FunctionCallNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
     function_id: MemberOperatorNode = expression.identifier
-    valid, class_type_node = check_arithmetic_expression(expression=function_id, environment=environment, **context)
+    static_class = _get_static_class(function_id.left, environment)
+    if static_class is not None:
+        return __get_static_method_call(expression, static_class, environment, context)
+
+    valid, class_type_node = _check_expression(function_id, environment, context.inner)
     if not valid:
         # error is already logged
         return False, None
 
     if not isinstance(class_type_node, TypeNode):
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
             reason="Invalid expression for method call"
         )
         return False, None
@@ -669,22 +868,26 @@ def __get_method_call(
 
     potentially_method_name = function_id.right
     if not isinstance(potentially_method_name, IdentifierNode):
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid expression for method name: {type(potentially_method_name).__name__}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid expression for method name: {}",
+            args=(type(potentially_method_name).__name__,)
         )
         return False, None
 
     if class_type_node.category not in (TypeCategory.CLASS, TypeCategory.GENERIC_CLASS):
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid type: {class_type_node.type}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid type: {}",
+            args=(class_type_node.type,)
         )
         return False, None
 
     args_signature = []
     for arg in expression.arguments:
-        valid_arg, arg_type = check_arithmetic_expression(expression=arg, environment=environment, **context)
+        valid_arg, arg_type = _check_expression(arg, environment, context.inner)
         if not valid_arg:
             # error is already logged
             return False, None
@@ -700,9 +903,11 @@ def __get_method_call(
         type_signature=args_signature)
 
     if not class_method:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid type: method {potentially_method_name.name} doesn't exist"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Invalid type: method {} doesn't exist",
+            args=(potentially_method_name.name,)
         )
         return False, None
 
@@ -712,26 +917,77 @@ def __get_method_call(
         generic_args=class_type_node.arguments
     )
     if not is_valid:
-        error_logger.add(
-            location=expression.location,
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.TYPE_MISMATCH,
             reason="Invalid return type"
         )
         return False, None
 
     expression.overload_number = class_method.overload_number
-    class_method.use()
+    use_declaration(class_method)
     return True, return_type
 
 
+def __get_static_method_call(
+    expression: FunctionCallNode,
+    static_class: ClassDefNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    function_id: MemberOperatorNode = expression.identifier
+    if not isinstance(function_id.right, IdentifierNode):
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid expression for method name: {}",
+            args=(type(function_id.right).__name__,)
+        )
+        return False, None
+
+    if _get_static_class_type(function_id, static_class) is None:
+        return False, None
+
+    args_signature = []
+    for arg in expression.arguments:
+        valid_arg, arg_type = _check_expression(arg, environment, context.inner)
+        if not valid_arg:
+            # error is already logged
+            return False, None
+        args_signature.append(arg_type)
+
+    method_name = function_id.right.name
+    static_method = get_class_method(
+        _class=static_class,
+        method_name=method_name,
+        type_signature=args_signature,
+        is_static=True
+    )
+    if static_method is None:
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Static method {} of the class {} doesn't exist",
+            args=(method_name, static_class.name)
+        )
+        return False, None
+
+    function_id.right.valid = True
+    function_id.right.expression_type = static_method.return_type
+    expression.overload_number = static_method.overload_number
+    use_declaration(static_method)
+    return True, static_method.return_type
+
+
 def __get_function_call(
     expression: FunctionCallNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
     function_id: IdentifierNode = expression.identifier
     args_signature = []
     for arg in expression.arguments:
-        valid_arg, arg_type = check_arithmetic_expression(expression=arg, environment=environment, **context)
+        valid_arg, arg_type = _check_expression(arg, environment, context.inner)
         if not valid_arg:
             # error is already logged
             return False, None
@@ -739,26 +995,28 @@ def __get_function_call(
 
     is_valid, function_node = get_function(func_name=function_id.name, args_signature=args_signature)
     if not is_valid or function_node is None:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid function: {function_id.name}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Invalid function: {}",
+            args=(function_id.name,)
         )
         return False, None
 
     expression.overload_number = function_node.overload_number
-    function_node.use()
+    use_declaration(function_node)
     return True, function_node.return_type
 
 
 def __get_constructor_call(
     expression: FunctionCallNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ):
     function_id: TypeNode = expression.identifier
     args_signature = []
     for arg in expression.arguments:
-        valid_arg, arg_type = check_arithmetic_expression(expression=arg, environment=environment, **context)
+        valid_arg, arg_type = _check_expression(arg, environment, context.inner)
         if not valid_arg:
             # error is already logged
             return False, None
@@ -767,63 +1025,98 @@ def __get_constructor_call(
     # TODO: generic constructor
     class_node = get_class_by_name(function_id.name)
     if not class_node:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Class {function_id.name} doesn't exist!"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Class {} doesn't exist!",
+            args=(function_id.name,)
         )
         return False, None
 
     constructor_node = get_class_method(function_id.name, "$constructor", args_signature, False)
     if constructor_node is None:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid constructor for class {function_id.name}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Invalid constructor for class {}",
+            args=(function_id.name,)
         )
         return False, None
 
+    if class_node.generic_params:
+        # instantiation of the generic class, e.g. new Box[integer](...)
+        context_class = context.context_class
+        generic_parameters_context = context_class.generic_params if context_class is not None else None
+        if not validate_type(function_id, generic_parameters_context):
+            return False, None
+
     expression.overload_number = constructor_node.overload_number
-    constructor_node.use()
-    return True, TypeNode(
-        TypeCategory.CLASS,
+    use_declaration(constructor_node)
+    constructed_type = TypeNode(
+        TypeCategory.GENERIC_CLASS if class_node.generic_params else TypeCategory.CLASS,
         IdentifierNode(class_node.name, *expression.location),
-        None,
+        function_id.arguments if class_node.generic_params else None,
         *expression.location
     )
+    constructed_type.set_class(cls=class_node)
+    return True, constructed_type
+
+
+def _check_indexation(
+    expression: IndexNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    res = _get_type_of_indexation_call(expression=expression, environment=environment, context=context)
+    if len(res) == 2:
+        return res
+    elif len(res) == 3:
+        valid_expr, expr_type, _num = res
+        expression.is_overload = True
+        expression.overload_number = _num
+        return valid_expr, expr_type
+    else:
+        # unreachable
+        return False, None
 
 
 def _get_type_of_indexation_call(
     expression: IndexNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    allow_compound_constructor = context.pop('allow_compound_constructor', False)
-    valid_expr, expression_type = check_arithmetic_expression(expression=expression.variable, environment=environment, **context)
+    valid_expr, expression_type = _check_expression(expression.variable, environment, context.inner)
 
     if not valid_expr:
         # error is already logged
         return False, None
 
     if expression_type.category == TypeCategory.PRIMITIVE:
-        error_logger.add(
-            location=expression.location,
-            reason=f"Invalid type: {expression_type.name}"
+        get_context().error_logger.add(
+            location=expression,
+            code=ErrorCode.INVALID_EXPRESSION,
+            reason="Invalid type: {}",
+            args=(expression_type.name,)
         )
         return False, None
 
     elif expression_type.category == TypeCategory.COLLECTION:
         if expression_type.name not in (TypeEnum.ARRAY, TypeEnum.KEYMAP):
-            error_logger.add(
-                location=expression.location,
-                reason=f"Invalid type: {expression_type.name}"
+            get_context().error_logger.add(
+                location=expression,
+                code=ErrorCode.INVALID_EXPRESSION,
+                reason="Invalid type: {}",
+                args=(expression_type.name,)
             )
             return False, None
 
     argument_signature = [expression_type]
     for arg in expression.arguments:
-        valid, arg_type = check_arithmetic_expression(expression=arg, environment=environment, **context)
+        valid, arg_type = _check_expression(arg, environment, context.inner)
         if not valid:
-            error_logger.add(
-                location=arg.location,
+            get_context().error_logger.add(
+                location=arg,
+                code=ErrorCode.INVALID_EXPRESSION,
                 reason="Invalid expression"
             )
             return False, None
@@ -832,28 +1125,35 @@ def _get_type_of_indexation_call(
     if expression_type.category == TypeCategory.COLLECTION:
 
         if not expression_type.arguments:
-            error_logger.add(
-                location=expression.location,
+            get_context().error_logger.add(
+                location=expression,
+                code=ErrorCode.INVALID_EXPRESSION,
                 reason="Invalid collection: no containing type provided"
             )
             return False, None
 
-        if len(argument_signature) == 0:
-            error_logger.add(
-                location=expression.location,
+        # the signature starts with the type of the collection itself
+        if len(argument_signature) == 1:
+            get_context().error_logger.add(
+                location=expression,
+                code=ErrorCode.INVALID_EXPRESSION,
                 reason="No argument provided for collection type"
             )
-        if len(argument_signature) > 1:
-            if True:
-                error_logger.add(
-                    location=expression.location,
-                    reason="Too many arguments for collection type"
-                )
+            return False, None
+        if len(argument_signature) > 2:
+            get_context().error_logger.add(
+                location=expression,
+                code=ErrorCode.INVALID_EXPRESSION,
+                reason="Too many arguments for collection type"
+            )
+            return False, None
         if expression_type.name == TypeEnum.ARRAY:
             cpt = common_primitive_type(left_type=argument_signature[1].name, right_type=TypeEnum.INTEGER)
             if not cpt or cpt != TypeEnum.INTEGER:
-                error_logger.add(
-                    location="Non-integer type argument provided for array type in index"
+                get_context().error_logger.add(
+                    location=expression,
+                    code=ErrorCode.TYPE_MISMATCH,
+                    reason="Non-integer type argument provided for array type in index"
                 )
                 return False, None
 
@@ -862,204 +1162,216 @@ def _get_type_of_indexation_call(
         else:
             cpt = common_primitive_type(left_type=argument_signature[1].name, right_type=expression_type.arguments[0].name)
             if not cpt:
-                error_logger.add(
-                    location="Incompatible type argument provided for keymap type in index"
+                get_context().error_logger.add(
+                    location=expression,
+                    code=ErrorCode.TYPE_MISMATCH,
+                    reason="Incompatible type argument provided for keymap type in index"
                 )
                 return False, None
 
             return True, expression_type.arguments[1]
     else:
-        return ___get_type_of_overloaded_operator(signature=argument_signature, operator="index", location=expression.location)
+        return ___get_type_of_overloaded_operator(signature=argument_signature, operator="index", location=expression)
 
 
-def _check_primitive_literal(
-    literal: LiteralNode,
+def _check_integer_literal(
+    literal: IntegerLiteralNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> Tuple[bool, Union[TypeNode, None]]:
-    if isinstance(literal, IntegerLiteralNode):
-        match literal.size:
-            case IntegerSizes.BYTE:
-                type_of_literal = TypeEnum.BYTE
-            case IntegerSizes.SHORT:
-                type_of_literal = TypeEnum.SHORT_INTEGER
-            case IntegerSizes.INTEGER:
-                type_of_literal = TypeEnum.INTEGER
-            case IntegerSizes.LONG:
-                type_of_literal = TypeEnum.LONG_INTEGER
-            case IntegerSizes.EXTENDED:
-                type_of_literal = TypeEnum.EXTENDED_INTEGER
-            case _:
-                raise ValueError(f"Invalid literal type: {literal.size}")
+    match literal.size:
+        case IntegerSizes.BYTE:
+            type_of_literal = TypeEnum.BYTE
+        case IntegerSizes.SHORT:
+            type_of_literal = TypeEnum.SHORT_INTEGER
+        case IntegerSizes.INTEGER:
+            type_of_literal = TypeEnum.INTEGER
+        case IntegerSizes.LONG:
+            type_of_literal = TypeEnum.LONG_INTEGER
+        case IntegerSizes.EXTENDED:
+            type_of_literal = TypeEnum.EXTENDED_INTEGER
+        case _:
+            raise ValueError(f"Invalid literal type: {literal.size}")
+
+    return True, TypeNode.mock_simple(type_of_literal, literal=True)
+
+
+def _check_float_literal(
+    literal: FloatLiteralNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    match literal.size:
+        case FloatSizes.FLOAT:
+            type_of_literal = TypeEnum.FLOAT
+        case FloatSizes.DOUBLE:
+            type_of_literal = TypeEnum.DOUBLE
+        case _:
+            raise ValueError(f"Invalid literal type: {literal.size}")
 
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(type_of_literal, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
+    return True, TypeNode.mock_simple(type_of_literal, literal=True)
 
-        )
-    elif isinstance(literal, FloatLiteralNode):
-        match literal.size:
-            case FloatSizes.FLOAT:
-                type_of_literal = TypeEnum.FLOAT
-            case FloatSizes.DOUBLE:
-                type_of_literal = TypeEnum.DOUBLE
-            case _:
-                raise ValueError(f"Invalid literal type: {literal.size}")
 
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(type_of_literal, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, ImaginaryFloatLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.COMPLEX, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, StringLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.STRING, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, BooleanLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.BOOLEAN, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, ByteStringLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.BYTESTRING, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, NullLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.NULL, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, UndefinedLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.UNDEFINED, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
-    elif isinstance(literal, CharLiteralNode):
-        return True, TypeNode(
-            category=TypeCategory.PRIMITIVE,
-            type_node=TypeLiteral(TypeEnum.CHAR, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
+def _simple_literal_checker(type_of_literal: TypeEnum) -> Callable:
+    """
+    Get the checker of literals of the given primitive type
+    """
+    def check_simple_literal(
+        literal: LiteralNode,
+        environment: dict[str, TypeNode],
+        context: ExpressionContext
+    ) -> Tuple[bool, Union[TypeNode, None]]:
+        return True, TypeNode.mock_simple(type_of_literal, literal=True)
 
-    elif isinstance(literal, ListLiteralNode):
-        elements: list[TypeNode] = []
-        for arg in literal.elements:
-            valid_arg, arg_type = check_arithmetic_expression(expression=arg, environment=environment, **context)
-            if not valid_arg:
-                # error is already logged
-                return False, None
-            elements.append(arg_type)
+    return check_simple_literal
 
-        if len(elements) == 0:
-            raise AssertionError("Tree shouldn't be parsed like that")
 
-        common_compatible_type = elements[0]
+def _check_list_literal(
+    literal: ListLiteralNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    elements: list[TypeNode] = []
+    for arg in literal.elements:
+        valid_arg, arg_type = _check_expression(arg, environment, context.inner)
+        if not valid_arg:
+            # error is already logged
+            return False, None
+        elements.append(arg_type)
 
-        if len(elements) > 1:
-            for element in elements:
-                common_compatible_type = common_base(left_type=element, right_type=common_compatible_type)
-                if common_compatible_type is None:
-                    error_logger.add(
-                        location=element.location,
-                        reason="Type inconsistency in list/array literal"
-                    )
-                    return False, None
+    if len(elements) == 0:
+        raise AssertionError("Tree shouldn't be parsed like that")
+
+    common_compatible_type = elements[0]
+
+    if len(elements) > 1:
+        for element in elements:
+            common_compatible_type = common_base(left_type=element, right_type=common_compatible_type)
+            if common_compatible_type is None:
+                get_context().error_logger.add(
+                    location=element,
+                    code=ErrorCode.TYPE_MISMATCH,
+                    reason="Type inconsistency in list/array literal"
+                )
+                return False, None
+
+    return True, TypeNode(
+        category=TypeCategory.COLLECTION,
+        type_node=TypeLiteral(TypeEnum.ARRAY, *literal.location),
+        args=[common_compatible_type],
+        line=literal.location[0], position=literal.location[1],
+        _literal=True,
+    )
 
-        return True, TypeNode(
-            category=TypeCategory.COLLECTION,
-            type_node=TypeLiteral(TypeEnum.ARRAY, *literal.location),
-            args=[common_compatible_type],
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
 
-    elif isinstance(literal, KeymapLiteralNode):
-        elements: list[tuple[TypeNode, TypeNode]] = []
-        for arg in literal.elements:
-            valid_arg, arg_type = __check_keymap_literal(arg=arg, environment=environment, **context)
-            if not valid_arg:
-                # error is already logged
+def _check_keymap_literal(
+    literal: KeymapLiteralNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    elements: list[tuple[TypeNode, TypeNode]] = []
+    for arg in literal.elements:
+        valid_arg, arg_type = __check_keymap_literal(arg=arg, environment=environment, context=context)
+        if not valid_arg:
+            # error is already logged
+            return False, None
+        elements.append(arg_type)
+
+    if len(elements) == 0:
+        raise AssertionError("Tree shouldn't be parsed like that")
+
+    common_compatible_key_type, common_compatible_value_type = elements[0]
+
+    if len(elements) > 1:
+        for element in elements:
+            common_compatible_key_type = common_base(left_type=element[0], right_type=common_compatible_key_type)
+            common_compatible_value_type = common_base(left_type=element[1], right_type=common_compatible_value_type)
+            if common_compatible_key_type is None or common_compatible_value_type is None:
+                get_context().error_logger.add(
+                    location=element[0],
+                    code=ErrorCode.TYPE_MISMATCH,
+                    reason="Type inconsistency in keymap literal"
+                )
                 return False, None
-            elements.append(arg_type)
 
-        if len(elements) == 0:
-            raise AssertionError("Tree shouldn't be parsed like that")
+    return True, TypeNode(
+        category=TypeCategory.COLLECTION,
+        type_node=TypeLiteral(name=TypeEnum.ARRAY, *literal.location),
+        args=[common_compatible_key_type, common_compatible_value_type],
+        line=literal.location[0], position=literal.location[1],
+        _literal=True,
+    )
 
-        common_compatible_key_type, common_compatible_value_type = elements[0]
 
-        if len(elements) > 1:
-            for element in elements:
-                common_compatible_key_type = common_base(left_type=element[0], right_type=common_compatible_key_type)
-                common_compatible_value_type = common_base(left_type=element[1], right_type=common_compatible_value_type)
-                if common_compatible_key_type is None or common_compatible_value_type is None:
-                    error_logger.add(
-                        location=element[0].location,
-                        reason="Type inconsistency in keymap literal"
-                    )
-                    return False, None
+def _check_empty_literal(
+    literal: EmptyLiteralNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    # special case: can be any empty sequence
+    return True, TypeNode(
+        category=TypeCategory.COLLECTION,
+        type_node=TypeLiteral(name=TypeEnum.ARRAY, *literal.location),
+        args=None,
+        line=literal.location[0], position=literal.location[1],
+        _literal=True
+    )
 
-        return True, TypeNode(
-            category=TypeCategory.COLLECTION,
-            type_node=TypeLiteral(name=TypeEnum.ARRAY, *literal.location),
-            args=[common_compatible_key_type, common_compatible_value_type],
-            line=literal.location[0], position=literal.location[1],
-            _literal=True,
-        )
 
-    elif isinstance(literal, EmptyLiteralNode):
-        # special case: can be any empty sequence
-        return True, TypeNode(
-            category=TypeCategory.COLLECTION,
-            type_node=TypeLiteral(name=TypeEnum.ARRAY, *literal.location),
-            args=None,
-            line=literal.location[0], position=literal.location[1],
-            _literal=True
-        )
-    else:
-        return False, None
+def _check_unsupported_literal(
+    literal: LiteralNode,
+    environment: dict[str, TypeNode],
+    context: ExpressionContext
+) -> Tuple[bool, Union[TypeNode, None]]:
+    return False, None
 
 
 def __check_keymap_literal(
     arg: KeymapElementNode,
     environment: dict[str, TypeNode],
-    **context: Unpack[_ContextParams]
+    context: ExpressionContext
 ) -> tuple[bool, tuple[TypeNode, TypeNode] | None]:
-    valid_key, key_type = check_arithmetic_expression(expression=arg.left, environment=environment, **context)
-    valid_value, value_type = check_arithmetic_expression(expression=arg.right, environment=environment, **context)
+    valid_key, key_type = _check_expression(arg.left, environment, context.inner)
+    valid_value, value_type = _check_expression(arg.right, environment, context.inner)
 
     if not valid_key or not valid_value:
         return False, None
 
     return True, (key_type, value_type)
+
+
+# checkers of expressions by node class, in order of priority: the first one the class is a subclass of is used
+_HANDLERS: tuple[tuple[type, Callable], ...] = (
+    (IntegerLiteralNode, _check_integer_literal),
+    (FloatLiteralNode, _check_float_literal),
+    (ImaginaryFloatLiteralNode, _simple_literal_checker(TypeEnum.COMPLEX)),
+    (StringLiteralNode, _simple_literal_checker(TypeEnum.STRING)),
+    (BooleanLiteralNode, _simple_literal_checker(TypeEnum.BOOLEAN)),
+    (ByteStringLiteralNode, _simple_literal_checker(TypeEnum.BYTESTRING)),
+    (NullLiteralNode, _simple_literal_checker(TypeEnum.NULL)),
+    (UndefinedLiteralNode, _simple_literal_checker(TypeEnum.UNDEFINED)),
+    (CharLiteralNode, _simple_literal_checker(TypeEnum.CHAR)),
+    (ListLiteralNode, _check_list_literal),
+    (KeymapLiteralNode, _check_keymap_literal),
+    (EmptyLiteralNode, _check_empty_literal),
+    (LiteralNode, _check_unsupported_literal),
+    (BinaryOperatorABCNode, _check_folded_binary_operator),
+    (UnaryOperatorABCNode, _check_folded_unary_operator),
+    (MemberOperatorNode, _check_member),
+    (FunctionCallNode, _get_type_of_function_call),
+    (IndexNode, _check_indexation),
+    (IdentifierNode, _get_type_of_identifier),
+    (ThisNode, _check_this_literal),
+    (AssignmentNode, _check_assignment),
+)
+
+# isinstance checks against abstract node classes are slow, so the checker is resolved once per class
+_MISSING = object()
+_handlers_by_class: dict[type, Callable | None] = {}
+
+
+def _resolve_handler(expression_class: type) -> Callable | None:
+    for node_class, handler in _HANDLERS:
+        if issubclass(expression_class, node_class):
+            return handler
+    return None
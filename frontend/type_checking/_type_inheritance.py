@@ -5,6 +5,7 @@ from ..abstract_syntax_tree import (
 )
 
 from ._helpers_class import get_class_by_name
+from .shared import get_context
 from ._type_match import strict_match_types
 
 
@@ -68,6 +69,15 @@ def least_common_base(
     else:
         raise AssertionError("Invalid use: should be a ClassDefinitionNode or TypeNode and equal type args")
 
+    # both classes are linearized: constant time query
+    hierarchy = get_context().class_hierarchy
+    if hierarchy is not None:
+        cls_id = hierarchy.get_id(cls)
+        other_id = hierarchy.get_id(other)
+        if cls_id is not None and other_id is not None:
+            common_class = hierarchy.least_common_base(cls_id, other_id)
+            return common_class.name if common_class is not None else None
+
     cls_inheritance_tree = get_superclass_list(cls=cls, as_strings=True)
     other_inheritance_tree = get_superclass_list(cls=other, as_strings=True)
 
@@ -175,6 +185,13 @@ def __is_subclass_of(
     elif cls_node.superclass is None:
         return False
 
+    hierarchy = get_context().class_hierarchy
+    if hierarchy is not None:
+        cls_id = hierarchy.get_id(cls_node)
+        other_id = hierarchy.get_id(other_node.name)
+        if cls_id is not None and other_id is not None:
+            return hierarchy.is_subclass(cls_id, other_id)
+
     __loop_iterations = 0
     __while_loop_limiter = 100
     curr_class_node = cls_node
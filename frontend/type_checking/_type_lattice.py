@@ -0,0 +1,155 @@
+"""
+Precomputed implicit conversion lattice of primitive types.
+Both the conversion relation and the common types are built once at import
+as flat matrices indexed by small type ids, so the type checker does single lookups.
+"""
+from ..semantics import TypeEnum
+
+
+# small int id of every type, used as matrix index
+_TYPE_IDS: dict[TypeEnum, int] = {type_name: index for index, type_name in enumerate(TypeEnum)}
+_SIZE = len(_TYPE_IDS)
+
+# implicit casts of primitive types (besides the identity)
+_IMPLICIT_CASTS: dict[TypeEnum, tuple[TypeEnum, ...]] = {
+    TypeEnum.BYTE: (
+        TypeEnum.SHORT_INTEGER,
+        TypeEnum.INTEGER,
+        TypeEnum.LONG_INTEGER,
+        TypeEnum.EXTENDED_INTEGER,
+        TypeEnum.FLOAT,
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX
+    ),
+    TypeEnum.SHORT_INTEGER: (
+        TypeEnum.INTEGER,
+        TypeEnum.LONG_INTEGER,
+        TypeEnum.EXTENDED_INTEGER,
+        TypeEnum.FLOAT,
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX
+    ),
+    TypeEnum.INTEGER: (
+        TypeEnum.LONG_INTEGER,
+        TypeEnum.EXTENDED_INTEGER,
+        TypeEnum.FLOAT,
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX
+    ),
+    TypeEnum.LONG_INTEGER: (
+        TypeEnum.EXTENDED_INTEGER,
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX,
+    ),
+    TypeEnum.FLOAT: (
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX
+    ),
+    TypeEnum.DOUBLE: (
+        TypeEnum.COMPLEX,
+    ),
+}
+
+# common types of numeric types: row is the left type, columns follow the order of _NUMERIC_TYPES.
+# The table keeps the results of the if/elif chain it replaced, which had no branch for long integer on the left
+# (the integer one was repeated instead), so the table isn't symmetric: long integer on the left has a common type
+# only with itself, while on the right it has one with every numeric type,
+# e.g. integer and long integer give long integer, but long integer and integer give none
+_NUMERIC_TYPES = (
+    TypeEnum.BYTE,
+    TypeEnum.SHORT_INTEGER,
+    TypeEnum.INTEGER,
+    TypeEnum.LONG_INTEGER,
+    TypeEnum.EXTENDED_INTEGER,
+    TypeEnum.FLOAT,
+    TypeEnum.DOUBLE,
+    TypeEnum.COMPLEX
+)
+_B, _S, _I, _L, _E, _F, _D, _C = _NUMERIC_TYPES
+_COMMON_TYPES: dict[TypeEnum, tuple[TypeEnum | None, ...]] = {
+    TypeEnum.BYTE:             (_B, _S, _I, _L, _E, _F, _D, _C),
+    TypeEnum.SHORT_INTEGER:    (_S, _S, _I, _L, _E, _F, _D, _C),
+    TypeEnum.INTEGER:          (_I, _I, _I, _L, _E, _F, _D, _C),
+    TypeEnum.LONG_INTEGER:     (None, None, None, _L, None, None, None, None),
+    TypeEnum.EXTENDED_INTEGER: (_E, _E, _E, _E, _E, None, None, None),
+    TypeEnum.FLOAT:            (_F, _F, _F, _F, None, _F, _D, _C),
+    TypeEnum.DOUBLE:           (_D, _D, _D, _D, None, _D, _D, _C),
+    TypeEnum.COMPLEX:          (_C, _C, _C, _C, None, _C, _C, _C),
+}
+
+
+def _build_conversion_matrix() -> tuple[bool, ...]:
+    matrix = [False] * (_SIZE * _SIZE)
+    for type_id in _TYPE_IDS.values():
+        matrix[type_id * _SIZE + type_id] = True
+    for source, targets in _IMPLICIT_CASTS.items():
+        for target in targets:
+            matrix[_TYPE_IDS[source] * _SIZE + _TYPE_IDS[target]] = True
+    return tuple(matrix)
+
+
+def _build_common_type_matrix() -> tuple[TypeEnum | None, ...]:
+    matrix: list[TypeEnum | None] = [None] * (_SIZE * _SIZE)
+    for left_type, row in _COMMON_TYPES.items():
+        for right_type, common in zip(_NUMERIC_TYPES, row):
+            matrix[_TYPE_IDS[left_type] * _SIZE + _TYPE_IDS[right_type]] = common
+    return tuple(matrix)
+
+
+_CONVERSION_MATRIX = _build_conversion_matrix()
+_COMMON_TYPE_MATRIX = _build_common_type_matrix()
+
+
+def is_implicitly_convertible(source_type: TypeEnum | str, target_type: TypeEnum | str) -> bool:
+    """
+    Checks if the primitive type can be implicitly cast into the other one
+    :param source_type: name of the primitive type to be cast
+    :param target_type: name of the primitive type to cast into
+    :return: True if types are equal or the implicit cast exists
+    """
+    source_id = _TYPE_IDS.get(source_type)
+    target_id = _TYPE_IDS.get(target_type)
+    if source_id is None or target_id is None:
+        return source_type == target_type
+    return _CONVERSION_MATRIX[source_id * _SIZE + target_id]
+
+
+def lookup_common_type(left_type: TypeEnum | str, right_type: TypeEnum | str) -> TypeEnum | None:
+    """
+    Looks up the common type of two different primitive types
+    :param left_type: name of the left primitive type
+    :param right_type: name of the right primitive type
+    :return: common type or None if there is no such one
+    """
+    left_id = _TYPE_IDS.get(left_type)
+    right_id = _TYPE_IDS.get(right_type)
+    if left_id is None or right_id is None:
+        return None
+    return _COMMON_TYPE_MATRIX[left_id * _SIZE + right_id]
+
+
+def _build_conversion_classes() -> dict[TypeEnum, TypeEnum]:
+    # types connected by implicit casts (in any direction) share the class, named by its first type
+    classes = {type_name: type_name for type_name in _TYPE_IDS}
+    for source, targets in _IMPLICIT_CASTS.items():
+        for target in targets:
+            source_class, target_class = classes[source], classes[target]
+            if source_class != target_class:
+                merged = min(source_class, target_class, key=_TYPE_IDS.__getitem__)
+                for type_name, type_class in classes.items():
+                    if type_class == source_class or type_class == target_class:
+                        classes[type_name] = merged
+    return classes
+
+
+_CONVERSION_CLASSES = _build_conversion_classes()
+
+
+def get_conversion_class(type_name: TypeEnum | str) -> TypeEnum | str:
+    """
+    Get the class of the primitive type in terms of implicit casts:
+    types of different classes are never cast into each other
+    :param type_name: name of the primitive type
+    :return: name of the first type of the class
+    """
+    return _CONVERSION_CLASSES.get(type_name, type_name)
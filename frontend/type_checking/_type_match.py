@@ -1,6 +1,75 @@
-from ..abstract_syntax_tree import TypeCategory, TypeNode, GenericParameterNode
+from ..abstract_syntax_tree import TypeCategory, TypeNode, GenericParameterNode, IdentifierNode
 from ..semantics import TypeEnum
 
+from ._type_lattice import is_implicitly_convertible, get_conversion_class
+
+
+TypeKey = tuple
+
+
+def get_type_key(type_node: TypeNode) -> TypeKey | None:
+    """
+    Get the hashable key of the type, such that types with equal keys are matched
+    by match_types in the same way against any other type.
+    Used to memoize lookups depending on argument types.
+    :param type_node: type to get key of
+    :return: key or None if the type can't be keyed
+    """
+    if not isinstance(type_node, TypeNode):
+        return None
+
+    # class types are compared by identity of their name nodes first,
+    # and these ones match nothing else (see match_types), so they can't be keyed by content
+    if isinstance(type_node.type, IdentifierNode) and (
+        (type_node.category == TypeCategory.CLASS and type_node.arguments) or
+        (type_node.category == TypeCategory.GENERIC_CLASS and not type_node.arguments)
+    ):
+        return None
+
+    argument_keys = ()
+    if type_node.arguments:
+        argument_keys = tuple(get_type_key(argument) for argument in type_node.arguments)
+        if None in argument_keys:
+            return None
+
+    return type_node.category, type_node.name, type_node.modifiers, argument_keys
+
+
+def get_signature_key(signature: list[TypeNode]) -> tuple[TypeKey, ...] | None:
+    """
+    Get the hashable key of argument types, or None if any of them can't be keyed
+    """
+    keys = tuple(get_type_key(type_node) for type_node in signature)
+    return keys if None not in keys else None
+
+
+def get_match_class_key(type_node: TypeNode) -> TypeKey | None:
+    """
+    Get the hashable key of the type, such that types matched by match_types (in any direction)
+    have equal keys. Unlike get_type_key, types with equal keys aren't necessarily matched
+    (e.g. primitive types convertible into each other), so it only narrows down the candidates.
+    :param type_node: type to get key of
+    :return: key or None if the type may match types with any key (e.g. null)
+    """
+    if not isinstance(type_node, TypeNode) or type_node.represents_generic_param:
+        return None
+    if type_node.type == TypeEnum.NULL:
+        return None
+
+    name = type_node.name
+    if type_node.category == TypeCategory.PRIMITIVE:
+        name = get_conversion_class(name)
+    return type_node.category, type_node.is_reference, name
+
+
+def get_signature_match_class_key(signature: list[TypeNode]) -> tuple[TypeKey, ...] | None:
+    """
+    Get the hashable key of the signature, such that signatures matched by match_signatures have equal keys,
+    or None if any of its types can't be keyed
+    """
+    keys = tuple(get_match_class_key(type_node) for type_node in signature)
+    return keys if None not in keys else None
+
 
 def match_types(
     current_type: TypeNode,
@@ -50,56 +119,8 @@ def match_types(
 
     if current_type.category == TypeCategory.PRIMITIVE:
 
-        # basic case: types match
-        if current_type_name == target_type_name:
-            return True
-
-        # non-basic cases: implicit cast
-        if current_type_name == TypeEnum.BYTE:
-            return target_type.name in (
-                TypeEnum.SHORT_INTEGER,
-                TypeEnum.INTEGER,
-                TypeEnum.LONG_INTEGER,
-                TypeEnum.EXTENDED_INTEGER,
-                TypeEnum.FLOAT,
-                TypeEnum.DOUBLE,
-                TypeEnum.COMPLEX
-            )
-        elif current_type_name == TypeEnum.SHORT_INTEGER:
-            return target_type.name in (
-                TypeEnum.INTEGER,
-                TypeEnum.LONG_INTEGER,
-                TypeEnum.EXTENDED_INTEGER,
-                TypeEnum.FLOAT,
-                TypeEnum.DOUBLE,
-                TypeEnum.COMPLEX
-            )
-        elif current_type_name == TypeEnum.INTEGER:
-            return target_type.name in (
-                TypeEnum.LONG_INTEGER,
-                TypeEnum.EXTENDED_INTEGER,
-                TypeEnum.FLOAT,
-                TypeEnum.DOUBLE,
-                TypeEnum.COMPLEX
-            )
-        elif current_type_name == TypeEnum.LONG_INTEGER:
-            return target_type.name in (
-                TypeEnum.EXTENDED_INTEGER,
-                TypeEnum.DOUBLE,
-                TypeEnum.COMPLEX,
-            )
-        elif current_type_name == TypeEnum.FLOAT:
-            return target_type.name in (
-                TypeEnum.DOUBLE,
-                TypeEnum.COMPLEX
-            )
-        elif current_type_name == TypeEnum.DOUBLE:
-            return target_type.name in (
-                TypeEnum.COMPLEX,
-            )
-
-        else:
-            return False
+        # types match or implicit cast exists
+        return is_implicitly_convertible(current_type_name, target_type_name)
 
     elif current_type.category == TypeCategory.COLLECTION:
         # case 1: literal
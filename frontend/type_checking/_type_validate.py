@@ -5,7 +5,9 @@ Note that every declaration of variable uses this file functions anyway, so don'
 
 
 from ..abstract_syntax_tree import TypeNode, ASTNode, TypeCategory, ClassDefNode, GenericParameterNode
-from .shared import error_logger
+from .core import ErrorCode
+from .shared import get_context, use_declaration, add_class_instantiation, record_dependency
+from ._validated_type_cache import ValidatedTypeCache
 
 from ._helpers_class import get_class_by_name
 
@@ -20,7 +22,11 @@ def validate_type(
 
     # Everything beside TypeNode is invalid
     if not isinstance(type_to_check, TypeNode):
-        error_logger.add(location=type_to_check, reason="Invalid type expression")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Invalid type expression"
+        )
         if type_to_check is not None:
             type_to_check.valid = False
         return False
@@ -32,31 +38,134 @@ def validate_type(
         type_to_check.type.valid = True
         return True
 
+    # Types of the same structure are valid or not in the same way, so valid ones are resolved once
+    type_cache = get_context().type_cache
+    key = _get_validation_key(type_to_check, generic_parameters_context)
+    resolution = type_cache.lookup(key)
+    if resolution is not type_cache.MISSING:
+        _apply_resolution(type_to_check, resolution)
+        return True
+
     # Every builtin collection is valid when elements type are also valid
-    elif type_to_check.category == TypeCategory.COLLECTION:
+    if type_to_check.category == TypeCategory.COLLECTION:
         valid = _validate_builtin_compound_type(type_to_check=type_to_check)
-        type_to_check.valid = valid
-        type_to_check.type.valid = valid
-        return valid
 
     elif type_to_check.category == TypeCategory.CLASS:
         valid = _validate_non_generic_class_or_generic(type_to_check=type_to_check, generic_parameters_context=generic_parameters_context)
-        type_to_check.valid = valid
-        type_to_check.type.valid = valid
-        return valid
 
     else:
-        valid = _validate_generic_class(type_to_check=type_to_check)
-        type_to_check.valid = valid
-        type_to_check.type.valid = valid
-        return valid
+        valid = _validate_generic_class(type_to_check=type_to_check, generic_parameters_context=generic_parameters_context)
+
+    type_to_check.valid = valid
+    type_to_check.type.valid = valid
+    if valid:
+        type_cache.store(key, _get_resolution(type_to_check))
+    return valid
+
+
+def _get_validation_key(
+    type_to_check: TypeNode,
+    generic_parameters_context: list[GenericParameterNode] | None,
+) -> tuple:
+    """
+    Get the hashable key of the type structure, such that valid types with equal keys are validated the same way.
+    Arguments other than types are never valid types, so they aren't told apart
+    """
+    argument_keys = tuple(
+        _get_validation_key(argument, generic_parameters_context) if isinstance(argument, TypeNode) else None
+        for argument in type_to_check.arguments or ()
+    )
+
+    # the only case when the generic context matters (see _validate_non_generic_class_or_generic)
+    is_generic_parameter = (
+        type_to_check.category == TypeCategory.CLASS and
+        bool(generic_parameters_context) and
+        type_to_check.represents_generic_param is None and
+        any(parameter.name == type_to_check.name for parameter in generic_parameters_context)
+    )
+    return type_to_check.category, type_to_check.name, argument_keys, is_generic_parameter
+
+
+def _get_validated_arguments(type_to_check: TypeNode) -> list[TypeNode]:
+    """
+    Get the arguments of the type validated along with it
+    """
+    if type_to_check.category == TypeCategory.COLLECTION:
+        return type_to_check.arguments[:2 if type_to_check.type == "keymap" else 1]
+    if type_to_check.category == TypeCategory.GENERIC_CLASS:
+        return type_to_check.arguments
+    return []
+
+
+def _get_resolution(type_to_check: TypeNode) -> tuple:
+    """
+    Get the resolution of the valid type and of all its validated arguments, as (resolved class, argument resolutions)
+    """
+    if type_to_check.category in (TypeCategory.PRIMITIVE, TypeCategory.COLLECTION):
+        resolved = None
+    elif type_to_check.represents_generic_param:
+        resolved = ValidatedTypeCache.GENERIC_PARAMETER
+    else:
+        resolved = type_to_check.class_node
+    return resolved, tuple(_get_resolution(argument) for argument in _get_validated_arguments(type_to_check))
+
+
+def _apply_resolution(type_to_check: TypeNode, resolution: tuple) -> tuple:
+    """
+    Repeat the changes validation of the valid type (and its arguments) makes, without validating it again
+    :return: canonical key of the type, built bottom-up along the way instead of walking the arguments again
+    """
+    resolved, argument_resolutions = resolution
+    type_to_check.valid = True
+    type_to_check.type.valid = True
+
+    if type_to_check.category == TypeCategory.PRIMITIVE:
+        return type_to_check.canonical_key
+
+    if type_to_check.category == TypeCategory.COLLECTION:
+        return type_to_check.make_canonical_key(_apply_argument_resolutions(type_to_check, argument_resolutions))
+
+    if resolved is ValidatedTypeCache.GENERIC_PARAMETER:
+        type_to_check.represents_generic_param = True
+        get_context().overload_cache.invalidate()
+        return type_to_check.canonical_key
+
+    record_dependency("class", type_to_check.name)
+    if type_to_check.category == TypeCategory.CLASS:
+        type_to_check.represents_generic_param = False
+        use_declaration(resolved)
+        type_to_check.set_class(cls=resolved)
+        return type_to_check.canonical_key
+
+    argument_keys = _apply_argument_resolutions(type_to_check, argument_resolutions)
+    add_class_instantiation(resolved, type_to_check.arguments, argument_keys)
+    type_to_check.set_class(cls=resolved)
+    return type_to_check.make_canonical_key(argument_keys)
+
+
+def _apply_argument_resolutions(type_to_check: TypeNode, argument_resolutions: tuple) -> tuple | None:
+    if not type_to_check.arguments:
+        return None
+
+    argument_keys = [
+        _apply_resolution(argument, argument_resolution)
+        for argument, argument_resolution in zip(type_to_check.arguments, argument_resolutions)
+    ]
+    # the rest of the arguments isn't validated along with the type (e.g. array size)
+    argument_keys.extend(
+        argument.canonical_key if isinstance(argument, TypeNode) else None
+        for argument in type_to_check.arguments[len(argument_resolutions):]
+    )
+    return tuple(argument_keys)
 
 
 def _validate_builtin_compound_type(type_to_check: TypeNode) -> bool:
     if not type_to_check.arguments:
-        error_logger.add(
-            location=type_to_check.location,
-            reason=f"Type {type_to_check.type} should contain at least one argument"
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Type {} should contain at least one argument",
+            args=(type_to_check.type,)
         )
         return False
     type_of_first_argument = validate_type(type_to_check=type_to_check.arguments[0])
@@ -66,14 +175,21 @@ def _validate_builtin_compound_type(type_to_check: TypeNode) -> bool:
         return True
     elif type_to_check.type == "keymap":
         if len(type_to_check.arguments) != 2:
-            error_logger.add(
-                location=type_to_check.location,
-                reason=f"Keymap type requires exactly two arguments, got {len(type_to_check.arguments)}"
+            get_context().error_logger.add(
+                location=type_to_check,
+                code=ErrorCode.INVALID_TYPE,
+                reason="Keymap type requires exactly two arguments, got {}",
+                args=(len(type_to_check.arguments),)
             )
             return False
         return validate_type(type_to_check=type_to_check.arguments[1])
     else:
-        error_logger.add(location=type_to_check.location, reason=f"Unknown type: {type_to_check.type}")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Unknown type: {}",
+            args=(type_to_check.type,)
+        )
         return False
 
 
@@ -96,6 +212,9 @@ def _validate_non_generic_class_or_generic(
                 break
         if generic_node:
             type_to_check.represents_generic_param = True
+
+            # parameters of this type are skipped when matching signatures from now on
+            get_context().overload_cache.invalidate()
             return True
         else:
             type_to_check.represents_generic_param = False
@@ -107,42 +226,73 @@ def _validate_non_generic_class_or_generic(
         class_name=class_name
     )
     if not isinstance(class_instance, ClassDefNode):
-        error_logger.add(location=type_to_check.location, reason=f"Unknown class definition: {class_name}")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Unknown class definition: {}",
+            args=(class_name,)
+        )
         return False
     if class_instance.generic_params:
-        error_logger.add(
-            location=type_to_check.location,
-            reason=f"Class {class_name} requires generic parameters to instantiate"
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Class {} requires generic parameters to instantiate",
+            args=(class_name,)
         )
         return False
 
-    class_instance.use()
+    use_declaration(class_instance)
     type_to_check.set_class(cls=class_instance)
     return True
 
 
-def _validate_generic_class(type_to_check: TypeNode) -> bool:
+def _validate_generic_class(
+    type_to_check: TypeNode,
+    generic_parameters_context: list[GenericParameterNode] | None,
+) -> bool:
     class_name = type_to_check.name
     class_instance = get_class_by_name(
         class_name=class_name
     )
     if not isinstance(class_instance, ClassDefNode):
-        error_logger.add(location=type_to_check.location, reason=f"Unknown class definition: {class_name}")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.UNRESOLVED_REFERENCE,
+            reason="Unknown class definition: {}",
+            args=(class_name,)
+        )
         return False
     if not class_instance.generic_params:
-        error_logger.add(
-            location=type_to_check.location,
-            reason=f"Class {class_name} doesn't require generic parameters to instantiate"
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Class {} doesn't require generic parameters to instantiate",
+            args=(class_name,)
         )
         return False
     if len(type_to_check.arguments) > len(class_instance.generic_params):
-        error_logger.add(location=type_to_check.location, reason=f"Too many arguments for class {class_name}")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Too many arguments for class {}",
+            args=(class_name,)
+        )
         return False
     if len(type_to_check.arguments) < len(class_instance.generic_params):
-        error_logger.add(location=type_to_check.location, reason=f"Not enough arguments for class {class_name}")
+        get_context().error_logger.add(
+            location=type_to_check,
+            code=ErrorCode.INVALID_TYPE,
+            reason="Not enough arguments for class {}",
+            args=(class_name,)
+        )
         return False
 
-    all_is_ok = all((validate_type(type_to_check=x) for x in type_to_check.arguments))
+    all_is_ok = all((
+        validate_type(type_to_check=x, generic_parameters_context=generic_parameters_context)
+        for x in type_to_check.arguments
+    ))
     if all_is_ok:
-        class_instance.add_instantiation(instantiation=type_to_check.arguments)
+        add_class_instantiation(class_instance, type_to_check.arguments)
         type_to_check.set_class(cls=class_instance)
+    return all_is_ok
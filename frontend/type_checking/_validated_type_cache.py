@@ -0,0 +1,56 @@
+"""
+Memoization of type validation.
+The same types (e.g. array[array[double]] or class types) are declared over and over again
+by fields, parameters, return types and local variables, so the outcome of their validation
+(the resolved class) is cached by the type structure instead of looking the classes up again.
+Only valid types are cached: errors are logged at every invalid type's own location.
+"""
+from typing import Any, Hashable
+
+
+class ValidatedTypeCache:
+    # marker of absent entry
+    MISSING = object()
+
+    # resolution of class types, which are names of generic parameters
+    GENERIC_PARAMETER = object()
+
+    def __init__(self):
+        self._resolutions: dict[Hashable, Any] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, key: Hashable | None) -> Any:
+        """
+        Get the resolution of the validated type
+        :param key: type key, None if the validation can't be memoized
+        :return: resolved class (or GENERIC_PARAMETER), None for builtin types or ValidatedTypeCache.MISSING
+        """
+        if key is None:
+            return self.MISSING
+
+        result = self._resolutions.get(key, self.MISSING)
+        if result is self.MISSING:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return result
+
+    def store(self, key: Hashable | None, result: Any) -> Any:
+        if key is not None:
+            self._resolutions[key] = result
+        return result
+
+    def invalidate(self) -> None:
+        """
+        Forget all the resolutions, e.g. when the class definitions change
+        """
+        self._resolutions.clear()
+
+    @property
+    def hit_rate(self) -> float:
+        total = self.hits + self.misses
+        return self.hits / total if total else 0.0
+
+    def __repr__(self) -> str:
+        return f"ValidatedTypeCache(hits={self.hits}, misses={self.misses}, hit_rate={self.hit_rate:.2%})"
@@ -1,12 +1,13 @@
 from frontend.abstract_syntax_tree import ClassDefNode, ClassMethodDeclarationNode
 
-from ..shared import error_logger, class_definitions
+from ..core import ErrorCode
+from ..shared import get_context
 
 from .._type_validate import validate_type
 
 from .inheritance import validate_class_inheritance
 from .._overloads import validate_overloaded_function_definitions
-from .._scope import validate_scope
+from .._scope import validate_function_body
 
 from .._helpers_function import instantiate_environment_from_function_parameters
 
@@ -25,18 +26,18 @@ def validate_all_class_definitions() -> bool:
     # and if types and default values are valid
     no_field_duplicates = [
         _flat_check_no_duplicate_fields(concrete_class)
-        for concrete_class in class_definitions
+        for concrete_class in get_context().class_definitions
     ]
 
     valid_field_types = [
         _flat_check_field_types(concrete_class)
-        for concrete_class in class_definitions
+        for concrete_class in get_context().class_definitions
     ]
 
     # 3. Check if methods inside classes are not duplicated in terms of overloading etc
     no_method_collisions = [
         _flat_check_no_method_collisions(concrete_class)
-        for concrete_class in class_definitions
+        for concrete_class in get_context().class_definitions
     ]
 
     if not (no_field_duplicates and valid_field_types and no_method_collisions):
@@ -46,7 +47,7 @@ def validate_all_class_definitions() -> bool:
     # (inheritance, methods content, has constructor...)
     valid_classes = [
         _validate_class_definition(concrete_class)
-        for concrete_class in class_definitions
+        for concrete_class in get_context().class_definitions
     ]
     return all(valid_classes)
 
@@ -57,24 +58,22 @@ def _check_no_duplicate_class_definitions() -> bool:
     (Hidden) Check if there are no duplicate class definitions in the program
     :return: True if there are no duplicate class definitions in the program, False otherwise
     """
-    # 1. check if the names are repeating
-    distinct_classes = set()
-    repeated_classes = set()
-    for class_definition in class_definitions:
-        name = class_definition.name
-        if name not in distinct_classes:
-            distinct_classes.add(name)
-            continue
-        else:
-            repeated_classes.add(name)
+    # 1. check if the names are repeating, by definitions grouped in the symbol tables
+    repeated_classes = {
+        name
+        for name, definitions in get_context().classes_by_name.items()
+        if len(definitions) > 1
+    }
 
     # 2. If there are, error log every duplicate definition
-    for class_definition in class_definitions:
+    for class_definition in get_context().class_definitions:
         if class_definition.name in repeated_classes:
             class_definition.valid = False
-            error_logger.add(
+            get_context().error_logger.add(
                 class_definition,
-                f"Repeated class name: {class_definition.name}"
+                ErrorCode.INVALID_DECLARATION,
+                "Repeated class name: {}",
+                (class_definition.name,)
             )
 
     return not repeated_classes
@@ -106,9 +105,11 @@ def _flat_check_no_duplicate_fields(
     for field_definition in fields_definitions:
         if field_definition.name in repeated_fields:
             field_definition.valid = False
-            error_logger.add(
-                field_definition.location,
-                f"Repeated field name: {field_definition.name}"
+            get_context().error_logger.add(
+                field_definition,
+                ErrorCode.INVALID_DECLARATION,
+                "Repeated field name: {}",
+                (field_definition.name,)
             )
 
     if repeated_fields:
@@ -146,22 +147,25 @@ def _flat_check_no_method_collisions(
     valid = True
     for static_method in concrete_class.static_methods_defs:
         if not static_method.is_public:
-            error_logger.add(
-                static_method.location,
+            get_context().error_logger.add(
+                static_method,
+                ErrorCode.INVALID_DECLARATION,
                 "Static method cannot be non-public"
             )
             static_method.valid = False
             valid = False
         if static_method.is_virtual:
-            error_logger.add(
-                static_method.location,
+            get_context().error_logger.add(
+                static_method,
+                ErrorCode.INVALID_DECLARATION,
                 "Static method cannot be virtual"
             )
             static_method.valid = False
             valid = False
         if static_method.is_overload:
-            error_logger.add(
-                static_method.location,
+            get_context().error_logger.add(
+                static_method,
+                ErrorCode.INVALID_DECLARATION,
                 "Static method cannot be overloaded"
             )
             static_method.valid = False
@@ -216,8 +220,8 @@ def validate_method_definition(
     valid_signature = (
         all((validate_type(param, concrete_class.generic_params) for param in method.parameters_signature))
     )
-    valid_implementation = validate_scope(
-        scope=method.function_body,
+    valid_implementation = validate_function_body(
+        method,
         environment=instantiate_environment_from_function_parameters(method.parameters),
         is_loop=False,
         is_function=True,
@@ -246,8 +250,8 @@ def validate_static_method_definition(
     valid_signature = (
         all((validate_type(param, concrete_class.generic_params) for param in method.parameters_signature))
     )
-    valid_implementation = validate_scope(
-        scope=method.function_body,
+    valid_implementation = validate_function_body(
+        method,
         environment=instantiate_environment_from_function_parameters(method.parameters),
         is_loop=False,
         is_function=True,
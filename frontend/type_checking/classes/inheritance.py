@@ -1,7 +1,8 @@
 # NOTE: done
 from frontend.abstract_syntax_tree import ClassDefNode
 
-from frontend.type_checking.shared import error_logger
+from frontend.type_checking.core import ErrorCode
+from frontend.type_checking.shared import get_context
 from frontend.type_checking._helpers_class import get_class_by_name
 from frontend.type_checking._helpers_function import strict_match_signatures
 from frontend.type_checking._type_match import strict_match_types
@@ -62,32 +63,40 @@ def _link_and_validate_class_inheritance(
         if (
             curr_class_node is None
         ):
-            error_logger.add(
-                class_node.location,
-                f"Inherited class {class_nodes_list[-1].superclass.name} is not unambiguously defined"
+            get_context().error_logger.add(
+                class_node,
+                ErrorCode.INVALID_INHERITANCE,
+                "Inherited class {} is not unambiguously defined",
+                (class_nodes_list[-1].superclass.name,)
             )
             valid = False
         elif curr_class_node.name in class_inheritance_names_list:
-            error_logger.add(
-                class_node.location,
-                f"Circular inheritance: {curr_class_node.name} from {curr_class_node.superclass.name}"
+            get_context().error_logger.add(
+                class_node,
+                ErrorCode.INVALID_INHERITANCE,
+                "Circular inheritance: {} from {}",
+                (curr_class_node.name, curr_class_node.superclass.name)
             )
             valid = False
         elif curr_class_node.is_valid_inherited_class is False:
-            error_logger.add(
-                class_node.location,
-                f"Invalid inheritance: {curr_class_node.name} from {curr_class_node.superclass.name}"
+            get_context().error_logger.add(
+                class_node,
+                ErrorCode.INVALID_INHERITANCE,
+                "Invalid inheritance: {} from {}",
+                (curr_class_node.name, curr_class_node.superclass.name)
             )
             valid = False
         elif len(curr_class_node.generic_params) != generic_args:
-            error_logger.add(
-                class_node.location,
+            get_context().error_logger.add(
+                class_node,
+                ErrorCode.INVALID_INHERITANCE,
                 "Superclass should be instantiated with same generic signature!"
             )
             valid = False
         elif not all((lhs.name == rhs.name for lhs, rhs in zip(curr_class_node.generic_params, generic_args))):
-            error_logger.add(
-                class_node.location,
+            get_context().error_logger.add(
+                class_node,
+                ErrorCode.INVALID_INHERITANCE,
                 "Superclass should be instantiated with same generic signature!"
             )
             valid = False
@@ -137,9 +146,11 @@ def _validate_inherited_fields(
             if f.is_private:
                 continue
             if f.name in field_name_set:
-                error_logger.add(
-                    f.location,
-                    f"Duplicate field redefinition: {f.name} is already defined in superclass {curr_node.name}!"
+                get_context().error_logger.add(
+                    f,
+                    ErrorCode.INVALID_DECLARATION,
+                    "Duplicate field redefinition: {} is already defined in superclass {}!",
+                    (f.name, curr_node.name)
                 )
                 f.valid = False
                 found_duplicate = True
@@ -175,10 +186,10 @@ def _validate_inherited_methods(
         valid = True
         for m in class_node.methods_defs:
             if m.is_overload:
-                error_logger.add(m.location, "No base class to overload from")
+                get_context().error_logger.add(m, ErrorCode.INVALID_INHERITANCE, "No base class to overload from")
                 valid = False
             if m.is_private and m.is_virtual:
-                error_logger.add(m.location, "Virtual method cannot be private")
+                get_context().error_logger.add(m, ErrorCode.INVALID_INHERITANCE, "Virtual method cannot be private")
                 valid = False
         class_node.validate_inherited_methods(valid)
         if not valid:
@@ -203,7 +214,12 @@ def _validate_inherited_methods(
     for method in current_node.methods_defs:
         if method.function_name not in virtual_methods_names:
             if method.is_overload:
-                error_logger.add(method.location, f"Method {method.function_name} has no virtual one in superclasses")
+                get_context().error_logger.add(
+                    method,
+                    ErrorCode.INVALID_INHERITANCE,
+                    "Method {} has no virtual one in superclasses",
+                    (method.function_name,)
+                )
                 valid = False
             else:
                 continue
@@ -219,27 +235,33 @@ def _validate_inherited_methods(
 
             if matching_method_instance is None:
                 if method.is_overload:
-                    error_logger.add(
-                        method.location,
-                        f"Invalid method with current signature to overload: {method.function_name}"
+                    get_context().error_logger.add(
+                        method,
+                        ErrorCode.INVALID_INHERITANCE,
+                        "Invalid method with current signature to overload: {}",
+                        (method.function_name,)
                     )
                     valid = False
             else:
                 if not method.is_overload or method.is_virtual:
-                    error_logger.add(
-                        method.location,
-                        f"Invalid method: {method.function_name}. It's not marked as an overload"
+                    get_context().error_logger.add(
+                        method,
+                        ErrorCode.INVALID_INHERITANCE,
+                        "Invalid method: {}. It's not marked as an overload",
+                        (method.function_name,)
                     )
                     valid = False
                 if method.access_type != matching_method_instance.access_type:
-                    error_logger.add(
-                        method.location,
+                    get_context().error_logger.add(
+                        method,
+                        ErrorCode.INVALID_INHERITANCE,
                         "Altered access type when overloading"
                     )
                     valid = False
                 if not strict_match_types(method.return_type, matching_method_instance.return_type):
-                    error_logger.add(
-                        method.location,
+                    get_context().error_logger.add(
+                        method,
+                        ErrorCode.INVALID_INHERITANCE,
                         "Altered return type when overloading"
                     )
                     valid = False
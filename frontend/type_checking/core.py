@@ -1,19 +1,152 @@
-from ..abstract_syntax_tree import ASTNode
+import json
+from bisect import bisect_left, insort
+from enum import StrEnum
+from typing import TextIO
+
+from ..abstract_syntax_tree import ASTNode, CalculationNode
+from ..exceptions import TooManyErrorsException
+
+
+class ErrorCode(StrEnum):
+    UNRESOLVED_REFERENCE = "unresolved-reference"
+    TYPE_MISMATCH = "type-mismatch"
+    INVALID_TYPE = "invalid-type"
+    INVALID_EXPRESSION = "invalid-expression"
+    UNSUPPORTED_OPERATION = "unsupported-operation"
+    INVALID_STATEMENT = "invalid-statement"
+    INVALID_DECLARATION = "invalid-declaration"
+    INVALID_INHERITANCE = "invalid-inheritance"
+    INVALID_INSTANTIATION = "invalid-instantiation"
+    CONSTANT_EVALUATION = "constant-evaluation"
+
+
+class ErrorRecord:
+    """
+    Type error at some location of the code.
+    Message is formatted from the reason template and its arguments only when needed
+    """
+
+    def __init__(
+        self,
+        code: ErrorCode,
+        line: int,
+        position: int,
+        reason: str,
+        args: tuple = (),
+        span: tuple[int, int] | None = None
+    ):
+        self.code = code
+        self.line = line
+        self.position = position
+        self.reason = reason
+        self.args = args
+        self.span = span
+
+    @property
+    def message(self) -> str:
+        return self.reason.format(*self.args) if self.args else self.reason
+
+    def to_json(self) -> str:
+        return json.dumps({
+            "code": str(self.code),
+            "line": self.line,
+            "position": self.position,
+            "span": list(self.span) if self.span is not None else None,
+            "message": self.message,
+        })
+
+    def __str__(self):
+        return f"[{self.line}:{self.position}]: {self.message}"
+
+    def __repr__(self):
+        return f"ErrorRecord({self.code!r}, {self.line}, {self.position}, {self.message!r})"
 
 
 class ErrorLogger:
-    def __init__(self):
-        self.errors = []
+    def __init__(self, max_errors: int | None = None, suppress_cascades: bool = False, json_lines: bool = False):
+        """
+        :param max_errors: (optional) number of errors to stop checking at, by raising TooManyErrorsException
+        :param suppress_cascades: (optional) if true, at most one error is logged per node,
+        and errors of expressions containing the ones with already logged errors are skipped
+        :param json_lines: (optional) if true, errors are written as JSON objects, one per line, else as text
+        """
+        self.errors: list[ErrorRecord] = []
+        self.max_errors = max_errors
+        self.suppress_cascades = suppress_cascades
+        self.json_lines = json_lines
+        self.aborted = False
+
+        # locations and sorted span starts of the nodes with logged errors, for suppress_cascades
+        self._logged_locations: set[tuple[int, int]] = set()
+        self._logged_offsets: list[int] = []
 
-    def add(self, location: ASTNode | tuple[int, int], reason: str) -> None:
+    def add(
+        self,
+        location: ASTNode | tuple[int, int],
+        code: ErrorCode,
+        reason: str,
+        args: tuple = ()
+    ) -> None:
+        """
+        Log the error, unless it's suppressed
+        :param location: node or (line, position) the error is at
+        :param code: kind of the error
+        :param reason: message, or its template to format with str.format if args are given
+        :param args: (optional) arguments of the message template
+        :raises TooManyErrorsException: if the number of errors reached max_errors
+        """
+        span = None
         if isinstance(location, ASTNode):
-            self.errors.append(
-                f"[{location.line}:{location.position}]: {reason}"
-            )
-        elif isinstance(location, tuple):
-            self.errors.append(
-                f"[{location[0]}:{location[1]}]: {reason}"
-            )
+            span = location.span
+            if self.suppress_cascades and self._is_cascade(location):
+                return
+            location = location.location
+        elif not isinstance(location, tuple):
+            return
+
+        if self.suppress_cascades:
+            if location in self._logged_locations:
+                return
+            self._logged_locations.add(location)
+            if span is not None:
+                insort(self._logged_offsets, span[0])
+
+        self._append(ErrorRecord(code, location[0], location[1], reason, args, span))
+
+    def extend(self, errors: list[ErrorRecord]) -> None:
+        """
+        Log the errors collected by other logger, e.g. the ones of separately checked function body
+        :raises TooManyErrorsException: if the number of errors reached max_errors
+        """
+        for error in errors:
+            self._append(error)
+
+    def _append(self, error: ErrorRecord) -> None:
+        self.errors.append(error)
+        if self.max_errors is not None and len(self.errors) >= self.max_errors:
+            self.aborted = True
+            raise TooManyErrorsException(self.max_errors)
+
+    def _is_cascade(self, node: ASTNode) -> bool:
+        if not isinstance(node, CalculationNode) or node.span is None:
+            return False
+        start, end = node.span
+        index = bisect_left(self._logged_offsets, start)
+        return index < len(self._logged_offsets) and self._logged_offsets[index] < end
+
+    def write(self, file: TextIO) -> None:
+        """
+        Write the logged errors, one per line
+        :param file: text stream to write to
+        """
+        for error in self.errors:
+            file.write(error.to_json() if self.json_lines else str(error))
+            file.write("\n")
+
+        if self.aborted:
+            message = str(TooManyErrorsException(self.max_errors))
+            file.write(json.dumps({"code": "too-many-errors", "message": message}) if self.json_lines else message)
+            file.write("\n")
 
     def __iter__(self):
         return iter(self.errors)
@@ -1,33 +1,98 @@
 from ..abstract_syntax_tree import ProgramNode
-from .shared import error_logger, class_definitions, function_definitions
+from ..exceptions import TooManyErrorsException
+from .shared import TypeCheckContext, type_check_context
 
 from .classes.entrypoint import validate_all_class_definitions
 from .functions.entrypoint import validate_all_function_definitions
 from ._scope import validate_scope
+from ._symbol_tables import build_symbol_tables
+from ._parallel import validate_definitions_in_parallel, can_validate_in_parallel
+from ._incremental import IncrementalBodyValidator
+from ._generic_expansion import validate_generic_expansion
 
 import sys
 
 
-def type_check_program(program: ProgramNode) -> bool:
+def type_check_program(
+    program: ProgramNode,
+    context: TypeCheckContext | None = None,
+    workers: int = 1,
+) -> bool:
     """
-    Check entire program for type errors
+    Check entire program for type errors.
+    Every call works in its own context, so programs can be checked repeatedly or in parallel threads.
     :param program: parsed AST tree root
+    :param context: (optional) fresh context to check the program in, e.g. to inspect the errors afterward.
+    Checking stops early if its error logger reaches the limit of errors
+    :param workers: (optional) number of processes to check function and method bodies in.
+    Results are the same as of sequential checking, which is used instead while other threads are running
     :return: true if program is valid else false
     """
-    # init global variables
-    class_definitions.extend(program.class_definitions)
-    function_definitions.extend(program.function_definitions)
-
-    valid_program = _check_program(program)
-    if not valid_program:
-        for error in error_logger:
-            print(error, file=sys.stderr)
+    with type_check_context(context) as current_context:
+        # init context variables
+        current_context.class_definitions.extend(program.class_definitions)
+        current_context.function_definitions.extend(program.function_definitions)
+        build_symbol_tables()
+
+        try:
+            valid_program = _check_program(program, workers)
+        except TooManyErrorsException:
+            valid_program = False
+
+        if not valid_program:
+            current_context.error_logger.write(sys.stderr)
+    return valid_program
+
+
+def type_check_program_incrementally(
+    program: ProgramNode,
+    previous_context: TypeCheckContext | None = None,
+    context: TypeCheckContext | None = None,
+) -> bool:
+    """
+    Check entire program for type errors, reusing the results of the previous check
+    for function and method bodies not affected by the changes since then.
+    The previously checked program is changed in place by replacing its class and function definitions
+    (or function bodies) with the newly parsed ones, locations of the kept nodes aren't updated.
+    Results are the same as of type_check_program for the program as it is.
+    The previous context can't be reused by the later checks.
+    :param program: parsed AST tree root, e.g. the previously checked one with replaced definitions
+    :param previous_context: (optional) context of the previous incremental check of the program,
+    nothing is reused if not given
+    :param context: (optional) fresh context to check the program in, to pass it to the next check
+    :return: true if program is valid else false
+    """
+    previous_state = previous_context.incremental_state if previous_context is not None else None
+    with type_check_context(context) as current_context:
+        # init context variables
+        current_context.class_definitions.extend(program.class_definitions)
+        current_context.function_definitions.extend(program.function_definitions)
+        build_symbol_tables()
+
+        body_validator = IncrementalBodyValidator(program, previous_state)
+        current_context.body_validator = body_validator
+        try:
+            valid_program = _check_program(program)
+        except TooManyErrorsException:
+            valid_program = False
+        finally:
+            current_context.body_validator = None
+
+        current_context.incremental_state = body_validator.state
+        if previous_context is not None:
+            previous_context.incremental_state = None
+
+        if not valid_program:
+            current_context.error_logger.write(sys.stderr)
     return valid_program
 
 
-def _check_program(program: ProgramNode) -> bool:
-    valid_class_defs = validate_all_class_definitions()
-    valid_function_defs = validate_all_function_definitions()
+def _check_program(program: ProgramNode, workers: int = 1) -> bool:
+    if workers > 1 and can_validate_in_parallel():
+        valid_class_defs, valid_function_defs = validate_definitions_in_parallel(program, workers)
+    else:
+        valid_class_defs = validate_all_class_definitions()
+        valid_function_defs = validate_all_function_definitions()
 
     valid_main_statements = validate_scope(
         scope=program,
@@ -41,6 +106,8 @@ def _check_program(program: ProgramNode) -> bool:
         outermost_function_scope=False
     )
 
-    valid = all([valid_class_defs, valid_function_defs, valid_main_statements])
+    valid_generic_expansion = validate_generic_expansion()
+
+    valid = all([valid_class_defs, valid_function_defs, valid_main_statements, valid_generic_expansion])
     program.valid = valid
     return valid
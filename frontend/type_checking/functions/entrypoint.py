@@ -1,8 +1,8 @@
 from ...abstract_syntax_tree import FunctionDefNode, ClassDefNode
-from ..shared import function_definitions
+from ..shared import get_context
 
 from .._overloads import validate_overloaded_function_definitions
-from .._scope import validate_scope
+from .._scope import validate_function_body
 
 from .._helpers_function import instantiate_environment_from_function_parameters
 from .._type_validate import validate_type
@@ -14,6 +14,7 @@ def validate_all_function_definitions() -> bool:
     return type, parameters and statements typing
     :return: true if all function definitions are valid, otherwise false
     """
+    function_definitions = get_context().function_definitions
     valid_overloads = validate_overloaded_function_definitions(function_definitions)
 
     valid_functions = [
@@ -39,8 +40,8 @@ def _validate_function_definition(
     if function_node.external_to:
         concrete_class = function_node.external_to
         valid_return_type = validate_type(function_node.return_type, concrete_class.generic_params)
-        valid_implementation = validate_scope(
-            scope=function_node.function_body,
+        valid_implementation = validate_function_body(
+            function_node,
             environment=instantiate_environment_from_function_parameters(function_node.parameters),
             is_loop=False,
             is_function=True,
@@ -52,8 +53,8 @@ def _validate_function_definition(
         )
     else:
         valid_return_type = validate_type(function_node.return_type)
-        valid_implementation = validate_scope(
-            scope=function_node.function_body,
+        valid_implementation = validate_function_body(
+            function_node,
             environment=instantiate_environment_from_function_parameters(function_node.parameters),
             is_loop=False,
             is_function=True,
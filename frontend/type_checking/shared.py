@@ -1,6 +1,112 @@
-from ..abstract_syntax_tree import FunctionDefNode, ClassDefNode
+"""
+State shared by the type checker modules during a single type checking run.
+Every run of type_check_program works in its own TypeCheckContext, held in a context variable,
+so that runs don't leak state into each other and can be executed in parallel threads.
+"""
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Iterator
+
+from ..abstract_syntax_tree import FunctionDefNode, ClassDefNode, ClassMethodDeclarationNode, TypeNode
+from ..abstract_syntax_tree.ast_mixins import Usable
 from .core import ErrorLogger
+from ._overload_cache import OverloadResolutionCache
+from ._validated_type_cache import ValidatedTypeCache
+from ._class_hierarchy import ClassHierarchy
+
+
+class TypeCheckContext:
+    def __init__(self, error_logger: ErrorLogger | None = None):
+        """
+        :param error_logger: (optional) logger to collect errors to, e.g. configured to stop at some number of them
+        """
+        self.error_logger = error_logger if error_logger is not None else ErrorLogger()
+        self.class_definitions: list[ClassDefNode] = []
+        self.function_definitions: list[FunctionDefNode] = []
+
+        # symbol tables (see _symbol_tables module)
+        self.classes_by_name: dict[str, list[ClassDefNode]] = {}
+        self.functions_by_name: dict[str, list[FunctionDefNode]] = {}
+
+        # keyed by id of class and whether methods are static,
+        # as class nodes are compared by identity anyway
+        self.methods_by_class: dict[tuple[int, bool], dict[str, list[ClassMethodDeclarationNode]]] = {}
+        self.class_hierarchy: ClassHierarchy | None = None
+
+        # memoized results of get_function and get_class_method
+        self.overload_cache = OverloadResolutionCache()
+
+        # memoized resolutions of valid types (see _type_validate module)
+        self.type_cache = ValidatedTypeCache()
+
+        # parallel checking of function bodies (see _parallel module):
+        # validator bodies are passed to, and changes of declarations made by the checked body
+        self.body_validator = None
+        self.declaration_log: list[tuple] | None = None
+
+        # incremental checking (see _incremental module):
+        # names of classes and functions the checked body looked up, and the results to reuse by the next check
+        self.dependency_log: set[tuple[str, str]] | None = None
+        self.incremental_state = None
+
+
+_current_context: ContextVar[TypeCheckContext] = ContextVar("type_check_context")
+
+
+def get_context() -> TypeCheckContext:
+    """
+    Get the context of the current type checking run
+    :raises LookupError: if called outside of type checking run
+    """
+    return _current_context.get()
+
+
+@contextmanager
+def type_check_context(context: TypeCheckContext | None = None) -> Iterator[TypeCheckContext]:
+    """
+    Make the context current for the type checker functions called inside the block
+    :param context: (optional) context to use, new one is created if not given
+    :return: the current context
+    """
+    context = context if context is not None else TypeCheckContext()
+    token = _current_context.set(context)
+    try:
+        yield context
+    finally:
+        _current_context.reset(token)
+
+
+def use_declaration(declaration: Usable) -> None:
+    """
+    Count the usage of the class, field, method or function
+    """
+    declaration.use()
+    log = get_context().declaration_log
+    if log is not None:
+        log.append(("use", declaration))
+
+
+def add_class_instantiation(
+    class_instance: ClassDefNode,
+    instantiation: list[TypeNode],
+    key: tuple | None = None
+) -> None:
+    """
+    Register the instantiation of the generic class with the given type arguments
+    (and their canonical keys, if they are already known)
+    """
+    class_instance.add_instantiation(instantiation=instantiation, key=key)
+    log = get_context().declaration_log
+    if log is not None:
+        log.append(("instantiate", class_instance, instantiation))
+
 
-error_logger = ErrorLogger()
-class_definitions: list[ClassDefNode] = []
-function_definitions: list[FunctionDefNode] = []
+def record_dependency(kind: str, name: str) -> None:
+    """
+    Record that the checked body depends on the declarations with the given name
+    :param kind: "class" or "function"
+    :param name: class or function name
+    """
+    log = get_context().dependency_log
+    if log is not None:
+        log.add((kind, name))
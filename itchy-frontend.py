@@ -7,7 +7,11 @@ def main():
     from frontend.lexer import Lexer
     from frontend.syntax import RULES
     from frontend.parser import Parser
+    from frontend.allocation import AllocationContext
     from frontend.type_checking.entrypoint import type_check_program
+    from frontend.type_checking.core import ErrorLogger, ErrorCode
+    from frontend.type_checking.shared import TypeCheckContext
+    from frontend.desugaring.main import desugar_ast_tree
 
     parser = argparse.ArgumentParser(
         description='Compile multiple input ItchyLang source code files '
@@ -42,7 +46,73 @@ def main():
     parser.add_argument(
         '--print-tree',
         action='store_true',
-        help='Print the content of each input file in a tree structure with separators.'
+        help='Print the content of each input file in a tree structure with separators, '
+             'as it is type checked, before desugaring and optimizations.'
+    )
+
+    # Add tree printing options
+    parser.add_argument(
+        '--tree-depth',
+        type=int,
+        default=None,
+        help='Limit the number of node levels printed with --print-tree. Deeper nodes are shown collapsed.'
+    )
+
+    parser.add_argument(
+        '--tree-root',
+        default=None,
+        help='Print only the subtree at the given dot-separated path with --print-tree. '
+             'Example: --tree-root function_definitions.0.function_body'
+    )
+
+    parser.add_argument(
+        '--no-color',
+        action='store_true',
+        help='Disable ANSI colors when printing the tree with --print-tree.'
+    )
+
+    parser.add_argument(
+        '-j', '--jobs',
+        type=int,
+        default=1,
+        help='Number of processes to type check function and method bodies in. Default is 1 (no extra processes).'
+    )
+
+    parser.add_argument(
+        '--max-errors',
+        type=int,
+        default=None,
+        help='Stop type checking after the given number of errors. By default, all errors are reported.'
+    )
+
+    parser.add_argument(
+        '--suppress-cascades',
+        action='store_true',
+        help='Report at most one type error per node, skipping errors of expressions '
+             'that contain already reported ones.'
+    )
+
+    parser.add_argument(
+        '--error-format',
+        choices=('text', 'json'),
+        default='text',
+        help='Format of the reported type errors: text or JSON objects, one per line (code, location, message).'
+    )
+
+    parser.add_argument(
+        '-O', '--optimize',
+        action='store_true',
+        help='Optimize the type checked program before translating it: remove the classes, functions and methods '
+             'unreachable from the top-level statements, unreachable statements and unused local variables, '
+             'inline the calls of small functions, hoist the loop invariant expressions out of the loops '
+             'and compute the repeated subexpressions once.'
+    )
+
+    parser.add_argument(
+        '--stats',
+        action='store_true',
+        help='Print the statistics of the compilation to stderr: type checker cache hits, the code removed, '
+             'the calls inlined, the expressions hoisted and the common subexpressions extracted by the optimizations.'
     )
 
     # Add no-output argument with a detailed help message
@@ -69,29 +139,55 @@ def main():
         with open(input_file, 'r') as f:
             all_content.append(f.read())
 
-    lexer = Lexer(RULES)
-    lexemes_iter = lexer.scan(''.join(all_content))
-
-    parser = Parser(lexemes_iter)
-    x = parser.parse()
-
-    print(type_check_program(x))
-    print("Entire program valid:", x.is_valid())
-
-    # desugar_ast_tree(x)
-
-    # Check if print-tree option is specified
-    if args.print_tree:
-        print("AST of the code:")
-        print(x)
-
-    if args.no_output or not args.output:
-
-        print('\n\n CODE: \n')
-        x.translate(sys.stdout)
-    else:
-        with open(args.output, 'w') as f:
-            x.translate(f)
+    with AllocationContext() as allocation:
+        lexer = Lexer(RULES)
+        lexemes_iter = lexer.scan(''.join(all_content))
+
+        parser = Parser(lexemes_iter)
+        x = allocation.track(parser.parse())
+
+        error_logger = ErrorLogger(
+            max_errors=args.max_errors,
+            suppress_cascades=args.suppress_cascades,
+            json_lines=args.error_format == 'json'
+        )
+        context = TypeCheckContext(error_logger)
+        print(type_check_program(x, context=context, workers=args.jobs))
+        print("Entire program valid:", x.is_valid())
+
+        # Check if print-tree option is specified
+        # the tree is printed as checked, before it's desugared (and optimized) or the translation is given up
+        if args.print_tree:
+            print("AST of the code:")
+            x.print_tree(sys.stdout, max_depth=args.tree_depth, colored=not args.no_color, subtree_path=args.tree_root)
+            print()
+
+        # checking stopped at the error limit, so the rest of the program isn't checked to desugar and translate it,
+        # or generic classes have infinitely many instances, so they can't be instantiated
+        if error_logger.aborted or any(error.code == ErrorCode.INVALID_INSTANTIATION for error in error_logger):
+            return
+
+        stats = desugar_ast_tree(x, optimize=args.optimize)
+
+        if args.stats:
+            print("Type cache:", context.type_cache, file=sys.stderr)
+            print("Overload cache:", context.overload_cache, file=sys.stderr)
+            if stats.dead_code is not None:
+                print("Dead code removed:", stats.dead_code, file=sys.stderr)
+            if stats.inlining is not None:
+                print("Inlined calls:", stats.inlining, file=sys.stderr)
+            if stats.hoisting is not None:
+                print("Hoisted loop invariants:", stats.hoisting, file=sys.stderr)
+            if stats.common_subexpressions is not None:
+                print("Common subexpressions:", stats.common_subexpressions, file=sys.stderr)
+
+        if args.no_output or not args.output:
+
+            print('\n\n CODE: \n')
+            x.translate(sys.stdout)
+        else:
+            with open(args.output, 'w') as f:
+                x.translate(f)
 
 
 if __name__ == '__main__':
@@ -0,0 +1,104 @@
+"""
+Helpers shared by the tests: compiling the programs of the tests and of the repository
+"""
+import contextlib
+import io
+import os
+from typing import Callable, TypeVar
+
+from frontend.lexer import Lexer
+from frontend.syntax import RULES
+from frontend.parser import Parser
+from frontend.abstract_syntax_tree import ProgramNode
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from frontend.type_checking import _type_get
+from frontend.type_checking.core import ErrorLogger
+from frontend.type_checking.entrypoint import type_check_program
+from frontend.type_checking.shared import TypeCheckContext
+
+REPOSITORY_PATH = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# statistics returned by an optimization pass
+Stats = TypeVar('Stats')
+
+
+def read_example() -> str:
+    with open(os.path.join(REPOSITORY_PATH, 'code_example.itchy')) as file:
+        return file.read()
+
+
+def parse_program(source: str) -> ProgramNode:
+    return Parser(Lexer(RULES).scan(source)).parse()
+
+
+def check_program(
+    source: str,
+    error_logger: ErrorLogger | None = None,
+    **kwargs
+) -> tuple[ProgramNode, bool, TypeCheckContext]:
+    """
+    Parse and type check the program, without printing its errors
+    :param error_logger: (optional) logger to collect the errors to, e.g. configured to stop at some number of them
+    :param kwargs: arguments of type_check_program
+    :return: the checked program, whether it's valid and the context it was checked in
+    """
+    program = parse_program(source)
+    context = TypeCheckContext(error_logger if error_logger is not None else ErrorLogger())
+    with contextlib.redirect_stderr(io.StringIO()):
+        valid = type_check_program(program, context=context, **kwargs)
+    return program, valid, context
+
+
+def translate_program(program: ProgramNode) -> str:
+    output = io.StringIO()
+    program.translate(output)
+    return output.getvalue()
+
+
+def get_errors(context: TypeCheckContext) -> list[str]:
+    return [str(error) for error in context.error_logger]
+
+
+def optimize_function(
+    declarations: str,
+    parameters: str,
+    body: str,
+    optimization: Callable[[ProgramNode], Stats],
+) -> tuple[str, Stats]:
+    """
+    Check the function run with the given body after the declarations it uses, flatten the static members
+    and optimize the program, asserting that it's checked without errors
+    :param declarations: source code of the classes and functions run uses
+    :param parameters: source code of the parameters of run
+    :param body: source code of the statements of run
+    :param optimization: pass to optimize the program with
+    :return: intermediate code of the function run and statistics of the pass
+    """
+    program, _, context = check_program(f'{declarations}function[integer] run({parameters}) {{\n{body}}}\n')
+    assert get_errors(context) == []
+    mangle_static_functions(program)
+    stats = optimization(program)
+    return translate_program(program).split('FUNCTION run\n')[1], stats
+
+
+@contextlib.contextmanager
+def isinstance_chain_dispatch():
+    """
+    Check the expressions walking the isinstance chain over the expression checkers for every node,
+    as the expression checker did before the checker was cached by node class
+    """
+    cached_dispatch = _type_get._check_expression
+
+    def check_expression(expression, environment, context):
+        for node_class, handler in _type_get._HANDLERS:
+            if isinstance(expression, node_class):
+                valid_expr, expr_type = handler(expression, environment, context)
+                return _type_get._annotate(expression, valid_expr, expr_type)
+        # reports the unexpected expression
+        return cached_dispatch(expression, environment, context)
+
+    _type_get._check_expression = check_expression
+    try:
+        yield
+    finally:
+        _type_get._check_expression = cached_dispatch
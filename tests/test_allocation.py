@@ -0,0 +1,147 @@
+"""
+Allocation context frees the tracked trees at once and defers the cyclic GC for the whole process
+until the last context exits; primitive types shared by the trees are never modified
+"""
+import gc
+import threading
+
+import pytest
+
+from frontend.abstract_syntax_tree import TypeNode, iter_referenced_nodes
+from frontend.allocation import AllocationContext
+from frontend.desugaring.main import desugar_ast_tree
+from .common import read_example, check_program, translate_program
+
+SOURCE = '''function[integer] twice(integer a) { return a * 2; }
+integer c := twice(3);
+nullable integer n := null;
+integer i := twice(c) + 7 % 4;
+double d := 1.5 * i;
+boolean b := i < 10 and not (d >= 2.0);
+'''
+
+
+def collect_nodes(root) -> tuple[list, list]:
+    """
+    Get the nodes reachable from the root, and separately the shared types among them (which aren't walked into)
+    """
+    nodes, shared = [], []
+    visited = set()
+    stack = [root]
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        if isinstance(node, TypeNode) and node.is_shared:
+            shared.append(node)
+            continue
+        nodes.append(node)
+        stack.extend(iter_referenced_nodes(node))
+    return nodes, shared
+
+
+def snapshot_shared_types() -> dict:
+    return {
+        key: (dict(vars(type_node)), dict(vars(type_node.type)))
+        for key, type_node in TypeNode._SHARED_PRIMITIVES.items()
+    }
+
+
+@pytest.fixture
+def restore_gc():
+    enabled = gc.isenabled()
+    yield
+    if enabled:
+        gc.enable()
+    else:
+        gc.disable()
+
+
+def test_release_empties_tracked_trees_except_shared_types():
+    with AllocationContext() as allocation:
+        program, _, _ = check_program(SOURCE)
+        allocation.track(program)
+        nodes, shared = collect_nodes(program)
+
+        assert shared
+        assert allocation.release() == len(nodes)
+
+    assert all(vars(node) == {} for node in nodes)
+    assert all(type_node.is_shared for type_node in shared)
+    # nothing is tracked anymore
+    assert allocation.release() == 0
+
+
+def test_shared_primitive_types_are_not_modified():
+    # shared types are created on first use
+    for source in (SOURCE, read_example()):
+        check_program(source)
+    before = snapshot_shared_types()
+
+    for source in (SOURCE, read_example()):
+        with AllocationContext() as allocation:
+            program, _, _ = check_program(source)
+            allocation.track(program)
+            desugar_ast_tree(program, optimize=True)
+            translate_program(program)
+
+    assert snapshot_shared_types() == before
+    with pytest.raises(AssertionError):
+        next(iter(TypeNode._SHARED_PRIMITIVES.values())).set_constant()
+
+
+def test_gc_is_restored_by_last_nested_context(restore_gc):
+    gc.enable()
+    outer = AllocationContext()
+    inner = AllocationContext()
+
+    outer.__enter__()
+    inner.__enter__()
+    outer.__exit__(None, None, None)
+    assert not gc.isenabled()
+
+    inner.__exit__(None, None, None)
+    assert gc.isenabled()
+
+
+def test_gc_disabled_before_contexts_stays_disabled(restore_gc):
+    gc.disable()
+    with AllocationContext():
+        with AllocationContext(defer_gc=False):
+            pass
+
+    assert not gc.isenabled()
+
+
+def test_gc_is_deferred_until_contexts_of_all_threads_exit(restore_gc):
+    gc.enable()
+    entered = threading.Barrier(3)
+    exit_first = threading.Event()
+    first_exited = threading.Event()
+    enabled_inside = []
+
+    def compile_first():
+        with AllocationContext():
+            entered.wait()
+            exit_first.wait()
+        first_exited.set()
+
+    def compile_second():
+        with AllocationContext():
+            entered.wait()
+            first_exited.wait()
+            # the other thread's context exited, but this one still defers the GC
+            enabled_inside.append(gc.isenabled())
+
+    threads = [threading.Thread(target=compile_first), threading.Thread(target=compile_second)]
+    for thread in threads:
+        thread.start()
+    entered.wait()
+    assert not gc.isenabled()
+    exit_first.set()
+    for thread in threads:
+        thread.join()
+
+    assert enabled_inside == [False]
+    assert gc.isenabled()
@@ -0,0 +1,73 @@
+"""
+Subclass checks and least common bases of the precomputed hierarchy are the ones found
+by walking the superclass chains, on random forests of classes
+"""
+import random
+
+import pytest
+
+from frontend.type_checking._class_hierarchy import ClassHierarchy
+from .common import parse_program
+
+
+def generate_forest(size: int, randomizer: random.Random) -> list[str]:
+    # some classes start new trees, the others inherit from any earlier class; definitions are shuffled
+    declarations = []
+    for index in range(size):
+        if index == 0 or randomizer.random() < 0.1:
+            declarations.append(f'class C{index} {{}}')
+        else:
+            declarations.append(f'class C{index} from C{randomizer.randrange(index)} {{}}')
+    randomizer.shuffle(declarations)
+    return declarations
+
+
+def build_hierarchy(declarations: list[str]) -> tuple[ClassHierarchy, dict]:
+    classes_by_name = {}
+    for class_node in parse_program('\n'.join(declarations) + '\n').class_definitions:
+        classes_by_name.setdefault(class_node.name, []).append(class_node)
+    return ClassHierarchy(classes_by_name), classes_by_name
+
+
+def walk_chain(class_node, classes_by_name: dict) -> list:
+    chain = [class_node]
+    while chain[-1].superclass is not None:
+        chain.append(classes_by_name[chain[-1].superclass.name][0])
+    return chain
+
+
+@pytest.mark.parametrize('seed', range(5))
+def test_queries_are_the_chain_walk_ones(seed):
+    randomizer = random.Random(seed)
+    hierarchy, classes_by_name = build_hierarchy(generate_forest(80, randomizer))
+    classes = [definitions[0] for definitions in classes_by_name.values()]
+    chains = {class_node.name: walk_chain(class_node, classes_by_name) for class_node in classes}
+
+    assert len(hierarchy) == len(classes)
+    for class_node in classes:
+        for other in classes:
+            class_id, other_id = hierarchy.get_id(class_node), hierarchy.get_id(other)
+            other_chain = chains[other.name]
+            expected_base = next((base for base in chains[class_node.name] if base in other_chain), None)
+
+            assert hierarchy.is_subclass(class_id, other_id) == (other in chains[class_node.name])
+            assert hierarchy.least_common_base(class_id, other_id) is expected_base
+
+
+def test_classes_not_linearized_are_unknown():
+    hierarchy, classes_by_name = build_hierarchy([
+        'class A {}',
+        'class B from A {}',
+        'class Twice {}',
+        'class Twice {}',
+        'class FromTwice from Twice {}',
+        'class FromMissing from Missing {}',
+        'class Cycle from Loop {}',
+        'class Loop from Cycle {}',
+    ])
+
+    assert len(hierarchy) == 2
+    assert hierarchy.is_subclass(hierarchy.get_id('B'), hierarchy.get_id('A'))
+    for name in ('Twice', 'FromTwice', 'FromMissing', 'Cycle', 'Loop'):
+        assert hierarchy.get_id(name) is None
+        assert hierarchy.get_id(classes_by_name[name][0]) is None
@@ -0,0 +1,84 @@
+"""
+The command line frontend translates checked programs, and stops after reporting the errors
+of the programs it can't desugar and translate
+"""
+import os
+import subprocess
+import sys
+
+from .common import REPOSITORY_PATH
+
+INFINITELY_NESTED = '''class Box[T] {
+    public T value;
+    public constructor() { }
+}
+class Node[T] {
+    public nullable Node[Box[T]] next;
+    public constructor() { }
+}
+Node[integer] n := new Node[integer]();
+'''
+
+WITH_ERRORS = '''class Counter {
+    public static function[integer] make(integer a) { return a * 2; }
+}
+integer q := missing;
+integer r := Counter.make(2) + other;
+'''
+
+
+def run_frontend(tmp_path, source: str, *args: str) -> subprocess.CompletedProcess:
+    path = tmp_path / 'program.itchy'
+    path.write_text(source)
+    return subprocess.run(
+        [sys.executable, os.path.join(REPOSITORY_PATH, 'itchy-frontend.py'), *args, str(path)],
+        capture_output=True, text=True, timeout=60, cwd=REPOSITORY_PATH,
+    )
+
+
+def test_program_with_errors_is_translated(tmp_path):
+    result = run_frontend(tmp_path, WITH_ERRORS)
+
+    assert result.returncode == 0
+    assert result.stderr.splitlines() == [
+        '[3:14]: Unresolved reference for missing',
+        '[4:32]: Unresolved reference for other',
+    ]
+    assert 'VALCOPY ID r ADD CALL 2 Counter$make 2 ID other' in result.stdout
+
+
+def test_program_checked_until_error_limit_isnt_translated(tmp_path):
+    result = run_frontend(tmp_path, WITH_ERRORS, '--max-errors', '1')
+
+    assert result.returncode == 0
+    assert result.stderr.splitlines() == [
+        '[3:14]: Unresolved reference for missing',
+        'Too many errors (1), type checking is stopped',
+    ]
+    assert 'CODE' not in result.stdout
+
+
+def test_program_of_infinitely_nested_instances_isnt_translated(tmp_path):
+    result = run_frontend(tmp_path, INFINITELY_NESTED, '-O')
+
+    assert result.returncode == 0
+    assert result.stderr.splitlines() == ['[5:21]: Generic class Node is instantiated with infinitely nested arguments']
+    assert 'CODE' not in result.stdout
+
+
+def test_tree_is_printed_before_desugaring(tmp_path):
+    source = 'function[integer] unused(integer a) { return a * 2; }\ninteger r := 1 + 2;\n'
+    result = run_frontend(tmp_path, source, '-O', '--print-tree', '--no-color')
+
+    assert result.returncode == 0
+    tree, code = result.stdout.split('CODE')
+    assert 'function_name: unused' in tree
+    assert 'unused' not in code
+
+
+def test_tree_is_printed_when_translation_is_given_up(tmp_path):
+    result = run_frontend(tmp_path, WITH_ERRORS, '--max-errors', '1', '--print-tree', '--no-color')
+
+    assert result.returncode == 0
+    assert 'AST of the code:' in result.stdout
+    assert 'CODE' not in result.stdout
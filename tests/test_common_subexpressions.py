@@ -0,0 +1,80 @@
+"""
+Expressions repeated in straight-line code are evaluated once, until anything they read may be changed
+"""
+from frontend.desugaring.common_subexpression_elimination import (
+    eliminate_common_subexpressions,
+    CommonSubexpressionStats,
+)
+from .common import optimize_function
+
+FUNCTIONS = '''class Counter { public integer x; }
+function[integer] bump(Counter c) {
+    c.x := c.x + 1;
+    return c.x;
+}
+'''
+
+
+def eliminate(statements: str) -> tuple[str, CommonSubexpressionStats]:
+    body = f'    array[integer] arr := [5, 3, 1, 4];\n    integer j := 0;\n{statements}    return n;\n'
+    return optimize_function(FUNCTIONS, 'integer n, integer m, Counter c', body, eliminate_common_subexpressions)
+
+
+def test_compared_elements_are_read_once_by_swap():
+    run, stats = eliminate('''    integer buffer := 0;
+    if (arr[j] > arr[j + 1]) {
+        buffer := arr[j];
+        arr[j] := arr[j + 1];
+        arr[j + 1] := buffer;
+    }
+''')
+
+    assert (
+        'VALCOPY ID common$1 INDEX 2 ID arr ID j\n'
+        'SET INT32 common$2\n'
+        'VALCOPY ID common$2 INDEX 2 ID arr ADD ID j 1\n'
+        'COND IF0 ENDIF0 GT ID common$1 ID common$2\n'
+    ) in run
+    assert 'VALCOPY ID buffer ID common$1' in run
+    assert 'VALCOPY INDEX 2 ID arr ID j ID common$2' in run
+    assert (stats.extracted_expressions, stats.replaced_occurrences) == (2, 2)
+
+
+def test_assigned_variables_make_expressions_unavailable():
+    run, stats = eliminate('''    integer a := n * m + n / m;
+    n := 3;
+    integer b := n * m + n / m;
+''')
+
+    assert run.count('DIV ID n ID m') == 2
+    assert stats.extracted_expressions == 0
+
+
+def test_repeated_expressions_are_extracted_once():
+    run, stats = eliminate('''    integer a := n / m + arr[j];
+    integer b := n / m - arr[j];
+    integer d := arr[j] * 2;
+''')
+
+    assert run.count('DIV ID n ID m') == 1
+    assert run.count('INDEX 2 ID arr ID j') == 1
+    assert 'VALCOPY ID d MUL ID common$2 2' in run
+    assert (stats.extracted_expressions, stats.replaced_occurrences) == (2, 3)
+
+
+def test_short_circuited_expressions_arent_extracted():
+    run, stats = eliminate('''    boolean a := n > 0 and arr[j] > 1;
+    integer b := arr[j];
+''')
+
+    assert run.count('INDEX 2 ID arr ID j') == 2
+    assert stats.extracted_expressions == 0
+
+
+def test_calls_writing_fields_make_fields_unavailable():
+    run, stats = eliminate('''    integer a := c.x * 2 + c.x;
+    integer b := bump(c) + c.x;
+''')
+
+    assert 'ADD CALL 2 bump ID c ACCESS ID c ID x' in run
+    assert (stats.extracted_expressions, stats.replaced_occurrences) == (1, 1)
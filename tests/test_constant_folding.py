@@ -0,0 +1,101 @@
+"""
+Constant folding evaluates the operators as the backend does, or leaves them to it
+"""
+import pytest
+
+from .common import check_program, translate_program, get_errors
+
+
+def fold(expression: str, type_name: str = 'integer') -> tuple[list[str], list[str]]:
+    program, _, context = check_program(f'{type_name} a := {expression};\n')
+    assignment = [line for line in translate_program(program).splitlines() if line.startswith('VALCOPY')]
+    return get_errors(context), assignment
+
+
+@pytest.mark.parametrize('expression, folded', [
+    ('3 + 4 * 5', '23'),
+    ('7 / 2', '3'),
+    ('-7 / 2', 'NEGATE 3'),
+    ('7 / -2', 'NEGATE 3'),
+    ('-7 // 2', 'NEGATE 3'),
+    ('7 % 3', '1'),
+    ('6 & 3 | 8', '10'),
+    ('100 + 100', '200'),
+    ('2147483646 + 1', '2147483647'),
+])
+def test_integer_operators_are_folded(expression, folded):
+    assert fold(expression) == ([], [f'VALCOPY ID a {folded}'])
+
+
+@pytest.mark.parametrize('expression, type_name, unfolded', [
+    ('2 ** 3', 'double', 'POW 2 3'),
+    ('-7 % 2', 'integer', 'MOD NEGATE 7 2'),
+])
+def test_operators_evaluated_differently_are_left_to_backend(expression, type_name, unfolded):
+    assert fold(expression, type_name) == ([], [f'VALCOPY ID a {unfolded}'])
+
+
+def test_float_operators_are_folded():
+    assert fold('7.0 / 2', 'double') == ([], ['VALCOPY ID a 3.5'])
+
+
+@pytest.mark.parametrize('expression, type_name, operator', [
+    ('2147483647 + 1', 'integer', '+'),
+    ('65536 * 65536', 'integer', '*'),
+    ('1 + 9223372036854775807', 'long integer', '+'),
+])
+def test_overflow_of_operator_type_is_error(expression, type_name, operator):
+    errors, _ = fold(expression, type_name)
+
+    assert [error.split(': ', 1)[1] for error in errors] == [
+        f'Integer overflow in constant expression with operator {operator}'
+    ]
+
+
+def test_extended_integers_dont_overflow():
+    assert fold('4 * 9223372036854775808', 'extended integer') == ([], ['VALCOPY ID a 36893488147419103232'])
+
+
+@pytest.mark.parametrize('expression', ['5 / 0', '5 // 0', '5 % 0', '(2 + 3) / (1 - 1)'])
+def test_integer_division_of_constants_by_zero_is_error(expression):
+    _, valid, context = check_program(f'integer a := {expression};\n')
+
+    assert not valid
+    assert [error.split(': ', 1)[1] for error in get_errors(context)] == ['Division by zero']
+
+
+@pytest.mark.parametrize('expression, unfolded', [
+    ('b / 0', 'DIV ID b 0'),
+    ('b // 0', 'FDIV ID b 0'),
+    ('b % 0', 'MOD ID b 0'),
+])
+def test_integer_division_of_variable_by_zero_is_left_to_backend(expression, unfolded):
+    program, _, context = check_program(f'integer b := 5;\ninteger a := {expression};\n')
+
+    assert get_errors(context) == []
+    assert f'VALCOPY ID a {unfolded}' in translate_program(program)
+
+
+def test_unreachable_division_by_zero_compiles():
+    program, _, context = check_program(
+        'function[integer] run(integer x) {\n'
+        '    if (false) {\n'
+        '        return x / 0;\n'
+        '    }\n'
+        '    return x;\n'
+        '}\n'
+    )
+
+    assert get_errors(context) == []
+    assert 'DIV ID x 0' in translate_program(program)
+
+
+@pytest.mark.parametrize('expression, unfolded', [
+    ('1.0 / 0.0', 'DIV 1.0 0.0'),
+    ('1 / 0.0', 'DIV 1 0.0'),
+    ('0.0 / 0', 'DIV 0.0 0'),
+    ('5.0 % 0.0', 'MOD 5.0 0.0'),
+])
+def test_float_division_by_zero_is_left_to_backend(expression, unfolded):
+    # the backend evaluates it into an infinity or NaN
+    assert fold(expression, 'double') == ([], [f'VALCOPY ID a {unfolded}'])
@@ -0,0 +1,99 @@
+"""
+Dead code elimination keeps everything reachable from the top-level statements and nothing else
+"""
+from frontend.desugaring.dead_code_elimination import eliminate_dead_code
+from .common import check_program, translate_program
+
+FUNCTIONS = '''function[integer] dead2() { return 2; }
+function[integer] dead1() { return dead2(); }
+function[integer] helper(integer a) { return a * 2; }
+function[integer] twice(integer a) { return helper(helper(a)); }
+'''
+
+
+def eliminate(source: str) -> tuple[str, object]:
+    program, _, _ = check_program(source)
+    stats = eliminate_dead_code(program)
+    return translate_program(program), stats
+
+
+def test_functions_called_only_by_dead_ones_are_removed():
+    intermediate_code, stats = eliminate(FUNCTIONS + 'integer r := twice(2);\n')
+
+    assert 'FUNCTION twice' in intermediate_code
+    assert 'FUNCTION helper' in intermediate_code
+    assert 'dead' not in intermediate_code
+    assert stats.removed_functions == 2
+
+
+def test_overloads_not_called_are_removed():
+    source = '''function[integer] f(integer a) { return a; }
+function[integer] f(boolean a) { return 0; }
+integer r := f(1);
+'''
+
+    intermediate_code, stats = eliminate(source)
+
+    assert intermediate_code.count('\nFUNCTION f') == 1
+    assert 'PARAM INT32 a' in intermediate_code
+    assert stats.removed_functions == 1
+
+
+def test_branches_of_constant_conditions_are_removed():
+    source = FUNCTIONS + '''function[integer] live(integer a) {
+    integer b := a + 1;
+    if (true) {
+        b := b + 1;
+    } else {
+        b := dead1();
+    }
+    while (1 > 2) {
+        b := dead2();
+    }
+    return b;
+}
+integer r := live(2);
+'''
+
+    intermediate_code, stats = eliminate(source)
+
+    assert 'dead' not in intermediate_code
+    assert 'VALCOPY ID b ADD ID b 1' in intermediate_code
+    assert stats.removed_statements == 1
+
+
+def test_statements_after_branches_returning_are_removed():
+    source = '''function[integer] f(integer a) {
+    if (a > 0) {
+        return 1;
+    } else {
+        return 2;
+    }
+    integer c := 3;
+    return c;
+}
+integer r := f(2);
+'''
+
+    intermediate_code, stats = eliminate(source)
+
+    assert 'RETURN ID c' not in intermediate_code
+    assert stats.removed_statements == 2
+
+
+def test_unused_locals_without_side_effects_are_removed():
+    source = FUNCTIONS + '''function[integer] f(integer a) {
+    integer unused := a * 5;
+    integer used_by_unused := 3;
+    integer unused_too := used_by_unused + 1;
+    integer called := helper(1);
+    return a;
+}
+integer r := f(2);
+'''
+
+    intermediate_code, stats = eliminate(source)
+
+    assert 'unused' not in intermediate_code
+    assert 'SET INT32 called' in intermediate_code
+    assert stats.removed_local_variables == 3
@@ -0,0 +1,38 @@
+"""
+Desugaring makes the checked program translatable, and optimizes it only if asked to
+"""
+from frontend.desugaring.main import desugar_ast_tree
+from .common import check_program, translate_program
+
+SOURCE = '''class Box[T] {
+    public T value;
+    public static integer count;
+    public constructor(T v) { this.value := v; }
+}
+function[integer] unused(integer a) { return a; }
+function[integer] sq(integer a) { return a * a; }
+Box[integer] box := new Box[integer](sq(3));
+'''
+
+
+def test_program_isnt_optimized_by_default():
+    program, _, _ = check_program(SOURCE)
+
+    stats = desugar_ast_tree(program)
+    intermediate_code = translate_program(program)
+
+    assert 'FUNCTION unused' in intermediate_code
+    assert 'CALL 2 sq 3' in intermediate_code
+    assert (stats.dead_code, stats.inlining, stats.hoisting, stats.common_subexpressions) == (None, None, None, None)
+
+
+def test_optimized_program_is_translated_without_dead_and_inlined_functions():
+    program, _, _ = check_program(SOURCE)
+
+    stats = desugar_ast_tree(program, optimize=True)
+    intermediate_code = translate_program(program)
+
+    assert 'FUNCTION' not in intermediate_code
+    assert 'MUL 3 3' in intermediate_code
+    assert stats.dead_code.removed_functions == 2
+    assert stats.inlining.inlined_expressions == 1
@@ -0,0 +1,74 @@
+"""
+Type errors are collected as records, optionally stopping at the limit of errors, skipping the cascading ones
+and written as JSON objects
+"""
+import io
+import json
+
+from frontend.type_checking.core import ErrorLogger, ErrorCode
+from .common import check_program, get_errors
+
+SOURCE = '''array[integer] arr := [1, 2];
+integer a := arr[missing];
+integer b := 1 + true;
+integer c := other;
+'''
+
+
+def test_all_errors_are_reported_by_default():
+    _, valid, context = check_program(SOURCE)
+
+    assert not valid
+    assert get_errors(context) == [
+        '[1:18]: Unresolved reference for missing',
+        '[1:18]: Invalid expression',
+        '[2:16]: Unsupported operation + for types byte and boolean',
+        '[3:14]: Unresolved reference for other',
+    ]
+    assert not context.error_logger.aborted
+
+
+def test_checking_stops_at_error_limit():
+    _, valid, context = check_program(SOURCE, ErrorLogger(max_errors=2))
+
+    assert not valid
+    assert get_errors(context) == ['[1:18]: Unresolved reference for missing', '[1:18]: Invalid expression']
+    assert context.error_logger.aborted
+
+    output = io.StringIO()
+    context.error_logger.write(output)
+    assert output.getvalue().splitlines()[-1] == 'Too many errors (2), type checking is stopped'
+
+
+def test_limit_not_reached_doesnt_stop_checking():
+    _, _, context = check_program(SOURCE, ErrorLogger(max_errors=5))
+
+    assert len(get_errors(context)) == 4
+    assert not context.error_logger.aborted
+
+
+def test_cascading_errors_are_suppressed():
+    _, _, context = check_program(SOURCE, ErrorLogger(suppress_cascades=True))
+
+    assert get_errors(context) == [
+        '[1:18]: Unresolved reference for missing',
+        '[2:16]: Unsupported operation + for types byte and boolean',
+        '[3:14]: Unresolved reference for other',
+    ]
+
+
+def test_errors_are_written_as_json_lines():
+    _, _, context = check_program(SOURCE, ErrorLogger(max_errors=3, json_lines=True))
+
+    output = io.StringIO()
+    context.error_logger.write(output)
+    records = [json.loads(line) for line in output.getvalue().splitlines()]
+
+    assert [record['code'] for record in records] == [
+        ErrorCode.UNRESOLVED_REFERENCE, ErrorCode.INVALID_EXPRESSION, ErrorCode.UNSUPPORTED_OPERATION, 'too-many-errors'
+    ]
+    assert records[0] == {
+        'code': 'unresolved-reference', 'line': 1, 'position': 18,
+        'span': list(context.error_logger.errors[0].span), 'message': 'Unresolved reference for missing',
+    }
+    assert records[-1]['message'] == 'Too many errors (3), type checking is stopped'
@@ -0,0 +1,125 @@
+import pytest
+
+from frontend.abstract_syntax_tree import (
+    ASTNode,
+    CalculationNode,
+    IdentifierNode,
+    ThisNode,
+    TypeNode,
+    iter_child_nodes,
+    structural_hash,
+)
+from frontend.semantics import TypeEnum
+from .common import read_example, check_program, get_errors, isinstance_chain_dispatch
+
+EXPRESSIONS = '''class Point {
+    public integer x;
+    public double y;
+    public constructor(integer x, double y) {
+        this.x := x;
+        this.y := y;
+    }
+    public function[double] total() {
+        return this.x + this.y;
+    }
+    public static function[integer] twice(integer a) {
+        return a * 2;
+    }
+}
+function[integer] square(integer a) { return a * a; }
+function[double] square(double a, double b) { return a * b; }
+Point p := new Point(1, 2.5);
+integer i := square(3) + Point.twice(p.x) - 7 % 4;
+double d := square(1.5, 2) * p.y;
+boolean b := i < 10 and not (d >= 2.0) or i == 3;
+integer k := i;
+while (k > 0) {
+    k := k - 1;
+    if (b) {
+        d := d / 2;
+    }
+}
+'''
+
+
+def iter_untyped_expressions(program: ASTNode):
+    # identifiers in type declarations name the types, they aren't expressions
+    stack = [program]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited or isinstance(node, TypeNode):
+            continue
+        visited.add(id(node))
+        if isinstance(node, (CalculationNode, IdentifierNode, ThisNode)) and node.valid and node.expression_type is None:
+            yield node
+        stack.extend(iter_child_nodes(node))
+
+
+@pytest.mark.parametrize('source', [EXPRESSIONS, read_example()], ids=['expressions', 'example'])
+@pytest.mark.parametrize('workers', [1, 2])
+def test_every_valid_expression_is_typed(source, workers):
+    program, _, _ = check_program(source, workers=workers)
+
+    assert [node.location for node in iter_untyped_expressions(program)] == []
+
+
+def iter_check_results(program: ASTNode):
+    stack = [program]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        if isinstance(node, (CalculationNode, IdentifierNode, ThisNode)):
+            # class types name their classes by identifier nodes, which are compared by identity
+            expression_type = None if node.expression_type is None else structural_hash(node.expression_type)
+            yield type(node).__name__, node.location, node.valid, expression_type, getattr(node, 'is_overload', None)
+        stack.extend(iter_child_nodes(node))
+
+
+@pytest.mark.parametrize('source', [
+    EXPRESSIONS,
+    read_example(),
+    'integer i := 1 + missing;\nboolean b := 1 < 2.5;\ninteger j := true * 2;\n',
+], ids=['expressions', 'example', 'invalid'])
+def test_dispatch_by_class_checks_as_isinstance_chain(source):
+    program, valid, context = check_program(source)
+    with isinstance_chain_dispatch():
+        chain_program, chain_valid, chain_context = check_program(source)
+
+    assert valid == chain_valid
+    assert get_errors(context) == get_errors(chain_context)
+    assert list(iter_check_results(program)) == list(iter_check_results(chain_program))
+
+
+def test_expression_types_are_inferred_ones():
+    program, _, context = check_program(EXPRESSIONS)
+    declarations = {statement.name: statement for statement in program.statements if hasattr(statement, 'name')}
+
+    assert get_errors(context) == []
+    assert declarations['i'].value.expression_type.name == TypeEnum.INTEGER
+    assert declarations['d'].value.expression_type.name == TypeEnum.DOUBLE
+    assert declarations['b'].value.expression_type.name == TypeEnum.BOOLEAN
+
+
+def test_invalid_expressions_are_not_typed():
+    program, valid, _ = check_program('integer i := 1 + missing;\n')
+
+    assert not valid
+    assert program.statements[0].value.expression_type is None
+
+
+def test_element_type_is_inferred_for_single_index():
+    program, _, context = check_program('array[integer] arr := [5, 3];\ninteger e := arr[1];\n')
+
+    assert get_errors(context) == []
+    assert program.statements[1].value.expression_type.name == TypeEnum.INTEGER
+
+
+def test_too_many_indices_are_reported():
+    program, _, context = check_program('array[integer] arr := [5, 3];\ninteger e := arr[1, 0];\n')
+
+    assert get_errors(context) == ['[1:14]: Too many arguments for collection type']
+    assert program.statements[1].value.expression_type is None
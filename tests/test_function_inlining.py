@@ -0,0 +1,67 @@
+"""
+Calls of small non-recursive functions are replaced with their bodies, evaluating the arguments as the calls do
+"""
+import re
+
+from frontend.desugaring.inline_functions import inline_functions, InliningStats
+from .common import optimize_function
+
+FUNCTIONS = '''function[integer] sq(integer a) { return a * a; }
+function[integer] fact(integer n) {
+    if (n < 2) { return 1; }
+    return n * fact(n - 1);
+}
+function[integer] clamp(integer a, integer high) {
+    integer result := a;
+    if (a > high) {
+        result := high;
+    }
+    return result;
+}
+'''
+
+
+def inline(statements: str) -> tuple[str, InliningStats]:
+    return optimize_function(FUNCTIONS, 'integer n', statements, inline_functions)
+
+
+def test_single_expression_is_inlined_into_expression():
+    run, stats = inline('    integer i := 3;\n    return n + sq(i);\n')
+
+    assert 'RETURN ADD ID n MUL ID i ID i' in run
+    assert stats.inlined_expressions == 1
+
+
+def test_argument_used_twice_isnt_evaluated_twice():
+    run, stats = inline('    integer total := n + sq(n + 1);\n    return sq(n + 2);\n')
+
+    # nothing can be declared in the expression, so the call is kept there
+    assert 'VALCOPY ID total ADD ID n CALL 2 sq ADD ID n 1' in run
+    assert re.search(r'VALCOPY ID (sq\$a\$inline_\d+) ADD ID n 2\nRETURN MUL ID \1 ID \1\n', run)
+    assert (stats.inlined_expressions, stats.inlined_statements) == (0, 1)
+
+
+def test_body_is_inlined_into_statement_with_renamed_locals():
+    run, stats = inline('    integer total := n * 3;\n    total := clamp(total, 1000);\n    return total;\n')
+
+    assert 'CALL' not in run
+    assert 'SET INT32 clamp$result$inline_' in run
+    assert 'GT ID total 1000' in run
+    assert 'SET INT32 result' not in run
+    assert stats.inlined_statements == 1
+
+
+def test_arguments_with_side_effects_are_evaluated_once_before_body():
+    run, _ = inline('    integer total := clamp(fact(n), 10);\n    return total;\n')
+
+    declaration = run.index('VALCOPY ID clamp$a$inline_')
+    assert run.count('CALL 2 fact ID n') == 1
+    assert run.index('CALL 2 fact ID n') > declaration
+    assert run.index('GT ID clamp$a$inline_') > declaration
+
+
+def test_recursive_functions_arent_inlined():
+    run, stats = inline('    return fact(n);\n')
+
+    assert 'RETURN CALL 2 fact ID n' in run
+    assert (stats.inlined_expressions, stats.inlined_statements) == (0, 0)
@@ -0,0 +1,126 @@
+"""
+Generic classes are replaced by one instance per distinct list of arguments,
+and the ones with infinitely many instances are rejected by the type checker
+"""
+import pytest
+
+from frontend.desugaring.instantiate_generic_class import instantiate_all_generics
+from frontend.type_checking.core import ErrorCode
+from .common import check_program, translate_program, get_errors
+
+BOX = '''class Box[T] {
+    public T value;
+    public constructor(T v) { this.value := v; }
+}
+'''
+
+NODE = '''class Node[T] {
+    public T value;
+    public nullable Node[T] next;
+    public constructor(T v) { this.value := v; this.next := null; }
+}
+'''
+
+
+def instantiate(source: str) -> list[str]:
+    # classes with constructors are never valid, as constructors have no return types, so only errors are checked
+    program, _, context = check_program(source)
+    assert get_errors(context) == []
+    instantiate_all_generics(program)
+    return [class_node.name for class_node in program.class_definitions]
+
+
+def test_same_instantiation_is_copied_once():
+    uses = ''.join(f'Box[integer] a{index} := new Box[integer]({index});\n' for index in range(50))
+    source = BOX + uses + 'Box[double] b := new Box[double](2.5);\n'
+
+    names = instantiate(source)
+
+    assert len(names) == 2
+    assert all(name.startswith('Box__') for name in names)
+
+
+def test_generic_classes_arent_translated():
+    program, _, _ = check_program(BOX + 'Box[integer] a := new Box[integer](5);\ninteger x := a.value;\n')
+    instantiate_all_generics(program)
+    (name,) = [class_node.name for class_node in program.class_definitions]
+
+    intermediate_code = translate_program(program)
+
+    assert f'CLASS {name}' in intermediate_code
+    assert f'SET CLASSID {name} a' in intermediate_code
+    assert 'CLASS Box\n' not in intermediate_code
+
+
+def test_class_referring_to_itself_refers_to_its_instance():
+    source = NODE + 'Node[integer] n := new Node[integer](1);\nn.next := new Node[integer](2);\n'
+    program, _, _ = check_program(source)
+    instantiate_all_generics(program)
+    (instance,) = program.class_definitions
+
+    intermediate_code = translate_program(program)
+
+    assert f'SET VOID CLASSID {instance.name} next' in intermediate_code
+    assert 'CLASSID Node\n' not in intermediate_code
+
+
+def test_nested_instantiations_of_other_classes_are_instantiated():
+    source = BOX + '''class Pair[A, B] {
+    public nullable Box[A] first;
+    public nullable Box[Box[B]] second;
+    public constructor() { this.first := null; this.second := null; }
+}
+Pair[integer, double] p := new Pair[integer, double]();
+'''
+
+    names = instantiate(source)
+
+    assert sorted(name.split('__')[0] for name in names) == ['Box', 'Box', 'Box', 'Pair']
+
+
+@pytest.mark.parametrize('field', [
+    'public nullable Node[Box[T]] next;',
+    'public nullable Node[Box[Box[T]]] next;',
+])
+def test_infinitely_nested_instantiation_is_error(field):
+    source = BOX + f'class Node[T] {{ {field} public constructor() {{ }} }}\nNode[integer] n := new Node[integer]();\n'
+
+    program, valid, context = check_program(source)
+
+    assert not valid
+    assert [error.split(': ', 1)[1] for error in get_errors(context)] == [
+        'Generic class Node is instantiated with infinitely nested arguments'
+    ]
+    assert [error.code for error in context.error_logger] == [ErrorCode.INVALID_INSTANTIATION]
+
+    # instantiating it anyway gives up at the nesting limit, instead of copying the classes forever
+    with pytest.raises(ValueError, match='infinitely nested arguments'):
+        instantiate_all_generics(program)
+
+
+def test_mutually_recursive_expansion_is_error():
+    source = BOX + '''class A[T] { public nullable B[Box[T]] b; public constructor() { } }
+class B[U] { public nullable A[U] a; public constructor() { } }
+A[integer] x := new A[integer]();
+'''
+
+    _, valid, context = check_program(source)
+
+    assert not valid
+    assert [error.split(': ', 1)[1] for error in get_errors(context)] == [
+        'Generic class B is instantiated with infinitely nested arguments'
+    ]
+
+
+def test_cycle_without_nesting_is_valid():
+    source = '''class A[T, U] {
+    public nullable A[U, T] swapped;
+    public nullable A[T, T] same;
+    public constructor() { }
+}
+A[integer, double] x := new A[integer, double]();
+'''
+
+    names = instantiate(source)
+
+    assert len(names) == 4
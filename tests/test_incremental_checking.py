@@ -0,0 +1,80 @@
+"""
+Incremental checking checks again only the bodies depending on the declarations changed since the previous check,
+and reports what a full check of the changed program does
+"""
+import contextlib
+import io
+
+from frontend.abstract_syntax_tree import ProgramNode, diff_programs
+from frontend.type_checking.entrypoint import type_check_program_incrementally
+from frontend.type_checking.shared import TypeCheckContext
+from .common import parse_program, check_program, get_errors
+
+SOURCE = '''class Point {
+    public integer x;
+    public function[integer] get(integer a) { return a + 1; }
+}
+class Size {
+    public integer width;
+    public function[integer] area(integer a) { return a * 2; }
+}
+function[integer] uses_point(Point p) { return p.x; }
+function[integer] uses_size(Size s) { return s.width; }
+function[integer] uses_both(Point p, Size s) { return p.x + s.width; }
+function[integer] uses_none(integer a) { return a * missing; }
+function[integer] calls_point(Point p) { return uses_point(p) + 1; }
+'''
+
+
+def check_incrementally(program: ProgramNode, previous_context: TypeCheckContext | None) -> TypeCheckContext:
+    context = TypeCheckContext()
+    with contextlib.redirect_stderr(io.StringIO()):
+        type_check_program_incrementally(program, previous_context, context)
+    return context
+
+
+def replace_changed_definitions(program: ProgramNode, new_program: ProgramNode) -> None:
+    # unchanged definitions are kept, the rest are taken from the new version
+    diff = diff_programs(program, new_program)
+    kept = {id(new_node): old_node for old_node, new_node in diff.unchanged.values()}
+    program.class_definitions = [kept.get(id(node), node) for node in new_program.class_definitions]
+    program.function_definitions = [kept.get(id(node), node) for node in new_program.function_definitions]
+    program.statements = new_program.statements
+
+
+def edit(source: str) -> tuple[TypeCheckContext, TypeCheckContext]:
+    """
+    Check the program, then incrementally check its edited version
+    :return: contexts of the incremental check and of the full check of the edited version
+    """
+    program = parse_program(SOURCE)
+    previous_context = check_incrementally(program, None)
+    replace_changed_definitions(program, parse_program(source))
+    _, _, full_context = check_program(source)
+    return check_incrementally(program, previous_context), full_context
+
+
+def test_changed_class_rechecks_only_bodies_depending_on_it():
+    context, full_context = edit(SOURCE.replace('public integer x;', 'public double x;'))
+
+    state = context.incremental_state
+    # Point.get, uses_point and uses_both, but not calls_point, which only passes the point to unchanged uses_point
+    assert (state.checked_bodies, state.reused_bodies) == (3, 4)
+    assert get_errors(context) == get_errors(full_context)
+
+
+def test_changed_function_signature_rechecks_its_callers():
+    context, full_context = edit(SOURCE.replace('function[integer] uses_point', 'function[double] uses_point'))
+
+    state = context.incremental_state
+    assert (state.checked_bodies, state.reused_bodies) == (2, 5)
+    assert get_errors(context) == get_errors(full_context)
+
+
+def test_unchanged_program_reuses_all_bodies_and_errors():
+    context, full_context = edit(SOURCE)
+
+    state = context.incremental_state
+    assert (state.checked_bodies, state.reused_bodies) == (0, 7)
+    assert get_errors(context) == get_errors(full_context)
+    assert any('missing' in error for error in get_errors(context))
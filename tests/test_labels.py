@@ -0,0 +1,81 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from frontend.abstract_syntax_tree import LabelAllocator
+from .common import read_example, parse_program, check_program, translate_program, get_errors
+
+NESTED_LOOPS = '''
+integer i := 0;
+while (i < 3) {
+    integer j := 0;
+    while (j < 3) {
+        j := j + 1;
+        break;
+    }
+    if (i == 1) { i := i + 2; } else { i := i + 1; };
+    continue;
+}
+'''
+
+
+def generate_program(loops: int) -> str:
+    return ''.join(
+        f'''integer k{index} := 0;
+while (k{index} < {index + 2}) {{
+    if (k{index} > 1) {{ k{index} := k{index} + 2; }} else {{ k{index} := k{index} + 1; }};
+}}
+'''
+        for index in range(loops)
+    )
+
+
+def compile_program(source: str) -> tuple[bool, list[str], str]:
+    program, valid, context = check_program(source)
+    return valid, get_errors(context), translate_program(program)
+
+
+def test_labels_are_numbered_per_translation():
+    program = parse_program(NESTED_LOOPS)
+    code = translate_program(program)
+
+    assert translate_program(program) == code
+    assert translate_program(parse_program(generate_program(5))).count('LABEL WHILE') == 5
+    assert translate_program(program) == code
+
+
+def test_break_and_continue_jump_to_their_loops():
+    lines = translate_program(parse_program(NESTED_LOOPS)).splitlines()
+
+    assert 'LABEL WHILE0' in lines
+    assert 'LABEL WHILE1' in lines
+    assert 'JUMP ENDWHILE1' in lines
+    assert 'JUMP WHILE0' in lines
+    assert lines.index('LABEL WHILE1') < lines.index('JUMP ENDWHILE1') < lines.index('LABEL ENDWHILE1')
+
+
+def test_translation_continues_given_label_allocator():
+    labels = LabelAllocator()
+    program = parse_program(generate_program(2))
+    program.translate(io.StringIO(), labels=labels)
+
+    assert labels.allocate(LabelAllocator.WHILE) == 2
+
+
+def test_continue_with_error_outside_of_loop_is_invalid():
+    _, valid, context = check_program('continue 3;\n')
+
+    assert not valid
+    assert [error.message for error in context.error_logger] == [
+        'Empty continue keyword cannot be used outside of loop'
+    ]
+
+
+def test_concurrent_compilations_in_threads_are_independent():
+    sources = [read_example(), NESTED_LOOPS] + [generate_program(loops) for loops in range(1, 7)]
+    expected = [compile_program(source) for source in sources]
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(compile_program, sources * 25))
+
+    assert results == expected * 25
+
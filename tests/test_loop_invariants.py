@@ -0,0 +1,77 @@
+"""
+Expressions evaluating the same on every iteration are hoisted before the outermost loop they are invariant in,
+if evaluating them before the loop can't fail where the loop wouldn't
+"""
+from frontend.desugaring.hoist_loop_invariants import hoist_loop_invariants, HoistingStats
+from .common import optimize_function
+
+FUNCTIONS = '''class Counter { public integer x; }
+function[integer] half(integer a) { return a / 2; }
+function[integer] bump(Counter c) {
+    c.x := c.x + 1;
+    return c.x;
+}
+'''
+
+
+def hoist(statements: str) -> tuple[str, HoistingStats]:
+    body = f'    integer total := 0;\n{statements}    return total;\n'
+    return optimize_function(FUNCTIONS, 'integer n, integer d, Counter c', body, hoist_loop_invariants)
+
+
+def test_bounds_are_hoisted_before_outermost_loop_they_are_invariant_in():
+    run, stats = hoist('''    integer i := 0;
+    while (i < n) {
+        integer j := 0;
+        while (j < n - 1 - i) {
+            total := total + j;
+            j := j + 1;
+        }
+        i := i + 1;
+    }
+''')
+
+    outer = run.index('COND WHILE0')
+    inner = run.index('COND WHILE1')
+    assert run.index('VALCOPY ID invariant$1 SUB ID n 1') < outer
+    assert outer < run.index('VALCOPY ID invariant$2 SUB ID invariant$1 ID i') < inner
+    assert 'COND WHILE1 ENDWHILE1 LT ID j ID invariant$2' in run
+    assert (stats.hoisted_expressions, stats.loops) == (2, 2)
+
+
+def test_variables_changed_in_loop_arent_hoisted():
+    run, stats = hoist('''    integer i := 0;
+    while (i < n * 2) {
+        n := n - 1;
+        i := i + 1;
+    }
+''')
+
+    assert 'COND WHILE0 ENDWHILE0 LT ID i MUL ID n 2' in run
+    assert stats.hoisted_expressions == 0
+
+
+def test_expressions_that_may_fail_are_hoisted_only_from_condition():
+    run, stats = hoist('''    integer i := 0;
+    while (i < n / d) {
+        total := total + n / d + n * 3;
+        i := i + 1;
+    }
+''')
+
+    assert 'VALCOPY ID invariant$1 DIV ID n ID d' in run
+    assert 'VALCOPY ID invariant$2 MUL ID n 3' in run
+    assert 'ADD ADD ID total DIV ID n ID d ID invariant$2' in run
+    assert stats.hoisted_expressions == 2
+
+
+def test_only_read_only_functions_are_hoisted():
+    run, stats = hoist('''    integer i := 0;
+    while (i < half(n) + bump(c)) {
+        i := i + 1;
+    }
+''')
+
+    assert 'VALCOPY ID invariant$1 CALL 2 half ID n' in run
+    assert 'LT ID i ADD ID invariant$1 CALL 2 bump ID c' in run
+    assert stats.hoisted_expressions == 1
@@ -0,0 +1,68 @@
+"""
+Memoized overload resolutions are reused by the calls with the same argument types,
+and forgotten when the definitions they were resolved from are rebuilt
+"""
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from frontend.type_checking._helpers_function import get_function
+from frontend.type_checking._overload_cache import OverloadResolutionCache
+from frontend.type_checking._symbol_tables import build_symbol_tables
+from frontend.type_checking.shared import type_check_context
+from .common import parse_program, check_program, translate_program, get_errors
+
+OVERLOADS = '''function[integer] f(integer a) { return a; }
+function[integer] f(boolean a) { return 0; }
+'''
+
+
+def test_repeated_calls_hit_cache():
+    calls = 20
+    source = OVERLOADS + ''.join(f'integer a{index} := f({index}) + f(true);\n' for index in range(calls))
+
+    _, _, context = check_program(source)
+
+    assert get_errors(context) == []
+    assert context.overload_cache.misses == 2
+    assert context.overload_cache.hits == 2 * calls - 2
+
+
+def test_cached_resolutions_translate_as_uncached(monkeypatch):
+    source = OVERLOADS + ''.join(f'integer a{index} := f({index}) + f(true);\n' for index in range(5))
+    program, _, _ = check_program(source)
+    mangle_static_functions(program)
+    cached = translate_program(program)
+
+    monkeypatch.setattr(OverloadResolutionCache, 'lookup', lambda self, key: self.MISSING)
+    program, _, _ = check_program(source)
+    mangle_static_functions(program)
+
+    assert translate_program(program) == cached
+    assert 'CALL 2 f$_1 true' in cached
+
+
+def test_failed_resolutions_are_cached():
+    with type_check_context() as context:
+        function, _ = parse_program(OVERLOADS).function_definitions
+        context.function_definitions.append(function)
+        build_symbol_tables()
+        boolean = parse_program(OVERLOADS).function_definitions[1].parameters_signature
+
+        assert get_function('f', boolean) == (False, None)
+        assert get_function('f', boolean) == (False, None)
+        assert (context.overload_cache.hits, context.overload_cache.misses) == (1, 1)
+
+
+def test_rebuilt_symbol_tables_invalidate_resolutions():
+    with type_check_context() as context:
+        old, _ = parse_program(OVERLOADS).function_definitions
+        context.function_definitions.append(old)
+        build_symbol_tables()
+        signature = old.parameters_signature
+        assert get_function('f', signature) == (True, old)
+        assert get_function('f', signature) == (True, old)
+
+        new, _ = parse_program(OVERLOADS).function_definitions
+        context.function_definitions[:] = [new]
+        build_symbol_tables()
+
+        assert get_function('f', signature) == (True, new)
+        assert (context.overload_cache.hits, context.overload_cache.misses) == (1, 2)
@@ -0,0 +1,142 @@
+"""
+Equivalence of the duplicate overload detection grouped by signature keys with the pairwise one it replaced
+"""
+import random
+import re
+
+import pytest
+
+import frontend.type_checking.classes.entrypoint as classes_entrypoint
+import frontend.type_checking.functions.entrypoint as functions_entrypoint
+from frontend.abstract_syntax_tree import FunctionDefNode, ClassMethodDeclarationNode
+from frontend.type_checking._helpers_function import match_signatures
+from frontend.type_checking.core import ErrorCode
+from frontend.type_checking.shared import get_context
+from .common import check_program
+
+PARAMETER_TYPES = [
+    'integer', 'double', 'byte', 'boolean', 'string', 'char', 'float', 'long integer',
+    'reference integer', 'const integer', 'nullable integer', 'const double',
+    'Base', 'Derived', 'Other', 'nullable Base', 'reference Derived',
+]
+
+
+def previous_validate_overloaded_function_definitions(
+    definitions: list[FunctionDefNode | ClassMethodDeclarationNode]
+) -> bool:
+    not_overloaded_function_names = set()
+    distinct_functions_names = set()
+
+    for function in definitions:
+        name = function.function_name
+        if name in distinct_functions_names:
+            not_overloaded_function_names.discard(name)
+        else:
+            not_overloaded_function_names.add(name)
+            distinct_functions_names.add(name)
+
+    overloads = distinct_functions_names.difference(not_overloaded_function_names)
+    if not overloads:
+        return True
+
+    counter = {name: 0 for name in overloads}
+    for function in definitions:
+        if (name := function.function_name) in overloads:
+            function.has_overloads = True
+            function.overload_number = counter[name]
+            counter[name] += 1
+
+    overload_validations = [
+        _previous_validate_overloaded_function_name(definitions=definitions, function_name=function_name)
+        for function_name in overloads
+    ]
+    return all(overload_validations)
+
+
+def _previous_validate_overloaded_function_name(
+    definitions: list[FunctionDefNode | ClassMethodDeclarationNode],
+    function_name: str
+) -> bool:
+    overloaded_functions = [function for function in definitions if function.function_name == function_name]
+
+    has_no_duplicate_definitions = True
+    for i in range(len(overloaded_functions)):
+        for j in range(i + 1, len(overloaded_functions)):
+            if match_signatures(
+                args_signature=overloaded_functions[i].parameters_signature,
+                function_signature=overloaded_functions[j].parameters_signature
+            ):
+                has_no_duplicate_definitions = False
+                get_context().error_logger.add(
+                    location=overloaded_functions[i],
+                    code=ErrorCode.INVALID_DECLARATION,
+                    reason="Multiple overloads for function {} with same signature{} found",
+                    args=(function_name, overloaded_functions[i].parameters_signature)
+                )
+
+    return has_no_duplicate_definitions
+
+
+def generate_program(overloads: int, randomizer: random.Random) -> str:
+    def parameters() -> str:
+        return ', '.join(
+            f'{randomizer.choice(PARAMETER_TYPES)} a{index}' for index in range(randomizer.randint(0, 3))
+        )
+
+    lines = [
+        'class Base { public integer x; }\n',
+        'class Derived from Base { public integer y; }\n',
+        'class Other { public integer z; }\n',
+        'class Big {\n',
+    ]
+    for _ in range(overloads):
+        static = 'static ' if randomizer.random() < 0.3 else ''
+        name = randomizer.choice(('m', 'n'))
+        lines.append(f'    public {static}function[integer] {name}({parameters()}) {{ return 1; }}\n')
+    lines.append('}\n')
+    for _ in range(overloads // 3):
+        name = randomizer.choice(('f', 'g'))
+        lines.append(f'function[integer] {name}({parameters()}) {{ return 1; }}\n')
+    return ''.join(lines)
+
+
+def summarize_check(source: str) -> tuple:
+    program, valid, context = check_program(source)
+    functions = program.function_definitions + [
+        method
+        for class_node in program.class_definitions
+        for method in class_node.methods_defs + class_node.static_methods_defs
+    ]
+    # errors of different names were logged in set iteration order, so they are compared regardless of order
+    errors = sorted(re.sub(r' at 0x[0-9a-f]+', '', str(error)) for error in context.error_logger)
+    return (
+        valid,
+        errors,
+        [(function.function_name, function.has_overloads, function.overload_number) for function in functions],
+    )
+
+
+@pytest.mark.parametrize('seed', range(8))
+def test_duplicate_overloads_are_reported_as_before(seed, monkeypatch):
+    source = generate_program(120, random.Random(seed))
+    with monkeypatch.context() as patch:
+        for module in (classes_entrypoint, functions_entrypoint):
+            patch.setattr(
+                module, 'validate_overloaded_function_definitions', previous_validate_overloaded_function_definitions
+            )
+        expected = summarize_check(source)
+
+    assert summarize_check(source) == expected
+
+
+def test_implicitly_convertible_overloads_are_duplicates():
+    _, valid, context = check_program(
+        'function[integer] f(integer a) { return 1; }\n'
+        'function[integer] f(double a) { return 2; }\n'
+        'function[integer] f(string a) { return 3; }\n'
+    )
+
+    assert not valid
+    assert [error.message.split(' with ')[0] for error in context.error_logger] == [
+        'Multiple overloads for function f'
+    ]
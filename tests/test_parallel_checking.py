@@ -0,0 +1,70 @@
+"""
+Checking the bodies in worker processes gives the results of the sequential checking:
+the same errors in the same order, validity, usages and translation
+"""
+import threading
+
+import pytest
+
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from frontend.type_checking import entrypoint
+from frontend.type_checking._parallel import can_validate_in_parallel
+from .common import read_example, check_program, translate_program, get_errors
+
+pytestmark = pytest.mark.skipif(not can_validate_in_parallel(), reason='processes can\'t be forked')
+
+
+def generate_program(functions: int) -> str:
+    # every few bodies have errors, so the order of the merged errors is checked too
+    return ''.join(
+        f'''class C{index} {{
+    public integer x;
+    public function[integer] get(integer a) {{ return a + {index}; }}
+    public static function[integer] make(integer a) {{ return a * missing{index}; }}
+}}
+function[integer] f{index}(integer a) {{
+    integer b := a * {index} + f{max(index - 1, 0)}(a);
+    return b{' + true' if index % 3 == 0 else ''};
+}}
+'''
+        for index in range(functions)
+    ) + ''.join(f'integer r{index} := f{index}({index});\n' for index in range(functions))
+
+
+def summarize_check(source: str, workers: int) -> tuple:
+    program, valid, context = check_program(source, workers=workers)
+    usages = [function_node.usages for function_node in program.function_definitions]
+    mangle_static_functions(program)
+    return (
+        valid,
+        get_errors(context),
+        usages,
+        translate_program(program),
+    )
+
+
+@pytest.mark.parametrize('workers', [2, 3])
+@pytest.mark.parametrize('source', [generate_program(20), read_example()], ids=['generated', 'example'])
+def test_workers_check_as_sequential(source, workers):
+    sequential = summarize_check(source, workers=1)
+
+    assert summarize_check(source, workers=workers) == sequential
+    assert sequential[1]
+
+
+def test_bodies_are_checked_sequentially_while_other_threads_run(monkeypatch):
+    def fork_workers(*args):
+        raise AssertionError('workers are forked while other threads are running')
+
+    source = generate_program(5)
+    sequential = summarize_check(source, workers=1)
+    monkeypatch.setattr(entrypoint, 'validate_definitions_in_parallel', fork_workers)
+
+    stopped = threading.Event()
+    thread = threading.Thread(target=stopped.wait)
+    thread.start()
+    try:
+        assert summarize_check(source, workers=2) == sequential
+    finally:
+        stopped.set()
+        thread.join()
@@ -0,0 +1,51 @@
+"""
+Scopes extend the environment of the enclosing one in place: their locals are removed on exit,
+so they aren't visible after the scope, and a rejected redeclaration doesn't remove the outer variable
+"""
+import pytest
+
+from frontend.semantics import TypeEnum
+from .common import check_program, get_errors
+
+
+@pytest.mark.parametrize('source, error', [
+    ('if (true) { integer t := 1; }\ninteger u := t;\n', '[1:14]: Unresolved reference for t'),
+    ('if (false) { } else { integer t := 1; }\ninteger u := t;\n', '[1:14]: Unresolved reference for t'),
+    (
+        'integer k := 0;\nwhile (k < 3) { integer t := k; k := k + 1; }\ninteger u := t;\n',
+        '[2:14]: Unresolved reference for t',
+    ),
+    (
+        'function[integer] f(integer a) { integer t := a; return t; }\ninteger u := t;\n',
+        '[1:14]: Unresolved reference for t',
+    ),
+], ids=['if', 'else', 'while', 'function'])
+def test_locals_are_not_visible_after_their_scope(source, error):
+    _, _, context = check_program(source)
+
+    assert get_errors(context) == [error]
+
+
+def test_nested_locals_are_not_visible_after_nested_scope():
+    _, _, context = check_program('function[integer] f(integer a) { if (a > 0) { integer t := a; } return t; }\n')
+
+    assert get_errors(context) == ['[0:71]: Unresolved reference for t']
+
+
+def test_sibling_scopes_declare_same_name():
+    program, _, context = check_program('''if (true) { integer t := 1; } else { double t := 2.5; }
+integer k := 0;
+while (k < 3) { boolean t := true; k := k + 1; }
+double t := 0.5;
+double u := t;
+''')
+
+    assert get_errors(context) == []
+    assert program.statements[-1].value.expression_type.name == TypeEnum.DOUBLE
+
+
+def test_rejected_redeclaration_keeps_outer_variable():
+    program, _, context = check_program('integer x := 1;\nif (true) { double x := 2.5; }\ninteger y := x;\n')
+
+    assert get_errors(context) == ['[1:20]: Variable is already defined in current context']
+    assert program.statements[-1].value.expression_type.name == TypeEnum.INTEGER
@@ -0,0 +1,100 @@
+"""
+Every parsed node has a span nested into the span of its parent,
+and the span index answers the same as the scan over all the nodes
+"""
+from frontend.abstract_syntax_tree import ASTNode, iter_child_nodes
+from .common import read_example, parse_program
+
+SOURCE = '''function[integer] shift(integer a, integer b) {
+    integer c := a * 3 + b - (a + 1) * (b - 2);
+    return -c;
+}
+integer r := shift(2, 4) + 10 / 5;
+boolean ordered := 1 < r and r < 100;
+'''
+
+
+def collect_nodes(root: ASTNode) -> dict[int, tuple[ASTNode, int]]:
+    nodes = {}
+    stack = [(root, 0)]
+    while stack:
+        node, depth = stack.pop()
+        if id(node) in nodes:
+            continue
+        nodes[id(node)] = (node, depth)
+        stack.extend((child, depth + 1) for child in iter_child_nodes(node))
+    return nodes
+
+
+def innermost_node_at(nodes: dict[int, tuple[ASTNode, int]], offset: int) -> ASTNode | None:
+    covering = [
+        (node.span[1] - node.span[0], -depth, node)
+        for node, depth in nodes.values()
+        if node.span[0] <= offset < node.span[1]
+    ]
+    if not covering:
+        return None
+    return min(covering, key=lambda item: item[:2])[2]
+
+
+def test_children_spans_are_nested_into_parent_spans():
+    for source in (SOURCE, read_example()):
+        for node, _ in collect_nodes(parse_program(source)).values():
+            assert node.span is not None, node
+            for child in iter_child_nodes(node):
+                assert node.span[0] <= child.span[0] and child.span[1] <= node.span[1], (node, child)
+
+
+def test_spans_cover_parentheses_and_brackets():
+    source = 'integer r := (a + 1) * b[2];\n'
+    program = parse_program(source)
+    assignment = program.statements[0].value
+
+    assert source[slice(*assignment.span)] == '(a + 1) * b[2]'
+    assert source[slice(*assignment.left.span)] == '(a + 1)'
+    assert source[slice(*assignment.right.span)] == 'b[2]'
+
+
+def test_node_at_is_innermost_node():
+    for source in (SOURCE, read_example()):
+        program = parse_program(source)
+        nodes = collect_nodes(program)
+        index = program.build_span_index()
+
+        assert len(index) == len(nodes)
+        for offset in range(len(source) + 1):
+            assert index.node_at(offset) is innermost_node_at(nodes, offset), offset
+
+
+def test_ancestors_are_enclosing_spans():
+    program = parse_program(SOURCE)
+    index = program.build_span_index()
+    literal = index.node_at(SOURCE.index('3 + b'))
+
+    ancestors = list(index.ancestors(literal))
+    assert ancestors[0] is literal
+    assert ancestors[-1] is program
+    assert index.enclosing(program) is None
+    for inner, outer in zip(ancestors, ancestors[1:]):
+        assert index.enclosing(inner) is outer
+        assert outer.span[0] <= inner.span[0] and inner.span[1] <= outer.span[1]
+
+
+def test_nodes_in_range_are_intersecting_nodes():
+    program = parse_program(SOURCE)
+    nodes = collect_nodes(program)
+    index = program.build_span_index()
+
+    ranges = [
+        (0, len(SOURCE)),
+        (SOURCE.index('(a + 1)'), SOURCE.index('* (b')),
+        (SOURCE.index('-c'), SOURCE.index('-c') + 1),
+    ]
+    for start, end in ranges:
+        found = index.nodes_in_range(start, end)
+        expected = {id(node) for node, _ in nodes.values() if node.span[0] < end and start < node.span[1]}
+
+        assert {id(node) for node in found} == expected
+        assert len(found) == len(expected)
+        assert [node.span[0] for node in found] == sorted(node.span[0] for node in found)
+    assert index.nodes_in_range(5, 5) == []
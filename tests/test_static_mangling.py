@@ -0,0 +1,71 @@
+"""
+Static members and overloads are flattened into global functions and variables called by their final names
+"""
+from frontend.desugaring.mangle_static_functions import mangle_static_functions
+from .common import check_program, translate_program, get_errors
+
+SOURCE = '''class Counter {
+    public static integer calls;
+    public static function[integer] square(integer a) {
+        Counter.calls := Counter.calls + 1;
+        return a * a;
+    }
+    public static function[integer] square(boolean a) {
+        return 0;
+    }
+}
+class Vec {
+    public integer x;
+    public constructor(integer x) { this.x := x; }
+    public static function[Vec] operator + (Vec a, Vec b) {
+        return new Vec(a.x + b.x);
+    }
+}
+function[integer] add(integer a, integer b) { return a + b; }
+function[integer] add(boolean a, boolean b) { return 0; }
+integer r := Counter.square(3) + add(1, 2);
+integer s := Counter.square(true) + add(true, false);
+Vec v := new Vec(1) + new Vec(2);
+integer c := Counter.calls;
+'''
+
+
+def mangle(source: str) -> str:
+    program, _, context = check_program(source)
+    assert get_errors(context) == []
+    mangle_static_functions(program)
+    return translate_program(program)
+
+
+def test_static_methods_become_global_functions():
+    intermediate_code = mangle(SOURCE)
+
+    assert 'FUNCTION Counter$square\n' in intermediate_code
+    assert 'FUNCTION Counter$square$_1\n' in intermediate_code
+    assert 'CALL 2 Counter$square 3' in intermediate_code
+    assert 'CALL 2 Counter$square$_1 true' in intermediate_code
+    assert 'METHOD' not in intermediate_code.split('CLASS Vec')[0]
+
+
+def test_static_fields_become_global_variables():
+    intermediate_code = mangle(SOURCE)
+    declaration = intermediate_code.index('SET INT32 Counter$calls')
+
+    assert declaration < intermediate_code.index('SET INT32 r')
+    assert 'VALCOPY ID Counter$calls ADD ID Counter$calls 1' in intermediate_code
+    assert 'VALCOPY ID c ID Counter$calls' in intermediate_code
+
+
+def test_overloads_are_called_by_final_names():
+    intermediate_code = mangle(SOURCE)
+
+    assert 'CALL 3 add 1 2' in intermediate_code
+    assert 'CALL 3 add$_1 true false' in intermediate_code
+    assert 'FUNCTION add$_1\n' in intermediate_code
+
+
+def test_overloaded_operators_are_called_as_functions():
+    intermediate_code = mangle(SOURCE)
+
+    assert 'FUNCTION $operator_ADD\n' in intermediate_code
+    assert 'VALCOPY ID v CALL 3 $operator_ADD' in intermediate_code
@@ -0,0 +1,69 @@
+"""
+Structural hashes depend only on the code: neither on locations nor on what the type checker adds to the nodes,
+and the diff of two program versions is keyed by the declarations
+"""
+from frontend.abstract_syntax_tree import structural_hash, diff_programs
+from .common import read_example, parse_program, check_program
+
+SOURCE = '''class Box[T] {
+    public T value;
+    public constructor(T v) { this.value := v; }
+}
+class Point {
+    public integer x;
+    public static integer count;
+}
+function[integer] twice(integer a) { return a * 2 + 3 * 4; }
+function[integer] twice(boolean a) { return 0; }
+Box[integer] box := new Box[integer](twice(1));
+integer r := twice(2) + 10 / 5;
+'''
+
+
+def test_same_code_on_other_lines_has_same_hash():
+    moved = '\n\n' + SOURCE.replace('{ return', '{\n    return')
+
+    assert structural_hash(parse_program(SOURCE)) == structural_hash(parse_program(moved))
+
+
+def test_type_checked_tree_has_hash_of_parsed_one():
+    # instantiations, expression types, folded literals etc. are set by the type checker and mustn't be hashed
+    for source in (SOURCE, read_example()):
+        checked, _, _ = check_program(source)
+
+        assert structural_hash(checked) == structural_hash(parse_program(source))
+
+
+def test_changed_code_has_other_hash():
+    changed = SOURCE.replace('a * 2', 'a * 3')
+
+    assert structural_hash(parse_program(SOURCE)) != structural_hash(parse_program(changed))
+
+
+def test_diff_reports_changed_declarations_only():
+    changed = SOURCE.replace('a * 2', 'a * 3').replace('public integer x;', 'public integer x;\n    public integer y;')
+
+    diff = diff_programs(parse_program(SOURCE), parse_program(changed))
+
+    assert sorted(key[:2] for key in diff.changed) == [('class', 'Point'), ('function', 'twice')]
+    assert not diff.added and not diff.removed
+    assert ('class', 'Box') in diff.unchanged
+
+
+def test_overloads_are_told_apart_by_signatures():
+    changed = SOURCE.replace('twice(boolean a)', 'twice(double a)')
+
+    diff = diff_programs(parse_program(SOURCE), parse_program(changed))
+
+    assert [key[:2] for key in diff.added] == [('function', 'twice')]
+    assert [key[:2] for key in diff.removed] == [('function', 'twice')]
+    assert not diff.changed
+
+
+def test_statements_are_matched_by_hash():
+    changed = SOURCE.replace('integer r := twice(2) + 10 / 5;', 'integer s := 1;\ninteger r := twice(2) + 10 / 5;')
+
+    diff = diff_programs(parse_program(SOURCE), parse_program(changed))
+
+    assert [key[0] for key in diff.added] == ['statement']
+    assert not diff.removed and not diff.changed
@@ -0,0 +1,64 @@
+"""
+Definitions are indexed by name per class: classes having methods of the same name
+(and functions named as these methods) resolve each to their own definitions
+"""
+from frontend.semantics import TypeEnum
+from frontend.type_checking._symbol_tables import build_symbol_tables, lookup_classes, lookup_functions, lookup_methods
+from frontend.type_checking.shared import type_check_context
+from .common import parse_program, check_program, get_errors
+
+SOURCE = '''class Meters {
+    public integer value;
+    public static function[integer] make(integer a) { return a * 2; }
+    public function[integer] size() { return this.value; }
+}
+class Miles {
+    public double value;
+    public static function[double] make(double a) { return a * 1.5; }
+    public function[double] size() { return this.value; }
+    public function[double] size(double scale) { return this.value * scale; }
+}
+function[boolean] make(boolean a) { return a; }
+'''
+
+
+def test_calls_of_same_name_resolve_in_their_classes():
+    program, _, context = check_program(
+        SOURCE + 'integer i := Meters.make(2);\ndouble d := Miles.make(2.5);\nboolean b := make(true);\n'
+    )
+
+    assert get_errors(context) == []
+    assert [statement.value.expression_type.name for statement in program.statements] == [
+        TypeEnum.INTEGER, TypeEnum.DOUBLE, TypeEnum.BOOLEAN,
+    ]
+
+
+def test_lookups_return_definitions_of_their_class():
+    program = parse_program(SOURCE)
+    meters, miles = program.class_definitions
+    with type_check_context() as context:
+        context.class_definitions.extend(program.class_definitions)
+        context.function_definitions.extend(program.function_definitions)
+        build_symbol_tables()
+
+        assert lookup_classes('Meters') == [meters]
+        assert lookup_classes('Miles') == [miles]
+        assert lookup_methods(meters, 'size') == meters.methods_defs
+        assert lookup_methods(miles, 'size') == miles.methods_defs
+        assert lookup_methods(meters, 'make', is_static=True) == meters.static_methods_defs
+        assert lookup_methods(miles, 'make', is_static=True) == miles.static_methods_defs
+        # static and non-static methods are indexed separately
+        assert lookup_methods(meters, 'make') == []
+        assert lookup_functions('make') == program.function_definitions
+
+
+def test_lookups_of_classes_outside_program():
+    program = parse_program(SOURCE)
+    other_meters, _ = parse_program(SOURCE).class_definitions
+    with type_check_context() as context:
+        context.class_definitions.extend(program.class_definitions)
+        build_symbol_tables()
+
+        # same-named class of another program has its own methods
+        assert lookup_methods(other_meters, 'size') == other_meters.methods_defs
+        assert lookup_methods(other_meters, 'size')[0] is not lookup_methods(program.class_definitions[0], 'size')[0]
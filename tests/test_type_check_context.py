@@ -0,0 +1,64 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from frontend.type_checking.shared import TypeCheckContext, get_context, type_check_context
+from .common import read_example, check_program, get_errors
+
+
+def generate_program(index: int) -> str:
+    # every program declares its own names and refers to an undefined one, so errors tell the programs apart
+    return f'''class Point{index} {{
+    public integer x;
+    public constructor(integer x) {{ this.x := x; }}
+}}
+function[integer] scale{index}(integer a) {{ return a * {index + 2}; }}
+function[integer] scale{index}(integer a, integer b) {{ return a * b; }}
+Point{index} p := new Point{index}({index});
+integer y := scale{index}(2) + missing{index};
+integer w := scale{index}(1, 2);
+'''
+
+
+def summarize_check(source: str) -> tuple:
+    program, valid, context = check_program(source)
+    return (
+        valid,
+        get_errors(context),
+        [class_node.name for class_node in context.class_definitions],
+        sorted(context.functions_by_name),
+        [function_node.usages for function_node in program.function_definitions],
+    )
+
+
+def test_context_holds_only_its_program():
+    _, _, first_context = check_program(generate_program(1))
+    _, _, second_context = check_program(generate_program(2))
+
+    assert [class_node.name for class_node in second_context.class_definitions] == ['Point2']
+    assert sorted(second_context.functions_by_name) == ['scale2']
+    assert any('missing1' in error for error in get_errors(first_context))
+    assert not any('missing1' in error for error in get_errors(second_context))
+
+
+def test_context_is_current_only_during_check():
+    with pytest.raises(LookupError):
+        get_context()
+
+    context = TypeCheckContext()
+    with type_check_context(context) as current_context:
+        assert current_context is context
+        assert get_context() is context
+
+    with pytest.raises(LookupError):
+        get_context()
+
+
+def test_checks_in_thread_pool_dont_share_state():
+    sources = [read_example()] + [generate_program(index) for index in range(12)]
+    expected = [summarize_check(source) for source in sources]
+
+    with ThreadPoolExecutor(max_workers=16) as executor:
+        results = list(executor.map(summarize_check, sources * 20))
+
+    assert results == expected * 20
@@ -0,0 +1,159 @@
+"""
+Equivalence of the precomputed conversion lattice with the if/elif chains it replaced
+"""
+import itertools
+
+from frontend.abstract_syntax_tree import TypeNode, TypeCategory, TypeLiteral
+from frontend.semantics import TypeEnum
+from frontend.type_checking._type_cast import common_primitive_type
+from frontend.type_checking._type_match import match_types
+
+# both the enum members and the plain names are passed around, and names of the other types too
+TYPE_NAMES = list(TypeEnum) + [str(type_name) for type_name in TypeEnum] + ['unknown']
+
+MODIFIERS = (
+    {},
+    {'_const': True},
+    {'_nullable': True},
+    {'_reference': True},
+    {'_literal': True},
+    {'_const': True, '_nullable': True},
+)
+
+
+def previous_common_primitive_type(left_type: TypeEnum | str, right_type: TypeEnum | str) -> TypeEnum | None:
+    if left_type == right_type:
+        return left_type
+
+    integer_types = (
+        TypeEnum.BYTE,
+        TypeEnum.SHORT_INTEGER,
+        TypeEnum.INTEGER,
+        TypeEnum.LONG_INTEGER,
+        TypeEnum.EXTENDED_INTEGER
+    )
+    float_types = (
+        TypeEnum.FLOAT,
+        TypeEnum.DOUBLE,
+        TypeEnum.COMPLEX
+    )
+    numeric_types = integer_types + float_types
+
+    if not (left_type in numeric_types and right_type in numeric_types):
+        return None
+
+    if left_type == TypeEnum.BYTE:
+        return right_type
+    elif left_type == TypeEnum.SHORT_INTEGER:
+        return right_type if right_type != TypeEnum.BYTE else left_type
+    elif left_type == TypeEnum.INTEGER:
+        return right_type if right_type not in (TypeEnum.BYTE, TypeEnum.SHORT_INTEGER) else left_type
+    elif left_type == TypeEnum.EXTENDED_INTEGER:
+        if right_type in float_types:
+            return None
+        return left_type
+    elif left_type == TypeEnum.FLOAT:
+        if right_type == TypeEnum.EXTENDED_INTEGER:
+            return None
+        return right_type if right_type in float_types else left_type
+    elif left_type == TypeEnum.DOUBLE:
+        if right_type == TypeEnum.EXTENDED_INTEGER:
+            return None
+        return right_type if right_type == TypeEnum.COMPLEX else left_type
+    elif left_type == TypeEnum.COMPLEX:
+        if right_type == TypeEnum.EXTENDED_INTEGER:
+            return None
+        return left_type
+    return None
+
+
+def previous_match_types(current_type: TypeNode, target_type: TypeNode) -> bool:
+    # the checks before the primitive types are unchanged, they are repeated for the complete comparison
+    if current_type == target_type:
+        return True
+    if not current_type.is_constant and target_type.is_constant:
+        return False
+    if current_type.is_nullable and not target_type.is_nullable:
+        return False
+    if current_type.is_reference != target_type.is_reference:
+        return False
+    if current_type.type == TypeEnum.NULL:
+        return target_type.is_nullable
+    if current_type.category != target_type.category:
+        return False
+
+    current_type_name = current_type.name
+    target_type_name = target_type.name
+    if current_type_name == target_type_name:
+        return True
+
+    if current_type_name == TypeEnum.BYTE:
+        return target_type_name in (
+            TypeEnum.SHORT_INTEGER,
+            TypeEnum.INTEGER,
+            TypeEnum.LONG_INTEGER,
+            TypeEnum.EXTENDED_INTEGER,
+            TypeEnum.FLOAT,
+            TypeEnum.DOUBLE,
+            TypeEnum.COMPLEX
+        )
+    elif current_type_name == TypeEnum.SHORT_INTEGER:
+        return target_type_name in (
+            TypeEnum.INTEGER,
+            TypeEnum.LONG_INTEGER,
+            TypeEnum.EXTENDED_INTEGER,
+            TypeEnum.FLOAT,
+            TypeEnum.DOUBLE,
+            TypeEnum.COMPLEX
+        )
+    elif current_type_name == TypeEnum.INTEGER:
+        return target_type_name in (
+            TypeEnum.LONG_INTEGER,
+            TypeEnum.EXTENDED_INTEGER,
+            TypeEnum.FLOAT,
+            TypeEnum.DOUBLE,
+            TypeEnum.COMPLEX
+        )
+    elif current_type_name == TypeEnum.LONG_INTEGER:
+        return target_type_name in (
+            TypeEnum.EXTENDED_INTEGER,
+            TypeEnum.DOUBLE,
+            TypeEnum.COMPLEX,
+        )
+    elif current_type_name == TypeEnum.FLOAT:
+        return target_type_name in (
+            TypeEnum.DOUBLE,
+            TypeEnum.COMPLEX
+        )
+    elif current_type_name == TypeEnum.DOUBLE:
+        return target_type_name in (
+            TypeEnum.COMPLEX,
+        )
+    return False
+
+
+def make_primitive_type(type_name: TypeEnum | str, **modifiers) -> TypeNode:
+    return TypeNode(TypeCategory.PRIMITIVE, TypeLiteral(type_name, 0, 0), None, 0, 0, **modifiers)
+
+
+def test_common_primitive_type_of_all_pairs():
+    for left_type, right_type in itertools.product(TYPE_NAMES, repeat=2):
+        expected = previous_common_primitive_type(left_type, right_type)
+        assert common_primitive_type(left_type, right_type) == expected, (left_type, right_type)
+
+
+def test_match_types_of_all_primitive_pairs():
+    types = [
+        make_primitive_type(type_name, **modifiers)
+        for type_name in TYPE_NAMES
+        for modifiers in MODIFIERS
+    ]
+    for current_type, target_type in itertools.product(types, repeat=2):
+        expected = previous_match_types(current_type, target_type)
+        assert match_types(current_type, target_type) == expected, (current_type.name, target_type.name)
+
+
+def test_long_integer_has_common_type_only_on_the_right():
+    assert common_primitive_type(TypeEnum.INTEGER, TypeEnum.LONG_INTEGER) == TypeEnum.LONG_INTEGER
+    assert common_primitive_type(TypeEnum.LONG_INTEGER, TypeEnum.INTEGER) is None
+    assert common_primitive_type(TypeEnum.LONG_INTEGER, TypeEnum.LONG_INTEGER) == TypeEnum.LONG_INTEGER
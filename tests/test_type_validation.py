@@ -0,0 +1,67 @@
+"""
+Memoized type validation repeats exactly what the validation of the type does
+"""
+import re
+
+from frontend.abstract_syntax_tree import iter_child_nodes
+from frontend.type_checking._validated_type_cache import ValidatedTypeCache
+from .common import read_example, check_program
+
+GENERIC_TYPES = '''class Box[T] { public T value; public Box[T] next; public array[T] items; }
+class Pair[A, B] { public A a; public keymap[A, Box[B]] m; }
+class Point { public integer x; }
+function f0(Box[const integer] a, Pair[Box[Box[double]], array[integer]] b, nullable Box[integer] c) { }
+function f1(Box[const integer] a, Pair[Box[Box[double]], array[integer]] b, nullable Box[integer] c) { }
+function f2(Box[Point] a, array[array[Point]] b, Box[Missing] c, array[Missing] d) { }
+function f3(Box[Point] a, array[array[Point]] b, Box[Missing] c, keymap[Point, Box[Point]] d) { }
+'''
+
+
+def summarize_check(source: str) -> tuple:
+    program, valid, context = check_program(source)
+    nodes = []
+    stack = [program]
+    visited = set()
+    while stack:
+        node = stack.pop()
+        if id(node) in visited:
+            continue
+        visited.add(id(node))
+        attributes = node.__dict__
+        nodes.append((
+            type(node).__name__,
+            node.location,
+            node.valid,
+            attributes.get('represents_generic_param'),
+            attributes.get('_class') is not None,
+            attributes.get('_usages'),
+            sorted(attributes.get('_instantiations') or (), key=repr),
+        ))
+        stack.extend(iter_child_nodes(node))
+    errors = [re.sub(r' at 0x[0-9a-f]+', '', str(error)) for error in context.error_logger]
+    return valid, errors, nodes, context.type_cache
+
+
+def test_cached_validation_is_same_as_validation(monkeypatch):
+    for source in (GENERIC_TYPES, read_example()):
+        *cached, type_cache = summarize_check(source)
+        with monkeypatch.context() as patch:
+            patch.setattr(ValidatedTypeCache, 'lookup', lambda self, key: self.MISSING)
+            *uncached, _ = summarize_check(source)
+
+        assert type_cache.hits > 0
+        assert cached == uncached
+
+
+def test_cache_hit_doesnt_look_up_arguments():
+    nested_box, nested_array = 'Box[integer]', 'array[integer]'
+    for _ in range(8):
+        nested_box, nested_array = f'Box[{nested_box}]', f'array[{nested_array}]'
+    source = 'class Box[T] { public T value; }\n' + ''.join(
+        f'function f{index}({nested_box} a, {nested_array} b) {{ }}\n' for index in range(10)
+    )
+
+    _, _, _, type_cache = summarize_check(source)
+
+    # the first declaration is validated level by level, the rest are single hits
+    assert type_cache.hits == 18